@@ -1,11 +1,21 @@
 """Analysis engine for coaching insights."""
 
-from .chunking import chunk_transcript, reconstruct_full_transcript
-from .engine import analyze_call, get_or_create_coaching_session
-
-__all__ = [
-    "chunk_transcript",
-    "reconstruct_full_transcript",
-    "analyze_call",
-    "get_or_create_coaching_session",
-]
+import importlib
+from typing import Any
+
+# Exported names and the submodule they live in, imported on first access so that
+# importing one analysis module doesn't load the engine and its dependencies.
+_EXPORTS = {
+    "chunk_transcript": ".chunking",
+    "reconstruct_full_transcript": ".chunking",
+    "analyze_call": ".engine",
+    "get_or_create_coaching_session": ".engine",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
@@ -9,9 +9,11 @@ from datetime import datetime, timedelta
 from typing import Any
 
 from coaching_mcp.shared import settings
-from db import execute_query, fetch_one
+from db import execute_query, fetch_one, queries
 from db.models import CoachingDimension
 
+from .objections import extract_objections
+
 logger = logging.getLogger(__name__)
 
 
@@ -84,7 +86,7 @@ def get_cached_analysis(
     """
     cache_key = generate_cache_key(call_id, dimension, transcript_hash, rubric_version)
 
-    # Check cache with TTL
+    # Check cache with TTL; the created_at cutoff also prunes partitions older than the TTL
     cache_cutoff = datetime.now() - timedelta(days=settings.cache_ttl_days)
 
     cached = fetch_one(
@@ -306,11 +308,13 @@ def store_analysis_with_cache(
         ),
     )
 
-    # Get inserted session ID
+    # Get inserted session ID. The created_at bound lets Postgres prune coaching_sessions
+    # to the current partition instead of probing the cache index in every quarter.
     session = fetch_one(
         """
-        SELECT id FROM coaching_sessions
+        SELECT id, created_at FROM coaching_sessions
         WHERE cache_key = %s
+        AND created_at >= NOW() - INTERVAL '1 day'
         ORDER BY created_at DESC
         LIMIT 1
         """,
@@ -324,4 +328,25 @@ def store_analysis_with_cache(
         f"cache_key={cache_key[:16]}..."
     )
 
+    # Index objections from objection-handling analyses for search and weekly reports.
+    # Failures are logged rather than raised: the session itself is already stored.
+    if dimension == CoachingDimension.OBJECTION_HANDLING and session:
+        try:
+            queries.replace_call_objections(
+                call_id,
+                session["id"],
+                rep_id,
+                extract_objections(analysis_result),
+                analyzed_at=session.get("created_at"),
+            )
+        except Exception as e:
+            logger.warning(f"Failed to store objections for call {call_id}: {e}")
+
+    # New session version for this call: drop opportunity analyses built on the old one.
+    # A failure here is safe to ignore because stale entries also fail the watermark check.
+    try:
+        queries.invalidate_opportunity_cache_for_call(call_id)
+    except Exception as e:
+        logger.warning(f"Failed to invalidate opportunity cache for call {call_id}: {e}")
+
     return str(session["id"]) if session and isinstance(session, dict) else None
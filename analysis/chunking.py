@@ -3,18 +3,25 @@ Transcript chunking for handling long calls.
 Uses sliding window with overlap to maintain context across chunks.
 """
 
+import functools
 import logging
-from typing import Any
-
-import tiktoken
+from typing import TYPE_CHECKING, Any
 
 from coaching_mcp.shared import settings
 from db.models import ChunkMetadata
 
+if TYPE_CHECKING:
+    from tiktoken import Encoding
+
 logger = logging.getLogger(__name__)
 
-# Initialize tokenizer (cl100k_base is used by Claude models)
-tokenizer = tiktoken.get_encoding("cl100k_base")
+
+@functools.cache
+def get_tokenizer() -> "Encoding":
+    """cl100k_base tokenizer (used by Claude models), loaded on first use."""
+    import tiktoken
+
+    return tiktoken.get_encoding("cl100k_base")
 
 
 def count_tokens(text: str) -> int:
@@ -27,7 +34,7 @@ def count_tokens(text: str) -> int:
     Returns:
         Number of tokens
     """
-    return len(tokenizer.encode(text))
+    return len(get_tokenizer().encode(text))
 
 
 def chunk_transcript(
@@ -55,6 +62,7 @@ def chunk_transcript(
     overlap_percentage = overlap_percentage or settings.chunk_overlap_percentage
 
     # Tokenize full transcript
+    tokenizer = get_tokenizer()
     tokens = tokenizer.encode(transcript)
     total_tokens = len(tokens)
 
@@ -144,6 +152,7 @@ def reconstruct_full_transcript(chunks: list[tuple[str, ChunkMetadata]]) -> str:
     full_text = chunks[0][0]
 
     # For subsequent chunks, skip the overlap portion
+    tokenizer = get_tokenizer()
     for chunk_text, metadata in chunks[1:]:
         # Tokenize chunk
         chunk_tokens = tokenizer.encode(chunk_text)
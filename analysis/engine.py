@@ -3,13 +3,13 @@ Core analysis engine for coaching insights.
 Integrates Claude API with caching and chunking.
 """
 
+import functools
 import json
 import logging
-from typing import Any
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
 from uuid import UUID
 
-from anthropic import Anthropic
-
 from coaching_mcp.shared import settings
 from db import fetch_all, fetch_one
 from db.models import CoachingDimension
@@ -28,11 +28,30 @@ from .prompts import (
 )
 from .prompts.five_wins_prompt import analyze_five_wins_prompt
 from .rubric_loader import load_rubric
+from .score_distribution import record_score
+
+if TYPE_CHECKING:
+    from anthropic import Anthropic
 
 logger = logging.getLogger(__name__)
 
-# Initialize Claude API client
-anthropic_client = Anthropic(api_key=settings.anthropic_api_key)
+
+@functools.cache
+def get_anthropic_client() -> "Anthropic":
+    """Claude API client, built on first use so importing the engine stays cheap."""
+    from anthropic import Anthropic
+
+    return Anthropic(api_key=settings.anthropic_api_key)
+
+
+class _LazyAnthropicClient:
+    """Stands in for the client until an attribute (e.g. .messages) is first used."""
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(get_anthropic_client(), name)
+
+
+anthropic_client: "Anthropic" = _LazyAnthropicClient()  # type: ignore[assignment]
 
 
 def detect_speaker_role(call_id: str) -> str:
@@ -101,6 +120,31 @@ def detect_speaker_role(call_id: str) -> str:
     return role
 
 
+def get_cached_coaching_session(
+    call_id: UUID,
+    dimension: CoachingDimension,
+    transcript: str,
+) -> dict[str, Any] | None:
+    """
+    Get the cached coaching session for the current transcript and rubric, if any.
+
+    Same cache lookup as get_or_create_coaching_session, without running an analysis
+    on a miss.
+
+    Returns:
+        Cached coaching session data, or None on a miss or with caching disabled
+    """
+    if not settings.enable_caching:
+        return None
+
+    return get_cached_analysis(
+        call_id=str(call_id),
+        dimension=dimension,
+        transcript_hash=generate_transcript_hash(transcript),
+        rubric_version=get_active_rubric_version(dimension),
+    )
+
+
 def get_or_create_coaching_session(
     call_id: UUID,
     rep_id: UUID,
@@ -108,6 +152,7 @@ def get_or_create_coaching_session(
     transcript: str,
     force_reanalysis: bool = False,
     session_type: str = "on_demand",
+    on_token: Callable[[str], None] | None = None,
 ) -> dict[str, Any]:
     """
     Get coaching session from cache or create new analysis.
@@ -120,6 +165,8 @@ def get_or_create_coaching_session(
         transcript: Full call transcript
         force_reanalysis: Bypass cache and regenerate
         session_type: Type of session (on_demand, weekly_review, etc.)
+        on_token: Called with each text delta while Claude generates a fresh analysis
+            (not called on a cache hit)
 
     Returns:
         Coaching session data with analysis
@@ -171,6 +218,7 @@ def get_or_create_coaching_session(
         dimension=dimension,
         transcript=transcript,
         call_metadata=call_metadata,
+        on_token=on_token,
     )
 
     # Store analysis with cache metadata
@@ -184,9 +232,20 @@ def get_or_create_coaching_session(
         session_type=session_type,
     )
 
-    # Fetch and return stored session
+    # Keep in-memory percentile/average distributions current for this process
+    record_score(
+        dimension.value,
+        analysis_result.get("score"),
+        call_metadata.get("product") if call_metadata else None,
+    )
+
+    # Fetch and return stored session (bounded on created_at so only the current
+    # partition is searched)
     session = fetch_one(
-        "SELECT * FROM coaching_sessions WHERE id = %s",
+        """
+        SELECT * FROM coaching_sessions
+        WHERE id = %s AND created_at >= NOW() - INTERVAL '1 day'
+        """,
         (session_id,),
         as_dict=True,
     )
@@ -291,6 +350,7 @@ def _run_claude_analysis(
     dimension: CoachingDimension,
     transcript: str,
     call_metadata: dict[str, Any] | None = None,
+    on_token: Callable[[str], None] | None = None,
 ) -> dict[str, Any]:
     """
     Run actual Claude API analysis for a coaching dimension.
@@ -300,6 +360,7 @@ def _run_claude_analysis(
         dimension: Coaching dimension to analyze
         transcript: Full call transcript
         call_metadata: Optional call metadata for context
+        on_token: If given, the response is streamed and each text delta passed to it
 
     Returns:
         Analysis result with scores, strengths, areas for improvement, etc.
@@ -380,12 +441,25 @@ def _run_claude_analysis(
 
     # Call Claude API with prompt caching
     try:
-        response = anthropic_client.messages.create(
-            model="claude-sonnet-4-5-20250929",
-            max_tokens=8000,  # Increased for complex discovery analysis with SPICED/Challenger/Sandler
-            temperature=0.3,
-            messages=messages,  # type: ignore[arg-type]
-        )
+        model = "claude-sonnet-4-5-20250929"
+        max_tokens = 8000  # Increased for complex discovery analysis with SPICED/Challenger/Sandler
+        if on_token is None:
+            response = anthropic_client.messages.create(
+                model=model,
+                max_tokens=max_tokens,
+                temperature=0.3,
+                messages=messages,  # type: ignore[arg-type]
+            )
+        else:
+            with anthropic_client.messages.stream(
+                model=model,
+                max_tokens=max_tokens,
+                temperature=0.3,
+                messages=messages,  # type: ignore[arg-type]
+            ) as stream:
+                for text in stream.text_stream:
+                    on_token(text)
+                response = stream.get_final_message()
 
         # Extract usage statistics
         usage = response.usage
@@ -15,8 +15,6 @@ import json
 import logging
 from typing import Any
 
-import anthropic
-
 from coaching_mcp.shared import settings
 from db import queries
 from db.models import CoachingDimension
@@ -116,38 +114,40 @@ def aggregate_coaching_patterns(
     all_scores = []
     high_score_examples = []
 
+    # Fetch calls and their latest session for this dimension in a fixed number of queries
+    opp_call_ids = queries.get_call_ids_for_opportunities([opp["id"] for opp in opportunities])
+    all_call_ids = list({call_id for ids in opp_call_ids.values() for call_id in ids})
+    latest_sessions = queries.get_latest_sessions_for_calls(all_call_ids, [dimension])
+
+    high_score_call_ids = set()
     for opp in opportunities:
-        # Get timeline to find calls
-        timeline_items = queries.get_opportunity_timeline(opp["id"], limit=1000, offset=0)
-        call_ids = [item["id"] for item in timeline_items if item["item_type"] == "call"]
-
-        for call_id in call_ids:
-            sessions = queries.get_coaching_sessions_for_call(call_id, dimension)
-            if sessions:
-                session = sessions[0]  # Most recent
+        for call_id in opp_call_ids.get(str(opp["id"]), []):
+            session = latest_sessions.get(call_id, {}).get(dimension.value)
+            if session:
                 score = session["score"]
                 all_scores.append(score)
 
                 # Collect high-scoring examples (>80)
                 if score >= 80:
-                    call = queries.get_call_by_id(call_id)
-                    transcript = queries.get_full_transcript(call_id)
-
+                    high_score_call_ids.add(call_id)
                     high_score_examples.append(
                         {
                             "call_id": call_id,
                             "opportunity_name": opp["name"],
                             "score": score,
                             "feedback": session.get("feedback"),
-                            "transcript_excerpt": transcript[:1000] if transcript else "",
-                            "call_date": (
-                                call["scheduled_at"].isoformat()
-                                if call.get("scheduled_at")
-                                else None
-                            ),
                         }
                     )
 
+    calls = queries.get_calls_by_ids(list(high_score_call_ids))
+    excerpts = queries.get_transcript_excerpts(list(high_score_call_ids), 1000)
+    for example in high_score_examples:
+        call = calls.get(example["call_id"], {})
+        example["transcript_excerpt"] = excerpts.get(example["call_id"], "")
+        example["call_date"] = (
+            call["scheduled_at"].isoformat() if call.get("scheduled_at") else None
+        )
+
     patterns["total_calls_analyzed"] = len(all_scores)
     patterns["average_score"] = sum(all_scores) / len(all_scores) if all_scores else 0
     patterns["high_scoring_examples"] = sorted(
@@ -238,6 +238,8 @@ def get_learning_insights(
     exemplars = extract_exemplar_moments(top_performer_patterns, focus_area)
 
     # Use Claude to generate comparative analysis with role context
+    import anthropic
+
     client = anthropic.Anthropic(api_key=settings.anthropic_api_key)
 
     # Map role to friendly name
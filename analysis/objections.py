@@ -0,0 +1,146 @@
+"""
+Structured objection extraction from objection-handling analyses.
+
+Each objection-handling analysis is broken into one row per objection (type, quote,
+timestamps, whether it was resolved) when it is stored, so objection search and the
+weekly recurring-objection report read the indexed call_objections table instead of
+scanning analysis text.
+
+The prompt asks Claude for an explicit objection list (objection_breakdown.objections);
+analyses without one (older sessions, or a model that skipped it) fall back to
+classifying the specific_examples exchanges by keyword.
+"""
+
+import json
+from typing import Any
+
+OBJECTION_TYPES = ("pricing", "timing", "technical_fit", "competitive", "other")
+
+OBJECTION_TYPE_LABELS = {
+    "pricing": "Pricing/Cost Concerns",
+    "timing": "Timing/Readiness",
+    "technical_fit": "Technical Concerns",
+    "competitive": "Competitive Comparison",
+    "other": "Other Objections",
+}
+
+# Names accepted from callers and older prompts for the canonical types
+_TYPE_ALIASES = {
+    "price": "pricing",
+    "cost": "pricing",
+    "budget": "pricing",
+    "timeline": "timing",
+    "technical": "technical_fit",
+    "integration": "technical_fit",
+    "competitor": "competitive",
+    "competition": "competitive",
+}
+
+# Keyword fallback, checked in order (first match wins)
+_KEYWORDS = (
+    ("pricing", ("pricing", "price", "cost", "budget", "expensive")),
+    ("timing", ("timing", "not ready", "next quarter", "timeline")),
+    ("technical_fit", ("technical", "integration")),
+    ("competitive", ("competitor", "competitive", "alternative")),
+)
+
+MAX_QUOTE_LENGTH = 500
+
+
+def normalize_objection_type(value: str | None) -> str | None:
+    """
+    Map an objection type name to one of OBJECTION_TYPES.
+
+    Returns:
+        Canonical type, or None if the value isn't a recognised type or alias
+    """
+    if not value:
+        return None
+    key = value.strip().lower().replace(" ", "_").replace("-", "_")
+    key = _TYPE_ALIASES.get(key, key)
+    return key if key in OBJECTION_TYPES else None
+
+
+def classify_objection_text(text: str) -> str:
+    """Classify free text into an objection type by keyword."""
+    lowered = text.lower()
+    for objection_type, keywords in _KEYWORDS:
+        if any(keyword in lowered for keyword in keywords):
+            return objection_type
+    return "other"
+
+
+def _seconds(value: Any) -> int | None:
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _quote(value: Any) -> str | None:
+    return str(value)[:MAX_QUOTE_LENGTH] if value else None
+
+
+def extract_objections(analysis: dict[str, Any]) -> list[dict[str, Any]]:
+    """
+    Pull objections out of an objection-handling analysis.
+
+    Args:
+        analysis: Analysis result as returned by the model (or a stored session row)
+
+    Returns:
+        List of dicts with objection_type, quote, timestamp_start, timestamp_end,
+        resolved (bool or None) and handled_well (bool or None)
+    """
+    breakdown = analysis.get("objection_breakdown") or {}
+    listed = breakdown.get("objections") if isinstance(breakdown, dict) else None
+
+    if isinstance(listed, list) and listed:
+        objections = []
+        for item in listed:
+            if not isinstance(item, dict):
+                continue
+            text = item.get("quote") or item.get("summary") or ""
+            objection_type = normalize_objection_type(item.get("type"))
+            objections.append(
+                {
+                    "objection_type": objection_type or classify_objection_text(text),
+                    "quote": _quote(text),
+                    "timestamp_start": _seconds(item.get("timestamp_start")),
+                    "timestamp_end": _seconds(item.get("timestamp_end")),
+                    "resolved": item.get("resolved"),
+                    "handled_well": item.get("handled_well"),
+                }
+            )
+        return objections
+
+    examples = analysis.get("specific_examples") or {}
+    if isinstance(examples, str):
+        examples = json.loads(examples)
+    if not isinstance(examples, dict):
+        return []
+
+    objections = []
+    for bucket, handled_well in (("good", True), ("needs_work", False)):
+        for example in examples.get(bucket) or []:
+            if not isinstance(example, dict):
+                continue
+            text = " ".join(
+                str(example.get(field) or "")
+                for field in ("quote", "exchange_summary", "analysis", "impact")
+            )
+            objections.append(
+                {
+                    "objection_type": classify_objection_text(text),
+                    "quote": _quote(
+                        example.get("quote")
+                        or example.get("exchange_summary")
+                        or example.get("analysis")
+                    ),
+                    "timestamp_start": _seconds(example.get("timestamp_start")),
+                    "timestamp_end": _seconds(example.get("timestamp_end")),
+                    "resolved": None,
+                    "handled_well": handled_well,
+                }
+            )
+    return objections
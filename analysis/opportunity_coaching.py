@@ -15,28 +15,22 @@ COACHING PHILOSOPHY:
 import hashlib
 import json
 import logging
-from datetime import datetime, timedelta
 from typing import Any
 from uuid import UUID
 
-import anthropic
-
 from coaching_mcp.shared import settings
 from db import queries
 from db.models import CoachingDimension
 
 logger = logging.getLogger(__name__)
 
-# Cache TTL for opportunity analysis (7 days - refreshes after new calls)
-OPPORTUNITY_CACHE_TTL_DAYS = 7
-
 
 def _get_opportunity_cache_key(opportunity_id: str, analysis_type: str) -> str:
     """
     Generate cache key for opportunity-level analysis.
 
-    The key includes all call IDs associated with the opportunity, so the cache
-    automatically invalidates when new calls are added.
+    There is one entry per opportunity and analysis type; freshness is decided by
+    comparing the entry's data watermark, not by the key.
 
     Args:
         opportunity_id: Opportunity UUID
@@ -45,40 +39,61 @@ def _get_opportunity_cache_key(opportunity_id: str, analysis_type: str) -> str:
     Returns:
         SHA256 hash-based cache key
     """
-    # Get all call IDs for this opportunity to include in cache key
-    timeline_items = queries.get_opportunity_timeline(opportunity_id, limit=1000, offset=0)
-    call_ids = sorted([item["id"] for item in timeline_items if item["item_type"] == "call"])
-
-    # Include call IDs in the key so cache invalidates when calls change
-    key_components = f"{opportunity_id}:{analysis_type}:{','.join(str(cid) for cid in call_ids)}"
+    key_components = f"{opportunity_id}:{analysis_type}"
     return hashlib.sha256(key_components.encode("utf-8")).hexdigest()
 
 
-def _get_cached_analysis(cache_key: str) -> dict[str, Any] | None:
+def _get_data_watermark(opportunity_id: str) -> str | None:
+    """
+    Fingerprint the opportunity data that analyses are computed from.
+
+    Covers the latest call and email timestamps, call/email counts and the
+    session versions of the opportunity's calls, so linking a call or email
+    or storing a coaching session yields a new watermark.
+
+    Args:
+        opportunity_id: Opportunity UUID
+
+    Returns:
+        SHA256 watermark, or None if it could not be computed (caching is skipped)
+    """
+    try:
+        watermark = queries.get_opportunity_data_watermark(opportunity_id)
+    except Exception as e:
+        logger.warning(f"Failed to compute opportunity data watermark: {e}")
+        return None
+
+    components = json.dumps(watermark or {}, sort_keys=True, default=str)
+    return hashlib.sha256(components.encode("utf-8")).hexdigest()
+
+
+def _get_cached_analysis(
+    cache_key: str, data_watermark: str | None
+) -> dict[str, Any] | list[str] | None:
     """
-    Retrieve cached opportunity analysis if valid.
+    Retrieve cached opportunity analysis if it matches the current data.
 
     Args:
         cache_key: Cache key from _get_opportunity_cache_key
+        data_watermark: Current watermark from _get_data_watermark
 
     Returns:
-        Cached analysis result or None if not found/expired
+        Cached analysis result or None if not found/stale
     """
+    if data_watermark is None:
+        return None
+
     try:
         cached = queries.get_opportunity_analysis_cache(cache_key)
         if cached:
-            # Check TTL
-            cached_at = cached.get("cached_at")
-            if cached_at:
-                expiry = cached_at + timedelta(days=OPPORTUNITY_CACHE_TTL_DAYS)
-                if datetime.utcnow() < expiry:
-                    logger.info(f"Cache HIT for opportunity analysis: {cache_key[:16]}...")
-                    result = cached.get("analysis_result")
-                    if isinstance(result, dict):
-                        return result
-                    return None
-                else:
-                    logger.info(f"Cache EXPIRED for opportunity analysis: {cache_key[:16]}...")
+            if cached.get("data_watermark") == data_watermark:
+                logger.info(f"Cache HIT for opportunity analysis: {cache_key[:16]}...")
+                result = cached.get("analysis_result")
+                if isinstance(result, dict | list):
+                    return result
+                return None
+            else:
+                logger.info(f"Cache STALE for opportunity analysis: {cache_key[:16]}...")
         return None
     except Exception as e:
         logger.warning(f"Failed to retrieve opportunity cache: {e}")
@@ -90,22 +105,31 @@ def _set_cached_analysis(
     opportunity_id: str,
     analysis_type: str,
     result: dict[str, Any] | list[str],
+    data_watermark: str | None,
 ) -> None:
     """
     Store opportunity analysis in cache.
 
+    The watermark must be the one read *before* computing the result, so data
+    that changes mid-analysis leaves the entry stale rather than wrongly fresh.
+
     Args:
         cache_key: Cache key from _get_opportunity_cache_key
         opportunity_id: Opportunity UUID
         analysis_type: Type of analysis
         result: Analysis result to cache
+        data_watermark: Watermark the result was computed from
     """
+    if data_watermark is None:
+        return
+
     try:
         queries.set_opportunity_analysis_cache(
             cache_key=cache_key,
             opportunity_id=opportunity_id,
             analysis_type=analysis_type,
             analysis_result=result,
+            data_watermark=data_watermark,
         )
         logger.info(f"Cached opportunity analysis: {cache_key[:16]}... type={analysis_type}")
     except Exception as e:
@@ -174,8 +198,9 @@ def analyze_opportunity_patterns(opportunity_id: str, use_cache: bool = True) ->
     # Check cache first
     if use_cache:
         cache_key = _get_opportunity_cache_key(opportunity_id, "patterns")
-        cached = _get_cached_analysis(cache_key)
-        if cached:
+        data_watermark = _get_data_watermark(opportunity_id)
+        cached = _get_cached_analysis(cache_key, data_watermark)
+        if cached and isinstance(cached, dict):
             return cached
 
     # Get opportunity and all associated calls
@@ -184,7 +209,6 @@ def analyze_opportunity_patterns(opportunity_id: str, use_cache: bool = True) ->
         raise ValueError(f"Opportunity not found: {opportunity_id}")
 
     # Get timeline to find all calls
-    timeline_items, _ = queries.search_opportunities(limit=1000, offset=0)
     call_ids = [
         item["id"]
         for item in queries.get_opportunity_timeline(opportunity_id, limit=1000, offset=0)
@@ -199,16 +223,17 @@ def analyze_opportunity_patterns(opportunity_id: str, use_cache: bool = True) ->
             "message": "No calls found for this opportunity",
         }
 
+    # Most recent session per call/dimension, fetched in one query
+    latest_sessions = queries.get_latest_sessions_for_calls(call_ids)
+
     # Aggregate coaching scores by dimension
     dimension_scores = {}
     for dimension in CoachingDimension:
         scores_over_time = []
 
         for call_id in call_ids:
-            sessions = queries.get_coaching_sessions_for_call(call_id, dimension)
-            if sessions:
-                # Get most recent session for this call/dimension
-                latest_session = sessions[0]
+            latest_session = latest_sessions.get(str(call_id), {}).get(dimension.value)
+            if latest_session:
                 scores_over_time.append(
                     {
                         "call_id": call_id,
@@ -253,7 +278,7 @@ def analyze_opportunity_patterns(opportunity_id: str, use_cache: bool = True) ->
 
     # Cache the result
     if use_cache:
-        _set_cached_analysis(cache_key, opportunity_id, "patterns", result)
+        _set_cached_analysis(cache_key, opportunity_id, "patterns", result, data_watermark)
 
     return result
 
@@ -272,8 +297,9 @@ def identify_recurring_themes(opportunity_id: str, use_cache: bool = True) -> di
     # Check cache first (expensive Claude call)
     if use_cache:
         cache_key = _get_opportunity_cache_key(opportunity_id, "themes")
-        cached = _get_cached_analysis(cache_key)
-        if cached:
+        data_watermark = _get_data_watermark(opportunity_id)
+        cached = _get_cached_analysis(cache_key, data_watermark)
+        if cached and isinstance(cached, dict):
             return cached
 
     # Get all call transcripts for opportunity
@@ -284,10 +310,12 @@ def identify_recurring_themes(opportunity_id: str, use_cache: bool = True) -> di
         return {"themes": [], "message": "No calls found"}
 
     # Gather transcripts
+    calls = queries.get_calls_by_ids(call_ids)
+    transcripts = queries.get_transcript_excerpts(call_ids, 5000)  # Limit length
     transcripts_data = []
     for call_id in call_ids:
-        transcript = queries.get_full_transcript(call_id)
-        call = queries.get_call_by_id(call_id)
+        transcript = transcripts.get(str(call_id))
+        call = calls.get(str(call_id))
         if transcript and call:
             transcripts_data.append(
                 {
@@ -295,11 +323,13 @@ def identify_recurring_themes(opportunity_id: str, use_cache: bool = True) -> di
                     "date": (
                         call["scheduled_at"].isoformat() if call.get("scheduled_at") else "unknown"
                     ),
-                    "transcript": transcript[:5000],  # Limit length
+                    "transcript": transcript,
                 }
             )
 
     # Use Claude to analyze themes
+    import anthropic
+
     client = anthropic.Anthropic(api_key=settings.anthropic_api_key)
 
     prompt = f"""Analyze these sales call transcripts for an opportunity. Identify recurring themes, topics, and concerns that appear across multiple calls.
@@ -327,7 +357,7 @@ BE DIRECT. State exactly what was discussed and how it changed over time. No enc
 
     # Cache the result
     if use_cache:
-        _set_cached_analysis(cache_key, opportunity_id, "themes", result)
+        _set_cached_analysis(cache_key, opportunity_id, "themes", result, data_watermark)
 
     return result
 
@@ -346,23 +376,28 @@ def analyze_objection_progression(opportunity_id: str, use_cache: bool = True) -
     # Check cache first
     if use_cache:
         cache_key = _get_opportunity_cache_key(opportunity_id, "objections")
-        cached = _get_cached_analysis(cache_key)
-        if cached:
+        data_watermark = _get_data_watermark(opportunity_id)
+        cached = _get_cached_analysis(cache_key, data_watermark)
+        if cached and isinstance(cached, dict):
             return cached
 
     # Get coaching sessions focused on objections
     timeline_items = queries.get_opportunity_timeline(opportunity_id, limit=1000, offset=0)
     call_ids = [item["id"] for item in timeline_items if item["item_type"] == "call"]
 
+    latest_sessions = queries.get_latest_sessions_for_calls(
+        call_ids, [CoachingDimension.OBJECTION_HANDLING]
+    )
+    calls = queries.get_calls_by_ids(call_ids)
+
     objections_by_call = []
     for call_id in call_ids:
-        sessions = queries.get_coaching_sessions_for_call(
-            call_id, CoachingDimension.OBJECTION_HANDLING
+        session = latest_sessions.get(str(call_id), {}).get(
+            CoachingDimension.OBJECTION_HANDLING.value
         )
-        call_data = queries.get_call_by_id(call_id)
+        call_data = calls.get(str(call_id), {})
 
-        if sessions:
-            session = sessions[0]  # Most recent
+        if session:
             objections_by_call.append(
                 {
                     "call_id": call_id,
@@ -377,6 +412,8 @@ def analyze_objection_progression(opportunity_id: str, use_cache: bool = True) -
             )
 
     # Use Claude to identify patterns
+    import anthropic
+
     client = anthropic.Anthropic(api_key=settings.anthropic_api_key)
 
     prompt = f"""Analyze objection handling patterns across these sales calls:
@@ -403,7 +440,7 @@ BE DIRECT. Point out exactly which objections the rep is failing to resolve and
 
     # Cache the result
     if use_cache:
-        _set_cached_analysis(cache_key, opportunity_id, "objections", result)
+        _set_cached_analysis(cache_key, opportunity_id, "objections", result, data_watermark)
 
     return result
 
@@ -422,8 +459,9 @@ def assess_relationship_strength(opportunity_id: str, use_cache: bool = True) ->
     # Check cache first
     if use_cache:
         cache_key = _get_opportunity_cache_key(opportunity_id, "relationship")
-        cached = _get_cached_analysis(cache_key)
-        if cached:
+        data_watermark = _get_data_watermark(opportunity_id)
+        cached = _get_cached_analysis(cache_key, data_watermark)
+        if cached and isinstance(cached, dict):
             return cached
 
     timeline_items = queries.get_opportunity_timeline(opportunity_id, limit=1000, offset=0)
@@ -433,9 +471,10 @@ def assess_relationship_strength(opportunity_id: str, use_cache: bool = True) ->
     emails = [item for item in timeline_items if item["item_type"] == "email"]
 
     # Analyze call duration trends
+    calls_by_id = queries.get_calls_by_ids([item["id"] for item in calls])
     call_durations = []
     for call_item in calls:
-        call = queries.get_call_by_id(call_item["id"])
+        call = calls_by_id.get(str(call_item["id"]))
         if call and call.get("duration"):
             call_durations.append(
                 {
@@ -475,7 +514,7 @@ def assess_relationship_strength(opportunity_id: str, use_cache: bool = True) ->
 
     # Cache the result
     if use_cache:
-        _set_cached_analysis(cache_key, opportunity_id, "relationship", result)
+        _set_cached_analysis(cache_key, opportunity_id, "relationship", result, data_watermark)
 
     return result
 
@@ -494,9 +533,10 @@ def generate_coaching_recommendations(opportunity_id: str, use_cache: bool = Tru
     # Check cache first
     if use_cache:
         cache_key = _get_opportunity_cache_key(opportunity_id, "recommendations")
-        cached = _get_cached_analysis(cache_key)
+        data_watermark = _get_data_watermark(opportunity_id)
+        cached = _get_cached_analysis(cache_key, data_watermark)
         if cached and isinstance(cached, list):
-            return cached  # type: ignore[return-value]
+            return cached
 
     # Gather all analysis data (use cache for sub-analyses)
     patterns = analyze_opportunity_patterns(opportunity_id, use_cache=use_cache)
@@ -505,6 +545,8 @@ def generate_coaching_recommendations(opportunity_id: str, use_cache: bool = Tru
     relationship = assess_relationship_strength(opportunity_id, use_cache=use_cache)
 
     # Use Claude to synthesize recommendations
+    import anthropic
+
     client = anthropic.Anthropic(api_key=settings.anthropic_api_key)
 
     prompt = f"""Based on this opportunity analysis, generate 3-5 specific coaching recommendations for the next customer interaction.
@@ -546,6 +588,8 @@ Format as a numbered list of 3-5 recommendations."""
 
     # Cache the result
     if use_cache:
-        _set_cached_analysis(cache_key, opportunity_id, "recommendations", recommendations)
+        _set_cached_analysis(
+            cache_key, opportunity_id, "recommendations", recommendations, data_watermark
+        )
 
     return recommendations
@@ -100,7 +100,17 @@ Provide a structured analysis in JSON format:
       "other": <count>
     }},
     "objections_resolved": <count>,
-    "objections_unresolved": <count>
+    "objections_unresolved": <count>,
+    "objections": [
+      {{
+        "type": "<pricing|timing|technical_fit|competitive|other>",
+        "quote": "<the customer's objection, quoted from the transcript>",
+        "timestamp_start": <seconds>,
+        "timestamp_end": <seconds>,
+        "resolved": <boolean>,
+        "handled_well": <boolean>
+      }}
+    ]
   }},
   "handling_analysis": {{
     "identification_score": <0-100>,
@@ -0,0 +1,201 @@
+"""
+In-memory score distributions for percentile and team-average lookups.
+
+Holds one fixed-width histogram (one bin per integer score, 0-100) per
+(dimension, product) over the trailing window, plus an all-products histogram
+per dimension. Each keeps cumulative counts, so percentiles and averages are
+O(1) lookups instead of a coaching_sessions scan per analyze_call response.
+
+Distributions are reloaded from the database with a single grouped query once
+they are older than settings.score_distribution_ttl_seconds, and new scores
+stored by this process are folded in immediately via record_score().
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from coaching_mcp.shared import settings
+from db import fetch_all
+
+logger = logging.getLogger(__name__)
+
+MAX_SCORE = 100
+WINDOW_DAYS = 90
+
+
+@dataclass
+class ScoreDistribution:
+    """Histogram of integer scores 0-100 with cumulative counts."""
+
+    counts: list[int] = field(default_factory=lambda: [0] * (MAX_SCORE + 1))
+    score_sum: int = 0
+    _cumulative: list[int] | None = field(default=None, repr=False)
+
+    @property
+    def total(self) -> int:
+        return self.cumulative[-1]
+
+    @property
+    def cumulative(self) -> list[int]:
+        """cumulative[i] = number of scores < i (length MAX_SCORE + 2)."""
+        if self._cumulative is None:
+            cumulative = [0] * (MAX_SCORE + 2)
+            for score, count in enumerate(self.counts):
+                cumulative[score + 1] = cumulative[score] + count
+            self._cumulative = cumulative
+        return self._cumulative
+
+    def add(self, score: int, count: int = 1) -> None:
+        score = min(max(int(score), 0), MAX_SCORE)
+        self.counts[score] += count
+        self.score_sum += score * count
+        self._cumulative = None
+
+    def percentile(self, score: int) -> float | None:
+        """Percentage of scores strictly below `score`, or None if empty."""
+        total = self.total
+        if not total:
+            return None
+        below = self.cumulative[min(max(int(score), 0), MAX_SCORE + 1)]
+        return below / total * 100
+
+    def mean(self) -> float | None:
+        total = self.total
+        return self.score_sum / total if total else None
+
+
+# (dimension, product) -> distribution; product None holds all products
+_distributions: dict[tuple[str, str | None], ScoreDistribution] = {}
+_loaded_at: float | None = None
+_lock = threading.Lock()
+
+
+def _load() -> dict[tuple[str, str | None], ScoreDistribution]:
+    """Build distributions for the trailing window from one grouped query."""
+    rows = fetch_all(
+        """
+        SELECT
+            cs.coaching_dimension,
+            c.product,
+            cs.score,
+            COUNT(*) as session_count
+        FROM coaching_sessions cs
+        LEFT JOIN calls c ON c.id = cs.call_id
+        WHERE cs.score IS NOT NULL
+            AND cs.created_at > NOW() - INTERVAL '%s days'
+        GROUP BY cs.coaching_dimension, c.product, cs.score
+        """,
+        (WINDOW_DAYS,),
+    )
+
+    distributions: dict[tuple[str, str | None], ScoreDistribution] = {}
+    for row in rows:
+        dimension = row["coaching_dimension"]
+        keys = [(dimension, None)]
+        if row["product"] is not None:
+            keys.append((dimension, row["product"]))
+        for key in keys:
+            distributions.setdefault(key, ScoreDistribution()).add(
+                row["score"], row["session_count"]
+            )
+    return distributions
+
+
+def _get_distributions() -> dict[tuple[str, str | None], ScoreDistribution]:
+    """Return current distributions, reloading them if the TTL has expired."""
+    global _distributions, _loaded_at
+
+    now = time.monotonic()
+    if _loaded_at is not None and now - _loaded_at < settings.score_distribution_ttl_seconds:
+        return _distributions
+
+    with _lock:
+        if _loaded_at is None or now - _loaded_at >= settings.score_distribution_ttl_seconds:
+            _distributions = _load()
+            _loaded_at = time.monotonic()
+            logger.debug(f"Loaded {len(_distributions)} score distributions")
+    return _distributions
+
+
+def get_distribution(dimension: str, product: str | None = None) -> ScoreDistribution | None:
+    """
+    Get the score distribution for a dimension, optionally for one product.
+
+    Args:
+        dimension: Coaching dimension value
+        product: Product name, or None for all products
+
+    Returns:
+        ScoreDistribution, or None if no scores were recorded in the window
+    """
+    return _get_distributions().get((dimension, product))
+
+
+def get_team_averages(product: str | None = None) -> dict[str, dict[str, Any]]:
+    """
+    Get average score and sample size for every dimension.
+
+    Args:
+        product: Product name, or None for all products
+
+    Returns:
+        Dict mapping dimension to {"avg_score", "sample_size"}
+    """
+    distributions = _get_distributions()
+    # record_score() adds distributions and updates counts from worker threads
+    with _lock:
+        return {
+            dimension: {"avg_score": dist.mean(), "sample_size": dist.total}
+            for (dimension, dist_product), dist in distributions.items()
+            if dist_product == product and dist.total
+        }
+
+
+def get_percentile(score: int, dimension: str, product: str | None = None) -> float | None:
+    """
+    Percentage of scores in the window that are below `score`.
+
+    Args:
+        score: Score to rank
+        dimension: Coaching dimension value
+        product: Product name, or None to rank against all products
+
+    Returns:
+        Percentile (0-100), or None if there is no data for the dimension
+    """
+    distributions = _get_distributions()
+    with _lock:
+        dist = distributions.get((dimension, product))
+        return dist.percentile(score) if dist else None
+
+
+def record_score(dimension: str, score: int | None, product: str | None = None) -> None:
+    """
+    Fold a newly stored score into the loaded distributions.
+
+    Other processes' writes are picked up on the next TTL reload.
+
+    Args:
+        dimension: Coaching dimension value
+        score: Score that was stored (ignored if None)
+        product: Product of the call, if known
+    """
+    if score is None:
+        return
+    with _lock:
+        if _loaded_at is None:
+            return  # Nothing loaded yet; the first lookup will include this score
+        keys = [(dimension, None)] + ([(dimension, product)] if product is not None else [])
+        for key in keys:
+            _distributions.setdefault(key, ScoreDistribution()).add(score)
+
+
+def reset() -> None:
+    """Drop loaded distributions so the next lookup reloads from the database."""
+    global _distributions, _loaded_at
+    with _lock:
+        _distributions = {}
+        _loaded_at = None
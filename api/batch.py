@@ -0,0 +1,274 @@
+"""
+Batch call analysis jobs.
+
+POST /api/v1/analyses:batch accepts many call IDs and returns a job handle
+immediately. The job runs in the background on this API worker:
+1. Each call is resolved and its cached sessions (current transcript and rubric
+   version) are looked up on the reads executor, without touching Claude.
+2. Only the missing dimensions are analyzed, as regular jobs on the analysis executor.
+   A job analyzes at most settings.batch_concurrency calls at once, so a 200-call QBR
+   batch doesn't take every worker from interactive requests; when the executor is
+   saturated the job waits for Retry-After instead of failing the call.
+3. Those dimensions are first charged to the submitter's Claude token budget (see
+   api.token_budget); when it's exhausted the job waits for it to refill, so a bulk
+   force_reanalysis spreads out over time instead of draining the provider quota.
+
+Each finished call appends one result (scores and sessions per dimension, which were
+cached and which analyzed, or an error). Clients poll the job, follow its SSE stream,
+or download all results as NDJSON once it's done. Each result is serialized to JSON
+once when it's recorded; polls, events and downloads send those bytes.
+
+Jobs live in memory on the worker that accepted them (the API runs one uvicorn
+process); the most recent settings.batch_max_jobs are kept.
+"""
+
+import asyncio
+import logging
+import uuid
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Any, Protocol, TypeVar
+
+from api.executors import ExecutorSaturated, run_analysis, run_read
+from api.responses import dumps
+from api.streaming import HEARTBEAT, HEARTBEAT_SECONDS, format_sse
+from api.token_budget import AnalysisCharge, TokenBudgetExceeded, get_token_budget
+from coaching_mcp.shared import settings
+from coaching_mcp.tools.analyze_call import (
+    analyze_call_dimension,
+    find_cached_dimensions,
+    prepare_call_analysis,
+)
+
+logger = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+
+class _Runner(Protocol):
+    """run_read or run_analysis."""
+
+    def __call__(self, func: Callable[..., _T], *args: Any) -> Awaitable[_T]: ...
+
+
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+CANCELLED = "cancelled"
+
+
+@dataclass
+class BatchJob:
+    """A batch analysis job and the results of the calls finished so far."""
+
+    id: str
+    call_ids: list[str]
+    dimensions: list[str] | None
+    force_reanalysis: bool
+    budget_key: str | None = None
+    status: str = QUEUED
+    created_at: datetime = field(default_factory=lambda: datetime.now(UTC))
+    finished_at: datetime | None = None
+    results: list[dict[str, Any]] = field(default_factory=list)
+    results_json: list[bytes] = field(default_factory=list, repr=False)
+    cached_dimensions: int = 0
+    analyzed_dimensions: int = 0
+    failed_calls: int = 0
+    task: asyncio.Task | None = field(default=None, repr=False)
+    changed: asyncio.Condition = field(default_factory=asyncio.Condition, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (COMPLETED, CANCELLED)
+
+    def summary(self) -> dict[str, Any]:
+        """Status and progress counters (no results)."""
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "total_calls": len(self.call_ids),
+            "completed_calls": len(self.results),
+            "failed_calls": self.failed_calls,
+            "cached_dimensions": self.cached_dimensions,
+            "analyzed_dimensions": self.analyzed_dimensions,
+            "created_at": self.created_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+_jobs: OrderedDict[str, BatchJob] = OrderedDict()
+
+
+def submit_batch(
+    call_ids: list[str],
+    dimensions: list[str] | None = None,
+    force_reanalysis: bool = False,
+    budget_key: str | None = None,
+) -> BatchJob:
+    """
+    Create a batch job and start it in the background.
+
+    Args:
+        call_ids: Gong call IDs (duplicates are analyzed once)
+        dimensions: Dimensions to analyze per call (default all)
+        force_reanalysis: Analyze every dimension again instead of using cached sessions
+        budget_key: Token budget analyses are charged to (None to not charge)
+
+    Returns:
+        The running job
+    """
+    job = BatchJob(
+        id=str(uuid.uuid4()),
+        call_ids=list(dict.fromkeys(call_ids)),
+        dimensions=dimensions,
+        force_reanalysis=force_reanalysis,
+        budget_key=budget_key,
+    )
+    _jobs[job.id] = job
+    _evict_finished_jobs()
+    job.task = asyncio.create_task(_run_job(job))
+    logger.info(f"Batch job {job.id} submitted: {len(job.call_ids)} calls")
+    return job
+
+
+def get_batch_job(job_id: str) -> BatchJob | None:
+    """Get a job by ID (None if unknown or evicted)."""
+    return _jobs.get(job_id)
+
+
+async def cancel_batch_jobs() -> None:
+    """Cancel every unfinished job (on application shutdown)."""
+    tasks = [job.task for job in _jobs.values() if job.task and not job.task.done()]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def job_events(job: BatchJob) -> AsyncIterator[str]:
+    """
+    Yield SSE events for a job: a "call" event per finished call (including those
+    already finished when the client connects), then "done" with the summary.
+    """
+    sent = 0
+    while True:
+        async with job.changed:
+            if sent == len(job.results) and not job.finished:
+                try:
+                    await asyncio.wait_for(job.changed.wait(), HEARTBEAT_SECONDS)
+                except TimeoutError:
+                    pass
+            results, finished = job.results_json[sent:], job.finished
+
+        if not results and not finished:
+            yield HEARTBEAT
+        for result in results:
+            yield format_sse("call", result)
+        sent += len(results)
+        if finished and sent == len(job.results_json):
+            yield format_sse("done", job.summary())
+            return
+
+
+# ============================================================================
+# JOB EXECUTION
+# ============================================================================
+
+
+async def _run_job(job: BatchJob) -> None:
+    pending = iter(job.call_ids)
+
+    async def worker() -> None:
+        for call_id in pending:
+            await _record(job, await _analyze_call(job, call_id))
+
+    job.status = RUNNING
+    try:
+        await asyncio.gather(*(worker() for _ in range(max(settings.batch_concurrency, 1))))
+        job.status = COMPLETED
+    except asyncio.CancelledError:
+        job.status = CANCELLED
+        raise
+    finally:
+        job.finished_at = datetime.now(UTC)
+        async with job.changed:
+            job.changed.notify_all()
+        logger.info(
+            f"Batch job {job.id} {job.status}: {len(job.results)}/{len(job.call_ids)} calls, "
+            f"{job.cached_dimensions} cached and {job.analyzed_dimensions} analyzed dimensions"
+        )
+
+
+async def _analyze_call(job: BatchJob, call_id: str) -> dict[str, Any]:
+    """Analyze one call's missing dimensions; returns its result record."""
+    charge = None
+    try:
+        context = await _run_when_free(run_read, prepare_call_analysis, call_id, job.dimensions)
+        cached: dict[str, dict[str, Any]] = {}
+        if not job.force_reanalysis:
+            cached = await _run_when_free(run_read, find_cached_dimensions, context)
+
+        misses = [d for d in context.dimensions if d not in cached]
+        if job.budget_key and misses:
+            # Batches don't run the unified Five Wins pass, so only dimensions are charged
+            charge = AnalysisCharge(get_token_budget(), job.budget_key, unified_pass=False)
+            await _run_when_free(run_read, charge, context, misses)
+
+        sessions = dict(cached)
+        for dimension in misses:
+            sessions[dimension] = await _run_when_free(
+                run_analysis, analyze_call_dimension, context, dimension, job.force_reanalysis
+            )
+        if charge:
+            charge.settle(sessions)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.warning(f"Batch job {job.id}: call {call_id} failed: {e}")
+        if charge:
+            charge.cancel()
+        return {"call_id": call_id, "status": "failed", "error": str(e)}
+
+    ordered = {d: sessions[d] for d in context.dimensions}
+    errors = {d: s["error"] for d, s in ordered.items() if s.get("error")}
+    return {
+        "call_id": call_id,
+        "status": "failed" if len(errors) == len(ordered) else COMPLETED,
+        "title": context.call["title"],
+        "scheduled_at": context.call["scheduled_at"],
+        "evaluated_as_role": context.detected_role,
+        "scores": {d: s.get("score") for d, s in ordered.items()},
+        "cached_dimensions": [d for d in ordered if d in cached],
+        "analyzed_dimensions": [d for d in ordered if d not in cached and d not in errors],
+        "errors": errors or None,
+        "dimensions": ordered,
+    }
+
+
+async def _run_when_free(runner: _Runner, func: Callable[..., _T], *args: Any) -> _T:
+    """Run on an executor, waiting out saturation and token budgets instead of failing."""
+    while True:
+        try:
+            return await runner(func, *args)
+        except (ExecutorSaturated, TokenBudgetExceeded) as e:
+            await asyncio.sleep(e.retry_after)
+
+
+async def _record(job: BatchJob, result: dict[str, Any]) -> None:
+    if result["status"] == "failed":
+        job.failed_calls += 1
+    job.cached_dimensions += len(result.get("cached_dimensions") or [])
+    job.analyzed_dimensions += len(result.get("analyzed_dimensions") or [])
+    encoded = dumps(result)
+    async with job.changed:
+        job.results.append(result)
+        job.results_json.append(encoded)
+        job.changed.notify_all()
+
+
+def _evict_finished_jobs() -> None:
+    """Drop the oldest finished jobs beyond settings.batch_max_jobs."""
+    excess = len(_jobs) - settings.batch_max_jobs
+    for job_id in [job_id for job_id, job in _jobs.items() if job.finished][: max(excess, 0)]:
+        del _jobs[job_id]
@@ -0,0 +1,93 @@
+"""
+Conditional GET support (ETag / If-None-Match) for read-mostly endpoints.
+
+Endpoints derive a strong ETag from a cheap data-version query (row counts and
+updated_at watermarks, rubric versions) before building their payload. When the
+client's If-None-Match already names that version the endpoint answers 304 Not
+Modified without running the expensive queries or serializing anything.
+
+Usage:
+    @router.get("/endpoint")
+    async def endpoint(request: Request, response: Response):
+        version = await async_queries.get_thing_version()
+        not_modified = conditional_get(request, response, make_etag("thing", version))
+        if not_modified:
+            return not_modified
+        ...  # build the payload as usual; ETag and Cache-Control are already set
+"""
+
+import hashlib
+import json
+from typing import Any
+
+from fastapi import Request, Response
+
+# Per-user endpoints: the browser keeps a copy but revalidates every time (cheap 304s)
+CACHE_PRIVATE = "private, no-cache"
+
+# Shared reference data: CDN and browser may serve it for a minute, then revalidate
+CACHE_PUBLIC = "public, max-age=60, stale-while-revalidate=300"
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    Build a strong ETag from the values that identify a representation.
+
+    Args:
+        parts: Endpoint name, query parameters and data-version values (counts,
+            timestamps, ids). Anything JSON-serializable or with a stable str().
+
+    Returns:
+        Quoted ETag, e.g. '"3f2a..."'
+    """
+    digest = hashlib.sha256(
+        json.dumps(parts, default=str, sort_keys=True, separators=(",", ":")).encode()
+    ).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag.
+
+    Uses the weak comparison RFC 9110 prescribes for If-None-Match, so a W/ tag
+    (e.g. after the compression middleware weakened it) still matches.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(",")
+    )
+
+
+def conditional_get(
+    request: Request,
+    response: Response,
+    etag: str,
+    cache_control: str = CACHE_PRIVATE,
+) -> Response | None:
+    """
+    Set validator headers and short-circuit when the client's copy is current.
+
+    Args:
+        request: Incoming request (If-None-Match is read from it)
+        response: The endpoint's injected Response; ETag and Cache-Control are set on
+            it so the full response carries them too
+        etag: ETag for the current data version (make_etag)
+        cache_control: Cache-Control value (CACHE_PRIVATE or CACHE_PUBLIC)
+
+    Returns:
+        A 304 response to return as-is, or None to build the payload
+    """
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(
+            status_code=304,
+            headers={"ETag": etag, "Cache-Control": cache_control},
+        )
+    return None
@@ -24,6 +24,8 @@ from typing import Annotated
 
 from fastapi import Depends, HTTPException, Request, status
 
+from api.middleware.gcra import DEFAULT_MAX_KEYS, BoundedLRU
+
 logger = logging.getLogger(__name__)
 
 
@@ -101,14 +103,16 @@ class RateLimitService:
         default_burst: int = 150,
         expensive_rate_limit: int = 20,
         expensive_burst: int = 30,
+        max_buckets: int = DEFAULT_MAX_KEYS,
     ):
         self.default_rate_limit = default_rate_limit
         self.default_burst = default_burst
         self.expensive_rate_limit = expensive_rate_limit
         self.expensive_burst = expensive_burst
 
-        # Per-user rate limit buckets (key: user_identifier:path)
-        self.user_buckets: dict[str, TokenBucket] = {}
+        # Per-user rate limit buckets (key: user_identifier:path); least recently used are
+        # evicted beyond max_buckets, so memory stays bounded between cleanups
+        self.user_buckets: BoundedLRU = BoundedLRU(max_buckets)
         self.lock = Lock()
 
         # Expensive endpoints (require more rate limiting)
@@ -161,7 +165,8 @@ class RateLimitService:
                     last_refill=time.time(),
                 )
 
-            return self.user_buckets[bucket_key]
+            bucket: TokenBucket = self.user_buckets[bucket_key]
+            return bucket
 
     def check_rate_limit(self, request: Request) -> RateLimitInfo:
         """
@@ -118,6 +118,7 @@ async def http_exception_handler(request: Request, exc: HTTPException) -> JSONRe
             message=exc.detail,
             request_id=request_id,
         ),
+        headers=getattr(exc, "headers", None),
     )
 
 
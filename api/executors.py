@@ -0,0 +1,220 @@
+"""
+Bounded thread pools for running synchronous tools from async endpoints.
+
+The MCP tools (analyze_call, search_calls, ...) do blocking psycopg2 and Claude HTTP
+I/O. Called directly from an async endpoint they block the event loop, so one
+analysis stalls every other request on the worker, health checks included. Endpoints
+instead await run_analysis()/run_read(), which run the tool on a thread pool sized for
+its workload:
+- analysis: Claude-backed work (call and opportunity analysis); few workers, since each
+  holds a thread for tens of seconds
+- reads: database-backed queries (search, feed, insights); more workers, short jobs
+
+Each pool admits at most workers + queue jobs. Beyond that run() raises
+ExecutorSaturated, which the existing HTTPException handling turns into a 503 with a
+Retry-After estimated from recent job durations, so overload sheds requests instead of
+queueing them until clients time out. Jobs run in a copy of the request's context, so
+read-replica pinning and query budgets (db.replica, db.query_budget) still apply.
+"""
+
+import asyncio
+import contextvars
+import functools
+import logging
+import math
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from fastapi import HTTPException, status
+from prometheus_client import Counter, Gauge, Histogram
+
+from coaching_mcp.shared import settings
+
+logger = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+EXECUTOR_QUEUE_SECONDS = Histogram(
+    "api_executor_queue_seconds",
+    "Time tool jobs waited for a free worker",
+    ["executor"],
+    buckets=(0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+EXECUTOR_RUN_SECONDS = Histogram(
+    "api_executor_run_seconds",
+    "Time tool jobs spent running",
+    ["executor"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0),
+)
+EXECUTOR_PENDING = Gauge(
+    "api_executor_pending",
+    "Tool jobs running or waiting",
+    ["executor"],
+)
+EXECUTOR_REJECTED = Counter(
+    "api_executor_rejected_total",
+    "Tool jobs rejected because the executor was saturated",
+    ["executor"],
+)
+
+MAX_RETRY_AFTER_SECONDS = 120
+
+
+class ExecutorSaturated(HTTPException):
+    """Raised when an executor's workers and queue are full (503 with Retry-After)."""
+
+    def __init__(self, executor: str, retry_after: int):
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Server busy ({executor}); retry in {retry_after}s",
+            headers={"Retry-After": str(retry_after)},
+        )
+        self.executor = executor
+        self.retry_after = retry_after
+
+
+class ToolExecutor:
+    """
+    Thread pool with a bounded queue and queue/run time metrics.
+
+    Usage:
+        executor = ToolExecutor("analysis", max_workers=4, max_queue=16)
+        result = await executor.run(analyze_call_tool, call_id=call_id)
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._pool = ThreadPoolExecutor(max_workers, thread_name_prefix=f"{name}-tool")
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._avg_run_seconds: float | None = None
+
+    @property
+    def pending(self) -> int:
+        """Jobs running or waiting."""
+        return self._pending
+
+    async def run(self, func: Callable[..., _T], *args: Any, **kwargs: Any) -> _T:
+        """
+        Run func on this executor and await its result.
+
+        Raises:
+            ExecutorSaturated: If max_workers + max_queue jobs are already pending
+        """
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                retry_after = self._retry_after()
+                EXECUTOR_REJECTED.labels(executor=self.name).inc()
+                logger.warning(
+                    f"{self.name} executor saturated ({self._pending} pending), "
+                    f"rejecting {getattr(func, '__name__', func)}"
+                )
+                raise ExecutorSaturated(self.name, retry_after)
+            self._pending += 1
+            EXECUTOR_PENDING.labels(executor=self.name).set(self._pending)
+
+        submitted = time.perf_counter()
+        context = contextvars.copy_context()
+        job = functools.partial(self._timed, func, submitted, *args, **kwargs)
+        try:
+            future = self._pool.submit(context.run, job)
+        except BaseException:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def shutdown(self) -> None:
+        """Stop accepting jobs and wait for running ones."""
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+    def _timed(self, func: Callable[..., _T], submitted: float, *args: Any, **kwargs: Any) -> _T:
+        started = time.perf_counter()
+        EXECUTOR_QUEUE_SECONDS.labels(executor=self.name).observe(started - submitted)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            EXECUTOR_RUN_SECONDS.labels(executor=self.name).observe(elapsed)
+            with self._lock:
+                avg = self._avg_run_seconds
+                self._avg_run_seconds = elapsed if avg is None else 0.8 * avg + 0.2 * elapsed
+
+    def _release(self, _future: Any) -> None:
+        with self._lock:
+            self._pending -= 1
+            EXECUTOR_PENDING.labels(executor=self.name).set(self._pending)
+
+    def _retry_after(self) -> int:
+        """Seconds until the queue ahead of a new job should have drained."""
+        avg = self._avg_run_seconds if self._avg_run_seconds is not None else 1.0
+        queued = max(self._pending - self.max_workers, 1)
+        return min(max(math.ceil(avg * queued / self.max_workers), 1), MAX_RETRY_AFTER_SECONDS)
+
+
+# ============================================================================
+# WORKLOAD EXECUTORS
+# ============================================================================
+
+_executors: dict[str, ToolExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def get_executor(name: str) -> ToolExecutor:
+    """Get (creating on first use) the "analysis" or "reads" executor."""
+    executor = _executors.get(name)
+    if executor is None:
+        with _executors_lock:
+            executor = _executors.get(name)
+            if executor is None:
+                if name == "analysis":
+                    executor = ToolExecutor(
+                        name,
+                        settings.analysis_executor_workers,
+                        settings.analysis_executor_queue,
+                    )
+                elif name == "reads":
+                    executor = ToolExecutor(
+                        name,
+                        settings.read_executor_workers,
+                        settings.read_executor_queue,
+                    )
+                else:
+                    raise ValueError(f"Unknown executor: {name}")
+                _executors[name] = executor
+    return executor
+
+
+async def run_analysis(func: Callable[..., _T], *args: Any, **kwargs: Any) -> _T:
+    """Run a Claude-backed tool on the analysis executor."""
+    return await get_executor("analysis").run(func, *args, **kwargs)
+
+
+async def run_read(func: Callable[..., _T], *args: Any, **kwargs: Any) -> _T:
+    """Run a database read tool on the reads executor."""
+    return await get_executor("reads").run(func, *args, **kwargs)
+
+
+def executor_status() -> dict[str, dict[str, int]]:
+    """Pending jobs and limits per executor, for the monitoring endpoint."""
+    return {
+        name: {
+            "pending": executor.pending,
+            "max_workers": executor.max_workers,
+            "max_queue": executor.max_queue,
+        }
+        for name, executor in _executors.items()
+    }
+
+
+def shutdown_executors() -> None:
+    """Shut down all executors (on application shutdown)."""
+    with _executors_lock:
+        for executor in _executors.values():
+            executor.shutdown()
+        _executors.clear()
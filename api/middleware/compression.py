@@ -1,181 +1,325 @@
 """
-Response compression middleware for FastAPI.
+Streaming response compression middleware.
 
-Compresses responses using gzip for bandwidth optimization.
-Critical for large coaching analysis responses with transcripts.
+Compresses responses chunk by chunk as the application sends them, so large
+transcript and feed payloads are never held in memory twice. Each chunk of a
+streamed response is flushed, so NDJSON rows reach the client as they are sent.
 
 Features:
-- Automatic gzip compression for responses > 1KB
-- Configurable compression level
-- Respects Accept-Encoding header
-- Skips already-compressed content types
+- Negotiates zstd, br or gzip from Accept-Encoding (q-values honoured); zstd and
+  brotli are used when the optional zstandard/brotli packages are installed
+- Compression level chosen by payload size: higher levels for small bodies where CPU
+  is cheap, faster levels for large or open-ended streams
+- Leaves alone Server-Sent Events, already-encoded responses, non-compressible
+  content types and bodies below minimum_size
 """
 
-import gzip
 import logging
-from collections.abc import Callable
+import re
+import zlib
+from typing import Any
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+try:
+    import zstandard
+
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
 
 logger = logging.getLogger(__name__)
 
+# Server preference when the client accepts several encodings with equal q
+PREFERRED_ENCODINGS = ("zstd", "br", "gzip")
+
+# Content types that benefit from compression
+COMPRESSIBLE_TYPES = {
+    "text/html",
+    "text/css",
+    "text/plain",
+    "text/xml",
+    "text/csv",
+    "text/javascript",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "application/xhtml+xml",
+    "application/rss+xml",
+    "application/atom+xml",
+    "application/x-ndjson",
+}
+
+# Streamed as events; compressing would buffer them inside the compressor
+STREAMING_TYPES = {"text/event-stream"}
+
+# (size upper bound, level) tiers per encoding; unknown-length streams use the last tier
+SMALL_BODY_BYTES = 64 * 1024
+MEDIUM_BODY_BYTES = 1024 * 1024
+LEVELS = {
+    "zstd": (9, 6, 3),
+    "br": (6, 4, 2),
+    "gzip": (6, 5, 3),
+}
+
+_ACCEPT_ENCODING = re.compile(r"\s*([\w*-]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?\s*")
+
+
+def available_encodings() -> tuple[str, ...]:
+    """Encodings this process can produce, in server preference order."""
+    return tuple(
+        encoding
+        for encoding in PREFERRED_ENCODINGS
+        if encoding == "gzip"
+        or (encoding == "br" and BROTLI_AVAILABLE)
+        or (encoding == "zstd" and ZSTD_AVAILABLE)
+    )
+
+
+def negotiate_encoding(accept_encoding: str) -> str | None:
+    """
+    Pick the response encoding from an Accept-Encoding header.
+
+    Args:
+        accept_encoding: Header value, e.g. "gzip, deflate, br;q=0.9"
 
-class CompressionMiddleware(BaseHTTPMiddleware):
+    Returns:
+        "zstd", "br" or "gzip", or None to send the response uncompressed
+    """
+    qualities: dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        match = _ACCEPT_ENCODING.fullmatch(part)
+        if not match:
+            continue
+        try:
+            qualities[match.group(1)] = float(match.group(2)) if match.group(2) else 1.0
+        except ValueError:
+            continue
+
+    wildcard = qualities.get("*", 0.0)
+    best, best_q = None, 0.0
+    for encoding in available_encodings():
+        q = qualities.get(encoding, wildcard)
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def compression_level(encoding: str, size: int | None) -> int:
     """
-    Middleware for gzip compression of HTTP responses.
+    Level for a payload of the given size (None for streams of unknown length).
 
-    Compresses responses when:
-    - Client accepts gzip (Accept-Encoding: gzip)
-    - Response size > min_size (default: 1KB)
-    - Content-Type is compressible (text/*, application/json, etc.)
+    Small bodies compress at a high level since CPU time is negligible; large ones at a
+    faster level so compression doesn't dominate latency.
+    """
+    small, medium, large = LEVELS[encoding]
+    if size is None or size > MEDIUM_BODY_BYTES:
+        return large
+    if size > SMALL_BODY_BYTES:
+        return medium
+    return small
+
+
+class StreamCompressor:
+    """Incremental compressor with the same interface for every encoding."""
+
+    def __init__(self, encoding: str, level: int):
+        self.encoding = encoding
+        if encoding == "gzip":
+            self._compressor: Any = zlib.compressobj(level, zlib.DEFLATED, 31)
+        elif encoding == "br":
+            self._compressor = brotli.Compressor(quality=level)
+        elif encoding == "zstd":
+            self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+        else:
+            raise ValueError(f"Unsupported encoding: {encoding}")
+
+    def compress(self, chunk: bytes) -> bytes:
+        """Compress a chunk; may return b"" while the compressor buffers."""
+        if self.encoding == "br":
+            return bytes(self._compressor.process(chunk))
+        return bytes(self._compressor.compress(chunk))
+
+    def flush(self) -> bytes:
+        """Emit everything compressed so far in a decodable block, keeping the stream open."""
+        if self.encoding == "gzip":
+            return bytes(self._compressor.flush(zlib.Z_SYNC_FLUSH))
+        if self.encoding == "br":
+            return bytes(self._compressor.flush())
+        return bytes(self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK))
+
+    def finish(self) -> bytes:
+        """Flush and end the stream."""
+        if self.encoding == "br":
+            return bytes(self._compressor.finish())
+        return bytes(self._compressor.flush())
+
+
+class CompressionMiddleware:
     """
+    ASGI middleware compressing HTTP responses as they stream.
 
-    # Content types that should be compressed
-    COMPRESSIBLE_TYPES = {
-        "text/html",
-        "text/css",
-        "text/plain",
-        "text/xml",
-        "text/javascript",
-        "application/json",
-        "application/javascript",
-        "application/xml",
-        "application/xhtml+xml",
-        "application/rss+xml",
-        "application/atom+xml",
-    }
+    Compresses responses when:
+    - Client accepts zstd, br or gzip
+    - Content-Type is compressible and not an event stream
+    - Response isn't already encoded
+    - Body is at least minimum_size bytes (or streamed without a known length)
+    """
 
     def __init__(
         self,
         app: ASGIApp,
-        min_size: int = 1024,
-        compression_level: int = 6,
+        minimum_size: int = 500,
+        compression_level: int | None = None,
+        min_size: int | None = None,
     ):
         """
         Initialize compression middleware.
 
         Args:
             app: ASGI application
-            min_size: Minimum response size to compress (bytes)
-            compression_level: gzip compression level (1-9, default: 6)
+            minimum_size: Minimum response size to compress (bytes)
+            compression_level: Fixed level for every response; None picks a level by
+                payload size
+            min_size: Alias of minimum_size (older keyword)
         """
-        super().__init__(app)
-        self.min_size = min_size
+        self.app = app
+        self.minimum_size = min_size if min_size is not None else minimum_size
         self.compression_level = compression_level
 
-    async def dispatch(
-        self,
-        request: Request,
-        call_next: Callable,
-    ) -> Response:
-        """
-        Process request and compress response if applicable.
-
-        Args:
-            request: Incoming HTTP request
-            call_next: Next middleware/handler
-
-        Returns:
-            HTTP response (possibly compressed)
-        """
-        # Get response from downstream
-        response = await call_next(request)
-
-        # Check if client accepts gzip
-        accept_encoding = request.headers.get("accept-encoding", "")
-        if "gzip" not in accept_encoding.lower():
-            return response
-
-        # Check if response should be compressed
-        if not self._should_compress(response):
-            return response
-
-        # Get response body
-        body = b""
-        async for chunk in response.body_iterator:
-            body += chunk
-
-        # Check size threshold
-        if len(body) < self.min_size:
-            return Response(
-                content=body,
-                status_code=response.status_code,
-                headers=dict(response.headers),
-                media_type=response.media_type,
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressedResponder(self, encoding, send)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressedResponder:
+    """Per-response state: decides on the first body chunk, then compresses the rest."""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: str, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self._send = send
+        self._start: Message | None = None
+        self._compressor: StreamCompressor | None = None
+        self._passthrough = False
+        self._original_size = 0
+        self._compressed_size = 0
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self._start = message
+            return
+
+        if message["type"] != "http.response.body" or self._passthrough:
+            if self._start is not None:
+                start, self._start = self._start, None
+                self._passthrough = True
+                await self._send(start)
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self._start is not None:
+            start, self._start = self._start, None
+            if not self._begin(start, body, more_body):
+                self._passthrough = True
+                await self._send(start)
+                await self._send(message)
+                return
+            await self._send(start)
+
+        assert self._compressor is not None
+        self._original_size += len(body)
+        chunk = self._compressor.compress(body) if body else b""
+        if not more_body:
+            chunk += self._compressor.finish()
+        elif body:
+            # Streamed rows and progress updates must reach the client as they are sent,
+            # not sit in the compressor's buffer until the response ends
+            chunk += self._compressor.flush()
+        self._compressed_size += len(chunk)
+
+        if chunk or not more_body:
+            await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+        if not more_body:
+            logger.debug(
+                f"Compressed response ({self.encoding}): {self._original_size} -> "
+                f"{self._compressed_size} bytes"
             )
 
-        # Compress response
-        compressed_body = gzip.compress(body, compresslevel=self.compression_level)
-
-        # Calculate compression ratio
-        original_size = len(body)
-        compressed_size = len(compressed_body)
-        ratio = (1 - compressed_size / original_size) * 100 if original_size > 0 else 0
-
-        logger.debug(
-            f"Compressed response: {original_size} -> {compressed_size} bytes "
-            f"({ratio:.1f}% reduction)"
-        )
-
-        # Update headers
-        headers = dict(response.headers)
-        headers["content-encoding"] = "gzip"
-        headers["content-length"] = str(compressed_size)
-        headers["x-original-size"] = str(original_size)
-        headers["x-compression-ratio"] = f"{ratio:.1f}%"
-
-        return Response(
-            content=compressed_body,
-            status_code=response.status_code,
-            headers=headers,
-            media_type=response.media_type,
-        )
-
-    def _should_compress(self, response: Response) -> bool:
-        """
-        Check if response should be compressed.
-
-        Args:
-            response: HTTP response
-
-        Returns:
-            True if response should be compressed
-        """
-        # Don't compress if already encoded
-        if response.headers.get("content-encoding"):
+    def _begin(self, start: Message, body: bytes, more_body: bool) -> bool:
+        """Decide whether to compress and, if so, rewrite the start message's headers."""
+        headers = MutableHeaders(scope=start)
+        if not self._should_compress(start["status"], headers, body, more_body):
+            if self._is_compressible_type(headers):
+                headers.add_vary_header("Accept-Encoding")
             return False
 
-        # Don't compress error responses
-        if response.status_code >= 300:
+        if more_body:
+            length = headers.get("content-length")
+            size = int(length) if length and length.isdigit() else None
+        else:
+            size = len(body)
+        level = self.middleware.compression_level or compression_level(self.encoding, size)
+        self._compressor = StreamCompressor(self.encoding, level)
+
+        del headers["content-length"]
+        headers["content-encoding"] = self.encoding
+        headers.add_vary_header("Accept-Encoding")
+        # The encoded bytes differ from the identity representation, so a strong
+        # validator no longer holds (If-None-Match compares weakly, so 304s still work)
+        etag = headers.get("etag")
+        if etag and not etag.startswith("W/"):
+            headers["etag"] = f"W/{etag}"
+        return True
+
+    def _should_compress(
+        self, status: int, headers: MutableHeaders, body: bytes, more_body: bool
+    ) -> bool:
+        if status < 200 or status in (204, 304):
             return False
+        if headers.get("content-encoding"):
+            return False
+        if not self._is_compressible_type(headers):
+            return False
+        if not more_body and len(body) < self.middleware.minimum_size:
+            return False
+        return True
 
-        # Check content type
-        content_type = response.media_type or ""
-        base_type = content_type.split(";")[0].strip().lower()
-
-        # Check if content type is compressible
-        for compressible in self.COMPRESSIBLE_TYPES:
-            if base_type == compressible or base_type.startswith(compressible):
-                return True
-
-        return False
+    @staticmethod
+    def _is_compressible_type(headers: MutableHeaders) -> bool:
+        base_type = headers.get("content-type", "").split(";")[0].strip().lower()
+        return base_type in COMPRESSIBLE_TYPES and base_type not in STREAMING_TYPES
 
 
 def get_compression_stats() -> dict:
     """
-    Get compression statistics.
-
-    This would typically integrate with a metrics system
-    to track compression ratios and bandwidth savings.
+    Get compression configuration.
 
     Returns:
-        Dict with compression statistics
+        Dict with the encodings this process can produce and the level tiers
     """
-    # This is a placeholder for actual metrics collection
     return {
         "enabled": True,
-        "min_size": 1024,
-        "compression_level": 6,
+        "encodings": list(available_encodings()),
+        "levels": {encoding: LEVELS[encoding] for encoding in available_encodings()},
     }
@@ -0,0 +1,264 @@
+"""
+GCRA (generic cell rate algorithm) rate limiting.
+
+GCRA is a token bucket that stores one number per key: the theoretical arrival time
+(TAT), the time at which the bucket would be full again. A limit of N requests per
+period with burst B spaces requests T = period / N apart; a request is allowed while
+TAT - now <= B * T, and advances TAT by T * cost.
+
+- RedisGCRA: one atomic Lua script per check (EVALSHA; redis-py reloads it on
+  NOSCRIPT), using the Redis clock so every API instance shares one timeline. When a
+  key is well under its limit the script also leases a few extra tokens, which are
+  spent in-process for the next second, so most requests from busy clients never
+  reach Redis. Leased tokens are already counted in Redis, so instances never
+  over-admit; tokens left when a lease expires are handed back on the key's next
+  Redis call, so clients well under their limit keep their full burst.
+- LocalGCRA: the same algorithm in memory, for single-instance deployments and as
+  the fallback when Redis errors.
+
+Per-key state lives in a BoundedLRU, so memory stays flat however many clients
+show up; an evicted key simply starts again with a full bucket.
+
+refund() gives back tokens charged for work that turned out not to be needed (e.g.
+an estimated cost that was never spent), moving TAT back but never before now.
+"""
+
+import logging
+import math
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_KEYS = 10_000
+
+# KEYS[1]: bucket key
+# ARGV: emission interval (ms), burst, cost, most extra tokens to lease,
+#       unused tokens from this instance's expired lease to give back first
+# Returns {granted, remaining, retry_after_ms, reset_after_ms}; granted = 0 when denied
+# Writing after TIME relies on effect replication, the default since Redis 5
+GCRA_SCRIPT = """
+local interval = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local lease = tonumber(ARGV[4])
+local unused = tonumber(ARGV[5])
+local clock = redis.call('TIME')
+local now = clock[1] * 1000 + clock[2] / 1000
+local tat = tonumber(redis.call('GET', KEYS[1])) or now
+tat = tat - unused * interval
+if tat < now then
+    tat = now
+end
+local available = math.floor(burst - (tat - now) / interval)
+if available < cost then
+    if unused > 0 then
+        redis.call('SET', KEYS[1], string.format('%.3f', tat), 'PX', math.max(math.ceil(tat - now), 1))
+    end
+    local retry_after = (tat - now) - (burst - cost) * interval
+    return {0, math.max(available, 0), math.ceil(retry_after), math.ceil(tat - now)}
+end
+-- Lease extra tokens only out of the top half of what is left
+local extra = math.max(math.min(lease, math.floor((available - cost) / 2)), 0)
+tat = tat + (cost + extra) * interval
+redis.call('SET', KEYS[1], string.format('%.3f', tat), 'PX', math.ceil(tat - now))
+return {cost + extra, available - cost - extra, 0, math.ceil(tat - now)}
+"""
+
+# KEYS[1]: bucket key
+# ARGV: emission interval (ms), tokens to give back
+REFUND_SCRIPT = """
+local interval = tonumber(ARGV[1])
+local cost = tonumber(ARGV[2])
+local tat = tonumber(redis.call('GET', KEYS[1]))
+if not tat then
+    return 0
+end
+local clock = redis.call('TIME')
+local now = clock[1] * 1000 + clock[2] / 1000
+tat = tat - cost * interval
+if tat <= now then
+    redis.call('DEL', KEYS[1])
+else
+    redis.call('SET', KEYS[1], string.format('%.3f', tat), 'PX', math.ceil(tat - now))
+end
+return 1
+"""
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    """Outcome of a rate limit check."""
+
+    allowed: bool
+    limit: int  # Burst size (requests allowed at once)
+    remaining: int
+    retry_after: float  # Seconds until the request would be allowed (0 if allowed)
+    reset_after: float  # Seconds until the bucket is full again
+
+
+class BoundedLRU(OrderedDict):
+    """Dict holding at most max_size keys; setting a new key evicts the least recently used."""
+
+    def __init__(self, max_size: int = DEFAULT_MAX_KEYS):
+        super().__init__()
+        self.max_size = max_size
+
+    def __getitem__(self, key: Any) -> Any:
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while len(self) > self.max_size:
+            self.popitem(last=False)
+
+
+class LocalGCRA:
+    """In-process GCRA limiter (counts only this instance's requests)."""
+
+    def __init__(self, max_keys: int = DEFAULT_MAX_KEYS):
+        self._tats = BoundedLRU(max_keys)
+        self._lock = Lock()
+
+    def check(
+        self, key: str, limit: int, period: float = 60.0, burst: int | None = None, cost: int = 1
+    ) -> RateLimitResult:
+        """
+        Admit or reject one request.
+
+        Args:
+            key: Bucket key (user, method, endpoint)
+            limit: Requests allowed per period
+            period: Period in seconds
+            burst: Requests allowed at once (default limit)
+            cost: Tokens this request uses
+
+        Returns:
+            RateLimitResult
+        """
+        burst = burst or limit
+        interval = period / limit
+        now = time.monotonic()
+
+        with self._lock:
+            tat = max(self._tats.get(key, now), now)
+            # tat - now first: adding a large clock value to burst * interval loses precision
+            available = math.floor(burst - (tat - now) / interval)
+            if available < cost:
+                retry_after = (tat - now) - (burst - cost) * interval
+                return RateLimitResult(False, burst, max(available, 0), retry_after, tat - now)
+            tat += cost * interval
+            self._tats[key] = tat
+
+        return RateLimitResult(True, burst, available - cost, 0.0, tat - now)
+
+    def refund(self, key: str, limit: int, period: float = 60.0, cost: int = 1) -> None:
+        """Give back tokens from an earlier check (the bucket never goes above full)."""
+        interval = period / limit
+        now = time.monotonic()
+
+        with self._lock:
+            tat = self._tats.get(key)
+            if tat is not None:
+                self._tats[key] = max(tat - cost * interval, now)
+
+
+@dataclass
+class _Lease:
+    tokens: int  # Tokens left to spend locally
+    remaining: int  # Redis remaining after the lease was taken
+    expires_at: float
+    reset_at: float
+
+
+class RedisGCRA:
+    """
+    Redis-backed GCRA limiter: one round trip per check, fewer with leases.
+
+    Usage:
+        limiter = RedisGCRA(redis.Redis(...))
+        result = limiter.check("ratelimit:user:a@b.c:GET:/calls", limit=100)
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        max_lease: int = 10,
+        lease_seconds: float = 1.0,
+        max_keys: int = DEFAULT_MAX_KEYS,
+    ):
+        """
+        Args:
+            client: redis.Redis client
+            max_lease: Most extra tokens taken per Redis call (0 disables leasing)
+            lease_seconds: How long leased tokens may be spent locally
+            max_keys: Keys with leases kept in memory
+        """
+        self._script = client.register_script(GCRA_SCRIPT)
+        self._refund_script = client.register_script(REFUND_SCRIPT)
+        self.max_lease = max_lease
+        self.lease_seconds = lease_seconds
+        self._leases = BoundedLRU(max_keys)
+        self._lock = Lock()
+
+    def check(
+        self, key: str, limit: int, period: float = 60.0, burst: int | None = None, cost: int = 1
+    ) -> RateLimitResult:
+        """
+        Admit or reject one request (same arguments as LocalGCRA.check).
+
+        Raises:
+            redis.RedisError: If Redis can't be reached (callers fall back to LocalGCRA)
+        """
+        burst = burst or limit
+        now = time.monotonic()
+        unused = 0
+
+        with self._lock:
+            lease = self._leases.get(key)
+            if lease is not None:
+                if lease.expires_at > now and lease.tokens >= cost:
+                    lease.tokens -= cost
+                    return RateLimitResult(
+                        True, burst, lease.remaining + lease.tokens, 0.0, lease.reset_at - now
+                    )
+                # Expired or too small: its tokens are still charged in Redis
+                del self._leases[key]
+                unused = lease.tokens
+
+        # Lease ~10% of the burst, so limits of a few requests a minute stay exact
+        want = min(self.max_lease, burst // 10)
+        granted, remaining, retry_ms, reset_ms = self._script(
+            keys=[key], args=[period * 1000 / limit, burst, cost, want, unused]
+        )
+        if granted == 0:
+            return RateLimitResult(False, burst, 0, retry_ms / 1000, reset_ms / 1000)
+
+        extra = granted - cost
+        if extra > 0:
+            with self._lock:
+                # Another thread may have leased for this key meanwhile; keep its tokens
+                # too, so they are handed back when this lease expires
+                concurrent = self._leases.get(key)
+                self._leases[key] = _Lease(
+                    tokens=extra + (concurrent.tokens if concurrent else 0),
+                    remaining=remaining,
+                    expires_at=now + self.lease_seconds,
+                    reset_at=now + reset_ms / 1000,
+                )
+        return RateLimitResult(True, burst, remaining + extra, 0.0, reset_ms / 1000)
+
+    def refund(self, key: str, limit: int, period: float = 60.0, cost: int = 1) -> None:
+        """
+        Give back tokens from an earlier check (same arguments as LocalGCRA.refund).
+
+        Raises:
+            redis.RedisError: If Redis can't be reached
+        """
+        self._refund_script(keys=[key], args=[period * 1000 / limit, cost])
@@ -1,8 +1,10 @@
 """
 Rate limiting middleware for API protection.
 
-Implements token bucket algorithm with Redis backend for
-distributed rate limiting across multiple API instances.
+Implements GCRA (a token bucket storing one timestamp per key) with a Redis
+backend for distributed rate limiting across multiple API instances: one atomic
+Lua script per check, and requests well under their limit are admitted from
+tokens leased in-process without a Redis call (see api.middleware.gcra).
 
 Rate Limits (per user):
 - GET endpoints: 100 requests/minute
@@ -16,27 +18,33 @@ Headers added to responses:
 """
 
 import logging
+import math
 import time
 from collections.abc import Callable
 
-from fastapi import HTTPException, Request, Response
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.types import ASGIApp
 
+from api.middleware.gcra import DEFAULT_MAX_KEYS, LocalGCRA, RateLimitResult, RedisGCRA
+
 logger = logging.getLogger(__name__)
 
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
     """
-    Rate limiting middleware using token bucket algorithm.
+    Rate limiting middleware using GCRA.
 
     Supports:
     - Per-user rate limits (by email or IP)
     - Per-endpoint rate limits
-    - Redis-backed distributed limiting
-    - Graceful degradation if Redis unavailable
+    - Redis-backed distributed limiting (single round trip, local pre-admission)
+    - Graceful degradation if Redis unavailable (bounded in-memory buckets)
     """
 
+    WINDOW_SECONDS = 60
+
     # Default rate limits (requests per minute)
     DEFAULT_LIMITS = {
         "GET": 100,
@@ -60,6 +68,7 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         app: ASGIApp,
         redis_client=None,
         enable_rate_limiting: bool = True,
+        max_keys: int = DEFAULT_MAX_KEYS,
     ):
         """
         Initialize rate limiting middleware.
@@ -68,11 +77,17 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             app: ASGI application
             redis_client: Redis client for distributed limiting
             enable_rate_limiting: Enable/disable rate limiting
+            max_keys: Rate limit keys kept in memory (least recently used are evicted)
         """
         super().__init__(app)
         self.redis_client = redis_client
         self.enable_rate_limiting = enable_rate_limiting
-        self._local_cache = {}  # Fallback if Redis unavailable
+        self._redis_limiter = (
+            RedisGCRA(redis_client._client, max_keys=max_keys)
+            if redis_client is not None and redis_client.available
+            else None
+        )
+        self._local_limiter = LocalGCRA(max_keys)  # Fallback if Redis unavailable
 
     async def dispatch(
         self,
@@ -100,23 +115,23 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         limit = self._get_rate_limit(request)
 
         # Check rate limit
-        allowed, remaining, reset_time = self._check_rate_limit(
+        result = self._check_rate_limit(
             user_id=user_id,
             endpoint=request.url.path,
             method=request.method,
             limit=limit,
         )
+        reset_time = int(time.time() + result.reset_after)
 
-        # Add rate limit headers to response
-        if not allowed:
+        if not result.allowed:
             # Rate limit exceeded
-            retry_after = int(reset_time - time.time())
+            retry_after = max(math.ceil(result.retry_after), 1)
             logger.warning(
                 f"Rate limit exceeded for user {user_id} on {request.method} {request.url.path}"
             )
-            raise HTTPException(
+            return JSONResponse(
                 status_code=429,
-                detail={
+                content={
                     "error": "Rate limit exceeded",
                     "limit": limit,
                     "retry_after": retry_after,
@@ -124,7 +139,7 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
                 headers={
                     "X-RateLimit-Limit": str(limit),
                     "X-RateLimit-Remaining": "0",
-                    "X-RateLimit-Reset": str(int(reset_time)),
+                    "X-RateLimit-Reset": str(reset_time),
                     "Retry-After": str(retry_after),
                 },
             )
@@ -134,8 +149,8 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
 
         # Add rate limit headers to successful response
         response.headers["X-RateLimit-Limit"] = str(limit)
-        response.headers["X-RateLimit-Remaining"] = str(remaining)
-        response.headers["X-RateLimit-Reset"] = str(int(reset_time))
+        response.headers["X-RateLimit-Remaining"] = str(result.remaining)
+        response.headers["X-RateLimit-Reset"] = str(reset_time)
 
         return response
 
@@ -197,15 +212,12 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         endpoint: str,
         method: str,
         limit: int,
-    ) -> tuple[bool, int, float]:
+    ) -> RateLimitResult:
         """
         Check if request is within rate limit.
 
-        Uses token bucket algorithm:
-        - Bucket starts full with {limit} tokens
-        - Each request consumes 1 token
-        - Bucket refills at rate of {limit} tokens per minute
-        - If bucket empty, request is rate limited
+        Uses GCRA (see api.middleware.gcra): {limit} requests per minute, all of
+        which may arrive at once, refilling evenly over the minute.
 
         Args:
             user_id: User identifier
@@ -214,133 +226,19 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             limit: Rate limit (requests per minute)
 
         Returns:
-            Tuple of (allowed, remaining, reset_time)
+            RateLimitResult
         """
-        window_seconds = 60  # 1 minute window
-        current_time = time.time()
-
-        # Build cache key
         key = f"ratelimit:{user_id}:{method}:{endpoint}"
 
-        if self.redis_client and self.redis_client.available:
-            # Use Redis for distributed rate limiting
-            return self._check_rate_limit_redis(key, limit, window_seconds, current_time)
-        else:
-            # Fall back to local cache (single instance only)
-            return self._check_rate_limit_local(key, limit, window_seconds, current_time)
-
-    def _check_rate_limit_redis(
-        self,
-        key: str,
-        limit: int,
-        window_seconds: int,
-        current_time: float,
-    ) -> tuple[bool, int, float]:
-        """
-        Check rate limit using Redis.
-
-        Uses Redis INCR with EXPIRE for atomic rate limiting.
-
-        Args:
-            key: Redis key
-            limit: Rate limit
-            window_seconds: Time window in seconds
-            current_time: Current timestamp
-
-        Returns:
-            Tuple of (allowed, remaining, reset_time)
-        """
-        try:
-            # Get current count
-            count = self.redis_client._client.get(key)
-
-            if count is None:
-                # First request in window
-                self.redis_client._client.setex(key, window_seconds, 1)
-                reset_time = current_time + window_seconds
-                return True, limit - 1, reset_time
-            else:
-                count = int(count)
-
-                if count < limit:
-                    # Within limit, increment
-                    new_count = self.redis_client._client.incr(key)
-                    ttl = self.redis_client._client.ttl(key)
-                    reset_time = current_time + ttl
-                    return True, limit - new_count, reset_time
-                else:
-                    # Exceeded limit
-                    ttl = self.redis_client._client.ttl(key)
-                    reset_time = current_time + ttl
-                    return False, 0, reset_time
-
-        except Exception as e:
-            logger.error(f"Redis rate limit error: {e}")
-            # Fall back to local cache
-            return self._check_rate_limit_local(key, limit, window_seconds, current_time)
-
-    def _check_rate_limit_local(
-        self,
-        key: str,
-        limit: int,
-        window_seconds: int,
-        current_time: float,
-    ) -> tuple[bool, int, float]:
-        """
-        Check rate limit using local in-memory cache.
-
-        Note: This only works for single-instance deployments.
-        Use Redis for distributed deployments.
-
-        Args:
-            key: Cache key
-            limit: Rate limit
-            window_seconds: Time window in seconds
-            current_time: Current timestamp
-
-        Returns:
-            Tuple of (allowed, remaining, reset_time)
-        """
-        # Clean up expired entries
-        self._cleanup_local_cache(current_time)
-
-        if key not in self._local_cache:
-            # First request in window
-            self._local_cache[key] = {
-                "count": 1,
-                "reset_time": current_time + window_seconds,
-            }
-            return True, limit - 1, current_time + window_seconds
-
-        entry = self._local_cache[key]
-
-        # Check if window expired
-        if current_time >= entry["reset_time"]:
-            # Reset window
-            entry["count"] = 1
-            entry["reset_time"] = current_time + window_seconds
-            return True, limit - 1, entry["reset_time"]
-
-        # Check limit
-        if entry["count"] < limit:
-            entry["count"] += 1
-            return True, limit - entry["count"], entry["reset_time"]
-        else:
-            return False, 0, entry["reset_time"]
-
-    def _cleanup_local_cache(self, current_time: float) -> None:
-        """
-        Remove expired entries from local cache.
-
-        Args:
-            current_time: Current timestamp
-        """
-        expired_keys = [
-            key for key, entry in self._local_cache.items() if current_time >= entry["reset_time"]
-        ]
+        if self._redis_limiter is not None and self.redis_client.available:
+            try:
+                # One EVALSHA, or none while a leased token is left
+                return self._redis_limiter.check(key, limit, self.WINDOW_SECONDS)
+            except Exception as e:
+                logger.error(f"Redis rate limit error: {e}")
 
-        for key in expired_keys:
-            del self._local_cache[key]
+        # Fall back to local limiting (single instance only)
+        return self._local_limiter.check(key, limit, self.WINDOW_SECONDS)
 
 
 def get_rate_limit_stats() -> dict:
@@ -354,5 +252,6 @@ def get_rate_limit_stats() -> dict:
         "enabled": True,
         "default_limits": RateLimitMiddleware.DEFAULT_LIMITS,
         "endpoint_limits": RateLimitMiddleware.ENDPOINT_LIMITS,
+        "algorithm": "gcra",
         "backend": "redis",
     }
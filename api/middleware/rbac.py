@@ -12,7 +12,7 @@ from typing import Any, Callable
 
 from fastapi import HTTPException, Request
 
-from db import queries
+from db import async_queries
 
 logger = logging.getLogger(__name__)
 
@@ -40,7 +40,7 @@ async def get_current_user(request: Request) -> dict[str, Any]:
         raise HTTPException(status_code=401, detail="Not authenticated")
 
     # Fetch user from database
-    user = queries.get_user_by_email(email)
+    user = await async_queries.get_user_by_email(email)
 
     if not user:
         raise HTTPException(status_code=404, detail=f"User not found: {email}")
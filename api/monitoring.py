@@ -7,11 +7,19 @@ Provides real-time metrics for:
 - Error rates
 - Database performance
 - API usage patterns
+
+Response times are kept per route in fixed-size log-bucketed histograms, so memory
+and percentile cost don't grow with traffic; /monitoring/metrics/export serves
+them raw for merging across workers.
 """
 
 import logging
+import math
+import operator
 import time
+from array import array
 from collections import defaultdict
+from collections.abc import Iterable
 from dataclasses import dataclass, field
 from datetime import datetime
 from threading import Lock
@@ -25,132 +33,258 @@ router = APIRouter(prefix="/monitoring", tags=["monitoring"])
 
 
 # ============================================================================
-# METRICS COLLECTION
+# LATENCY HISTOGRAMS
 # ============================================================================
 
+# Log-spaced buckets (HDR-style): each is 2% wider than the last, so any recorded
+# value is reported within ~1% from 10us to an hour, in under a thousand counters
+HISTOGRAM_MIN_MS = 0.01
+HISTOGRAM_MAX_MS = 3_600_000.0
+HISTOGRAM_GROWTH = 1.02
+_LOG_GROWTH = math.log(HISTOGRAM_GROWTH)
+HISTOGRAM_BUCKETS = math.ceil(math.log(HISTOGRAM_MAX_MS / HISTOGRAM_MIN_MS) / _LOG_GROWTH) + 1
+# Value reported for each bucket: the geometric middle of its range
+_BUCKET_VALUES: list[float] = [HISTOGRAM_MIN_MS] + [
+    HISTOGRAM_MIN_MS * HISTOGRAM_GROWTH ** (i - 0.5) for i in range(1, HISTOGRAM_BUCKETS)
+]
 
-@dataclass
-class MetricsCollector:
+
+class LatencyHistogram:
     """
-    Thread-safe metrics collector for API monitoring.
+    Fixed-memory latency histogram.
 
-    Tracks request counts, response times, errors, and rate limiting.
+    Recording is O(1) and percentiles are O(buckets) whatever the request count.
+    Histograms with the same buckets merge by adding counts, so per-endpoint and
+    per-worker histograms combine into exact totals (see to_dict/from_dict).
     """
 
-    # Request counts by endpoint
-    request_counts: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    __slots__ = ("counts", "count", "total_ms", "max_ms")
+
+    def __init__(self) -> None:
+        self.counts = array("Q", bytes(8 * HISTOGRAM_BUCKETS))
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, value_ms: float) -> None:
+        """Record one duration in milliseconds."""
+        if value_ms <= HISTOGRAM_MIN_MS:
+            index = 0
+        else:
+            index = min(
+                int(math.log(value_ms / HISTOGRAM_MIN_MS) / _LOG_GROWTH) + 1,
+                HISTOGRAM_BUCKETS - 1,
+            )
+        self.counts[index] += 1
+        self.count += 1
+        self.total_ms += value_ms
+        if value_ms > self.max_ms:
+            self.max_ms = value_ms
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add another histogram's samples to this one."""
+        self.counts = array("Q", map(operator.add, self.counts, other.counts))
+        self.count += other.count
+        self.total_ms += other.total_ms
+        self.max_ms = max(self.max_ms, other.max_ms)
+
+    def percentile(self, percentile: float) -> float | None:
+        """Duration (ms) at a percentile, or None if nothing was recorded."""
+        if not self.count:
+            return None
+        rank = min(int(self.count * (percentile / 100)) + 1, self.count)
+        if rank == self.count:
+            return self.max_ms
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(_BUCKET_VALUES[index], self.max_ms)
+        return self.max_ms
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serializable form (non-empty buckets only) for merging across workers."""
+        return {
+            "count": self.count,
+            "total_ms": self.total_ms,
+            "max_ms": self.max_ms,
+            "buckets": {str(i): n for i, n in enumerate(self.counts) if n},
+        }
 
-    # Response times (store last N for percentiles)
-    response_times: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
-    max_response_time_samples: int = 1000
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "LatencyHistogram":
+        """Rebuild a histogram exported by to_dict."""
+        histogram = cls()
+        for index, n in data["buckets"].items():
+            histogram.counts[int(index)] = n
+        histogram.count = data["count"]
+        histogram.total_ms = data["total_ms"]
+        histogram.max_ms = data["max_ms"]
+        return histogram
 
-    # Error counts by status code
-    error_counts: dict[int, int] = field(default_factory=lambda: defaultdict(int))
 
-    # Rate limit hits
-    rate_limit_hits: int = 0
+# ============================================================================
+# METRICS COLLECTION
+# ============================================================================
+
+OTHER_ENDPOINT = "other"
+UNMATCHED_ENDPOINT = "unmatched"
+
+
+@dataclass
+class MetricsSnapshot:
+    """Request counters and latency histograms (one worker's, or merged across workers)."""
+
+    request_counts: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    response_times: dict[str, LatencyHistogram] = field(
+        default_factory=lambda: defaultdict(LatencyHistogram)
+    )
+    error_counts: dict[int, int] = field(default_factory=lambda: defaultdict(int))
     rate_limit_hits_by_endpoint: dict[str, int] = field(default_factory=lambda: defaultdict(int))
 
+    def add(self, other: "MetricsSnapshot") -> None:
+        for endpoint, n in other.request_counts.items():
+            self.request_counts[endpoint] += n
+        for endpoint, histogram in other.response_times.items():
+            self.response_times[endpoint].merge(histogram)
+        for status_code, n in other.error_counts.items():
+            self.error_counts[status_code] += n
+        for endpoint, n in other.rate_limit_hits_by_endpoint.items():
+            self.rate_limit_hits_by_endpoint[endpoint] += n
+
+    def overall_latency(self) -> LatencyHistogram:
+        """All endpoints' response times in one histogram."""
+        overall = LatencyHistogram()
+        for histogram in self.response_times.values():
+            overall.merge(histogram)
+        return overall
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "request_counts": dict(self.request_counts),
+            "response_times": {e: h.to_dict() for e, h in self.response_times.items()},
+            "error_counts": {str(code): n for code, n in self.error_counts.items()},
+            "rate_limit_hits_by_endpoint": dict(self.rate_limit_hits_by_endpoint),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "MetricsSnapshot":
+        snapshot = cls()
+        snapshot.request_counts.update(data["request_counts"])
+        for endpoint, histogram in data["response_times"].items():
+            snapshot.response_times[endpoint] = LatencyHistogram.from_dict(histogram)
+        snapshot.error_counts.update({int(c): n for c, n in data["error_counts"].items()})
+        snapshot.rate_limit_hits_by_endpoint.update(data["rate_limit_hits_by_endpoint"])
+        return snapshot
+
+
+def merge_metrics(exports: Iterable[dict[str, Any]]) -> MetricsSnapshot:
+    """
+    Merge exports from several API workers (GET /monitoring/metrics/export) into one
+    snapshot; percentiles of the result are those of all their requests together.
+    """
+    merged = MetricsSnapshot()
+    for export in exports:
+        merged.add(MetricsSnapshot.from_dict(export))
+    return merged
+
+
+def _percentiles(histogram: LatencyHistogram | None, *percentiles: int) -> dict[str, Any]:
+    return {
+        f"p{p}": histogram.percentile(p) if histogram is not None else None for p in percentiles
+    }
+
+
+@dataclass
+class MetricsCollector:
+    """
+    Thread-safe metrics collector for API monitoring.
+
+    Tracks request counts, response times, errors, and rate limiting. Response
+    times go into fixed-size histograms, and at most max_endpoints endpoints are
+    tracked (the rest count as "other"), so memory stays flat however long the
+    worker runs.
+    """
+
+    max_endpoints: int = 500
+
     # Start time for uptime calculation
     start_time: float = field(default_factory=time.time)
 
-    # Thread lock
-    lock: Lock = field(default_factory=Lock)
+    _lock: Lock = field(init=False, repr=False, default_factory=Lock)
+    _metrics: MetricsSnapshot = field(init=False, repr=False, default_factory=MetricsSnapshot)
+    _endpoints: set[str] = field(init=False, repr=False, default_factory=set)
 
     def record_request(self, endpoint: str, response_time: float, status_code: int):
-        """Record request metrics."""
-        with self.lock:
-            self.request_counts[endpoint] += 1
+        """Record request metrics (response_time in milliseconds)."""
+        with self._lock:
+            if endpoint not in self._endpoints:
+                if len(self._endpoints) >= self.max_endpoints:
+                    endpoint = OTHER_ENDPOINT
+                else:
+                    self._endpoints.add(endpoint)
 
-            # Store response time (keep last N samples)
-            times = self.response_times[endpoint]
-            times.append(response_time)
-            if len(times) > self.max_response_time_samples:
-                times.pop(0)
+            self._metrics.request_counts[endpoint] += 1
+            self._metrics.response_times[endpoint].record(response_time)
 
             # Record errors
             if status_code >= 400:
-                self.error_counts[status_code] += 1
+                self._metrics.error_counts[status_code] += 1
 
             # Record rate limit hits
             if status_code == 429:
-                self.rate_limit_hits += 1
-                self.rate_limit_hits_by_endpoint[endpoint] += 1
+                self._metrics.rate_limit_hits_by_endpoint[endpoint] += 1
+
+    def snapshot(self) -> MetricsSnapshot:
+        """Copy of the counters and histograms, safe to read while recording continues."""
+        snapshot = MetricsSnapshot()
+        with self._lock:
+            snapshot.add(self._metrics)
+        return snapshot
 
     def get_percentile(self, endpoint: str, percentile: float) -> float | None:
         """Calculate response time percentile for endpoint."""
-        with self.lock:
-            times = self.response_times.get(endpoint, [])
-            if not times:
-                return None
-
-            sorted_times = sorted(times)
-            index = int(len(sorted_times) * (percentile / 100))
-            return sorted_times[min(index, len(sorted_times) - 1)]
+        histogram = self.snapshot().response_times.get(endpoint)
+        return histogram.percentile(percentile) if histogram is not None else None
 
     def get_metrics_summary(self) -> dict[str, Any]:
         """Get summary of all metrics."""
-        with self.lock:
-            total_requests = sum(self.request_counts.values())
-            total_errors = sum(self.error_counts.values())
-
-            # Calculate global percentiles
-            all_times = []
-            for times in self.response_times.values():
-                all_times.extend(times)
-
-            global_p50 = None
-            global_p95 = None
-            global_p99 = None
-
-            if all_times:
-                sorted_times = sorted(all_times)
-                global_p50 = sorted_times[int(len(sorted_times) * 0.5)]
-                global_p95 = sorted_times[int(len(sorted_times) * 0.95)]
-                global_p99 = sorted_times[int(len(sorted_times) * 0.99)]
-
-            return {
-                "uptime_seconds": time.time() - self.start_time,
-                "total_requests": total_requests,
-                "total_errors": total_errors,
-                "error_rate": total_errors / total_requests if total_requests > 0 else 0,
-                "rate_limit_hits": self.rate_limit_hits,
-                "response_time_ms": {
-                    "p50": global_p50,
-                    "p95": global_p95,
-                    "p99": global_p99,
-                },
-                "requests_by_endpoint": dict(self.request_counts),
-                "errors_by_status": dict(self.error_counts),
-                "rate_limit_hits_by_endpoint": dict(self.rate_limit_hits_by_endpoint),
-            }
+        return self.summarize(self.snapshot())
+
+    def summarize(self, snapshot: MetricsSnapshot) -> dict[str, Any]:
+        """Summary of a snapshot (this worker's, or merged across workers)."""
+        total_requests = sum(snapshot.request_counts.values())
+        total_errors = sum(snapshot.error_counts.values())
+
+        return {
+            "uptime_seconds": time.time() - self.start_time,
+            "total_requests": total_requests,
+            "total_errors": total_errors,
+            "error_rate": total_errors / total_requests if total_requests > 0 else 0,
+            "rate_limit_hits": sum(snapshot.rate_limit_hits_by_endpoint.values()),
+            "response_time_ms": _percentiles(snapshot.overall_latency(), 50, 95, 99),
+            "requests_by_endpoint": dict(snapshot.request_counts),
+            "errors_by_status": dict(snapshot.error_counts),
+            "rate_limit_hits_by_endpoint": dict(snapshot.rate_limit_hits_by_endpoint),
+        }
 
     def get_endpoint_metrics(self, endpoint: str) -> dict[str, Any]:
         """Get detailed metrics for specific endpoint."""
-        with self.lock:
-            request_count = self.request_counts.get(endpoint, 0)
-
-            return {
-                "endpoint": endpoint,
-                "total_requests": request_count,
-                "rate_limit_hits": self.rate_limit_hits_by_endpoint.get(endpoint, 0),
-                "response_time_ms": {
-                    "p50": self.get_percentile(endpoint, 50),
-                    "p90": self.get_percentile(endpoint, 90),
-                    "p95": self.get_percentile(endpoint, 95),
-                    "p99": self.get_percentile(endpoint, 99),
-                },
-            }
+        snapshot = self.snapshot()
+
+        return {
+            "endpoint": endpoint,
+            "total_requests": snapshot.request_counts.get(endpoint, 0),
+            "rate_limit_hits": snapshot.rate_limit_hits_by_endpoint.get(endpoint, 0),
+            "response_time_ms": _percentiles(snapshot.response_times.get(endpoint), 50, 90, 95, 99),
+        }
 
     def reset_metrics(self):
         """Reset all metrics (useful for testing)."""
-        with self.lock:
-            self.request_counts.clear()
-            self.response_times.clear()
-            self.error_counts.clear()
-            self.rate_limit_hits = 0
-            self.rate_limit_hits_by_endpoint.clear()
-            self.start_time = time.time()
+        with self._lock:
+            self._metrics = MetricsSnapshot()
+            self._endpoints.clear()
+        self.start_time = time.time()
 
 
 # Global metrics collector instance
@@ -201,6 +335,21 @@ async def get_metrics() -> dict[str, Any]:
     return metrics.get_metrics_summary()
 
 
+@router.get("/metrics/export")
+async def export_metrics() -> dict[str, Any]:
+    """
+    Export this worker's raw counters and latency histograms.
+
+    Each API worker keeps its own metrics; collect this from every worker and
+    combine with merge_metrics() for fleet-wide percentiles (histograms merge
+    exactly, unlike percentiles).
+
+    Returns:
+        Serialized MetricsSnapshot
+    """
+    return metrics.snapshot().to_dict()
+
+
 @router.get("/metrics/endpoint/{endpoint:path}")
 async def get_endpoint_metrics(endpoint: str) -> dict[str, Any]:
     """
@@ -223,34 +372,43 @@ async def get_database_metrics() -> dict[str, Any]:
     Returns:
         Database connection pool stats and query performance
     """
-    from db.connection import fetch_one
+    from db.connection import fetch_one, get_db_pool, get_replica_monitor, get_replica_pool
+    from db.replica import use_primary
 
     try:
-        # Get connection pool stats
-        pool_stats = fetch_one(
-            """
-            SELECT
-                count(*) as total_connections,
-                sum(CASE WHEN state = 'active' THEN 1 ELSE 0 END) as active,
-                sum(CASE WHEN state = 'idle' THEN 1 ELSE 0 END) as idle,
-                sum(CASE WHEN state = 'idle in transaction' THEN 1 ELSE 0 END) as idle_in_transaction
-            FROM pg_stat_activity
-            WHERE datname = current_database()
-        """
-        )
-
-        # Get slow query count (queries > 1 second)
-        slow_queries = fetch_one(
-            """
-            SELECT count(*) as slow_query_count
-            FROM pg_stat_activity
-            WHERE state != 'idle'
-            AND now() - query_start > interval '1 second'
-        """
-        )
+        # Server-side stats describe the primary, not the read replica
+        with use_primary():
+            # Get connection pool stats
+            pool_stats = fetch_one("""
+                SELECT
+                    count(*) as total_connections,
+                    sum(CASE WHEN state = 'active' THEN 1 ELSE 0 END) as active,
+                    sum(CASE WHEN state = 'idle' THEN 1 ELSE 0 END) as idle,
+                    sum(CASE WHEN state = 'idle in transaction' THEN 1 ELSE 0 END) as idle_in_transaction
+                FROM pg_stat_activity
+                WHERE datname = current_database()
+            """)
+
+            # Get slow query count (queries > 1 second)
+            slow_queries = fetch_one("""
+                SELECT count(*) as slow_query_count
+                FROM pg_stat_activity
+                WHERE state != 'idle'
+                AND now() - query_start > interval '1 second'
+            """)
+
+        try:
+            replica_pool = get_replica_pool()
+        except Exception as e:
+            logger.warning(f"Read replica pool unavailable: {e}")
+            replica_pool = None
 
         return {
             "connection_pool": pool_stats,
+            # Client-side pool state; wait/hold histograms are exported via prometheus_client
+            "app_pool": get_db_pool().stats(),
+            "replica_pool": replica_pool.stats() if replica_pool else None,
+            "replica": get_replica_monitor().status() if replica_pool else None,
             "slow_queries": slow_queries["slow_query_count"],
             "timestamp": datetime.utcnow().isoformat(),
         }
@@ -263,6 +421,23 @@ async def get_database_metrics() -> dict[str, Any]:
         }
 
 
+@router.get("/metrics/executors")
+async def get_executor_metrics() -> dict[str, Any]:
+    """
+    Get tool executor saturation.
+
+    Returns:
+        Pending jobs and limits per executor; queue and run time histograms are
+        exported via prometheus_client
+    """
+    from api.executors import executor_status
+
+    return {
+        "executors": executor_status(),
+        "timestamp": datetime.utcnow().isoformat(),
+    }
+
+
 @router.get("/metrics/rate-limits")
 async def get_rate_limit_metrics() -> dict[str, Any]:
     """
@@ -271,9 +446,10 @@ async def get_rate_limit_metrics() -> dict[str, Any]:
     Returns:
         Rate limit hits and patterns
     """
+    hits = metrics.snapshot().rate_limit_hits_by_endpoint
     return {
-        "total_rate_limit_hits": metrics.rate_limit_hits,
-        "rate_limit_hits_by_endpoint": dict(metrics.rate_limit_hits_by_endpoint),
+        "total_rate_limit_hits": sum(hits.values()),
+        "rate_limit_hits_by_endpoint": dict(hits),
         "timestamp": datetime.utcnow().isoformat(),
     }
 
@@ -307,5 +483,15 @@ async def record_request_metrics(request: Request, response_time: float, status_
         response_time: Response time in milliseconds
         status_code: HTTP status code
     """
-    endpoint = request.url.path
-    metrics.record_request(endpoint, response_time, status_code)
+    metrics.record_request(endpoint_label(request), response_time, status_code)
+
+
+def endpoint_label(request: Request) -> str:
+    """
+    The matched route's path template (e.g. /api/v1/calls/{call_id}).
+
+    Requests no route matched (404s, scanners) share one label, so they can't use
+    up max_endpoints.
+    """
+    route = request.scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ENDPOINT
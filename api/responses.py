@@ -0,0 +1,70 @@
+"""
+Fast JSON responses.
+
+FastAPI turns an endpoint's return value into JSON by validating it against the
+return annotation and serializing it with pydantic, or, for endpoints without one,
+by walking it with jsonable_encoder and then json.dumps. On large payloads (a call
+analysis with its transcript, a coaching feed, a page of calls) that walk costs
+milliseconds per request.
+
+Endpoints that return large dicts instead return FastJSONResponse(payload), which
+FastAPI passes through untouched. orjson encodes UUID, datetime and date natively,
+and Decimal and pydantic models through _default, so rows from the database can
+be returned as they are.
+
+Payloads that are served many times (batch job results) can be serialized once
+with dumps() and embedded in later responses with PreSerialized(bytes), which
+orjson copies into the output without decoding it. Cached analyses are not served
+this way: analyze_call aggregates the cached sessions' scores and examples, so
+they have to be decoded anyway.
+"""
+
+from decimal import Decimal
+from typing import Any
+
+import orjson
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
+# Already-encoded JSON embedded as-is in a larger document
+PreSerialized = orjson.Fragment
+
+_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return float(value)
+    if hasattr(value, "model_dump"):
+        return value.model_dump(mode="json")
+    if isinstance(value, set | frozenset):
+        return list(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize to JSON bytes (UUID, datetime and Decimal included)."""
+    return orjson.dumps(content, default=_default, option=_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson; bytes content is sent as already-encoded JSON."""
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
+
+
+def json_response(content: Any, response: Response | None = None) -> FastJSONResponse:
+    """
+    FastJSONResponse carrying the headers an endpoint set on its injected Response
+    (ETag, Cache-Control, X-Next-Cursor), which FastAPI only copies onto responses
+    it builds itself.
+    """
+    fast = FastJSONResponse(content)
+    if response is not None:
+        fast.headers.raw.extend(response.headers.raw)
+        if response.status_code:
+            fast.status_code = response.status_code
+    return fast
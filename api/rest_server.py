@@ -6,21 +6,22 @@ This bridge allows the React app to call MCP tools via standard HTTP POST reques
 
 Production Features:
 - Rate limiting per-user and per-endpoint
-- Response compression (gzip)
+- Response compression (zstd, br, gzip; streaming)
 - API versioning (/api/v1/)
 - Standardized error handling
 - Request/response logging
 - Performance monitoring
 """
 
+import asyncio
 import logging
 import time
 import uuid
 from typing import Any
 
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 
 from analysis.learning_insights import get_learning_insights
@@ -31,21 +32,43 @@ from analysis.opportunity_coaching import (
     generate_coaching_recommendations,
     identify_recurring_themes,
 )
+from api.batch import cancel_batch_jobs
+from api.dependencies.conditional import CACHE_PUBLIC, conditional_get, make_etag
 
 # Import error handlers
 from api.error_handlers import setup_error_handlers
+from api.executors import run_analysis, run_read, shutdown_executors
+from api.middleware.compression import CompressionMiddleware
+from api.monitoring import endpoint_label, metrics
 from api.monitoring import router as monitoring_router
+from api.responses import FastJSONResponse
+from api.streaming import SSE_HEADERS, analyze_call_events
+from api.token_budget import analysis_charge
 
 # Import versioned API routers
 from api.v1 import router as v1_router
 
 # Import MCP tool implementations
-from coaching_mcp.tools.analyze_call import analyze_call_tool
+from coaching_mcp.shared import settings
+from coaching_mcp.tools.analyze_call import (
+    analyze_call_tool,
+    find_cached_dimensions,
+    prepare_call_analysis,
+)
 from coaching_mcp.tools.get_coaching_feed import get_coaching_feed_tool
 from coaching_mcp.tools.get_rep_insights import get_rep_insights_tool
 from coaching_mcp.tools.search_calls import search_calls_tool
-from db import queries
+from db import async_queries, replica
+from db.async_connection import close_async_pool
 from db.models import CoachingDimension, KnowledgeBaseCategory, Product
+from db.pagination import InvalidCursorError
+from db.query_budget import (
+    QueryBudgetExceededError,
+    budget_for,
+    check_budget,
+    query_budget,
+    track_queries,
+)
 from knowledge_base.loader import KnowledgeBaseManager
 from services.scheduler import get_scheduler, start_scheduler, stop_scheduler
 
@@ -94,6 +117,16 @@ async def shutdown_event():
     except Exception as e:
         logger.error(f"Error stopping scheduler: {e}", exc_info=True)
 
+    # Stop batch analysis jobs, then let running tool jobs finish. Waiting happens off
+    # the event loop so the requests awaiting those jobs can still be answered.
+    await cancel_batch_jobs()
+    await asyncio.to_thread(shutdown_executors)
+
+    try:
+        await close_async_pool()
+    except Exception as e:
+        logger.error(f"Error closing async database pool: {e}", exc_info=True)
+
 
 # ============================================================================
 # MIDDLEWARE SETUP
@@ -121,6 +154,8 @@ app.add_middleware(
         "X-RateLimit-Reset",
         "X-Request-ID",
         "X-Response-Time",
+        "X-Next-Cursor",
+        "Server-Timing",
     ],
 )
 
@@ -134,44 +169,68 @@ app.add_middleware(
 #     expensive_burst=30,
 # )
 
-# Compression middleware
-# TODO: Fix middleware initialization - temporarily disabled for testing
-# app.add_middleware(
-#     CompressionMiddleware,
-#     minimum_size=500,  # Only compress responses > 500 bytes
-#     compression_level=6,
-# )
+# Compression middleware (streams; level chosen per payload size)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=500,  # Only compress responses > 500 bytes
+)
 
 
 # Request ID and timing middleware
 @app.middleware("http")
 async def add_request_context(request: Request, call_next):
-    """Add request ID and timing to all requests."""
+    """Add request ID, timing and database query accounting to all requests."""
     # Generate request ID
     request_id = request.headers.get("X-Request-ID", str(uuid.uuid4()))
 
     # Time request
     start_time = time.time()
 
-    # Process request
-    response = await call_next(request)
+    # Process request; reads after a write in this request go to the primary
+    with replica.request_scope(), track_queries() as query_stats:
+        response = await call_next(request)
 
     # Add headers
+    duration_ms = (time.time() - start_time) * 1000
     response.headers["X-Request-ID"] = request_id
-    response.headers["X-Response-Time"] = f"{(time.time() - start_time) * 1000:.2f}ms"
+    response.headers["X-Response-Time"] = f"{duration_ms:.2f}ms"
+    response.headers["Server-Timing"] = (
+        f"{query_stats.server_timing()}, total;dur={duration_ms:.1f}"
+    )
+
+    metrics.record_request(endpoint_label(request), duration_ms, response.status_code)
 
     # Log request
+    query_summary = query_stats.summary(settings.query_repeat_threshold)
     logger.info(
         f"{request.method} {request.url.path} - {response.status_code} - "
-        f"{response.headers['X-Response-Time']}",
+        f"{response.headers['X-Response-Time']} - {query_stats.count} queries",
         extra={
             "request_id": request_id,
             "method": request.method,
             "path": request.url.path,
             "status_code": response.status_code,
-            "duration_ms": float(response.headers["X-Response-Time"].rstrip("ms")),
+            "duration_ms": round(duration_ms, 2),
+            **query_summary,
         },
     )
+    if query_summary["db_repeated"]:
+        logger.warning(
+            f"Possible N+1 in {request.method} {request.url.path}: "
+            + "; ".join(f"x{n} {shape}" for shape, n in query_summary["db_repeated"].items()),
+            extra={"request_id": request_id, "path": request.url.path},
+        )
+
+    # Enforce the endpoint's declared query budget
+    budget = budget_for(request.scope.get("endpoint"))
+    if budget is not None:
+        label = f"{request.method} {request.url.path}"
+        try:
+            check_budget(query_stats, budget, label, settings.query_repeat_threshold)
+        except QueryBudgetExceededError as e:
+            if settings.query_budget_strict:
+                raise
+            logger.warning(str(e), extra={"request_id": request_id, "path": request.url.path})
 
     return response
 
@@ -202,6 +261,10 @@ class AnalyzeCallRequest(BaseModel):
     force_reanalysis: bool = Field(False, description="Force regeneration of analysis")
 
 
+class AnalyzeCallStreamRequest(AnalyzeCallRequest):
+    stream_tokens: bool = Field(False, description="Stream model tokens for fresh dimensions")
+
+
 class RepInsightsRequest(BaseModel):
     rep_email: str = Field(..., description="Email of the sales rep")
     time_period: str = Field("last_30_days", description="Time period for analysis")
@@ -236,6 +299,8 @@ class CoachingFeedRequest(BaseModel):
     end_date: str | None = Field(None, description="Custom end date (ISO format)")
     limit: int = Field(20, description="Maximum number of items to return")
     offset: int = Field(0, description="Pagination offset")
+    cursor: str | None = Field(None, description="next_cursor from the previous page")
+    include_total: bool = Field(False, description="Return an approximate total_count")
     include_dismissed: bool = Field(False, description="Include dismissed items")
     include_team_insights: bool = Field(False, description="Include team-wide insights")
     rep_email: str | None = Field(None, description="Filter to specific rep")
@@ -321,29 +386,87 @@ async def trigger_import_now() -> dict[str, Any]:
 
 
 # Tool endpoints
-@app.post("/tools/analyze_call")
-async def analyze_call_endpoint(request: AnalyzeCallRequest) -> dict[str, Any]:
+@app.post("/tools/analyze_call", response_class=FastJSONResponse)
+@query_budget(40)
+async def analyze_call_endpoint(
+    request: AnalyzeCallRequest, http_request: Request
+) -> FastJSONResponse:
     """
     Analyze a specific call with coaching insights.
 
     Returns comprehensive coaching analysis with scores, strengths,
-    areas for improvement, and actionable recommendations.
+    areas for improvement, and actionable recommendations. Dimensions not
+    answered by the cache are charged to the caller's Claude token budget
+    (429 with Retry-After when exhausted; see api.token_budget).
     """
+    charge = analysis_charge(http_request)
     try:
-        result = analyze_call_tool(
+        result = await run_analysis(
+            analyze_call_tool,
             call_id=request.call_id,
             dimensions=request.dimensions,
             use_cache=request.use_cache,
             include_transcript_snippets=request.include_transcript_snippets,
             force_reanalysis=request.force_reanalysis,
+            before_analysis=charge,
         )
-        return result
+        if charge:
+            charge.settle(result.get("dimension_details") or {})
+        return FastJSONResponse(result)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error analyzing call {request.call_id}: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        # Refund the estimate if the analysis raised before it could be settled
+        if charge:
+            charge.cancel()
+
+
+@app.post("/tools/analyze_call/stream")
+async def analyze_call_stream_endpoint(
+    request: AnalyzeCallStreamRequest, http_request: Request
+) -> StreamingResponse:
+    """
+    Analyze a call, streaming results as Server-Sent Events.
+
+    Emits an event per dimension as it completes (cached or fresh), then the
+    Five Wins, insights, comparison and transcript sections. See api.streaming.
+    """
+    charge = analysis_charge(http_request)
+    try:
+        # Resolve the call (and charge its token budget) up front, so a bad call ID
+        # or dimension is a normal 400 and an exhausted budget a normal 429
+        context = await run_read(prepare_call_analysis, request.call_id, request.dimensions)
+        if charge:
+            cached = {}
+            if not request.force_reanalysis:
+                cached = await run_read(find_cached_dimensions, context)
+            await run_read(charge, context, [d for d in context.dimensions if d not in cached])
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error analyzing call {request.call_id}: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return StreamingResponse(
+        analyze_call_events(
+            context,
+            include_transcript_snippets=request.include_transcript_snippets,
+            force_reanalysis=request.force_reanalysis,
+            stream_tokens=request.stream_tokens,
+            charge=charge,
+        ),
+        media_type="text/event-stream",
+        headers=SSE_HEADERS,
+    )
 
 
 @app.post("/tools/get_rep_insights")
+@query_budget(20)
 async def get_rep_insights_endpoint(request: RepInsightsRequest) -> dict[str, Any]:
     """
     Get performance insights and trends for a sales rep.
@@ -351,26 +474,31 @@ async def get_rep_insights_endpoint(request: RepInsightsRequest) -> dict[str, An
     Returns score trends, skill gaps, improvement areas, and coaching plan.
     """
     try:
-        result = get_rep_insights_tool(
+        result = await run_read(
+            get_rep_insights_tool,
             rep_email=request.rep_email,
             time_period=request.time_period,
             product_filter=request.product_filter,
         )
         return result
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting insights for {request.rep_email}: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/tools/search_calls")
-async def search_calls_endpoint(request: SearchCallsRequest) -> list[dict[str, Any]]:
+@app.post("/tools/search_calls", response_class=FastJSONResponse)
+@query_budget(5)
+async def search_calls_endpoint(request: SearchCallsRequest) -> FastJSONResponse:
     """
     Search for calls matching specific criteria.
 
     Returns list of calls with metadata and scores.
     """
     try:
-        result = search_calls_tool(
+        result = await run_read(
+            search_calls_tool,
             rep_email=request.rep_email,
             product=request.product,
             call_type=request.call_type,
@@ -381,32 +509,42 @@ async def search_calls_endpoint(request: SearchCallsRequest) -> list[dict[str, A
             topics=request.topics,
             limit=request.limit,
         )
-        return result
+        return FastJSONResponse(result)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error searching calls: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.post("/coaching/feed")
-async def coaching_feed_endpoint(request: CoachingFeedRequest) -> dict[str, Any]:
+@app.post("/coaching/feed", response_class=FastJSONResponse)
+@query_budget(15)
+async def coaching_feed_endpoint(request: CoachingFeedRequest) -> FastJSONResponse:
     """
     Get personalized coaching feed with recent insights and recommendations.
 
     Returns feed items, team insights, highlights, and pagination metadata.
     """
     try:
-        result = get_coaching_feed_tool(
+        result = await run_read(
+            get_coaching_feed_tool,
             type_filter=request.type_filter,
             time_filter=request.time_filter,
             start_date=request.start_date,
             end_date=request.end_date,
             limit=request.limit,
             offset=request.offset,
+            cursor=request.cursor,
+            include_total=request.include_total,
             include_dismissed=request.include_dismissed,
             include_team_insights=request.include_team_insights,
             rep_email=request.rep_email,
         )
-        return result
+        return FastJSONResponse(result)
+    except HTTPException:
+        raise
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
     except Exception as e:
         logger.error(f"Error generating coaching feed: {e}")
         raise HTTPException(status_code=500, detail=str(e)) from e
@@ -423,16 +561,16 @@ async def analyze_opportunity_endpoint(request: AnalyzeOpportunityRequest) -> di
         opportunity_id = request.opportunity_id
 
         # Verify opportunity exists
-        opp = queries.get_opportunity(opportunity_id)
+        opp = await async_queries.get_opportunity(opportunity_id)
         if not opp:
             raise HTTPException(status_code=404, detail=f"Opportunity not found: {opportunity_id}")
 
         # Run all analyses
-        patterns = analyze_opportunity_patterns(opportunity_id)
-        themes = identify_recurring_themes(opportunity_id)
-        objections = analyze_objection_progression(opportunity_id)
-        relationship = assess_relationship_strength(opportunity_id)
-        recommendations = generate_coaching_recommendations(opportunity_id)
+        patterns = await run_analysis(analyze_opportunity_patterns, opportunity_id)
+        themes = await run_analysis(identify_recurring_themes, opportunity_id)
+        objections = await run_analysis(analyze_objection_progression, opportunity_id)
+        relationship = await run_analysis(assess_relationship_strength, opportunity_id)
+        recommendations = await run_analysis(generate_coaching_recommendations, opportunity_id)
 
         return {
             "opportunity": {
@@ -464,11 +602,14 @@ async def get_learning_insights_endpoint(request: LearningInsightsRequest) -> di
     Returns behavioral differences with concrete examples from successful calls.
     """
     try:
-        result = get_learning_insights(
+        result = await run_analysis(
+            get_learning_insights,
             rep_email=request.rep_email,
             focus_area=request.focus_area,
         )
         return result
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting learning insights for {request.rep_email}: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -479,16 +620,24 @@ async def get_learning_insights_endpoint(request: LearningInsightsRequest) -> di
 # ============================================================================
 
 
-@app.get("/knowledge")
+@app.get("/knowledge", response_model=None)
 async def list_knowledge_entries(
+    request: Request,
+    response: Response,
     product: str | None = None,
     category: str | None = None,
-) -> list[dict[str, Any]]:
-    """List knowledge base entries with optional filters."""
+) -> list[dict[str, Any]] | Response:
+    """List knowledge base entries with optional filters (ETag-validated)."""
     try:
         product_enum = Product(product) if product else None
         category_enum = KnowledgeBaseCategory(category) if category else None
 
+        version = kb_manager.get_entries_version()
+        etag = make_etag("knowledge", product, category, version)
+        not_modified = conditional_get(request, response, etag, CACHE_PUBLIC)
+        if not_modified:
+            return not_modified
+
         entries = kb_manager.list_entries(product=product_enum, category=category_enum)
 
         return [
@@ -593,16 +742,24 @@ async def get_knowledge_stats() -> dict[str, Any]:
 # ============================================================================
 
 
-@app.get("/knowledge/rubrics")
+@app.get("/knowledge/rubrics", response_model=None)
 async def list_rubrics(
+    request: Request,
+    response: Response,
     category: str | None = None,
     active_only: bool = True,
     all_versions: bool = False,
-) -> list[dict[str, Any]]:
-    """List coaching rubrics with optional filters."""
+) -> list[dict[str, Any]] | Response:
+    """List coaching rubrics with optional filters (ETag-validated)."""
     try:
         category_enum = CoachingDimension(category) if category else None
 
+        version = kb_manager.get_rubrics_version()
+        etag = make_etag("knowledge/rubrics", category, active_only, all_versions, version)
+        not_modified = conditional_get(request, response, etag, CACHE_PUBLIC)
+        if not_modified:
+            return not_modified
+
         if all_versions and category_enum:
             rubrics = kb_manager.get_rubric_versions(category_enum)
         else:
@@ -698,7 +855,9 @@ async def update_rubric(rubric_id: str, updates: dict[str, Any]) -> dict[str, An
 async def http_exception_handler(request: Request, exc: HTTPException):
     """Handle HTTP exceptions with consistent error format."""
     return JSONResponse(
-        status_code=exc.status_code, content={"error": exc.detail, "status_code": exc.status_code}
+        status_code=exc.status_code,
+        content={"error": exc.detail, "status_code": exc.status_code},
+        headers=exc.headers,
     )
 
 
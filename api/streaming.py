@@ -0,0 +1,195 @@
+"""
+Server-Sent Events stream for call analysis.
+
+POST /tools/analyze_call/stream runs the same steps as analyze_call_tool, but sends
+each part of the result as soon as it exists instead of after the slowest dimension:
+
+    event: call        call id, title, rep and the dimensions being analyzed
+    event: token       {"dimension", "text"} while Claude writes a fresh analysis
+                       (only with stream_tokens)
+    event: dimension   {"dimension", "result"} as each dimension completes, cached or fresh
+    event: five_wins   scores and the aggregated Five Wins evaluation
+    event: insights    strengths, improvements, action items, themes, key moments,
+                       narrative and primary action
+    event: comparison  comparison to team averages
+    event: transcript  transcript segments (with include_transcript_snippets)
+    event: done        {"overall_score"}
+    event: error       {"detail"}; ends the stream
+
+Dimensions run concurrently as separate jobs on the analysis executor. While waiting,
+a comment line is sent every HEARTBEAT_SECONDS so proxies keep the connection open.
+"""
+
+import asyncio
+import json
+import logging
+from collections.abc import AsyncIterator, Callable
+from typing import Any
+
+from fastapi import HTTPException
+
+from api.executors import run_analysis
+from api.token_budget import AnalysisCharge
+from coaching_mcp.tools.analyze_call import (
+    CallAnalysisContext,
+    analyze_call_dimension,
+    build_call_analysis,
+)
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT_SECONDS = 15.0
+HEARTBEAT = ": keep-alive\n\n"
+
+# Keys of the final analysis sent in each section event, in order
+SECTIONS: dict[str, tuple[str, ...]] = {
+    "five_wins": ("scores", "five_wins_evaluation"),
+    "insights": (
+        "strengths",
+        "areas_for_improvement",
+        "specific_examples",
+        "action_items",
+        "action_items_filtered",
+        "thematic_insights",
+        "key_moments",
+        "narrative",
+        "wins_addressed",
+        "wins_missed",
+        "primary_action",
+    ),
+    "comparison": ("comparison_to_average",),
+    "transcript": ("transcript",),
+}
+
+SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "X-Accel-Buffering": "no",  # Stop nginx buffering the stream
+}
+
+
+def format_sse(event: str, data: Any) -> str:
+    """Format one SSE event with a JSON payload (or JSON bytes already encoded)."""
+    payload = data.decode() if isinstance(data, bytes) else json.dumps(data, default=str)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+async def analyze_call_events(
+    context: CallAnalysisContext,
+    include_transcript_snippets: bool = True,
+    force_reanalysis: bool = False,
+    stream_tokens: bool = False,
+    charge: AnalysisCharge | None = None,
+) -> AsyncIterator[str]:
+    """
+    Analyze a prepared call and yield SSE events as results arrive.
+
+    Args:
+        context: Result of prepare_call_analysis
+        include_transcript_snippets: Include quotes and the transcript section
+        force_reanalysis: Force new analysis even if cached
+        stream_tokens: Also send Claude's text deltas for dimensions analyzed fresh
+        charge: Token budget charge already made for the dimensions; refunds failed ones
+            (or all of it if the stream errors before they finish)
+
+    Yields:
+        SSE-formatted events (see module docstring)
+    """
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue[tuple[str, dict[str, Any]]] = asyncio.Queue()
+
+    def token_sink(dimension: str) -> Callable[[str], None]:
+        # Called on the executor thread; hand each delta to the event loop
+        def on_token(text: str) -> None:
+            loop.call_soon_threadsafe(
+                events.put_nowait, ("token", {"dimension": dimension, "text": text})
+            )
+
+        return on_token
+
+    async def run_dimension(dimension: str) -> None:
+        try:
+            result = await run_analysis(
+                analyze_call_dimension,
+                context,
+                dimension,
+                force_reanalysis,
+                token_sink(dimension) if stream_tokens else None,
+            )
+        except HTTPException as e:
+            result = {"error": e.detail, "score": None}
+        except Exception as e:
+            logger.error(f"Failed to analyze {dimension}: {e}", exc_info=True)
+            result = {"error": str(e), "score": None}
+        await events.put(("dimension", {"dimension": dimension, "result": result}))
+
+    call, rep = context.call, context.rep
+    yield format_sse(
+        "call",
+        {
+            "id": call["gong_call_id"],
+            "title": call["title"],
+            "date": str(call["scheduled_at"]) if call["scheduled_at"] else None,
+            "call_type": call["call_type"],
+            "product": call["product"],
+            "rep_analyzed": {
+                "name": rep["name"] if rep else "Unknown",
+                "email": rep["email"] if rep else None,
+                "evaluated_as_role": context.detected_role,
+            },
+            "dimensions": context.dimensions,
+        },
+    )
+
+    tasks = [asyncio.create_task(run_dimension(d)) for d in context.dimensions]
+    try:
+        results: dict[str, dict[str, Any]] = {}
+        while len(results) < len(context.dimensions):
+            try:
+                event, data = await asyncio.wait_for(events.get(), HEARTBEAT_SECONDS)
+            except TimeoutError:
+                yield HEARTBEAT
+                continue
+            if event == "dimension":
+                results[data["dimension"]] = data["result"]
+            yield format_sse(event, data)
+        if charge:
+            charge.settle(results)
+
+        # Aggregation may make its own Claude call (unified Five Wins), so keep beating
+        build = asyncio.ensure_future(
+            run_analysis(
+                build_call_analysis,
+                context,
+                {d: results[d] for d in context.dimensions},
+                include_transcript_snippets,
+            )
+        )
+        while not build.done():
+            await asyncio.wait({build}, timeout=HEARTBEAT_SECONDS)
+            if not build.done():
+                yield HEARTBEAT
+        analysis = build.result()
+    except HTTPException as e:
+        if charge:
+            charge.cancel()
+        yield format_sse("error", {"detail": e.detail})
+        return
+    except Exception as e:
+        logger.error(f"Error streaming analysis of call {context.call_id}: {e}", exc_info=True)
+        if charge:
+            charge.cancel()
+        yield format_sse("error", {"detail": str(e)})
+        return
+    finally:
+        # Client went away: stop waiting on dimensions (jobs already running finish and cache)
+        for task in tasks:
+            task.cancel()
+
+    for section, keys in SECTIONS.items():
+        if section == "transcript" and not include_transcript_snippets:
+            continue
+        yield format_sse(section, {key: analysis.get(key) for key in keys})
+
+    yield format_sse(
+        "done", {"overall_score": (analysis.get("five_wins_evaluation") or {}).get("overall_score")}
+    )
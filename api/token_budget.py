@@ -0,0 +1,223 @@
+"""
+Claude token budgets for call analysis.
+
+Request rate limits count requests, but analysis requests differ in cost by orders of
+magnitude: a fully cached analyze_call costs one Five Wins pass, while
+force_reanalysis on a two-hour call sends the transcript to Claude once per
+dimension. So analysis is also charged its predicted token spend, against two GCRA
+buckets refilling over settings.claude_token_budget_window_seconds:
+- per user (X-User-Email, else client IP): claude_tokens_per_user per window
+- global: claude_tokens_global per window, kept below the provider quota, so one
+  user's bulk reanalysis can't starve everyone else
+
+The charge is made after the cache lookup, so dimensions served from cache are never
+charged, and dimensions whose analysis fails are refunded afterwards. Interactive
+requests over budget get a 429 with Retry-After; batch jobs wait instead.
+
+Buckets live in Redis when it's available (shared by every API instance, no leases,
+since a single charge can be most of a bucket) and fall back to memory.
+"""
+
+import logging
+import math
+from typing import Any
+
+from fastapi import HTTPException, Request, status
+
+from analysis.chunking import count_tokens
+from api.middleware.gcra import LocalGCRA, RateLimitResult, RedisGCRA
+from coaching_mcp.shared import settings
+from coaching_mcp.tools.analyze_call import CallAnalysisContext
+
+logger = logging.getLogger(__name__)
+
+# Predicted tokens per Claude analysis besides the transcript
+PROMPT_TOKENS = 2_000  # Rubric, instructions and knowledge base context
+OUTPUT_TOKENS = 4_000  # Typical structured response (max_tokens is 8000)
+
+GLOBAL_KEY = "global"
+
+
+class TokenBudgetExceeded(HTTPException):
+    """Raised when an analysis would exceed a token budget (429 with Retry-After)."""
+
+    def __init__(self, scope: str, tokens: int, retry_after: int):
+        super().__init__(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"Claude token budget exceeded ({scope}): this analysis needs ~{tokens} "
+            f"tokens; retry in {retry_after}s",
+            headers={"Retry-After": str(retry_after)},
+        )
+        self.scope = scope
+        self.tokens = tokens
+        self.retry_after = retry_after
+
+
+def estimate_analysis_tokens(transcript: str | None) -> int:
+    """Predicted tokens (input and output) for one Claude pass over a transcript."""
+    return count_tokens(transcript or "") + PROMPT_TOKENS + OUTPUT_TOKENS
+
+
+def budget_key(request: Request) -> str:
+    """Whose budget a request is charged to: X-User-Email, else the client IP."""
+    user_email = request.headers.get("x-user-email")
+    if user_email:
+        return f"user:{user_email}"
+    forwarded = request.headers.get("x-forwarded-for")
+    if forwarded:
+        return f"ip:{forwarded.split(',')[0].strip()}"
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+
+class TokenBudget:
+    """Per-user and global token buckets."""
+
+    def __init__(
+        self,
+        redis_client: Any = None,
+        user_tokens: int | None = None,
+        global_tokens: int | None = None,
+        window_seconds: float | None = None,
+    ):
+        """
+        Args:
+            redis_client: redis.Redis client (None for in-memory buckets only)
+            user_tokens: Tokens per user per window (default from settings)
+            global_tokens: Tokens across all users per window (default from settings)
+            window_seconds: Window over which budgets refill (default from settings)
+        """
+        self.user_tokens = user_tokens or settings.claude_tokens_per_user
+        self.global_tokens = global_tokens or settings.claude_tokens_global
+        self.window_seconds = window_seconds or settings.claude_token_budget_window_seconds
+        self._redis = RedisGCRA(redis_client, max_lease=0) if redis_client else None
+        self._local = LocalGCRA()
+
+    def charge(self, key: str, tokens: int) -> None:
+        """
+        Charge tokens to a user's budget and the global budget.
+
+        A charge larger than a whole budget is capped at the budget, so a huge call
+        can still be analyzed once the bucket is full.
+
+        Raises:
+            TokenBudgetExceeded: If either budget can't cover the charge (nothing is charged)
+        """
+        if tokens <= 0:
+            return
+
+        user = self._check(key, self.user_tokens, tokens)
+        if not user.allowed:
+            logger.warning(f"Token budget exceeded for {key}: {tokens} tokens")
+            raise TokenBudgetExceeded(key, tokens, _retry_seconds(user))
+
+        total = self._check(GLOBAL_KEY, self.global_tokens, tokens)
+        if not total.allowed:
+            self._refund(key, self.user_tokens, tokens)
+            logger.warning(f"Global token budget exceeded: {tokens} tokens for {key}")
+            raise TokenBudgetExceeded(GLOBAL_KEY, tokens, _retry_seconds(total))
+
+    def refund(self, key: str, tokens: int) -> None:
+        """Give back tokens charged for analyses that never ran to completion."""
+        if tokens <= 0:
+            return
+        self._refund(key, self.user_tokens, tokens)
+        self._refund(GLOBAL_KEY, self.global_tokens, tokens)
+
+    def _check(self, key: str, limit: int, tokens: int) -> RateLimitResult:
+        cost = min(tokens, limit)
+        if self._redis is not None:
+            try:
+                return self._redis.check(
+                    f"token_budget:{key}", limit, self.window_seconds, cost=cost
+                )
+            except Exception as e:
+                logger.warning(f"Redis token budget check failed, using local: {e}")
+        return self._local.check(key, limit, self.window_seconds, cost=cost)
+
+    def _refund(self, key: str, limit: int, tokens: int) -> None:
+        cost = min(tokens, limit)
+        if self._redis is not None:
+            try:
+                self._redis.refund(f"token_budget:{key}", limit, self.window_seconds, cost=cost)
+                return
+            except Exception as e:
+                logger.warning(f"Redis token budget refund failed, using local: {e}")
+        self._local.refund(key, limit, self.window_seconds, cost=cost)
+
+
+def _retry_seconds(result: RateLimitResult) -> int:
+    return max(math.ceil(result.retry_after), 1)
+
+
+class AnalysisCharge:
+    """
+    Charges one call analysis to a budget.
+
+    Pass as analyze_call_tool's before_analysis hook (or call directly with the
+    dimensions that will be analyzed), then settle() with the per-dimension results,
+    or cancel() if the analysis raised before producing any.
+    """
+
+    def __init__(self, budget: TokenBudget, key: str, unified_pass: bool = True):
+        """
+        Args:
+            budget: Budget to charge
+            key: Whose budget (see budget_key)
+            unified_pass: Also charge the Five Wins unified pass, which runs uncached on
+                every analyze_call when settings.use_five_wins_unified is on
+        """
+        self.budget = budget
+        self.key = key
+        self.unified_pass = unified_pass
+        self.dimensions: list[str] = []
+        self.dimension_tokens = 0
+        self.tokens = 0
+        self.settled = False
+
+    def __call__(self, context: CallAnalysisContext, dimensions: list[str]) -> None:
+        """Charge the predicted cost of analyzing dimensions (cache misses) of a call."""
+        self.dimension_tokens = estimate_analysis_tokens(context.transcript)
+        passes = len(dimensions)
+        if self.unified_pass and settings.use_five_wins_unified:
+            passes += 1
+        self.budget.charge(self.key, self.dimension_tokens * passes)
+        self.dimensions = list(dimensions)
+        self.tokens = self.dimension_tokens * passes
+
+    def settle(self, results: dict[str, dict[str, Any]]) -> None:
+        """Refund the dimensions whose analysis failed."""
+        failed = [d for d in self.dimensions if (results.get(d) or {}).get("error")]
+        if failed:
+            refund = self.dimension_tokens * len(failed)
+            self.budget.refund(self.key, refund)
+            self.tokens -= refund
+        self.settled = True
+
+    def cancel(self) -> None:
+        """Refund the whole charge unless already settled (the analysis raised)."""
+        if self.settled or not self.tokens:
+            return
+        self.budget.refund(self.key, self.tokens)
+        self.tokens = 0
+        self.settled = True
+
+
+_token_budget: TokenBudget | None = None
+
+
+def get_token_budget() -> TokenBudget:
+    """Get the process-wide token budget (Redis-backed when Redis is available)."""
+    global _token_budget
+    if _token_budget is None:
+        from cache.redis_client import get_redis_cache
+
+        redis_cache = get_redis_cache()
+        _token_budget = TokenBudget(redis_cache._client if redis_cache.available else None)
+    return _token_budget
+
+
+def analysis_charge(request: Request) -> AnalysisCharge | None:
+    """Charge for a request's analyze_call, or None when budgets are disabled."""
+    if not settings.claude_token_budget_enabled:
+        return None
+    return AnalysisCharge(get_token_budget(), budget_key(request))
@@ -9,6 +9,7 @@ Version 1 of the Call Coaching API with:
 
 from fastapi import APIRouter
 
+from .analyses import router as analyses_router
 from .calls import router as calls_router
 from .opportunities import router as opportunities_router
 from .rubrics import router as rubrics_router
@@ -30,5 +31,6 @@ router.include_router(opportunities_router)
 router.include_router(speakers_router)
 router.include_router(rubrics_router)
 router.include_router(sync_router)
+router.include_router(analyses_router)
 
 __all__ = ["router"]
@@ -0,0 +1,139 @@
+"""
+Batch analysis endpoints.
+
+Analyze many calls in one request (e.g. every call in a quarter for a QBR):
+- POST /analyses:batch                      start a job, returns its handle (202)
+- GET  /analyses/batches/{job_id}           progress and results so far (poll)
+- GET  /analyses/batches/{job_id}/events    progress as Server-Sent Events
+- GET  /analyses/batches/{job_id}/results   all results as NDJSON once finished
+
+See api.batch for how jobs reuse cached sessions and bound their concurrency.
+"""
+
+from collections.abc import Iterator
+from typing import Any
+
+from fastapi import APIRouter, HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+
+from api.batch import BatchJob, get_batch_job, job_events, submit_batch
+from api.responses import FastJSONResponse, PreSerialized
+from api.streaming import SSE_HEADERS
+from api.token_budget import budget_key
+from coaching_mcp.shared import settings
+from db.models import CoachingDimension
+
+router = APIRouter(tags=["analyses"])
+
+
+class BatchAnalysisRequest(BaseModel):
+    """Request body for a batch analysis job."""
+
+    call_ids: list[str] = Field(..., min_length=1, description="Gong call IDs to analyze")
+    dimensions: list[str] | None = Field(None, description="Dimensions to analyze per call")
+    force_reanalysis: bool = Field(False, description="Ignore cached sessions")
+
+
+def _job_links(job: BatchJob) -> dict[str, str]:
+    base = f"/api/v1/analyses/batches/{job.id}"
+    return {"self": base, "events": f"{base}/events", "results": f"{base}/results"}
+
+
+def _get_job(job_id: str) -> BatchJob:
+    job = get_batch_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Batch job {job_id} not found")
+    return job
+
+
+@router.post("/analyses:batch", status_code=status.HTTP_202_ACCEPTED)
+async def create_batch_analysis(
+    request: BatchAnalysisRequest, response: Response, http_request: Request
+) -> dict[str, Any]:
+    """
+    Start analyzing many calls.
+
+    Cached sessions are reused; only missing dimensions are sent to Claude, charged
+    to the caller's token budget (the job waits while it's exhausted). Returns the
+    job handle immediately; follow the links for progress and results.
+    """
+    if len(request.call_ids) > settings.batch_max_calls:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.batch_max_calls} calls per batch "
+            f"(got {len(request.call_ids)})",
+        )
+    if request.dimensions is not None:
+        valid_dimensions = {d.value for d in CoachingDimension}
+        invalid = [d for d in request.dimensions if d not in valid_dimensions]
+        if invalid:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid dimensions: {invalid}. Valid options: {sorted(valid_dimensions)}",
+            )
+
+    job = submit_batch(
+        request.call_ids,
+        request.dimensions,
+        request.force_reanalysis,
+        budget_key(http_request) if settings.claude_token_budget_enabled else None,
+    )
+    links = _job_links(job)
+    response.headers["Location"] = links["self"]
+    return {**job.summary(), "links": links}
+
+
+@router.get("/analyses/batches/{job_id}", response_class=FastJSONResponse)
+async def get_batch_analysis(job_id: str, offset: int = 0) -> FastJSONResponse:
+    """
+    Get a batch job's progress and the results of its finished calls.
+
+    Query Parameters:
+        offset: Skip the first results (pass the number already received to poll
+            for new ones only)
+    """
+    job = _get_job(job_id)
+    return FastJSONResponse(
+        {
+            **job.summary(),
+            "links": _job_links(job),
+            "offset": offset,
+            # Serialized once when recorded, not on every poll
+            "results": [PreSerialized(r) for r in job.results_json[max(offset, 0) :]],
+        }
+    )
+
+
+@router.get("/analyses/batches/{job_id}/events")
+async def stream_batch_analysis(job_id: str) -> StreamingResponse:
+    """
+    Stream a batch job's progress as Server-Sent Events.
+
+    Sends a "call" event per finished call (earlier ones first, on connect) and a
+    final "done" event with the job summary.
+    """
+    job = _get_job(job_id)
+    return StreamingResponse(job_events(job), media_type="text/event-stream", headers=SSE_HEADERS)
+
+
+@router.get("/analyses/batches/{job_id}/results")
+async def download_batch_results(job_id: str) -> StreamingResponse:
+    """Download a finished job's results as NDJSON, one call per line."""
+    job = _get_job(job_id)
+    if not job.finished:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Batch job {job_id} is {job.status} "
+            f"({len(job.results)}/{len(job.call_ids)} calls)",
+        )
+
+    def lines() -> Iterator[bytes]:
+        for result in job.results_json:
+            yield result + b"\n"
+
+    return StreamingResponse(
+        lines(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="batch-{job_id}.ndjson"'},
+    )
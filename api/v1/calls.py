@@ -9,19 +9,27 @@ Provides endpoints to retrieve calls filtered by user role:
 
 from typing import Any
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, Response
 
 from api.middleware.rbac import get_current_user
-from db import queries
+from api.responses import FastJSONResponse, json_response
+from db import async_queries
+from db.pagination import InvalidCursorError
+from db.queries import CALLS_KEYSET
 
 router = APIRouter(prefix="/calls", tags=["calls"])
 
 
-@router.get("")
+@router.get("", response_class=FastJSONResponse)
 async def get_calls(
+    response: Response,
     limit: int = 50,
+    cursor: str | None = None,
+    min_score: float | None = None,
+    max_score: float | None = None,
+    evaluated_role: str | None = None,
     user: dict[str, Any] = Depends(get_current_user),
-) -> list[dict[str, Any]]:
+) -> FastJSONResponse:
     """
     Get calls filtered by user role.
 
@@ -35,24 +43,36 @@ async def get_calls(
 
     Query Parameters:
         limit: Maximum number of calls to return (default: 50, max: 200)
+        cursor: X-Next-Cursor header value from the previous page
+        min_score: Minimum overall score
+        max_score: Maximum overall score
+        evaluated_role: Only calls evaluated against this rubric role (ae, se, csm)
 
     Returns:
-        List of call objects with metadata
+        List of call objects with metadata, overall and per-dimension scores and
+        participant names. When more calls remain, the X-Next-Cursor response header
+        holds the cursor for the next page.
     """
     # Enforce max limit
     limit = min(limit, 200)
 
-    # Get calls filtered by role
-    calls = queries.get_calls_for_user(user["email"], user["role"], limit)
-
-    # Convert UUIDs to strings and timestamps to ISO format
-    return [
-        {
-            **call,
-            "id": str(call["id"]),
-            "scheduled_at": call["scheduled_at"].isoformat() if call.get("scheduled_at") else None,
-            "created_at": call["created_at"].isoformat() if call.get("created_at") else None,
-            "updated_at": call["updated_at"].isoformat() if call.get("updated_at") else None,
-        }
-        for call in calls
-    ]
+    # Get calls filtered by role, one extra to detect the next page
+    try:
+        rows = await async_queries.get_calls_for_user(
+            user["email"],
+            user["role"],
+            limit + 1,
+            cursor=cursor,
+            min_score=min_score,
+            max_score=max_score,
+            evaluated_role=evaluated_role,
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    calls, next_cursor = CALLS_KEYSET.paginate(rows, limit)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+
+    # Rows go out as they are: orjson writes UUIDs and timestamps (ISO 8601) itself
+    return json_response(calls, response)
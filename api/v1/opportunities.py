@@ -10,15 +10,27 @@ Provides REST API access to opportunity data including:
 import logging
 from typing import Any, Literal
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, HTTPException, Query, Request, Response
 from pydantic import BaseModel, Field
 
-from db import queries
+from api.dependencies.conditional import conditional_get, make_etag
+from db import async_queries
+from db.pagination import InvalidCursorError
+from db.queries import OPPORTUNITY_TIMELINE_KEYSET, opportunity_keyset
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/opportunities", tags=["opportunities"])
 
+# Maps the public sort options to (column, direction) for search_opportunities
+SORT_OPTIONS: dict[str, tuple[str, str]] = {
+    "updated_desc": ("updated_at", "DESC"),
+    "activity_desc": ("last_activity_at", "DESC"),
+    "close_date_asc": ("close_date", "ASC"),
+    "amount_desc": ("amount", "DESC"),
+    "name_asc": ("name", "ASC"),
+}
+
 
 # ============================================================================
 # REQUEST/RESPONSE MODELS
@@ -29,10 +41,16 @@ class OpportunityListResponse(BaseModel):
     """Response model for opportunity list endpoint."""
 
     opportunities: list[dict[str, Any]] = Field(description="List of opportunities")
-    total: int = Field(description="Total count of opportunities matching filters")
+    total: int | None = Field(
+        description="Count of opportunities matching filters (approximate for count=estimate, "
+        "null for count=none)"
+    )
     page: int = Field(description="Current page number (1-indexed)")
     page_size: int = Field(description="Number of items per page")
     has_more: bool = Field(description="Whether there are more pages available")
+    next_cursor: str | None = Field(
+        default=None, description="Pass as cursor to fetch the next page (null on the last page)"
+    )
 
 
 class OpportunityDetailResponse(BaseModel):
@@ -40,6 +58,10 @@ class OpportunityDetailResponse(BaseModel):
 
     opportunity: dict[str, Any] = Field(description="Opportunity details")
     timeline: list[dict[str, Any]] = Field(description="Timeline of calls and emails", default=[])
+    timeline_next_cursor: str | None = Field(
+        default=None,
+        description="Pass as timeline_cursor to fetch more timeline items (null when exhausted)",
+    )
 
 
 # ============================================================================
@@ -58,11 +80,17 @@ async def list_opportunities(
         None, description="Maximum health score (0.0-10.0)", ge=0.0, le=10.0
     ),
     search: str | None = Query(None, description="Search in opportunity name and account name"),
-    sort: Literal["updated_desc", "close_date_asc", "amount_desc", "name_asc"] = Query(
-        "updated_desc", description="Sort order"
-    ),
+    sort: Literal[
+        "updated_desc", "activity_desc", "close_date_asc", "amount_desc", "name_asc"
+    ] = Query("updated_desc", description="Sort order"),
     page: int = Query(1, description="Page number (1-indexed)", ge=1),
     page_size: int = Query(20, description="Items per page", ge=1, le=100),
+    cursor: str | None = Query(
+        None, description="next_cursor from the previous page; takes precedence over page"
+    ),
+    count: Literal["exact", "estimate", "none"] = Query(
+        "exact", description="How to compute total: exact COUNT, planner estimate, or skip"
+    ),
 ) -> OpportunityListResponse:
     """
     List opportunities with optional filters and pagination.
@@ -75,17 +103,20 @@ async def list_opportunities(
 
     Supports sorting by:
     - updated_desc: Most recently updated first (default)
+    - activity_desc: Most recent call or email first
     - close_date_asc: Soonest closing date first
     - amount_desc: Highest value first
     - name_asc: Alphabetical by name
 
     Returns paginated results with total count and pagination metadata.
+    Follow next_cursor for deep paging: it seeks directly to the next page,
+    so later pages cost the same as the first, unlike page numbers.
     """
     try:
         # Build filters dict
         filters: dict[str, Any] = {}
         if owner_email:
-            filters["owner_email"] = owner_email
+            filters["owner"] = owner_email
         if stage:
             filters["stage"] = stage
         if health_score_min is not None:
@@ -95,26 +126,35 @@ async def list_opportunities(
         if search:
             filters["search"] = search
 
-        # Calculate offset from page number
-        offset = (page - 1) * page_size
-
-        # Query database
-        result = queries.search_opportunities(
-            filters=filters, sort=sort, limit=page_size, offset=offset
+        # Calculate offset from page number (cursor pages seek instead)
+        offset = 0 if cursor else (page - 1) * page_size
+
+        # Query database, fetching one extra row to detect the next page
+        sort_column, sort_dir = SORT_OPTIONS[sort]
+        rows, total = await async_queries.search_opportunities(
+            filters=filters,
+            sort=sort_column,
+            sort_dir=sort_dir,
+            limit=page_size + 1,
+            offset=offset,
+            cursor=cursor,
+            count=count,
+        )
+        opportunities, next_cursor = opportunity_keyset(sort_column, sort_dir).paginate(
+            rows, page_size
         )
-
-        # Calculate pagination metadata
-        total = result["total"]  # type: ignore[call-overload,index]
-        has_more = offset + page_size < total
 
         return OpportunityListResponse(
-            opportunities=result["opportunities"],  # type: ignore[call-overload,index]
+            opportunities=opportunities,
             total=total,
             page=page,
             page_size=page_size,
-            has_more=has_more,
+            has_more=next_cursor is not None,
+            next_cursor=next_cursor,
         )
 
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
     except Exception as e:
         logger.error(f"Error listing opportunities: {e}", exc_info=True)
         raise HTTPException(
@@ -125,10 +165,15 @@ async def list_opportunities(
 
 @router.get("/{opportunity_id}", response_model=OpportunityDetailResponse)
 async def get_opportunity_detail(
+    request: Request,
+    response: Response,
     opportunity_id: str,
     timeline_limit: int = Query(50, description="Number of timeline items to return", ge=1, le=200),
     timeline_offset: int = Query(0, description="Timeline pagination offset", ge=0),
-) -> OpportunityDetailResponse:
+    timeline_cursor: str | None = Query(
+        None, description="timeline_next_cursor from a previous response; replaces the offset"
+    ),
+) -> OpportunityDetailResponse | Response:
     """
     Get detailed information about a specific opportunity.
 
@@ -140,10 +185,15 @@ async def get_opportunity_detail(
     Timeline items are sorted chronologically (newest first) and include:
     - Calls: title, date, participants, coaching scores
     - Emails: subject, sender, recipients, sent date, body snippet
+
+    The ETag comes from the opportunity row (updated_at plus the trigger-maintained
+    call/email counters and last_activity_at) and a hash of the linked calls' and
+    emails' timeline fields, so a matching If-None-Match returns 304 without
+    querying the timeline.
     """
     try:
         # Get opportunity details
-        opportunity = queries.get_opportunity(opportunity_id)
+        opportunity = await async_queries.get_opportunity(opportunity_id)
 
         if not opportunity:
             raise HTTPException(
@@ -151,17 +201,40 @@ async def get_opportunity_detail(
                 detail=f"Opportunity not found: {opportunity_id}",
             )
 
-        # Get timeline items
-        timeline_result = queries.get_opportunity_timeline(
-            opp_id=opportunity_id, limit=timeline_limit, offset=timeline_offset
+        timeline_version = await async_queries.get_opportunity_timeline_version(opportunity_id)
+        etag = make_etag(
+            "opportunity",
+            opportunity_id,
+            opportunity.get("updated_at"),
+            opportunity.get("call_count"),
+            opportunity.get("email_count"),
+            opportunity.get("last_activity_at"),
+            *(timeline_version or {}).values(),
+            timeline_limit,
+            timeline_offset,
+            timeline_cursor,
+        )
+        not_modified = conditional_get(request, response, etag)
+        if not_modified:
+            return not_modified
+
+        # Get timeline items, one extra to detect whether more remain
+        rows = await async_queries.get_opportunity_timeline(
+            opp_id=opportunity_id,
+            limit=timeline_limit + 1,
+            offset=0 if timeline_cursor else timeline_offset,
+            cursor=timeline_cursor,
         )
+        timeline, next_cursor = OPPORTUNITY_TIMELINE_KEYSET.paginate(rows, timeline_limit)
 
         return OpportunityDetailResponse(
-            opportunity=opportunity, timeline=timeline_result["items"]  # type: ignore[call-overload,index]
+            opportunity=opportunity, timeline=timeline, timeline_next_cursor=next_cursor
         )
 
     except HTTPException:
         raise
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
     except Exception as e:
         logger.error(f"Error fetching opportunity {opportunity_id}: {e}", exc_info=True)
         raise HTTPException(
@@ -7,16 +7,19 @@ Provides endpoints for managers to view and edit rubric criteria:
 - PUT /rubrics/criteria/{criterion_id}: Update a criterion
 - POST /rubrics/criteria: Create new criterion
 - DELETE /rubrics/criteria/{criterion_id}: Delete a criterion
+
+GET endpoints send an ETag and answer If-None-Match with 304.
 """
 
 from typing import Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from pydantic import BaseModel, Field
 
+from api.dependencies.conditional import conditional_get, make_etag
 from api.middleware.rbac import get_current_user
-from db import queries
+from db import async_queries, queries
 
 router = APIRouter(prefix="/rubrics", tags=["rubrics"])
 
@@ -50,12 +53,14 @@ class CreateCriterionRequest(BaseModel):
 
 
 # Endpoints
-@router.get("/{role}/{dimension}")
+@router.get("/{role}/{dimension}", response_model=None)
 async def get_criteria_for_dimension(
     role: str,
     dimension: str,
+    request: Request,
+    response: Response,
     user: dict[str, Any] = Depends(get_current_user),
-) -> list[dict[str, Any]]:
+) -> list[dict[str, Any]] | Response:
     """
     Get rubric criteria for a specific role-dimension combination.
 
@@ -70,7 +75,8 @@ async def get_criteria_for_dimension(
                    objection_handling, five_wins)
 
     Returns:
-        List of criteria ordered by display_order
+        List of criteria ordered by display_order, or 304 when If-None-Match
+        matches the current ETag
 
     Raises:
         HTTPException: 403 if user is not a manager or admin
@@ -79,7 +85,13 @@ async def get_criteria_for_dimension(
         raise HTTPException(status_code=403, detail="Managers and admins only")
 
     try:
-        criteria = queries.get_rubric_criteria(role, dimension)
+        version = await async_queries.get_rubric_criteria_version(role, dimension)
+        not_modified = conditional_get(
+            request, response, make_etag("rubric_criteria", role, dimension, version)
+        )
+        if not_modified:
+            return not_modified
+        criteria = await async_queries.get_rubric_criteria(role, dimension)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Invalid role or dimension: {e}")
 
@@ -99,11 +111,13 @@ async def get_criteria_for_dimension(
     ]
 
 
-@router.get("/{role}")
+@router.get("/{role}", response_model=None)
 async def get_criteria_for_role(
     role: str,
+    request: Request,
+    response: Response,
     user: dict[str, Any] = Depends(get_current_user),
-) -> list[dict[str, Any]]:
+) -> list[dict[str, Any]] | Response:
     """
     Get all rubric criteria for a specific role across all dimensions.
 
@@ -116,7 +130,8 @@ async def get_criteria_for_role(
         role: Speaker role (ae, se, csm, support)
 
     Returns:
-        List of criteria ordered by dimension and display_order
+        List of criteria ordered by dimension and display_order, or 304 when
+        If-None-Match matches the current ETag
 
     Raises:
         HTTPException: 403 if user is not a manager or admin
@@ -125,7 +140,13 @@ async def get_criteria_for_role(
         raise HTTPException(status_code=403, detail="Managers and admins only")
 
     try:
-        criteria = queries.get_rubric_criteria(role)
+        version = await async_queries.get_rubric_criteria_version(role)
+        not_modified = conditional_get(
+            request, response, make_etag("rubric_criteria", role, None, version)
+        )
+        if not_modified:
+            return not_modified
+        criteria = await async_queries.get_rubric_criteria(role)
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Invalid role: {e}")
 
@@ -11,11 +11,12 @@ Provides endpoints for managers to view and update speaker roles:
 from typing import Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from pydantic import BaseModel, Field
 
+from api.dependencies.conditional import conditional_get, make_etag
 from api.middleware.rbac import get_current_user
-from db import queries
+from db import async_queries, queries
 
 router = APIRouter(prefix="/speakers", tags=["speakers"])
 
@@ -38,13 +39,15 @@ class BulkUpdateRequest(BaseModel):
 
 
 # Endpoints
-@router.get("/")
+@router.get("/", response_model=None)
 async def list_speakers(
+    request: Request,
+    response: Response,
     company_side_only: bool = True,
     role: str | None = None,
     include_unassigned: bool = True,
     user: dict[str, Any] = Depends(get_current_user),
-) -> list[dict[str, Any]]:
+) -> list[dict[str, Any]] | Response:
     """
     List all speakers with optional filtering.
 
@@ -59,7 +62,8 @@ async def list_speakers(
         include_unassigned: If false, exclude speakers with no role (default: true)
 
     Returns:
-        List of unique speakers (one per email) with aggregated call stats
+        List of unique speakers (one per email) with aggregated call stats, or 304
+        when If-None-Match matches the current ETag
 
     Raises:
         HTTPException: 403 if user is not a manager or admin
@@ -67,7 +71,13 @@ async def list_speakers(
     if user["role"] not in ["manager", "admin"]:
         raise HTTPException(status_code=403, detail="Managers and admins only")
 
-    speakers = queries.get_all_speakers(
+    version = await async_queries.get_speakers_version()
+    etag = make_etag("speakers", company_side_only, role, include_unassigned, version)
+    not_modified = conditional_get(request, response, etag)
+    if not_modified:
+        return not_modified
+
+    speakers = await async_queries.get_all_speakers(
         company_side_only=company_side_only,
         role_filter=role,
         include_unassigned=include_unassigned,
@@ -117,7 +127,7 @@ async def get_speaker(
     if user["role"] not in ["manager", "admin"]:
         raise HTTPException(status_code=403, detail="Managers and admins only")
 
-    speaker = queries.get_speaker_role(speaker_id)
+    speaker = await async_queries.get_speaker_role(speaker_id)
 
     if not speaker:
         raise HTTPException(status_code=404, detail="Speaker not found")
@@ -215,7 +225,7 @@ async def get_speaker_history(
     if user["role"] not in ["manager", "admin"]:
         raise HTTPException(status_code=403, detail="Managers and admins only")
 
-    history = queries.get_speaker_role_history(speaker_id, limit=limit)
+    history = await async_queries.get_speaker_role_history(speaker_id, limit=limit)
 
     # Convert UUIDs and timestamps to strings
     return [
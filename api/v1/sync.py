@@ -10,8 +10,6 @@ from typing import Any
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
-from scripts.sync_bigquery_data import sync_bigquery_data
-
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/sync", tags=["sync"])
@@ -51,6 +49,10 @@ async def trigger_bigquery_sync(request: SyncRequest) -> dict[str, Any]:
     )
 
     try:
+        # Imported here: the BigQuery client and pandas take longer to load than the
+        # rest of the API combined
+        from scripts.sync_bigquery_data import sync_bigquery_data
+
         result = sync_bigquery_data(
             sync_opportunities_flag=request.sync_opportunities,
             sync_calls_flag=request.sync_calls,
@@ -70,11 +72,11 @@ async def trigger_bigquery_sync(request: SyncRequest) -> dict[str, Any]:
 @router.get("/status")
 async def get_sync_status() -> dict[str, Any]:
     """Get the last sync status for all entity types."""
-    from db import queries
+    from db import async_queries
 
     try:
-        opportunities_status = queries.get_sync_status("opportunities")
-        calls_status = queries.get_sync_status("calls")
+        opportunities_status = await async_queries.get_sync_status("opportunities")
+        calls_status = await async_queries.get_sync_status("calls")
 
         return {
             "opportunities": opportunities_status,
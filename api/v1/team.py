@@ -11,7 +11,8 @@ from typing import Any
 from fastapi import APIRouter, Depends, HTTPException
 
 from api.middleware.rbac import get_current_user
-from db import queries
+from api.responses import FastJSONResponse
+from db import async_queries
 
 router = APIRouter(prefix="/team", tags=["team"])
 
@@ -38,7 +39,7 @@ async def get_team_reps(
         raise HTTPException(status_code=403, detail="Managers and admins only")
 
     # Get managed reps
-    reps = queries.get_managed_reps(user["email"])
+    reps = await async_queries.get_managed_reps(user["email"])
 
     return [
         {
@@ -51,11 +52,14 @@ async def get_team_reps(
     ]
 
 
-@router.get("/calls")
+@router.get("/calls", response_class=FastJSONResponse)
 async def get_team_calls(
     limit: int = 50,
+    min_score: float | None = None,
+    max_score: float | None = None,
+    evaluated_role: str | None = None,
     user: dict[str, Any] = Depends(get_current_user),
-) -> list[dict[str, Any]]:
+) -> FastJSONResponse:
     """
     Get all calls from managed reps.
 
@@ -67,9 +71,12 @@ async def get_team_calls(
 
     Query Parameters:
         limit: Maximum number of calls to return (default: 50)
+        min_score: Minimum overall score
+        max_score: Maximum overall score
+        evaluated_role: Only calls evaluated against this rubric role (ae, se, csm)
 
     Returns:
-        List of call objects
+        List of call objects with scores and participant names
 
     Raises:
         HTTPException: 403 if user is not a manager or admin
@@ -78,13 +85,13 @@ async def get_team_calls(
         raise HTTPException(status_code=403, detail="Managers and admins only")
 
     # Get calls filtered by role
-    calls = queries.get_calls_for_user(user["email"], user["role"], limit)
-
-    # Convert UUIDs to strings for JSON serialization
-    return [
-        {
-            **call,
-            "id": str(call["id"]),
-        }
-        for call in calls
-    ]
+    calls = await async_queries.get_calls_for_user(
+        user["email"],
+        user["role"],
+        limit,
+        min_score=min_score,
+        max_score=max_score,
+        evaluated_role=evaluated_role,
+    )
+
+    return FastJSONResponse(calls)
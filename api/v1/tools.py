@@ -10,7 +10,7 @@ These endpoints provide stable interfaces to MCP tools with:
 import logging
 from typing import Any
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from pydantic import BaseModel, Field
 
 from analysis.learning_insights import get_learning_insights
@@ -21,12 +21,15 @@ from analysis.opportunity_coaching import (
     generate_coaching_recommendations,
     identify_recurring_themes,
 )
+from api.executors import run_analysis, run_read
+from api.responses import FastJSONResponse
+from api.token_budget import analysis_charge
 
 # Import MCP tool implementations
 from coaching_mcp.tools.analyze_call import analyze_call_tool
 from coaching_mcp.tools.get_rep_insights import get_rep_insights_tool
 from coaching_mcp.tools.search_calls import search_calls_tool
-from db import queries
+from db import async_queries
 
 logger = logging.getLogger(__name__)
 
@@ -99,29 +102,43 @@ class PaginatedResponse(BaseModel):
 # ============================================================================
 
 
-@router.post("/analyze_call", response_model=dict[str, Any])
-async def analyze_call_v1(request: AnalyzeCallRequestV1) -> dict[str, Any]:
+@router.post("/analyze_call", response_class=FastJSONResponse)
+async def analyze_call_v1(request: AnalyzeCallRequestV1, http_request: Request) -> FastJSONResponse:
     """
     Analyze a specific call with coaching insights (v1).
 
     Returns comprehensive coaching analysis with scores, strengths,
-    areas for improvement, and actionable recommendations.
+    areas for improvement, and actionable recommendations. Uncached
+    dimensions are charged to the caller's Claude token budget.
     """
+    charge = analysis_charge(http_request)
     try:
-        result = analyze_call_tool(
+        result = await run_analysis(
+            analyze_call_tool,
             call_id=request.call_id,
             dimensions=request.dimensions,
             use_cache=request.use_cache,
             include_transcript_snippets=request.include_transcript_snippets,
             force_reanalysis=request.force_reanalysis,
+            before_analysis=charge,
         )
-        return {
-            "api_version": "v1",
-            "data": result,
-        }
+        if charge:
+            charge.settle(result.get("dimension_details") or {})
+        return FastJSONResponse(
+            {
+                "api_version": "v1",
+                "data": result,
+            }
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error analyzing call {request.call_id}: {e}")
         raise HTTPException(status_code=500, detail=str(e))
+    finally:
+        # Refund the estimate if the analysis raised before it could be settled
+        if charge:
+            charge.cancel()
 
 
 @router.post("/get_rep_insights", response_model=dict[str, Any])
@@ -132,7 +149,8 @@ async def get_rep_insights_v1(request: RepInsightsRequestV1) -> dict[str, Any]:
     Returns score trends, skill gaps, improvement areas, and coaching plan.
     """
     try:
-        result = get_rep_insights_tool(
+        result = await run_read(
+            get_rep_insights_tool,
             rep_email=request.rep_email,
             time_period=request.time_period,
             product_filter=request.product_filter,
@@ -141,20 +159,23 @@ async def get_rep_insights_v1(request: RepInsightsRequestV1) -> dict[str, Any]:
             "api_version": "v1",
             "data": result,
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting insights for {request.rep_email}: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.post("/search_calls", response_model=dict[str, Any])
-async def search_calls_v1(request: SearchCallsRequestV1) -> dict[str, Any]:
+@router.post("/search_calls", response_class=FastJSONResponse)
+async def search_calls_v1(request: SearchCallsRequestV1) -> FastJSONResponse:
     """
     Search for calls matching specific criteria (v1).
 
     Returns paginated list of calls with metadata and scores.
     """
     try:
-        result = search_calls_tool(
+        result = await run_read(
+            search_calls_tool,
             rep_email=request.rep_email,
             product=request.product,
             call_type=request.call_type,
@@ -167,16 +188,20 @@ async def search_calls_v1(request: SearchCallsRequestV1) -> dict[str, Any]:
         )
 
         # Add pagination metadata
-        return {
-            "api_version": "v1",
-            "data": {
-                "items": result,
-                "total": len(result),
-                "page": request.offset // request.limit if request.limit > 0 else 0,
-                "page_size": request.limit,
-                "has_next": len(result) == request.limit,
-            },
-        }
+        return FastJSONResponse(
+            {
+                "api_version": "v1",
+                "data": {
+                    "items": result,
+                    "total": len(result),
+                    "page": request.offset // request.limit if request.limit > 0 else 0,
+                    "page_size": request.limit,
+                    "has_next": len(result) == request.limit,
+                },
+            }
+        )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error searching calls: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -193,16 +218,16 @@ async def analyze_opportunity_v1(request: AnalyzeOpportunityRequestV1) -> dict[s
         opportunity_id = request.opportunity_id
 
         # Verify opportunity exists
-        opp = queries.get_opportunity(opportunity_id)
+        opp = await async_queries.get_opportunity(opportunity_id)
         if not opp:
             raise HTTPException(status_code=404, detail=f"Opportunity not found: {opportunity_id}")
 
         # Run all analyses
-        patterns = analyze_opportunity_patterns(opportunity_id)
-        themes = identify_recurring_themes(opportunity_id)
-        objections = analyze_objection_progression(opportunity_id)
-        relationship = assess_relationship_strength(opportunity_id)
-        recommendations = generate_coaching_recommendations(opportunity_id)
+        patterns = await run_analysis(analyze_opportunity_patterns, opportunity_id)
+        themes = await run_analysis(identify_recurring_themes, opportunity_id)
+        objections = await run_analysis(analyze_objection_progression, opportunity_id)
+        relationship = await run_analysis(assess_relationship_strength, opportunity_id)
+        recommendations = await run_analysis(generate_coaching_recommendations, opportunity_id)
 
         return {
             "api_version": "v1",
@@ -237,7 +262,8 @@ async def get_learning_insights_v1(request: LearningInsightsRequestV1) -> dict[s
     Returns behavioral differences with concrete examples from successful calls.
     """
     try:
-        result = get_learning_insights(
+        result = await run_analysis(
+            get_learning_insights,
             rep_email=request.rep_email,
             focus_area=request.focus_area,
         )
@@ -245,6 +271,8 @@ async def get_learning_insights_v1(request: LearningInsightsRequestV1) -> dict[s
             "api_version": "v1",
             "data": result,
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting learning insights for {request.rep_email}: {e}")
         raise HTTPException(status_code=500, detail=str(e))
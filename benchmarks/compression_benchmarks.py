@@ -0,0 +1,147 @@
+"""
+Response Compression Benchmarks
+
+Compares the streaming CompressionMiddleware against the previous buffered
+implementation (collect the whole body, then gzip it) on:
+- Peak memory while compressing a large streamed payload
+- Time to first byte and total latency
+- Compressed size per negotiated encoding
+"""
+
+import asyncio
+import gzip
+import time
+import tracemalloc
+
+import pytest
+from starlette.types import Message
+
+from api.middleware.compression import (
+    CompressionMiddleware,
+    available_encodings,
+)
+
+CHUNK = (
+    b'{"speaker": "rep@example.com", "timestamp": 1234, '
+    b'"text": "Walk me through how your team handles deployment failures today."}\n'
+) * 64
+CHUNK_COUNT = 2048  # ~10MB, a large transcript/feed export
+
+
+def streaming_app(chunk_count: int = CHUNK_COUNT):
+    """ASGI app streaming NDJSON chunks, like a transcript export."""
+
+    async def app(scope, receive, send):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"application/x-ndjson")],
+            }
+        )
+        for i in range(chunk_count):
+            await send(
+                {"type": "http.response.body", "body": CHUNK, "more_body": i < chunk_count - 1}
+            )
+
+    return app
+
+
+class BufferedGzipMiddleware:
+    """The previous behaviour: buffer the full body, then gzip it in one go."""
+
+    def __init__(self, app, compression_level: int = 6):
+        self.app = app
+        self.compression_level = compression_level
+
+    async def __call__(self, scope, receive, send):
+        start: Message = {}
+        body = b""
+
+        async def collect(message: Message) -> None:
+            nonlocal start, body
+            if message["type"] == "http.response.start":
+                start = message
+            else:
+                body += message.get("body", b"")
+
+        await self.app(scope, receive, collect)
+        compressed = gzip.compress(body, compresslevel=self.compression_level)
+        await send(start)
+        await send({"type": "http.response.body", "body": compressed})
+
+
+def run_request(app, accept_encoding: str = "gzip") -> dict:
+    """Drive one request through an ASGI app and measure it."""
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/export",
+        "headers": [(b"accept-encoding", accept_encoding.encode())],
+    }
+    stats = {"first_byte": None, "bytes": 0}
+    started = time.perf_counter()
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Message) -> None:
+        if message["type"] == "http.response.body" and message.get("body"):
+            if stats["first_byte"] is None:
+                stats["first_byte"] = time.perf_counter() - started
+            stats["bytes"] += len(message["body"])
+
+    tracemalloc.start()
+    try:
+        asyncio.run(app(scope, receive, send))
+        stats["peak_memory"] = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    stats["total"] = time.perf_counter() - started
+    return stats
+
+
+class TestCompressionBenchmarks:
+    """Streaming vs buffered compression of a large payload."""
+
+    def test_streaming_gzip(self, benchmark):
+        """Benchmark the streaming middleware (gzip)."""
+        app = CompressionMiddleware(streaming_app())
+        benchmark(run_request, app)
+
+    def test_buffered_gzip(self, benchmark):
+        """Benchmark the previous buffered implementation."""
+        app = BufferedGzipMiddleware(streaming_app())
+        benchmark(run_request, app)
+
+    @pytest.mark.parametrize("encoding", ["gzip", "br", "zstd"])
+    def test_streaming_by_encoding(self, benchmark, encoding):
+        """Benchmark each negotiated encoding and record its output size."""
+        if encoding not in available_encodings():
+            pytest.skip(f"{encoding} support not installed")
+        app = CompressionMiddleware(streaming_app())
+        stats = benchmark(run_request, app, encoding)
+        benchmark.extra_info["compressed_bytes"] = stats["bytes"]
+
+
+class TestCompressionMemory:
+    """Peak memory and time to first byte, streaming vs buffered."""
+
+    def test_streaming_uses_less_peak_memory(self):
+        payload_size = len(CHUNK) * CHUNK_COUNT
+        streaming = run_request(CompressionMiddleware(streaming_app()))
+        buffered = run_request(BufferedGzipMiddleware(streaming_app()))
+
+        print(
+            f"\npayload {payload_size / 1e6:.1f}MB | "
+            f"streaming peak {streaming['peak_memory'] / 1e6:.2f}MB, "
+            f"ttfb {streaming['first_byte'] * 1000:.1f}ms, total {streaming['total'] * 1000:.0f}ms | "
+            f"buffered peak {buffered['peak_memory'] / 1e6:.2f}MB, "
+            f"ttfb {buffered['first_byte'] * 1000:.1f}ms, total {buffered['total'] * 1000:.0f}ms"
+        )
+
+        # Buffering holds the whole body; streaming holds roughly one chunk plus
+        # the compressor window
+        assert buffered["peak_memory"] > payload_size
+        assert streaming["peak_memory"] < payload_size / 4
+        assert streaming["first_byte"] < buffered["first_byte"]
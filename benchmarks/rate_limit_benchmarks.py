@@ -0,0 +1,90 @@
+"""
+Rate Limiting Benchmarks
+
+Measures the per-request cost of GCRA rate limit checks:
+- In-process limiter across many keys (bounded LRU)
+- Redis limiter with in-process leases (set REDIS_URL to use a real server;
+  otherwise fakeredis, which shows the lease hit path but not network latency)
+- p99 latency against the 1ms budget
+"""
+
+import os
+import random
+import time
+
+import pytest
+
+from api.middleware.gcra import LocalGCRA, RedisGCRA
+
+KEYS = [f"ratelimit:user:rep_{i:04d}@example.com:GET:/api/v1/calls" for i in range(5000)]
+REQUESTS = 20_000
+
+
+@pytest.fixture
+def redis_client():
+    url = os.environ.get("REDIS_URL")
+    if url:
+        redis = pytest.importorskip("redis")
+        client = redis.Redis.from_url(url)
+        client.ping()
+        return client
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    return fakeredis.FakeRedis()
+
+
+def p99_seconds(check, keys) -> float:
+    """p99 latency of check(key) over REQUESTS calls with a skewed key distribution."""
+    rng = random.Random(42)
+    hot = keys[:50]  # A few busy clients make most requests
+    samples = []
+    for _ in range(REQUESTS):
+        key = rng.choice(hot) if rng.random() < 0.8 else rng.choice(keys)
+        started = time.perf_counter()
+        check(key)
+        samples.append(time.perf_counter() - started)
+    samples.sort()
+    return samples[int(len(samples) * 0.99)]
+
+
+class TestRateLimitBenchmarks:
+    """Per-check cost of the GCRA limiters."""
+
+    def test_local_check(self, benchmark):
+        limiter = LocalGCRA()
+        keys = iter(KEYS * 1000)
+        benchmark(lambda: limiter.check(next(keys), limit=100))
+
+    def test_redis_check_with_leases(self, benchmark, redis_client):
+        limiter = RedisGCRA(redis_client)
+        benchmark(lambda: limiter.check("ratelimit:bench", limit=100_000))
+
+
+class TestRateLimitLatency:
+    """p99 check latency stays under a millisecond."""
+
+    def test_local_p99(self):
+        limiter = LocalGCRA(max_keys=1000)  # Smaller than the key space: exercises eviction
+        p99 = p99_seconds(lambda key: limiter.check(key, limit=100), KEYS)
+
+        print(f"\nlocal GCRA p99 {p99 * 1e6:.1f}us over {REQUESTS} checks")
+        assert p99 < 0.001
+
+    def test_redis_p99_with_leases(self, redis_client):
+        limiter = RedisGCRA(redis_client)
+        calls = 0
+        script = limiter._script
+
+        def counted(*args, **kwargs):
+            nonlocal calls
+            calls += 1
+            return script(*args, **kwargs)
+
+        limiter._script = counted
+        p99 = p99_seconds(lambda key: limiter.check(key, limit=6000), KEYS[:200])
+
+        print(
+            f"\nredis GCRA p99 {p99 * 1e6:.1f}us over {REQUESTS} checks, "
+            f"{calls} Redis calls ({calls / REQUESTS:.0%})"
+        )
+        assert calls < REQUESTS / 2
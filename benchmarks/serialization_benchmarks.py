@@ -0,0 +1,120 @@
+"""
+JSON Serialization Benchmarks
+
+Measures per-endpoint response serialization for representative payloads:
+- jsonable_encoder + json.dumps (FastAPI without a return annotation)
+- pydantic dump_json (FastAPI with a return annotation)
+- FastJSONResponse (orjson, returned directly; also skips response validation,
+  which dump_json timings here leave out)
+- Batch job polls from pre-serialized results versus re-encoding them
+"""
+
+import json
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+from typing import Any
+from uuid import uuid4
+
+import pytest
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from api.responses import FastJSONResponse, PreSerialized, dumps
+
+NOW = datetime(2025, 3, 4, 15, 30, tzinfo=UTC)
+
+
+def analysis_payload() -> dict[str, Any]:
+    """An analyze_call response: five dimensions with examples and a one-hour transcript."""
+    session = {
+        "id": uuid4(),
+        "created_at": NOW,
+        "score": 78,
+        "strengths": ["Asked about the current deployment process in detail"] * 8,
+        "areas_for_improvement": ["Quantify the cost of failed pipeline runs"] * 8,
+        "specific_examples": {
+            "good": [{"quote": "Walk me through what happens when a flow fails", "ts": 1234}] * 6,
+            "needs_work": [{"quote": "We can get into pricing later", "ts": 2345}] * 6,
+        },
+    }
+    return {
+        "call_metadata": {"id": "1234567890", "title": "Acme discovery", "date": NOW},
+        "scores": {"discovery": 80, "engagement": 74, "overall": 77},
+        "dimension_details": {f"dimension_{i}": dict(session) for i in range(5)},
+        "transcript": [
+            {"speaker": "Sam Rep", "start_time_ms": i * 4000, "text": "Tell me more. " * 10}
+            for i in range(900)
+        ],
+    }
+
+
+def calls_page() -> list[dict[str, Any]]:
+    """A 200-call page from /api/v1/calls, as the database returns it."""
+    return [
+        {
+            "id": uuid4(),
+            "gong_call_id": f"{i:010d}",
+            "title": f"Call {i}",
+            "scheduled_at": NOW - timedelta(hours=i),
+            "created_at": NOW,
+            "updated_at": NOW,
+            "overall_score": Decimal("77.5"),
+            "scores": {"discovery": 80, "engagement": 74},
+            "participants": ["Sam Rep", "Alex Buyer"],
+        }
+        for i in range(200)
+    ]
+
+
+PAYLOADS = {"analyze_call": analysis_payload(), "calls_page": calls_page()}
+
+SERIALIZERS: dict[str, Callable[[Any], bytes]] = {
+    "jsonable_encoder": lambda content: json.dumps(jsonable_encoder(content)).encode(),
+    "pydantic_dump_json": TypeAdapter(Any).dump_json,
+    "fast_json_response": lambda content: FastJSONResponse(content).body,
+}
+
+
+def mean_ms(func: Callable[[], Any], rounds: int = 50) -> float:
+    started = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return (time.perf_counter() - started) * 1000 / rounds
+
+
+class TestSerializationBenchmarks:
+    """Serialization cost per endpoint payload."""
+
+    @pytest.mark.parametrize("payload", PAYLOADS)
+    @pytest.mark.parametrize("serializer", SERIALIZERS)
+    def test_serialize(self, benchmark, payload, serializer):
+        content, serialize = PAYLOADS[payload], SERIALIZERS[serializer]
+        benchmark(lambda: serialize(content))
+
+    def test_batch_poll_pre_serialized(self, benchmark):
+        results = [dumps(analysis_payload()) for _ in range(20)]
+        benchmark(lambda: dumps({"results": [PreSerialized(r) for r in results]}))
+
+
+class TestSerializationSpeedup:
+    """FastJSONResponse against FastAPI's own serialization paths."""
+
+    @pytest.mark.parametrize("payload", PAYLOADS)
+    def test_fast_json_response_speedup(self, payload):
+        content = PAYLOADS[payload]
+        timings = {name: mean_ms(lambda s=s: s(content)) for name, s in SERIALIZERS.items()}
+
+        print(f"\n{payload}: " + ", ".join(f"{n} {ms:.2f}ms" for n, ms in timings.items()))
+        assert timings["fast_json_response"] * 5 < timings["jsonable_encoder"]
+
+    def test_pre_serialized_poll_avoids_reencoding(self):
+        sessions = [analysis_payload() for _ in range(20)]
+        results = [dumps(s) for s in sessions]
+
+        reencoded = mean_ms(lambda: dumps({"results": sessions}))
+        embedded = mean_ms(lambda: dumps({"results": [PreSerialized(r) for r in results]}))
+
+        print(f"\nbatch poll: re-encoded {reencoded:.2f}ms, pre-serialized {embedded:.2f}ms")
+        assert embedded < reencoded
@@ -14,10 +14,6 @@ from typing import Any
 from fastmcp import FastMCP
 
 from coaching_mcp.shared import settings
-from coaching_mcp.tools.analyze_call import analyze_call_tool
-from coaching_mcp.tools.get_coaching_feed import get_coaching_feed_tool
-from coaching_mcp.tools.get_rep_insights import get_rep_insights_tool
-from coaching_mcp.tools.search_calls import search_calls_tool
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -176,7 +172,8 @@ async def health_check(request):
 mcp.sse_app().add_route("/health", health_check, methods=["GET"])
 
 
-# Register tools
+# Register tools. Their implementations are imported inside each tool so the server
+# starts without loading the analysis engine; the first call pays for the imports.
 @mcp.tool()
 def analyze_opportunity(opportunity_id: str) -> dict[str, Any]:
     """
@@ -269,6 +266,8 @@ def get_coaching_feed(
     include_dismissed: bool = False,
     include_team_insights: bool = False,
     rep_email: str | None = None,
+    cursor: str | None = None,
+    include_total: bool = False,
 ) -> dict[str, Any]:
     """
     Get personalized coaching feed with recent insights and recommendations.
@@ -285,20 +284,25 @@ def get_coaching_feed(
         start_date: Custom start date (ISO format)
         end_date: Custom end date (ISO format)
         limit: Maximum number of items to return
-        offset: Pagination offset
+        offset: Pagination offset (prefer cursor for paging)
         include_dismissed: Include dismissed items
         include_team_insights: Include team-wide insights (managers only)
         rep_email: Filter to specific rep (None = current user)
+        cursor: next_cursor from the previous page; replaces offset
+        include_total: Return an approximate total_count of all matching items
 
     Returns:
         dict with:
             - items: List of feed items
             - team_insights: Team-wide insights (managers only)
             - highlights: Notable moments
-            - total_count: Total available items
+            - total_count: Approximate total with include_total, else items up to this page
             - has_more: Whether more items available
+            - next_cursor: Cursor for the next page (None on the last page)
             - new_items_count: Count of unread items
     """
+    from coaching_mcp.tools.get_coaching_feed import get_coaching_feed_tool
+
     return get_coaching_feed_tool(
         type_filter=type_filter,
         time_filter=time_filter,
@@ -309,6 +313,8 @@ def get_coaching_feed(
         include_dismissed=include_dismissed,
         include_team_insights=include_team_insights,
         rep_email=rep_email,
+        cursor=cursor,
+        include_total=include_total,
     )
 
 
@@ -359,6 +365,8 @@ def analyze_call(
         >>> for strength in result['strengths']:
         >>>     print(f"✓ {strength}")
     """
+    from coaching_mcp.tools.analyze_call import analyze_call_tool
+
     return analyze_call_tool(
         call_id=call_id,
         dimensions=dimensions,
@@ -410,6 +418,8 @@ def get_rep_insights(
         >>> for gap in insights['skill_gaps']:
         >>>     print(f"Gap: {gap['area']} - Current: {gap['current_score']}, Target: {gap['target_score']}")
     """
+    from coaching_mcp.tools.get_rep_insights import get_rep_insights_tool
+
     return get_rep_insights_tool(
         rep_email=rep_email,
         time_period=time_period,
@@ -469,6 +479,8 @@ def search_calls(
         >>> for call in calls:
         >>>     print(f"{call['title']}: {call['overall_score']}/100")
     """
+    from coaching_mcp.tools.search_calls import search_calls_tool
+
     return search_calls_tool(
         rep_email=rep_email,
         product=product,
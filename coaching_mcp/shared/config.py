@@ -43,6 +43,46 @@ class Settings(BaseSettings):
     database_url: PostgresDsn = Field(..., description="PostgreSQL connection string")
     database_pool_min_size: int = Field(default=5, description="Min connection pool size")
     database_pool_max_size: int = Field(default=20, description="Max connection pool size")
+    database_pool_timeout_seconds: float = Field(
+        default=30.0, description="Max wait for a free pooled connection before failing"
+    )
+    database_pool_leak_threshold_seconds: float = Field(
+        default=60.0, description="Log connections held longer than this as leaks (0 disables)"
+    )
+    database_replica_url: str | None = Field(
+        default=None,
+        description="Read replica connection string; fetch_one/fetch_all read from it when set",
+    )
+    database_replica_pool_max_size: int = Field(
+        default=20, description="Max read replica connection pool size"
+    )
+    database_replica_max_lag_seconds: float = Field(
+        default=10.0, description="Reads fall back to the primary while replica lag exceeds this"
+    )
+    database_replica_lag_check_seconds: float = Field(
+        default=5.0, description="Seconds between replica lag checks"
+    )
+    database_read_your_writes_seconds: float = Field(
+        default=5.0,
+        description="Reads go to the primary for this long after a write in the same "
+        "request (or thread, outside requests)",
+    )
+    database_statement_cache_size: int = Field(
+        default=256,
+        description="Prepared statements cached per async connection (0 disables for PgBouncer)",
+    )
+    database_command_timeout_seconds: float = Field(
+        default=30.0, description="Async query timeout; the query is cancelled server-side"
+    )
+    query_budget_strict: bool = Field(
+        default=False,
+        description="Fail requests that exceed their endpoint's declared query budget "
+        "(for tests and staging); otherwise overruns are only logged",
+    )
+    query_repeat_threshold: int = Field(
+        default=5,
+        description="Log a possible N+1 when one statement shape runs this often in a request",
+    )
 
     # Analysis settings
     enable_caching: bool = Field(default=True, description="Enable intelligent caching")
@@ -51,6 +91,11 @@ class Settings(BaseSettings):
     chunk_overlap_percentage: int = Field(
         default=20, description="Overlap between chunks as percentage"
     )
+    score_distribution_ttl_seconds: float = Field(
+        default=300.0,
+        description="Seconds between reloads of the in-memory score distributions used for "
+        "percentiles and team averages",
+    )
 
     # Five Wins Unified Pipeline
     use_five_wins_unified: bool = Field(
@@ -67,6 +112,47 @@ class Settings(BaseSettings):
         default=None, description="Slack webhook URL for notifications"
     )
 
+    # Tool executors (sync tools called from async endpoints)
+    analysis_executor_workers: int = Field(
+        default=4, description="Threads running Claude-backed analysis tools per API worker"
+    )
+    analysis_executor_queue: int = Field(
+        default=16, description="Analysis jobs allowed to wait before requests get 503"
+    )
+    read_executor_workers: int = Field(
+        default=16, description="Threads running database read tools per API worker"
+    )
+    read_executor_queue: int = Field(
+        default=64, description="Read jobs allowed to wait before requests get 503"
+    )
+
+    # Batch analysis jobs (POST /api/v1/analyses:batch)
+    batch_max_calls: int = Field(default=500, description="Most calls accepted in one batch")
+    batch_concurrency: int = Field(
+        default=2,
+        description="Calls each batch job analyzes at once; keep below analysis_executor_workers "
+        "so interactive analysis still gets workers",
+    )
+    batch_max_jobs: int = Field(
+        default=100, description="Batch jobs (and their results) kept in memory per API worker"
+    )
+
+    # Claude token budgets (see api.token_budget)
+    claude_token_budget_enabled: bool = Field(
+        default=True, description="Charge analyses their predicted Claude tokens"
+    )
+    claude_tokens_per_user: int = Field(
+        default=2_000_000, description="Claude tokens each user may spend per budget window"
+    )
+    claude_tokens_global: int = Field(
+        default=10_000_000,
+        description="Claude tokens all users together may spend per budget window; keep "
+        "below the provider quota",
+    )
+    claude_token_budget_window_seconds: float = Field(
+        default=3600.0, description="Window over which token budgets refill"
+    )
+
     # Webhook endpoint (FastAPI)
     webhook_host: str = Field(default="0.0.0.0", description="Webhook server host")
     webhook_port: int = Field(default=8000, description="Webhook server port")
@@ -1,11 +1,20 @@
 """MCP Tools for Gong Call Coaching Agent."""
 
-from .analyze_call import analyze_call_tool
-from .get_rep_insights import get_rep_insights_tool
-from .search_calls import search_calls_tool
-
-__all__ = [
-    "analyze_call_tool",
-    "get_rep_insights_tool",
-    "search_calls_tool",
-]
+import importlib
+from typing import Any
+
+# Exported tools and the submodule they live in, imported on first access so that
+# importing one tool doesn't load every other tool's dependencies.
+_EXPORTS = {
+    "analyze_call_tool": ".analyze_call",
+    "get_rep_insights_tool": ".get_rep_insights",
+    "search_calls_tool": ".search_calls",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
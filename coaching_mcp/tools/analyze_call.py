@@ -3,6 +3,8 @@ Analyze Call Tool - Deep-dive coaching analysis for a specific call.
 """
 
 import logging
+from collections.abc import Callable
+from dataclasses import dataclass
 from typing import Any, TypedDict
 from uuid import UUID
 
@@ -60,8 +62,7 @@ def validate_five_wins_scores(five_wins_eval: dict[str, Any]) -> None:
         status = win_data.get("status")
         if status not in ["met", "partial", "missed"]:
             raise ValueError(
-                f"{win_name} has invalid status '{status}' "
-                f"(must be 'met', 'partial', or 'missed')"
+                f"{win_name} has invalid status '{status}' (must be 'met', 'partial', or 'missed')"
             )
 
         # Validate max_score matches expected
@@ -220,6 +221,20 @@ def aggregate_five_wins(results: dict[str, dict[str, Any]]) -> dict[str, Any]:
     }
 
 
+@dataclass
+class CallAnalysisContext:
+    """Everything resolved about a call before its dimensions are analyzed."""
+
+    call_id: str
+    call: dict[str, Any]
+    db_call_id: UUID
+    dimensions: list[str]
+    detected_role: str
+    speakers: list[dict[str, Any]]
+    rep: dict[str, Any] | None
+    transcript: str | None
+
+
 def analyze_call_tool(
     call_id: str,
     dimensions: list[str] | None = None,
@@ -227,6 +242,7 @@ def analyze_call_tool(
     include_transcript_snippets: bool = True,
     force_reanalysis: bool = False,
     role: str | None = None,
+    before_analysis: Callable[[CallAnalysisContext, list[str]], None] | None = None,
 ) -> dict[str, Any]:
     """
     Perform comprehensive coaching analysis on a call with role-aware evaluation.
@@ -238,10 +254,42 @@ def analyze_call_tool(
         include_transcript_snippets: Include actual quotes
         force_reanalysis: Force new analysis even if cached
         role: Optional role override (ae, se, csm). If not provided, auto-detects from speaker.
+        before_analysis: Called with the context and the dimensions not answered by the
+            cache before any is analyzed (e.g. to charge a token budget); may raise to abort
 
     Returns:
         Comprehensive analysis with scores and coaching insights evaluated against role-specific rubric
     """
+    context = prepare_call_analysis(call_id, dimensions, role)
+
+    cached: dict[str, dict[str, Any]] = {}
+    if before_analysis is not None:
+        if not force_reanalysis:
+            cached = find_cached_dimensions(context)
+        before_analysis(context, [d for d in context.dimensions if d not in cached])
+
+    # Step 4: Run analysis for each dimension
+    results: dict[str, dict[str, Any]] = {}
+    for dimension in context.dimensions:
+        if dimension in cached:
+            results[dimension] = cached[dimension]
+        else:
+            results[dimension] = analyze_call_dimension(context, dimension, force_reanalysis)
+
+    return build_call_analysis(context, results, include_transcript_snippets)
+
+
+def prepare_call_analysis(
+    call_id: str,
+    dimensions: list[str] | None = None,
+    role: str | None = None,
+) -> CallAnalysisContext:
+    """
+    Resolve the call, dimensions, rubric role, participants and transcript (steps 1-3).
+
+    Raises:
+        ValueError: If the call doesn't exist, or a dimension or role is invalid
+    """
     logger.info(f"Analyzing call {call_id} (role override: {role})")
 
     # Step 1: Verify call exists in database
@@ -271,7 +319,7 @@ def analyze_call_tool(
         invalid = [d for d in dimensions if d not in valid_dimensions]
         if invalid:
             raise ValueError(
-                f"Invalid dimensions: {invalid}. " f"Valid options: {sorted(valid_dimensions)}"
+                f"Invalid dimensions: {invalid}. Valid options: {sorted(valid_dimensions)}"
             )
 
     logger.info(f"Analyzing {len(dimensions)} dimensions: {dimensions}")
@@ -319,40 +367,117 @@ def analyze_call_tool(
             (s for s in speakers if s.get("company_side")), speakers[0] if speakers else None
         )
 
-    # Step 4: Run analysis for each dimension
-    results: dict[str, dict[str, Any]] = {}
-    for dimension in dimensions:
-        try:
-            # Get transcript for analysis
-            from analysis.engine import get_or_create_coaching_session
-
-            segments = fetch_one(
-                """
-                SELECT STRING_AGG(text, ' ' ORDER BY sequence_number) as full_transcript
-                FROM transcripts
-                WHERE call_id = %s
-                """,
-                (str(db_call_id),),
-                as_dict=True,
-            )
+    # Full transcript, shared by every dimension (and the unified Five Wins pass)
+    segments = fetch_one(
+        """
+        SELECT STRING_AGG(text, ' ' ORDER BY sequence_number) as full_transcript
+        FROM transcripts
+        WHERE call_id = %s
+        """,
+        (str(db_call_id),),
+        as_dict=True,
+    )
+    transcript = None
+    if segments and isinstance(segments, dict) and segments.get("full_transcript"):
+        transcript = str(segments["full_transcript"])
+
+    return CallAnalysisContext(
+        call_id=call_id,
+        call=call,
+        db_call_id=db_call_id,
+        dimensions=dimensions,
+        detected_role=detected_role,
+        speakers=speakers,
+        rep=rep,
+        transcript=transcript,
+    )
 
-            if segments and isinstance(segments, dict) and segments.get("full_transcript"):
-                analysis = get_or_create_coaching_session(
-                    call_id=db_call_id,
-                    rep_id=UUID(rep["id"]) if rep and isinstance(rep, dict) else db_call_id,
-                    dimension=CoachingDimension(dimension),
-                    transcript=str(segments["full_transcript"]),
-                    force_reanalysis=force_reanalysis,
-                )
-                results[dimension] = dict(analysis)
-            else:
-                raise ValueError(f"No transcript found for call {db_call_id}")
-        except Exception as e:
-            logger.error(f"Failed to analyze {dimension}: {e}", exc_info=True)
-            results[dimension] = {
-                "error": str(e),
-                "score": None,
-            }
+
+def analyze_call_dimension(
+    context: CallAnalysisContext,
+    dimension: str,
+    force_reanalysis: bool = False,
+    on_token: Callable[[str], None] | None = None,
+) -> dict[str, Any]:
+    """
+    Analyze one dimension (from cache or fresh).
+
+    Args:
+        context: Result of prepare_call_analysis
+        dimension: Dimension to analyze
+        force_reanalysis: Force new analysis even if cached
+        on_token: Called with each text delta of a fresh Claude analysis
+
+    Returns:
+        The coaching session, or {"error": ..., "score": None} if the analysis failed
+    """
+    try:
+        from analysis.engine import get_or_create_coaching_session
+
+        if not context.transcript:
+            raise ValueError(f"No transcript found for call {context.db_call_id}")
+
+        rep = context.rep
+        analysis = get_or_create_coaching_session(
+            call_id=context.db_call_id,
+            rep_id=UUID(rep["id"]) if rep and isinstance(rep, dict) else context.db_call_id,
+            dimension=CoachingDimension(dimension),
+            transcript=context.transcript,
+            force_reanalysis=force_reanalysis,
+            on_token=on_token,
+        )
+        return dict(analysis)
+    except Exception as e:
+        logger.error(f"Failed to analyze {dimension}: {e}", exc_info=True)
+        return {
+            "error": str(e),
+            "score": None,
+        }
+
+
+def find_cached_dimensions(context: CallAnalysisContext) -> dict[str, dict[str, Any]]:
+    """
+    Look up cached sessions for the context's dimensions without analyzing any.
+
+    Returns:
+        Cached session per dimension; dimensions missing from the result need analysis
+    """
+    from analysis.engine import get_cached_coaching_session
+
+    if not context.transcript:
+        return {}
+
+    cached: dict[str, dict[str, Any]] = {}
+    for dimension in context.dimensions:
+        session = get_cached_coaching_session(
+            context.db_call_id, CoachingDimension(dimension), context.transcript
+        )
+        if session:
+            cached[dimension] = dict(session)
+    return cached
+
+
+def build_call_analysis(
+    context: CallAnalysisContext,
+    results: dict[str, dict[str, Any]],
+    include_transcript_snippets: bool = True,
+) -> dict[str, Any]:
+    """
+    Aggregate per-dimension results into the full analyze_call response (steps 5-8).
+
+    Args:
+        context: Result of prepare_call_analysis
+        results: Dimension name to analyze_call_dimension result
+        include_transcript_snippets: Include actual quotes and the transcript
+
+    Returns:
+        Comprehensive analysis with scores and coaching insights
+    """
+    call = context.call
+    db_call_id = context.db_call_id
+    speakers = context.speakers
+    rep = context.rep
+    detected_role = context.detected_role
 
     # Step 5: Aggregate scores
     scores = {}
@@ -511,24 +636,10 @@ def analyze_call_tool(
             # Get call type for primary win determination
             call_type = call.get("call_type") or "discovery"
 
-            # Fetch transcript for unified analysis
-            transcript_data = fetch_one(
-                """
-                SELECT STRING_AGG(text, ' ' ORDER BY sequence_number) as full_transcript
-                FROM transcripts
-                WHERE call_id = %s
-                """,
-                (str(db_call_id),),
-                as_dict=True,
-            )
-            transcript_text = ""
-            if transcript_data and isinstance(transcript_data, dict):
-                transcript_text = str(transcript_data.get("full_transcript", ""))
-
             # Run unified analysis
             unified_result = run_five_wins_unified_analysis(
-                call_id=call_id,
-                transcript=transcript_text,
+                call_id=context.call_id,
+                transcript=context.transcript or "",
                 call_type=call_type,
                 call_metadata=call,
             )
@@ -605,6 +716,9 @@ def calculate_comparison_to_average(
     """
     Compare rep scores to team averages.
 
+    Averages and percentiles come from the in-memory score distributions
+    (90-day window), scoped to the call's product when known.
+
     Args:
         scores: Rep's scores for this call
         product: Product being sold
@@ -612,81 +726,42 @@ def calculate_comparison_to_average(
     Returns:
         List of comparisons showing rep vs team average
     """
-    # Query team averages
-    team_avg = fetch_all(
-        """
-        SELECT
-            coaching_dimension,
-            AVG(score) as avg_score,
-            COUNT(*) as sample_size
-        FROM coaching_sessions
-        WHERE score IS NOT NULL
-            AND created_at > NOW() - INTERVAL '90 days'
-            AND (%s IS NULL OR EXISTS (
-                SELECT 1 FROM calls
-                WHERE calls.id = coaching_sessions.call_id
-                AND calls.product = %s
-            ))
-        GROUP BY coaching_dimension
-        """,
-        (product, product),
-        as_dict=True,
-    )
+    from analysis.score_distribution import get_team_averages
 
-    comparisons = []
-    if isinstance(team_avg, list):
-        for avg in team_avg:
-            if not isinstance(avg, dict):
-                continue
+    team_avg = get_team_averages(product)
 
-            dim = avg.get("coaching_dimension")
-            if not dim:
-                continue
+    comparisons = []
+    for dim, avg in team_avg.items():
+        rep_score = scores.get(dim)
 
-            rep_score = scores.get(dim)
-
-            if rep_score is not None and avg.get("avg_score") is not None:
-                comparisons.append(
-                    {
-                        "metric": dim,
-                        "rep_score": rep_score,
-                        "team_average": round(float(avg["avg_score"]), 1),
-                        "difference": round(rep_score - float(avg["avg_score"]), 1),
-                        "percentile": calculate_percentile(rep_score, dim),
-                        "sample_size": avg.get("sample_size", 0),
-                    }
-                )
+        if rep_score is not None and avg["avg_score"] is not None:
+            comparisons.append(
+                {
+                    "metric": dim,
+                    "rep_score": rep_score,
+                    "team_average": round(avg["avg_score"], 1),
+                    "difference": round(rep_score - avg["avg_score"], 1),
+                    "percentile": calculate_percentile(rep_score, dim, product),
+                    "sample_size": avg["sample_size"],
+                }
+            )
 
     return comparisons
 
 
-def calculate_percentile(score: int, dimension: str) -> int:
+def calculate_percentile(score: int, dimension: str, product: str | None = None) -> int:
     """
     Calculate what percentile this score falls into.
 
     Args:
         score: Rep's score
         dimension: Coaching dimension
+        product: Optional product to rank against (default: all products)
 
     Returns:
-        Percentile (0-100)
+        Percentile (0-100), 50 when there is no data for the dimension
     """
-    result = fetch_one(
-        """
-        SELECT
-            COUNT(CASE WHEN score < %s THEN 1 END)::float /
-            NULLIF(COUNT(*), 0) * 100 as percentile
-        FROM coaching_sessions
-        WHERE coaching_dimension = %s
-            AND score IS NOT NULL
-            AND created_at > NOW() - INTERVAL '90 days'
-        """,
-        (score, dimension),
-        as_dict=True,
-    )
+    from analysis.score_distribution import get_percentile
 
-    return (
-        round(float(result["percentile"]))
-        if result and isinstance(result, dict) and result["percentile"]
-        else 50
-    )
+    percentile = get_percentile(score, dimension, product)
+    return round(percentile) if percentile is not None else 50
@@ -11,9 +11,15 @@ from typing import Any
 
 from db import queries
 from db.connection import get_db_connection
+from db.pagination import InvalidCursorError, Keyset, SortKey, estimate_count
 
 logger = logging.getLogger(__name__)
 
+# Newest sessions first; ids break ties between sessions created at the same instant
+FEED_KEYSET = Keyset(
+    (SortKey("cs.created_at", "created_at"), SortKey("cs.id", "id")), descending=True
+)
+
 
 def get_coaching_feed_tool(
     type_filter: str | None = None,
@@ -25,6 +31,8 @@ def get_coaching_feed_tool(
     include_dismissed: bool = False,
     include_team_insights: bool = False,
     rep_email: str | None = None,
+    cursor: str | None = None,
+    include_total: bool = False,
 ) -> dict[str, Any]:
     """
     Get personalized coaching feed with recent insights and recommendations.
@@ -41,19 +49,25 @@ def get_coaching_feed_tool(
         start_date: Custom start date (ISO format)
         end_date: Custom end date (ISO format)
         limit: Maximum number of items to return
-        offset: Pagination offset
+        offset: Pagination offset (prefer cursor for paging)
         include_dismissed: Include dismissed items
         include_team_insights: Include team-wide insights (managers only)
         rep_email: Filter to specific rep (None = current user)
+        cursor: next_cursor from the previous page; replaces offset
+        include_total: Return the planner's estimate of all matching items as total_count
 
     Returns:
         dict with:
             - items: List of feed items
             - team_insights: Team-wide insights (managers only)
             - highlights: Notable moments
-            - total_count: Total available items
+            - total_count: Approximate total with include_total, else items up to this page
             - has_more: Whether more items available
+            - next_cursor: Cursor for the next page (None on the last page)
             - new_items_count: Count of unread items
+
+    Raises:
+        InvalidCursorError: If cursor is not a coaching feed cursor
     """
     try:
         # Calculate date range based on time_filter
@@ -71,15 +85,23 @@ def get_coaching_feed_tool(
             # Default: last 7 days
             start_dt = end_dt - timedelta(days=7)
 
-        # Fetch recent coaching sessions
-        if rep_email:
-            # Get sessions for specific rep
-            sessions = queries.get_coaching_sessions_for_rep(
-                rep_email=rep_email, start_date=start_dt, end_date=end_dt
+        # Fetch one page of coaching sessions, plus one row to detect the next page.
+        # Every feed item is a call analysis, so other type filters match nothing.
+        sessions: list[dict[str, Any]] = []
+        next_cursor = None
+        if not type_filter or type_filter in ("all", "call_analysis"):
+            rows = _get_recent_sessions(
+                start_dt,
+                end_dt,
+                limit + 1,
+                cursor=cursor,
+                offset=0 if cursor else offset,
+                rep_email=rep_email,
             )
-        else:
-            # Get all recent sessions (for managers/feed view)
-            sessions = _get_recent_sessions(start_dt, end_dt, limit * 2)
+            sessions, next_cursor = FEED_KEYSET.paginate(rows, limit)
+
+        # Fetch call details for all sessions in one query
+        calls = queries.get_calls_by_ids(list({s["call_id"] for s in sessions}))
 
         # Generate feed items from sessions
         feed_items = []
@@ -88,12 +110,8 @@ def get_coaching_feed_tool(
             if not include_dismissed and session.get("is_dismissed"):
                 continue
 
-            # Apply type filter
-            if type_filter and type_filter != "all" and type_filter != "call_analysis":
-                continue
-
             # Get call details
-            call = queries.get_call_by_id(session["call_id"])
+            call = calls.get(str(session["call_id"]))
             if not call:
                 continue
 
@@ -136,10 +154,12 @@ def get_coaching_feed_tool(
 
                 pass
 
-        # Apply pagination
-        total_count = len(feed_items)
-        feed_items = feed_items[offset : offset + limit]
-        has_more = offset + limit < total_count
+        # Pagination metadata
+        has_more = next_cursor is not None
+        if include_total:
+            total_count = _estimate_recent_sessions(start_dt, end_dt, rep_email)
+        else:
+            total_count = (0 if cursor else offset) + len(feed_items)
 
         # Extract highlights (top/bottom performers)
         highlights = []
@@ -205,9 +225,13 @@ def get_coaching_feed_tool(
             "highlights": highlights[:5],  # Limit to 5 highlights
             "total_count": total_count,
             "has_more": has_more,
+            "next_cursor": next_cursor,
             "new_items_count": new_items_count,
         }
 
+    except InvalidCursorError:
+        # A bad cursor is the caller's error, not an empty feed
+        raise
     except Exception as e:
         logger.error(f"Error generating coaching feed: {e}", exc_info=True)
         # Return empty feed on error
@@ -217,6 +241,7 @@ def get_coaching_feed_tool(
             "highlights": [],
             "total_count": 0,
             "has_more": False,
+            "next_cursor": None,
             "new_items_count": 0,
             "error": str(e),
         }
@@ -257,13 +282,53 @@ def _is_new(session: dict[str, Any]) -> bool:
     return bool(age.total_seconds() < 86400)  # 24 hours
 
 
+def _recent_sessions_filter(
+    start_date: datetime, end_date: datetime, rep_email: str | None
+) -> tuple[str, list[Any]]:
+    """Build the FROM/WHERE clause shared by the feed query and its count estimate."""
+    where_clauses = [
+        "cs.created_at >= %s",
+        "cs.created_at <= %s",
+        "s.company_side = true",
+    ]
+    params: list[Any] = [start_date, end_date]
+    if rep_email:
+        where_clauses.append("s.email = %s")
+        params.append(rep_email)
+
+    from_where = f"""
+            FROM coaching_sessions cs
+            JOIN speakers s ON cs.rep_id = s.id
+            WHERE {' AND '.join(where_clauses)}"""
+    return from_where, params
+
+
 def _get_recent_sessions(
-    start_date: datetime, end_date: datetime, limit: int = 100
+    start_date: datetime,
+    end_date: datetime,
+    limit: int = 100,
+    cursor: str | None = None,
+    offset: int = 0,
+    rep_email: str | None = None,
 ) -> list[dict[str, Any]]:
-    """Get all recent coaching sessions within a date range."""
+    """
+    Get recent coaching sessions within a date range, newest first.
+
+    Pages with a cursor (FEED_KEYSET) so later pages don't rescan earlier ones;
+    offset is kept for older clients.
+    """
+    from_where, params = _recent_sessions_filter(start_date, end_date, rep_email)
+
+    def bind(value: Any) -> str:
+        params.append(value)
+        return "%s"
+
+    seek = FEED_KEYSET.condition(cursor, bind)
+    params.extend([limit, offset])
+
     with get_db_connection() as conn:
-        cursor = conn.cursor()
-        query = """
+        cur = conn.cursor()
+        query = f"""
             SELECT
                 cs.id,
                 cs.call_id,
@@ -274,14 +339,19 @@ def _get_recent_sessions(
                 cs.weaknesses,
                 s.email as rep_email,
                 s.name as rep_name
-            FROM coaching_sessions cs
-            JOIN speakers s ON cs.rep_id = s.id
-            WHERE cs.created_at >= %s
-              AND cs.created_at <= %s
-              AND s.company_side = true
-            ORDER BY cs.created_at DESC
-            LIMIT %s
+            {from_where}
+              AND {seek}
+            ORDER BY {FEED_KEYSET.order_by()}
+            LIMIT %s OFFSET %s
         """
-        cursor.execute(query, (start_date, end_date, limit))
-        columns = [desc[0] for desc in cursor.description]
-        return [dict(zip(columns, row, strict=False)) for row in cursor.fetchall()]
+        cur.execute(query, params)
+        columns = [desc[0] for desc in cur.description]
+        return [dict(zip(columns, row, strict=False)) for row in cur.fetchall()]
+
+
+def _estimate_recent_sessions(
+    start_date: datetime, end_date: datetime, rep_email: str | None = None
+) -> int:
+    """Planner estimate of the sessions the feed can page through."""
+    from_where, params = _recent_sessions_filter(start_date, end_date, rep_email)
+    return estimate_count(f"SELECT 1 {from_where}", params)
@@ -64,25 +64,44 @@ def get_rep_insights_tool(
     logger.info(f"Found {rep_info['calls_analyzed']} calls for {rep_info['name']}")
 
     # Step 3: Get score trends over time
-    score_trends = fetch_all(
-        """
-        SELECT
-            cs.coaching_dimension,
-            DATE_TRUNC('week', cs.created_at) as week,
-            AVG(cs.score) as avg_score,
-            COUNT(*) as call_count
-        FROM coaching_sessions cs
-        JOIN calls c ON cs.call_id = c.id
-        WHERE cs.rep_id = %s
-            AND cs.score IS NOT NULL
-            AND cs.created_at >= %s
-            AND (%s IS NULL OR c.product = %s)
-        GROUP BY cs.coaching_dimension, DATE_TRUNC('week', cs.created_at)
-        ORDER BY cs.coaching_dimension, week
-        """,
-        (rep_info["id"], date_filter, product_filter, product_filter),
-        as_dict=True,
-    )
+    if product_filter is None:
+        # Weekly rollups; a week counts once its Thursday is inside the period
+        score_trends = fetch_all(
+            """
+            SELECT
+                coaching_dimension,
+                week_start as week,
+                score_sum::numeric / score_count as avg_score,
+                score_count as call_count
+            FROM rep_dimension_weekly_scores
+            WHERE rep_email = %s
+                AND week_start >= %s::date - 3
+            ORDER BY coaching_dimension, week
+            """,
+            (rep_info["email"], date_filter),
+            as_dict=True,
+        )
+    else:
+        # Rollups aren't broken down by product; aggregate the raw sessions
+        score_trends = fetch_all(
+            """
+            SELECT
+                cs.coaching_dimension,
+                DATE_TRUNC('week', cs.created_at)::date as week,
+                AVG(cs.score) as avg_score,
+                COUNT(*) as call_count
+            FROM coaching_sessions cs
+            JOIN calls c ON cs.call_id = c.id
+            WHERE cs.rep_id = %s
+                AND cs.score IS NOT NULL
+                AND cs.created_at >= %s
+                AND c.product = %s
+            GROUP BY cs.coaching_dimension, DATE_TRUNC('week', cs.created_at)
+            ORDER BY cs.coaching_dimension, week
+            """,
+            (rep_info["id"], date_filter, product_filter),
+            as_dict=True,
+        )
 
     # Format trends by dimension
     trends_by_dimension: dict[str, dict[str, list[Any]]] = {}
@@ -94,7 +113,10 @@ def get_rep_insights_tool(
             if dim not in trends_by_dimension:
                 trends_by_dimension[dim] = {"dates": [], "scores": [], "call_counts": []}
 
-            trends_by_dimension[dim]["dates"].append(str(row["week"].date()))
+            week = row["week"]
+            trends_by_dimension[dim]["dates"].append(
+                str(week.date() if isinstance(week, datetime) else week)
+            )
             trends_by_dimension[dim]["scores"].append(round(float(row["avg_score"]), 1))
             trends_by_dimension[dim]["call_counts"].append(row["call_count"])
 
@@ -153,22 +175,20 @@ def get_rep_insights_tool(
         WITH recent AS (
             SELECT
                 coaching_dimension,
-                AVG(score) as recent_score
-            FROM coaching_sessions
-            WHERE rep_id = %s
-                AND score IS NOT NULL
-                AND created_at >= NOW() - INTERVAL '14 days'
+                SUM(score_sum)::numeric / SUM(score_count) as recent_score
+            FROM rep_dimension_weekly_scores
+            WHERE rep_email = %s
+                AND week_start >= CURRENT_DATE - 14 - 3
             GROUP BY coaching_dimension
         ),
         older AS (
             SELECT
                 coaching_dimension,
-                AVG(score) as older_score
-            FROM coaching_sessions
-            WHERE rep_id = %s
-                AND score IS NOT NULL
-                AND created_at >= NOW() - INTERVAL '60 days'
-                AND created_at < NOW() - INTERVAL '14 days'
+                SUM(score_sum)::numeric / SUM(score_count) as older_score
+            FROM rep_dimension_weekly_scores
+            WHERE rep_email = %s
+                AND week_start >= CURRENT_DATE - 60 - 3
+                AND week_start < CURRENT_DATE - 14 - 3
             GROUP BY coaching_dimension
         )
         SELECT
@@ -185,7 +205,7 @@ def get_rep_insights_tool(
         LEFT JOIN older o ON r.coaching_dimension = o.coaching_dimension
         WHERE o.older_score IS NOT NULL
         """,
-        (rep_info["id"], rep_info["id"]),
+        (rep_info["email"], rep_info["email"]),
         as_dict=True,
     )
 
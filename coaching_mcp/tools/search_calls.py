@@ -6,7 +6,9 @@ import logging
 from datetime import datetime
 from typing import Any, cast
 
+from analysis.objections import normalize_objection_type
 from db import fetch_all
+from db.queries import call_summary_filters
 
 logger = logging.getLogger(__name__)
 
@@ -33,9 +35,10 @@ def search_calls_tool(
         date_range: Date range filter
         min_score: Minimum overall score
         max_score: Maximum overall score
-        has_objection_type: Filter for calls with specific objections
+        has_objection_type: Filter for calls with an objection of this type (pricing, timing,
+            technical_fit, competitive, other; "technical" and "competitor" also work)
         topics: Filter by topics discussed
-        role: Filter by speaker role (ae, se, csm) - searches metadata rubric_role field
+        role: Filter by the rubric role the call was evaluated against (ae, se, csm)
         limit: Maximum results
 
     Returns:
@@ -49,18 +52,9 @@ def search_calls_tool(
     where_clauses = ["c.processed_at IS NOT NULL"]
     params: list[Any] = []
 
-    # Filter by rep email
+    # Filter by rep email (company-side emails are kept on call_summary)
     if rep_email:
-        where_clauses.append(
-            """
-            EXISTS (
-                SELECT 1 FROM speakers s
-                WHERE s.call_id = c.id
-                AND s.email = %s
-                AND s.company_side = true
-            )
-        """
-        )
+        where_clauses.append("sm.rep_emails @> ARRAY[%s]::text[]")
         params.append(rep_email)
 
     # Filter by product
@@ -82,31 +76,39 @@ def search_calls_tool(
             where_clauses.append("c.scheduled_at <= %s")
             params.append(datetime.fromisoformat(date_range["end"]))
 
-    # Filter by score range (requires aggregating coaching sessions)
-    score_filter = ""
-    if min_score is not None or max_score is not None:
-        score_conditions = []
-        if min_score is not None:
-            score_conditions.append("avg_score >= %s")
-            params.append(min_score)
-        if max_score is not None:
-            score_conditions.append("avg_score <= %s")
-            params.append(max_score)
-        score_filter = "AND " + " AND ".join(score_conditions)
-
-    # Filter by objection type (search in coaching session analysis)
+    # Filter by score range and evaluated role (indexed call_summary columns)
+    def bind(value: Any) -> str:
+        params.append(value)
+        return "%s"
+
+    where_clauses.extend(call_summary_filters(bind, min_score, max_score, role))
+
+    # Filter by objection type (objections extracted from objection-handling analyses)
     if has_objection_type:
-        where_clauses.append(
+        objection_type = normalize_objection_type(has_objection_type)
+        if objection_type:
+            where_clauses.append(
+                """
+                EXISTS (
+                    SELECT 1 FROM call_objections o
+                    WHERE o.call_id = c.id
+                    AND o.objection_type = %s
+                )
             """
-            EXISTS (
-                SELECT 1 FROM coaching_sessions cs
-                WHERE cs.call_id = c.id
-                AND cs.coaching_dimension = 'objection_handling'
-                AND cs.full_analysis ILIKE %s
             )
-        """
-        )
-        params.append(f"%{has_objection_type}%")
+            params.append(objection_type)
+        else:
+            # Not a known type: match the objection quotes instead
+            where_clauses.append(
+                """
+                EXISTS (
+                    SELECT 1 FROM call_objections o
+                    WHERE o.call_id = c.id
+                    AND o.quote ILIKE %s
+                )
+            """
+            )
+            params.append(f"%{has_objection_type}%")
 
     # Filter by topics (search in transcript topics array)
     if topics:
@@ -121,33 +123,12 @@ def search_calls_tool(
         )
         params.append(topics)
 
-    # Filter by role (search in coaching_sessions metadata)
-    if role:
-        where_clauses.append(
-            """
-            EXISTS (
-                SELECT 1 FROM coaching_sessions cs
-                WHERE cs.call_id = c.id
-                AND cs.metadata->>'rubric_role' = %s
-            )
-        """
-        )
-        params.append(role)
-
     # Limit
     params.append(min(limit, 100))  # Cap at 100
 
     # Build final query (where_clauses are pre-validated SQL fragments with placeholders)
     # nosec - Dynamic query building with parameterized values (SQL injection safe)
     query = f"""
-        WITH call_scores AS (
-            SELECT
-                cs.call_id,
-                AVG(cs.score) as avg_score
-            FROM coaching_sessions cs
-            WHERE cs.score IS NOT NULL
-            GROUP BY cs.call_id
-        )
         SELECT
             c.id,
             c.gong_call_id,
@@ -156,16 +137,12 @@ def search_calls_tool(
             c.duration_seconds,
             c.call_type,
             c.product,
-            COALESCE(csc.avg_score, 0) as overall_score,
-            ARRAY_AGG(DISTINCT s.name) FILTER (WHERE s.company_side = false) as customer_names,
-            ARRAY_AGG(DISTINCT s.name) FILTER (WHERE s.company_side = true) as prefect_reps
+            COALESCE(sm.overall_score, 0) as overall_score,
+            sm.customer_names,
+            sm.rep_names as prefect_reps
         FROM calls c
-        LEFT JOIN call_scores csc ON c.id = csc.call_id
-        LEFT JOIN speakers s ON c.id = s.call_id
+        LEFT JOIN call_summary sm ON sm.call_id = c.id
         WHERE {' AND '.join(where_clauses)}
-            {score_filter}
-        GROUP BY c.id, c.gong_call_id, c.title, c.scheduled_at,
-                 c.duration_seconds, c.call_type, c.product, csc.avg_score
         ORDER BY c.scheduled_at DESC
         LIMIT %s
     """
@@ -0,0 +1,170 @@
+"""
+Async database connection management with connection pooling.
+Uses asyncpg for the FastAPI tier so queries don't block the event loop.
+Prefect flows, MCP tools and scripts keep using the sync psycopg2 path in connection.py.
+
+Queries use asyncpg's native $1, $2, ... placeholders and return plain dicts,
+matching the shape of fetch_one/fetch_all in connection.py.
+"""
+
+import asyncio
+import json
+import logging
+import re
+from typing import Any
+
+import asyncpg
+
+from coaching_mcp.shared import settings
+
+from .query_budget import timed
+
+logger = logging.getLogger(__name__)
+
+# Global connection pool, bound to the event loop that created it
+_async_pool: asyncpg.Pool | None = None
+_async_pool_loop: asyncio.AbstractEventLoop | None = None
+_async_pool_lock: asyncio.Lock | None = None
+
+
+async def _init_connection(conn: asyncpg.Connection) -> None:
+    """Decode json/jsonb columns to Python objects, as psycopg2 does."""
+    for type_name in ("json", "jsonb"):
+        await conn.set_type_codec(
+            type_name, encoder=json.dumps, decoder=json.loads, schema="pg_catalog"
+        )
+
+
+def _sanitize(message: str) -> str:
+    """Mask passwords in error messages before logging."""
+    return re.sub(r"((?:password|pwd)=|://[^:/@\s]+:)([^&@\s]+)", r"\1***", message, flags=re.I)
+
+
+async def get_async_pool() -> asyncpg.Pool:
+    """
+    Get or create the asyncpg connection pool.
+
+    The pool is created lazily on first use. Statement timeouts are enforced with
+    asyncpg's command_timeout (cancels the query server-side) rather than a per-connection
+    SET, for Neon pooler compatibility. Prepared statements are cached per connection.
+    """
+    global _async_pool, _async_pool_loop, _async_pool_lock
+
+    loop = asyncio.get_running_loop()
+
+    if _async_pool is not None and _async_pool_loop is loop:
+        return _async_pool
+
+    if _async_pool_lock is None or _async_pool_loop is not loop:
+        _async_pool_lock = asyncio.Lock()
+        if _async_pool is not None:
+            # Pool belongs to a loop that is gone (e.g. test clients); connections can't be reused
+            _async_pool.terminate()
+            _async_pool = None
+        _async_pool_loop = loop
+
+    async with _async_pool_lock:
+        if _async_pool is None:
+            logger.info("Initializing async database connection pool")
+            try:
+                _async_pool = await asyncpg.create_pool(
+                    dsn=settings.database_url,
+                    min_size=settings.database_pool_min_size,
+                    max_size=settings.database_pool_max_size,
+                    statement_cache_size=settings.database_statement_cache_size,
+                    command_timeout=settings.database_command_timeout_seconds,
+                    init=_init_connection,
+                )
+                logger.info(
+                    f"Async database pool initialized: "
+                    f"{settings.database_pool_min_size}-{settings.database_pool_max_size} connections"
+                )
+            except Exception as e:
+                logger.error(f"Failed to initialize async database pool: {_sanitize(str(e))}")
+                raise
+
+    return _async_pool
+
+
+async def async_execute_query(query: str, *args: Any) -> str:
+    """
+    Execute a query that doesn't return results (INSERT, UPDATE, DELETE).
+
+    Args:
+        query: SQL query string with $n placeholders
+        *args: Query parameters
+
+    Returns:
+        Command status string (e.g. "UPDATE 3")
+    """
+    pool = await get_async_pool()
+    try:
+        with timed(query):
+            status: str = await pool.execute(query, *args)
+        logger.debug(f"Query executed: {status}")
+        return status
+    except Exception as e:
+        logger.error(f"Query failed: {_sanitize(str(e))}\nQuery: {query}")
+        raise
+
+
+async def async_fetch_one(query: str, *args: Any) -> dict[str, Any] | None:
+    """
+    Fetch a single row from the database.
+
+    Args:
+        query: SQL query string with $n placeholders
+        *args: Query parameters
+
+    Returns:
+        Single row as dict, or None if no results
+    """
+    pool = await get_async_pool()
+    with timed(query):
+        row = await pool.fetchrow(query, *args)
+    return dict(row) if row is not None else None
+
+
+async def async_fetch_all(query: str, *args: Any) -> list[dict[str, Any]]:
+    """
+    Fetch all rows from the database.
+
+    Args:
+        query: SQL query string with $n placeholders
+        *args: Query parameters
+
+    Returns:
+        List of rows as dicts
+    """
+    pool = await get_async_pool()
+    with timed(query):
+        rows = await pool.fetch(query, *args)
+    return [dict(row) for row in rows]
+
+
+async def async_fetch_val(query: str, *args: Any) -> Any:
+    """
+    Fetch the first column of the first row.
+
+    Args:
+        query: SQL query string with $n placeholders
+        *args: Query parameters
+
+    Returns:
+        Scalar value, or None if no results
+    """
+    pool = await get_async_pool()
+    with timed(query):
+        return await pool.fetchval(query, *args)
+
+
+async def close_async_pool() -> None:
+    """Close all connections in the async pool. Call on application shutdown."""
+    global _async_pool, _async_pool_loop, _async_pool_lock
+
+    if _async_pool is not None:
+        await _async_pool.close()
+        _async_pool = None
+        _async_pool_loop = None
+        _async_pool_lock = None
+        logger.info("Async database connection pool closed")
@@ -0,0 +1,612 @@
+"""
+Async twins of the hot read queries in queries.py, used by the FastAPI tier.
+Each function mirrors its sync counterpart's signature and return shape.
+"""
+
+import logging
+from typing import Any
+from uuid import UUID
+
+from .async_connection import async_fetch_all, async_fetch_one, async_fetch_val
+from .pagination import async_estimate_count
+from .queries import (
+    CALL_SUMMARY_COLUMNS,
+    CALLS_KEYSET,
+    OPPORTUNITY_TIMELINE_KEYSET,
+    call_summary_filters,
+    opportunity_keyset,
+)
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# SPEAKER QUERIES
+# ============================================================================
+
+
+async def get_all_speakers(
+    company_side_only: bool = True,
+    role_filter: str | None = None,
+    include_unassigned: bool = True,
+) -> list[dict[str, Any]]:
+    """
+    Get all speakers, optionally filtered by company_side and role.
+
+    Args:
+        company_side_only: If True, only return Prefect staff (company_side=true)
+        role_filter: Optional role to filter by ('ae', 'se', 'csm', 'support')
+        include_unassigned: If False, exclude speakers with role=NULL
+
+    Returns:
+        List of speaker dictionaries with unique speakers (distinct by email)
+        Fields: id, email, name, role, company_side, last_call_date, total_calls
+    """
+    where_clauses = []
+    params: list[Any] = []
+
+    if company_side_only:
+        where_clauses.append("company_side = true")
+
+    if role_filter:
+        params.append(role_filter)
+        where_clauses.append(f"role = ${len(params)}")
+
+    if not include_unassigned:
+        where_clauses.append("role IS NOT NULL")
+
+    where_sql = f"WHERE {' AND '.join(where_clauses)}" if where_clauses else ""
+
+    query = f"""
+        SELECT DISTINCT ON (email)
+            id,
+            email,
+            name,
+            role,
+            company_side,
+            (SELECT MIN(c.scheduled_at)
+             FROM calls c
+             JOIN speakers s2 ON s2.call_id = c.id
+             WHERE s2.email = speakers.email) as first_seen,
+            (SELECT MAX(c.scheduled_at)
+             FROM calls c
+             JOIN speakers s2 ON s2.call_id = c.id
+             WHERE s2.email = speakers.email) as last_call_date,
+            (SELECT COUNT(DISTINCT s3.call_id)
+             FROM speakers s3
+             WHERE s3.email = speakers.email) as total_calls
+        FROM speakers
+        {where_sql}
+        ORDER BY email, id DESC
+    """
+
+    return await async_fetch_all(query, *params)
+
+
+async def get_speakers_version() -> dict[str, Any] | None:
+    """
+    Get a cheap data version for get_all_speakers (for ETags).
+
+    New speaker rows change the count; role changes are logged to speaker_role_history
+    by trigger, so its latest changed_at moves with every role edit. first_seen and
+    last_call_date come from calls.scheduled_at, which has no updated_at, so the
+    version includes a sum of it: a rescheduled call changes the sum even when the
+    latest call date stays the same.
+
+    Returns:
+        Dict with speaker_count, last_role_change, last_call_at and call_schedule_sum
+    """
+    return await async_fetch_one("""
+        SELECT
+            (SELECT COUNT(*) FROM speakers) as speaker_count,
+            (SELECT MAX(changed_at) FROM speaker_role_history) as last_role_change,
+            calls.last_call_at,
+            calls.call_schedule_sum
+        FROM (
+            SELECT
+                MAX(scheduled_at) as last_call_at,
+                SUM(EXTRACT(EPOCH FROM scheduled_at)) as call_schedule_sum
+            FROM calls
+        ) calls
+        """)
+
+
+async def get_speaker_role(speaker_id: UUID) -> dict[str, Any] | None:
+    """
+    Get speaker with role information by speaker_id.
+
+    Args:
+        speaker_id: UUID of the speaker
+
+    Returns:
+        Dictionary with speaker details including role, or None if not found
+    """
+    return await async_fetch_one(
+        """
+        SELECT
+            id,
+            email,
+            name,
+            role,
+            company_side,
+            call_id,
+            talk_time_seconds,
+            talk_time_percentage,
+            speaker_id as gong_speaker_id,
+            manager_id
+        FROM speakers
+        WHERE id = $1
+        """,
+        str(speaker_id),
+    )
+
+
+async def get_speaker_role_history(speaker_id: UUID, limit: int = 50) -> list[dict[str, Any]]:
+    """
+    Get role change history for a speaker.
+
+    Args:
+        speaker_id: UUID of the speaker
+        limit: Maximum number of history entries to return (default: 50)
+
+    Returns:
+        List of history entries, ordered by most recent first
+    """
+    return await async_fetch_all(
+        """
+        SELECT
+            id,
+            speaker_id,
+            old_role,
+            new_role,
+            changed_by,
+            changed_at,
+            change_reason,
+            metadata
+        FROM speaker_role_history
+        WHERE speaker_id = $1
+        ORDER BY changed_at DESC
+        LIMIT $2
+        """,
+        str(speaker_id),
+        limit,
+    )
+
+
+# ============================================================================
+# RUBRIC QUERIES
+# ============================================================================
+
+
+async def get_rubric_criteria(role: str, dimension: str | None = None) -> list[dict[str, Any]]:
+    """
+    Get rubric criteria filtered by role and optionally by dimension.
+
+    Args:
+        role: Speaker role ('ae', 'se', 'csm', 'support')
+        dimension: Optional dimension filter. If None, returns all dimensions for role.
+
+    Returns:
+        List of rubric criteria ordered by display_order
+    """
+    columns = """
+            id,
+            role,
+            dimension,
+            criterion_name,
+            description,
+            weight,
+            max_score,
+            display_order,
+            created_at,
+            updated_at
+    """
+    if dimension:
+        return await async_fetch_all(
+            f"""
+            SELECT {columns}
+            FROM rubric_criteria
+            WHERE role = $1 AND dimension = $2
+            ORDER BY display_order ASC
+            """,
+            role,
+            dimension,
+        )
+    return await async_fetch_all(
+        f"""
+        SELECT {columns}
+        FROM rubric_criteria
+        WHERE role = $1
+        ORDER BY dimension ASC, display_order ASC
+        """,
+        role,
+    )
+
+
+async def get_rubric_criteria_version(
+    role: str, dimension: str | None = None
+) -> dict[str, Any] | None:
+    """
+    Get a cheap data version for get_rubric_criteria (for ETags).
+
+    Edits bump updated_at (trigger_rubric_criteria_updated_at), and creates and
+    deletes change the count.
+
+    Args:
+        role: Speaker role ('ae', 'se', 'csm', 'support')
+        dimension: Optional dimension filter
+
+    Returns:
+        Dict with criteria_count and last_updated
+    """
+    return await async_fetch_one(
+        """
+        SELECT COUNT(*) as criteria_count, MAX(updated_at) as last_updated
+        FROM rubric_criteria
+        WHERE role = $1 AND ($2::varchar IS NULL OR dimension = $2)
+        """,
+        role,
+        dimension,
+    )
+
+
+# ============================================================================
+# OPPORTUNITY QUERIES
+# ============================================================================
+
+
+async def get_opportunity(opp_id: str) -> dict[str, Any] | None:
+    """
+    Get opportunity with its call/email counts.
+
+    call_count, email_count and last_activity_at are columns kept current by
+    triggers on call_opportunities and emails (migration 019).
+
+    Args:
+        opp_id: Opportunity UUID
+
+    Returns:
+        Opportunity dict with call_count and email_count
+    """
+    return await async_fetch_one("SELECT * FROM opportunities WHERE id = $1", opp_id)
+
+
+async def get_opportunity_timeline_version(opp_id: str) -> dict[str, Any] | None:
+    """
+    Get a cheap data version for an opportunity's timeline (for ETags).
+
+    Calls are linked through call_opportunities and updated in place by sync
+    (title, scheduled_at, duration_seconds) without touching the opportunity row,
+    so the version hashes the fields the timeline shows for each call and email.
+
+    Args:
+        opp_id: Opportunity UUID
+
+    Returns:
+        Dict with calls_version and emails_version
+    """
+    return await async_fetch_one(
+        """
+        SELECT
+            (
+                SELECT SUM(
+                    hashtext(concat_ws('|', c.id, c.title, c.scheduled_at, c.duration_seconds))
+                )
+                FROM calls c
+                JOIN call_opportunities co ON c.id = co.call_id
+                WHERE co.opportunity_id = $1
+            ) as calls_version,
+            (
+                SELECT SUM(hashtext(concat_ws('|', e.id, e.subject, e.sender_email, e.sent_at)))
+                FROM emails e
+                WHERE e.opportunity_id = $1
+            ) as emails_version
+        """,
+        opp_id,
+    )
+
+
+async def get_opportunity_timeline(
+    opp_id: str,
+    limit: int = 20,
+    offset: int = 0,
+    cursor: str | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Get chronological timeline of calls and emails for an opportunity.
+
+    Args:
+        opp_id: Opportunity UUID
+        limit: Max items to return
+        offset: Number of items to skip (prefer cursor for paging)
+        cursor: Continue after the item this cursor was made from
+            (OPPORTUNITY_TIMELINE_KEYSET.cursor_for)
+
+    Returns:
+        List of timeline items with type field ('call' or 'email')
+
+    Raises:
+        InvalidCursorError: If cursor is not a timeline cursor
+    """
+    params: list[Any] = [opp_id]
+
+    def bind(value: Any) -> str:
+        params.append(value)
+        return f"${len(params)}"
+
+    seek = OPPORTUNITY_TIMELINE_KEYSET.condition(cursor, bind)
+    params.extend([limit, offset])
+
+    return await async_fetch_all(
+        f"""
+        SELECT * FROM (
+            -- Calls timeline
+            SELECT
+                'call' as item_type,
+                c.id,
+                c.gong_call_id,
+                c.title,
+                c.scheduled_at as timestamp,
+                c.duration,
+                NULL as subject,
+                NULL as sender_email
+            FROM calls c
+            JOIN call_opportunities co ON c.id = co.call_id
+            WHERE co.opportunity_id = $1
+
+            UNION ALL
+
+            -- Emails timeline
+            SELECT
+                'email' as item_type,
+                e.id,
+                e.gong_email_id,
+                NULL as title,
+                e.sent_at as timestamp,
+                NULL as duration,
+                e.subject,
+                e.sender_email
+            FROM emails e
+            WHERE e.opportunity_id = $1
+        ) timeline
+        WHERE {seek}
+        ORDER BY {OPPORTUNITY_TIMELINE_KEYSET.order_by()}
+        LIMIT ${len(params) - 1} OFFSET ${len(params)}
+        """,
+        *params,
+    )
+
+
+async def search_opportunities(
+    filters: dict[str, Any] | None = None,
+    sort: str = "updated_at",
+    sort_dir: str = "DESC",
+    limit: int = 50,
+    offset: int = 0,
+    cursor: str | None = None,
+    count: str = "exact",
+) -> tuple[list[dict[str, Any]], int | None]:
+    """
+    Search opportunities with filters, sorting, and pagination.
+
+    Args:
+        filters: Dict with optional keys: owner, stage, health_score_min, health_score_max, search
+        sort: Field to sort by (updated_at, last_activity_at, close_date, health_score, amount)
+        sort_dir: Sort direction (ASC or DESC)
+        limit: Max results to return
+        offset: Number of results to skip (prefer cursor for paging)
+        cursor: Continue after the row this cursor was made from
+            (opportunity_keyset(sort, sort_dir).cursor_for)
+        count: "exact" for COUNT(*), "estimate" for the planner's estimate, "none" to skip
+
+    Returns:
+        Tuple of (opportunities list, total count or None when count="none")
+
+    Raises:
+        InvalidCursorError: If cursor was made for a different sort order
+    """
+    filters = filters or {}
+
+    where_clauses = []
+    params: list[Any] = []
+
+    if "owner" in filters:
+        params.append(filters["owner"])
+        where_clauses.append(f"o.owner_email = ${len(params)}")
+
+    if "stage" in filters:
+        params.append(filters["stage"])
+        if isinstance(filters["stage"], list):
+            where_clauses.append(f"o.stage = ANY(${len(params)})")
+        else:
+            where_clauses.append(f"o.stage = ${len(params)}")
+
+    if "health_score_min" in filters:
+        params.append(filters["health_score_min"])
+        where_clauses.append(f"o.health_score >= ${len(params)}")
+
+    if "health_score_max" in filters:
+        params.append(filters["health_score_max"])
+        where_clauses.append(f"o.health_score <= ${len(params)}")
+
+    if "search" in filters:
+        params.append(f"%{filters['search']}%")
+        where_clauses.append(
+            f"(o.name ILIKE ${len(params)} OR o.account_name ILIKE ${len(params)})"
+        )
+
+    where_sql = "WHERE " + " AND ".join(where_clauses) if where_clauses else ""
+
+    total: int | None = None
+    if count == "exact":
+        total = await async_fetch_val(
+            f"SELECT COUNT(*) as total FROM opportunities o {where_sql}", *params
+        )
+        total = total or 0
+    elif count == "estimate":
+        total = await async_estimate_count(f"SELECT 1 FROM opportunities o {where_sql}", *params)
+
+    keyset = opportunity_keyset(sort, sort_dir)
+    page_params = list(params)
+
+    def bind(value: Any) -> str:
+        page_params.append(value)
+        return f"${len(page_params)}"
+
+    seek = keyset.condition(cursor, bind)
+    page_where = " AND ".join([*where_clauses, seek])
+    page_params.extend([limit, offset])
+
+    opportunities = await async_fetch_all(
+        f"""
+        SELECT o.*
+        FROM opportunities o
+        WHERE {page_where}
+        ORDER BY {keyset.order_by()}
+        LIMIT ${len(page_params) - 1} OFFSET ${len(page_params)}
+        """,
+        *page_params,
+    )
+
+    return opportunities, total
+
+
+# ============================================================================
+# SYNC STATUS QUERIES
+# ============================================================================
+
+
+async def get_sync_status(entity_type: str) -> dict[str, Any] | None:
+    """
+    Get last sync timestamp for entity type.
+
+    Args:
+        entity_type: Type of entity (opportunities, calls, emails)
+
+    Returns:
+        Sync status dict or None
+    """
+    return await async_fetch_one(
+        "SELECT * FROM sync_status WHERE entity_type = $1",
+        entity_type,
+    )
+
+
+# ============================================================================
+# USER QUERIES (RBAC)
+# ============================================================================
+
+
+async def get_user_by_email(email: str) -> dict[str, Any] | None:
+    """
+    Get user by email address.
+
+    Args:
+        email: User email address
+
+    Returns:
+        User dict with id, email, name, role, or None if not found
+    """
+    return await async_fetch_one(
+        "SELECT id, email, name, role, created_at, updated_at FROM users WHERE email = $1",
+        email,
+    )
+
+
+async def get_managed_reps(manager_email: str) -> list[dict[str, Any]]:
+    """
+    Get all reps managed by a specific manager.
+
+    Args:
+        manager_email: Manager's email address
+
+    Returns:
+        List of user dicts for reps reporting to this manager
+    """
+    return await async_fetch_all(
+        """
+        SELECT DISTINCT u.id, u.email, u.name, u.role
+        FROM users u
+        JOIN speakers s ON u.email = s.email
+        JOIN users m ON s.manager_id = m.id
+        WHERE m.email = $1
+        AND u.role = 'rep'
+        ORDER BY u.name
+        """,
+        manager_email,
+    )
+
+
+async def get_calls_for_user(
+    user_email: str,
+    role: str,
+    limit: int = 50,
+    cursor: str | None = None,
+    min_score: float | None = None,
+    max_score: float | None = None,
+    evaluated_role: str | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Get calls filtered by user role.
+    - Reps see only their own calls
+    - Managers see their team's calls
+    - Admins see all calls
+
+    Args:
+        user_email: User's email address
+        role: User's role ('admin', 'manager', 'rep')
+        limit: Maximum number of calls to return
+        cursor: Continue after the call this cursor was made from (CALLS_KEYSET.cursor_for)
+        min_score: Minimum overall score
+        max_score: Maximum overall score
+        evaluated_role: Only calls evaluated against this rubric role
+
+    Returns:
+        List of call dicts with their call_summary columns (CALL_SUMMARY_COLUMNS)
+
+    Raises:
+        InvalidCursorError: If cursor is not a calls cursor
+    """
+    params: list[Any] = []
+    if role == "admin":
+        visible = "TRUE"
+    elif role == "manager":
+        params.append(user_email)
+        visible = """EXISTS (
+                SELECT 1
+                FROM speakers s
+                JOIN users u ON s.email = u.email
+                JOIN speakers s2 ON u.email = s2.email
+                JOIN users manager ON s2.manager_id = manager.id
+                WHERE s.call_id = c.id
+                AND manager.email = $1
+            )"""
+    else:  # rep
+        params.append(user_email)
+        visible = """EXISTS (
+                SELECT 1
+                FROM speakers s
+                WHERE s.call_id = c.id
+                AND s.email = $1
+                AND s.company_side = true
+            )"""
+
+    def bind(value: Any) -> str:
+        params.append(value)
+        return f"${len(params)}"
+
+    conditions = [visible, *call_summary_filters(bind, min_score, max_score, evaluated_role)]
+    conditions.append(CALLS_KEYSET.condition(cursor, bind))
+    params.append(limit)
+
+    return await async_fetch_all(
+        f"""
+        SELECT c.*, {CALL_SUMMARY_COLUMNS}
+        FROM calls c
+        LEFT JOIN call_summary sm ON sm.call_id = c.id
+        WHERE {" AND ".join(conditions)}
+        ORDER BY {CALLS_KEYSET.order_by()}
+        LIMIT ${len(params)}
+        """,
+        *params,
+    )
@@ -0,0 +1,226 @@
+"""
+Bulk loading through COPY.
+
+Rows are streamed into a temporary staging table with COPY ... FROM STDIN (CSV) and
+merged into the target table with a single INSERT ... SELECT ... ON CONFLICT, instead
+of one INSERT (and often one existence check) per row. Used by the BigQuery import and
+sync scripts, where a historical import is millions of transcript sentences.
+
+DataFrames are written to COPY with pandas' vectorized to_csv in chunks, so only one
+chunk of CSV text is held in memory at a time. Prepare frames with vectorized
+transforms before loading; in particular, use the nullable "Int64" dtype for integer
+columns that may contain nulls (float columns would be written as "12.0").
+"""
+
+import io
+import logging
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from psycopg2 import sql
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_ROWS = 50_000
+
+# COPY's NULL marker. Written by to_csv for missing values, so empty strings stay empty
+# strings rather than turning into NULL.
+NULL_MARKER = r"\N"
+
+
+@dataclass
+class BulkLoadResult:
+    """Outcome of one bulk_merge call."""
+
+    table: str
+    rows_copied: int
+    inserted: int
+    updated: int
+    seconds: float
+
+    @property
+    def skipped(self) -> int:
+        """Staged rows that were neither inserted nor updated."""
+        return self.rows_copied - self.inserted - self.updated
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_copied / self.seconds if self.seconds > 0 else 0.0
+
+
+def copy_dataframe(
+    cursor: Any,
+    table: str,
+    df: "pd.DataFrame",
+    columns: Sequence[str] | None = None,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> int:
+    """
+    Stream a DataFrame into a table with COPY ... FROM STDIN.
+
+    Args:
+        cursor: psycopg2 cursor
+        table: Table to copy into (usually a staging table)
+        df: Rows to copy
+        columns: DataFrame columns to copy, in table column order (default: all)
+        chunk_rows: Rows rendered to CSV per COPY round trip
+
+    Returns:
+        Number of rows copied
+    """
+    columns = list(columns) if columns is not None else list(df.columns)
+    copy_sql = sql.SQL("COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv, NULL {null})").format(
+        table=sql.Identifier(table),
+        columns=sql.SQL(", ").join(map(sql.Identifier, columns)),
+        null=sql.Literal(NULL_MARKER),
+    )
+
+    frame = df[columns]
+    for start in range(0, len(frame), chunk_rows):
+        buffer = io.StringIO()
+        frame.iloc[start : start + chunk_rows].to_csv(
+            buffer, index=False, header=False, na_rep=NULL_MARKER
+        )
+        buffer.seek(0)
+        cursor.copy_expert(copy_sql, buffer)
+
+    return len(frame)
+
+
+def bulk_merge(
+    conn: Any,
+    table: str,
+    df: "pd.DataFrame",
+    stage_columns: dict[str, str],
+    *,
+    target_columns: Sequence[str] | None = None,
+    source: str | None = None,
+    conflict_columns: Sequence[str] | None = None,
+    update_columns: Sequence[str] = (),
+    touch_columns: Sequence[str] = (),
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+) -> BulkLoadResult:
+    """
+    COPY a DataFrame into a staging table and merge it into a table in one statement.
+
+    The staging table is a temporary table dropped on commit, so the load and the merge
+    are one transaction. Commits on success and rolls back on failure.
+
+    Args:
+        conn: psycopg2 connection
+        table: Target table
+        df: Rows to load; must contain the stage_columns
+        stage_columns: Staging table columns and their Postgres types, e.g.
+            {"gong_call_id": "varchar", "title": "varchar"}
+        target_columns: Target columns to insert (default: the stage columns)
+        source: SELECT producing target_columns from the staging table, referenced as
+            {stage}. Use it to resolve foreign keys or skip existing rows with a join.
+            Default: SELECT <target_columns> FROM {stage}
+        conflict_columns: ON CONFLICT target. When omitted, rows violating any unique
+            constraint are skipped (ON CONFLICT DO NOTHING)
+        update_columns: Columns overwritten from the new row on conflict (requires
+            conflict_columns). Rows whose values are unchanged are not rewritten
+        touch_columns: Columns set to NOW() when a row is updated, e.g. updated_at
+        chunk_rows: Rows rendered to CSV per COPY round trip
+
+    Returns:
+        BulkLoadResult with rows copied, inserted and updated
+    """
+    if update_columns and not conflict_columns:
+        raise ValueError("update_columns requires conflict_columns")
+
+    started = time.monotonic()
+    stage = f"{table}_stage"
+    target_columns = list(target_columns or stage_columns)
+
+    create_stage = sql.SQL("CREATE TEMP TABLE {stage} ({columns}) ON COMMIT DROP").format(
+        stage=sql.Identifier(stage),
+        columns=sql.SQL(", ").join(
+            sql.SQL("{} {}").format(sql.Identifier(name), sql.SQL(pg_type))
+            for name, pg_type in stage_columns.items()
+        ),
+    )
+
+    if source is None:
+        source_sql = sql.SQL("SELECT {columns} FROM {stage}").format(
+            columns=sql.SQL(", ").join(map(sql.Identifier, target_columns)),
+            stage=sql.Identifier(stage),
+        )
+    else:
+        source_sql = sql.SQL(source).format(stage=sql.Identifier(stage))
+
+    if not conflict_columns:
+        on_conflict = sql.SQL("ON CONFLICT DO NOTHING")
+    elif not update_columns:
+        on_conflict = sql.SQL("ON CONFLICT ({}) DO NOTHING").format(
+            sql.SQL(", ").join(map(sql.Identifier, conflict_columns))
+        )
+    else:
+        on_conflict = sql.SQL(
+            "ON CONFLICT ({conflict}) DO UPDATE SET {assignments} "
+            "WHERE ({current}) IS DISTINCT FROM ({excluded})"
+        ).format(
+            conflict=sql.SQL(", ").join(map(sql.Identifier, conflict_columns)),
+            assignments=sql.SQL(", ").join(
+                [
+                    sql.SQL("{col} = EXCLUDED.{col}").format(col=sql.Identifier(col))
+                    for col in update_columns
+                ]
+                + [sql.SQL("{} = NOW()").format(sql.Identifier(col)) for col in touch_columns]
+            ),
+            current=sql.SQL(", ").join(
+                sql.SQL("t.{}").format(sql.Identifier(col)) for col in update_columns
+            ),
+            excluded=sql.SQL(", ").join(
+                sql.SQL("EXCLUDED.{}").format(sql.Identifier(col)) for col in update_columns
+            ),
+        )
+
+    # xmax is 0 for freshly inserted rows and set for rows updated in place
+    merge = sql.SQL("""
+        WITH merged AS (
+            INSERT INTO {table} AS t ({columns})
+            {source}
+            {on_conflict}
+            RETURNING (xmax = 0) AS inserted
+        )
+        SELECT
+            COUNT(*) FILTER (WHERE inserted),
+            COUNT(*) FILTER (WHERE NOT inserted)
+        FROM merged
+        """).format(
+        table=sql.Identifier(table),
+        columns=sql.SQL(", ").join(map(sql.Identifier, target_columns)),
+        source=source_sql,
+        on_conflict=on_conflict,
+    )
+
+    with conn.cursor() as cur:
+        try:
+            cur.execute(create_stage)
+            copied = copy_dataframe(cur, stage, df, list(stage_columns), chunk_rows)
+            cur.execute(merge)
+            inserted, updated = cur.fetchone()
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    result = BulkLoadResult(
+        table=table,
+        rows_copied=copied,
+        inserted=inserted,
+        updated=updated,
+        seconds=time.monotonic() - started,
+    )
+    logger.info(
+        f"Bulk loaded {table}: {result.rows_copied} rows staged, {result.inserted} inserted, "
+        f"{result.updated} updated in {result.seconds:.2f}s "
+        f"({result.rows_per_second:,.0f} rows/s)"
+    )
+    return result
@@ -1,6 +1,9 @@
 """
 Database connection management with connection pooling.
 Uses psycopg2 for synchronous operations (Prefect flows, MCP tools).
+
+Writes go to the primary pool. fetch_one/fetch_all read from an optional replica pool
+(settings.database_replica_url); see db.replica for when reads fall back to the primary.
 """
 
 import logging
@@ -14,13 +17,22 @@ from psycopg2.extras import RealDictCursor
 
 from coaching_mcp.shared import settings
 
+from . import replica
+from .pool import InstrumentedConnectionPool
+
 logger = logging.getLogger(__name__)
 
-# Global connection pool
-_db_pool: pool.ThreadedConnectionPool | None = None
+# Global connection pools
+_db_pool: InstrumentedConnectionPool | None = None
+_replica_pool: InstrumentedConnectionPool | None = None
+_replica_monitor: replica.ReplicaMonitor | None = None
+
+# Applied once per physical connection. Set after connect rather than as startup
+# options for Neon pooler compatibility.
+SESSION_SETTINGS = {"statement_timeout": "30s"}
 
 
-def get_db_pool() -> pool.ThreadedConnectionPool:
+def get_db_pool() -> InstrumentedConnectionPool:
     """
     Get or create database connection pool.
     Thread-safe singleton pattern.
@@ -30,10 +42,13 @@ def get_db_pool() -> pool.ThreadedConnectionPool:
     if _db_pool is None:
         logger.info("Initializing database connection pool")
         try:
-            _db_pool = pool.ThreadedConnectionPool(
+            _db_pool = InstrumentedConnectionPool(
                 minconn=settings.database_pool_min_size,
                 maxconn=settings.database_pool_max_size,
                 dsn=settings.database_url,
+                session_settings=SESSION_SETTINGS,
+                checkout_timeout=settings.database_pool_timeout_seconds,
+                leak_threshold=settings.database_pool_leak_threshold_seconds,
             )
             logger.info(
                 f"Database pool initialized: "
@@ -53,11 +68,78 @@ def get_db_pool() -> pool.ThreadedConnectionPool:
     return _db_pool
 
 
+def get_replica_pool() -> InstrumentedConnectionPool | None:
+    """
+    Get or create the read replica connection pool.
+
+    Returns:
+        The replica pool, or None if no replica is configured
+    """
+    global _replica_pool
+
+    if not settings.database_replica_url:
+        return None
+
+    if _replica_pool is None:
+        logger.info("Initializing read replica connection pool")
+        _replica_pool = InstrumentedConnectionPool(
+            minconn=min(settings.database_pool_min_size, settings.database_replica_pool_max_size),
+            maxconn=settings.database_replica_pool_max_size,
+            dsn=settings.database_replica_url,
+            session_settings=SESSION_SETTINGS,
+            checkout_timeout=settings.database_pool_timeout_seconds,
+            leak_threshold=settings.database_pool_leak_threshold_seconds,
+            name="replica",
+        )
+
+    return _replica_pool
+
+
+def get_replica_monitor() -> replica.ReplicaMonitor:
+    """Get or create the replica lag monitor."""
+    global _replica_monitor
+
+    if _replica_monitor is None:
+        _replica_monitor = replica.ReplicaMonitor(
+            max_lag_seconds=settings.database_replica_max_lag_seconds,
+            check_interval_seconds=settings.database_replica_lag_check_seconds,
+        )
+    return _replica_monitor
+
+
+@contextmanager
+def _checkout(
+    db_pool: InstrumentedConnectionPool, conn: psycopg2.extensions.connection | None = None
+) -> Generator[psycopg2.extensions.connection, None, None]:
+    """
+    Check out a connection (or take one already checked out from db_pool) and return it
+    to the pool afterwards, validating it if the block raised.
+    """
+    if conn is None:
+        conn = db_pool.getconn()
+
+    failed = False
+    try:
+        yield conn
+    except BaseException:
+        failed = True
+        raise
+    finally:
+        if failed:
+            db_pool.putconn(conn, validate=True)
+        else:
+            db_pool.putconn(conn)
+
+
 @contextmanager
 def get_db_connection() -> Generator[psycopg2.extensions.connection, None, None]:
     """
     Context manager for getting a database connection from the pool.
-    Automatically returns connection to pool when done.
+    Automatically returns connection to pool when done. If the block raised,
+    the connection is validated and discarded if it is no longer usable.
+
+    This is the primary; using it counts as a write for read-your-writes routing, so
+    reads right after it in the same request don't go to a lagging replica.
 
     Usage:
         with get_db_connection() as conn:
@@ -65,17 +147,53 @@ def get_db_connection() -> Generator[psycopg2.extensions.connection, None, None]
                 cur.execute("SELECT * FROM calls")
                 results = cur.fetchall()
     """
-    db_pool = get_db_pool()
-    conn = db_pool.getconn()
-
     try:
-        # Set statement timeout per connection (30 seconds)
-        # This is done per-connection rather than in pool options for Neon pooler compatibility
-        with conn.cursor() as cur:
-            cur.execute("SET statement_timeout = '30s'")
-        yield conn
+        with _checkout(get_db_pool()) as conn:
+            yield conn
     finally:
-        db_pool.putconn(conn)
+        replica.mark_write()
+
+
+@contextmanager
+def get_read_connection() -> Generator[psycopg2.extensions.connection, None, None]:
+    """
+    Context manager for a connection to run read-only queries on.
+
+    Uses the replica pool when one is configured, it is within the lag limit and the
+    current request hasn't just written; otherwise the primary. A replica that can't
+    hand out a connection is skipped until its next check.
+    """
+    if not settings.database_replica_url:
+        with _checkout(get_db_pool()) as conn:
+            yield conn
+        return
+
+    monitor = get_replica_monitor()
+    reason = replica.primary_read_reason(settings.database_read_your_writes_seconds)
+    if reason is None:
+        reason = monitor.unusable_reason(get_replica_pool)
+
+    if reason is None:
+        replica_pool = get_replica_pool()
+        if replica_pool is None:
+            # Replica URL cleared since the check above
+            reason = "unavailable"
+        else:
+            try:
+                conn = replica_pool.getconn()
+            except (psycopg2.OperationalError, pool.PoolError) as e:
+                monitor.mark_unavailable(e)
+                reason = "unavailable"
+            else:
+                replica.READS_ROUTED.labels(pool="replica").inc()
+                with _checkout(replica_pool, conn) as conn:
+                    yield conn
+                return
+
+    replica.REPLICA_FALLBACKS.labels(reason=reason).inc()
+    replica.READS_ROUTED.labels(pool="primary").inc()
+    with _checkout(get_db_pool()) as conn:
+        yield conn
 
 
 def execute_query(
@@ -162,7 +280,7 @@ def fetch_one(
     as_dict: bool = True,
 ) -> dict[str, Any] | tuple[Any, ...] | None:
     """
-    Fetch a single row from the database.
+    Fetch a single row from the database (replica when configured, see get_read_connection).
 
     Args:
         query: SQL query string
@@ -172,7 +290,7 @@ def fetch_one(
     Returns:
         Single row as dict or tuple, or None if no results
     """
-    with get_db_connection() as conn:
+    with get_read_connection() as conn:
         cursor_factory = RealDictCursor if as_dict else None
         with conn.cursor(cursor_factory=cursor_factory) as cur:
             cur.execute(query, params)
@@ -202,7 +320,7 @@ def fetch_all(
     as_dict: bool = True,
 ) -> list[dict[str, Any]] | list[tuple[Any, ...]]:
     """
-    Fetch all rows from the database.
+    Fetch all rows from the database (replica when configured, see get_read_connection).
 
     Args:
         query: SQL query string
@@ -212,7 +330,7 @@ def fetch_all(
     Returns:
         List of rows as dicts or tuples
     """
-    with get_db_connection() as conn:
+    with get_read_connection() as conn:
         cursor_factory = RealDictCursor if as_dict else None
         with conn.cursor(cursor_factory=cursor_factory) as cur:
             cur.execute(query, params)
@@ -221,10 +339,16 @@ def fetch_all(
 
 
 def close_db_pool() -> None:
-    """Close all connections in the pool. Call on application shutdown."""
-    global _db_pool
+    """Close all connections in the pools. Call on application shutdown."""
+    global _db_pool, _replica_pool, _replica_monitor
 
     if _db_pool is not None:
         _db_pool.closeall()
         _db_pool = None
         logger.info("Database connection pool closed")
+
+    if _replica_pool is not None:
+        _replica_pool.closeall()
+        _replica_pool = None
+        logger.info("Read replica connection pool closed")
+    _replica_monitor = None
@@ -0,0 +1,24 @@
+-- Migration: 015_opportunity_cache_watermark.sql
+-- Purpose: Tie opportunity_analysis_cache freshness to the opportunity's data
+-- Date: 2026-10-18
+--
+-- Changes:
+-- 1. Add data_watermark column recording the opportunity data an entry was computed from
+-- 2. Drop legacy entries that cannot be validated against a watermark
+--
+-- The watermark is a SHA256 fingerprint of: max call timestamp, call count, max email
+-- timestamp, email count, and the session version (count + latest created_at) of the
+-- coaching sessions on the opportunity's calls. Entries whose watermark no longer matches
+-- are treated as misses, so the 7-day TTL is no longer needed.
+
+ALTER TABLE opportunity_analysis_cache
+    ADD COLUMN IF NOT EXISTS data_watermark VARCHAR(64);
+
+COMMENT ON COLUMN opportunity_analysis_cache.data_watermark IS
+    'SHA256 fingerprint of call/email timestamps and session versions the entry was computed from';
+
+-- Entries written before watermarks existed can never be validated; drop them
+DELETE FROM opportunity_analysis_cache WHERE data_watermark IS NULL;
+
+COMMENT ON TABLE opportunity_analysis_cache IS
+'Caches opportunity-level coaching analysis. Each entry records the data watermark it was computed from; link_call_to_opportunity, upsert_email and coaching session writes invalidate precisely, and mismatched watermarks are treated as misses.';
@@ -0,0 +1,14 @@
+-- Migration: 016_coaching_sessions_call_dimension_index.sql
+-- Purpose: Support batch "latest session per call and dimension" lookups
+-- Date: 2026-10-18
+--
+-- Changes:
+-- 1. Add (call_id, coaching_dimension, created_at DESC) index on coaching_sessions
+--
+-- get_latest_sessions_for_calls() fetches the newest session for many calls at once with
+-- DISTINCT ON (call_id, coaching_dimension) ... WHERE call_id = ANY(...). This index matches
+-- that ordering so each (call, dimension) group is read from the top of the index instead of
+-- sorting every session for the requested calls.
+
+CREATE INDEX IF NOT EXISTS idx_coaching_sessions_call_dimension
+    ON coaching_sessions(call_id, coaching_dimension, created_at DESC);
@@ -0,0 +1,93 @@
+-- Migration: 017_rep_dimension_weekly_scores.sql
+-- Purpose: Incrementally maintained rep/dimension/week score rollup for analytics
+-- Date: 2026-10-18
+--
+-- Changes:
+-- 1. Create rep_dimension_weekly_scores (sum, count, min, max and a 10-bucket histogram)
+-- 2. Add trigger on coaching_sessions that folds each new scored session into its row
+--
+-- Analytics (score trends, team averages, top performers, weekly reviews, rep insights)
+-- read this table instead of re-aggregating coaching_sessions joined to speakers, so their
+-- cost depends on the number of weeks requested rather than on session history.
+--
+-- Rows are keyed by rep email (speakers has one row per call, so speaker IDs aren't stable
+-- per rep) and by ISO week (week_start is the Monday, date_trunc('week', created_at)).
+-- Histogram bucket i (1-based) counts scores in [10*(i-1), 10*i - 1]; bucket 10 also holds 100.
+--
+-- Only inserts are folded in: sessions are immutable once stored, and rollups deliberately
+-- outlive raw sessions removed by partition retention. Use
+-- db.queries.rebuild_rep_dimension_weekly_scores() (scripts/backfill_score_rollups.py)
+-- to populate existing history or recompute weeks after manual edits.
+
+CREATE TABLE IF NOT EXISTS rep_dimension_weekly_scores (
+    rep_email VARCHAR(255) NOT NULL,
+    coaching_dimension VARCHAR(50) NOT NULL,
+    week_start DATE NOT NULL,
+    score_sum BIGINT NOT NULL DEFAULT 0,
+    score_count INT NOT NULL DEFAULT 0,
+    score_min INT,
+    score_max INT,
+    score_histogram INT[] NOT NULL DEFAULT '{0,0,0,0,0,0,0,0,0,0}',
+    updated_at TIMESTAMP DEFAULT NOW(),
+    PRIMARY KEY (rep_email, coaching_dimension, week_start)
+);
+
+-- Team-wide reads (team averages, top performers) filter by dimension and week range
+CREATE INDEX IF NOT EXISTS idx_rep_dimension_weekly_scores_dimension_week
+    ON rep_dimension_weekly_scores(coaching_dimension, week_start);
+
+CREATE OR REPLACE FUNCTION rollup_coaching_session_score()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_rep_email VARCHAR(255);
+    v_bucket INT;
+BEGIN
+    IF NEW.score IS NULL OR NEW.rep_id IS NULL THEN
+        RETURN NULL;
+    END IF;
+
+    SELECT email INTO v_rep_email FROM speakers WHERE id = NEW.rep_id;
+    IF v_rep_email IS NULL THEN
+        RETURN NULL;
+    END IF;
+
+    v_bucket := LEAST(NEW.score / 10, 9) + 1;
+
+    INSERT INTO rep_dimension_weekly_scores AS r (
+        rep_email, coaching_dimension, week_start,
+        score_sum, score_count, score_min, score_max, score_histogram
+    ) VALUES (
+        v_rep_email,
+        NEW.coaching_dimension,
+        date_trunc('week', COALESCE(NEW.created_at, NOW()))::date,
+        NEW.score,
+        1,
+        NEW.score,
+        NEW.score,
+        array_fill(0, ARRAY[v_bucket - 1]) || 1 || array_fill(0, ARRAY[10 - v_bucket])
+    )
+    ON CONFLICT (rep_email, coaching_dimension, week_start) DO UPDATE SET
+        score_sum = r.score_sum + EXCLUDED.score_sum,
+        score_count = r.score_count + 1,
+        score_min = LEAST(r.score_min, EXCLUDED.score_min),
+        score_max = GREATEST(r.score_max, EXCLUDED.score_max),
+        score_histogram[v_bucket] = r.score_histogram[v_bucket] + 1,
+        updated_at = NOW();
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$ BEGIN
+    CREATE TRIGGER trigger_rollup_coaching_session_score
+        AFTER INSERT ON coaching_sessions
+        FOR EACH ROW
+        EXECUTE FUNCTION rollup_coaching_session_score();
+EXCEPTION
+    WHEN duplicate_object THEN null;
+END $$;
+
+COMMENT ON TABLE rep_dimension_weekly_scores IS
+    'Per rep/dimension/ISO week score aggregates, maintained by trigger on coaching_sessions inserts';
+COMMENT ON FUNCTION rollup_coaching_session_score IS
+    'Folds a newly stored coaching session score into rep_dimension_weekly_scores';
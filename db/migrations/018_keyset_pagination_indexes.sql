@@ -0,0 +1,36 @@
+-- Migration: 018_keyset_pagination_indexes.sql
+-- Purpose: Index the sort keys used by cursor (keyset) pagination
+-- Date: 2026-10-18
+--
+-- Changes:
+-- 1. Opportunity list indexes for each API sort option, ending in id
+-- 2. Calls index on (scheduled_at, id) for the role-filtered call list
+-- 3. coaching_sessions index on (created_at, id) for the coaching feed
+--
+-- Keyset pages seek with a row comparison such as
+--   (COALESCE(updated_at, '-infinity'::timestamptz), id) < ($1, $2)
+-- NULLs are folded to +/-infinity so they sort last without an OR in the predicate.
+-- Each index below matches one of those expressions (see db/pagination.py and
+-- opportunity_keyset/CALLS_KEYSET in db/queries.py) so every page is a short index
+-- range scan, however deep.
+
+-- Opportunities: updated_desc (default), close_date_asc, amount_desc, name_asc
+CREATE INDEX IF NOT EXISTS idx_opportunities_keyset_updated
+    ON opportunities((COALESCE(updated_at, '-infinity'::timestamptz)) DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_opportunities_keyset_close_date
+    ON opportunities((COALESCE(close_date, 'infinity'::date)) ASC, id ASC);
+
+CREATE INDEX IF NOT EXISTS idx_opportunities_keyset_amount
+    ON opportunities((COALESCE(amount, '-infinity'::numeric)) DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_opportunities_keyset_name
+    ON opportunities(name ASC, id ASC);
+
+-- Calls: most recent first, unscheduled last
+CREATE INDEX IF NOT EXISTS idx_calls_keyset_scheduled
+    ON calls((COALESCE(scheduled_at, '-infinity'::timestamp)) DESC, id DESC);
+
+-- Coaching feed: newest sessions first (created_at is NOT NULL as part of the primary key)
+CREATE INDEX IF NOT EXISTS idx_coaching_sessions_keyset_created
+    ON coaching_sessions(created_at DESC, id DESC);
@@ -0,0 +1,206 @@
+-- Migration: 019_opportunity_activity_counters.sql
+-- Purpose: Store call/email counts and last activity on opportunities instead of
+--          aggregating call_opportunities and emails on every read
+-- Date: 2026-10-18
+--
+-- Changes:
+-- 1. Add call_count, email_count and last_activity_at columns to opportunities
+-- 2. Add refresh_opportunity_activity(ids) to recompute them for given (or all) opportunities
+-- 3. Statement-level triggers on call_opportunities and emails refresh the affected
+--    opportunities; inserted opportunities are filled in from existing activity
+-- 4. Backfill existing opportunities
+-- 5. Index last_activity_at for the "recent activity" sort
+--
+-- The triggers cover every writer: link_call_to_opportunity, upsert_email and the DLT
+-- merge into call_opportunities/emails. They use transition tables, so a bulk merge
+-- recomputes each touched opportunity once per statement rather than once per row.
+-- A change to calls.scheduled_at alone is not tracked (no trigger on calls); the
+-- reconciliation run after each DLT sync (queries.reconcile_opportunity_activity)
+-- picks that up along with any other drift.
+
+ALTER TABLE opportunities
+    ADD COLUMN IF NOT EXISTS call_count INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS email_count INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS last_activity_at TIMESTAMP WITH TIME ZONE;
+
+COMMENT ON COLUMN opportunities.call_count IS
+    'Number of linked calls, maintained by trigger on call_opportunities';
+COMMENT ON COLUMN opportunities.email_count IS
+    'Number of emails, maintained by trigger on emails';
+COMMENT ON COLUMN opportunities.last_activity_at IS
+    'Latest linked call scheduled_at or email sent_at, maintained by triggers';
+
+-- ============================================================================
+-- REFRESH FUNCTION
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION refresh_opportunity_activity(p_opportunity_ids UUID[] DEFAULT NULL)
+RETURNS INTEGER AS $$
+DECLARE
+    v_updated INTEGER;
+BEGIN
+    UPDATE opportunities o
+    SET call_count = a.call_count,
+        email_count = a.email_count,
+        last_activity_at = a.last_activity_at
+    FROM (
+        SELECT
+            op.id,
+            c.call_count,
+            e.email_count,
+            GREATEST(c.last_call_at, e.last_email_at) AS last_activity_at
+        FROM opportunities op
+        CROSS JOIN LATERAL (
+            SELECT COUNT(*) AS call_count, MAX(cl.scheduled_at)::timestamptz AS last_call_at
+            FROM call_opportunities co
+            JOIN calls cl ON cl.id = co.call_id
+            WHERE co.opportunity_id = op.id
+        ) c
+        CROSS JOIN LATERAL (
+            SELECT COUNT(*) AS email_count, MAX(em.sent_at) AS last_email_at
+            FROM emails em
+            WHERE em.opportunity_id = op.id
+        ) e
+        WHERE p_opportunity_ids IS NULL OR op.id = ANY(p_opportunity_ids)
+    ) a
+    WHERE o.id = a.id
+      AND (o.call_count, o.email_count, o.last_activity_at)
+          IS DISTINCT FROM (a.call_count, a.email_count, a.last_activity_at);
+
+    GET DIAGNOSTICS v_updated = ROW_COUNT;
+    RETURN v_updated;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION refresh_opportunity_activity IS
+    'Recomputes call_count, email_count and last_activity_at for the given opportunities '
+    '(all when NULL); returns the number of rows that changed';
+
+-- ============================================================================
+-- TRIGGERS
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION refresh_activity_for_call_links()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_ids UUID[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(DISTINCT opportunity_id) INTO v_ids FROM new_rows;
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT array_agg(DISTINCT opportunity_id) INTO v_ids FROM old_rows;
+    ELSE
+        SELECT array_agg(DISTINCT opportunity_id) INTO v_ids
+        FROM (
+            SELECT opportunity_id FROM new_rows
+            UNION
+            SELECT opportunity_id FROM old_rows
+        ) changed;
+    END IF;
+
+    IF v_ids IS NOT NULL THEN
+        PERFORM refresh_opportunity_activity(array_remove(v_ids, NULL));
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION refresh_activity_for_emails()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_ids UUID[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(DISTINCT opportunity_id) INTO v_ids FROM new_rows;
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT array_agg(DISTINCT opportunity_id) INTO v_ids FROM old_rows;
+    ELSE
+        -- Only rows whose opportunity or timestamp changed affect the counters
+        SELECT array_agg(DISTINCT moved.opportunity_id) INTO v_ids
+        FROM new_rows n
+        JOIN old_rows o ON o.id = n.id
+        CROSS JOIN LATERAL (VALUES (n.opportunity_id), (o.opportunity_id)) moved(opportunity_id)
+        WHERE (n.opportunity_id, n.sent_at) IS DISTINCT FROM (o.opportunity_id, o.sent_at);
+    END IF;
+
+    IF v_ids IS NOT NULL THEN
+        PERFORM refresh_opportunity_activity(array_remove(v_ids, NULL));
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- DLT merges opportunities with delete-insert, so re-synced rows come back with the
+-- column defaults; fill them in from their existing calls and emails
+CREATE OR REPLACE FUNCTION refresh_activity_for_new_opportunities()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_ids UUID[];
+BEGIN
+    SELECT array_agg(id) INTO v_ids FROM new_rows;
+    IF v_ids IS NOT NULL THEN
+        PERFORM refresh_opportunity_activity(v_ids);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Transition tables can't be shared across events, so each event gets its own trigger
+DO $$ BEGIN
+    CREATE TRIGGER trigger_call_links_activity_insert
+        AFTER INSERT ON call_opportunities
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION refresh_activity_for_call_links();
+    CREATE TRIGGER trigger_call_links_activity_update
+        AFTER UPDATE ON call_opportunities
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION refresh_activity_for_call_links();
+    CREATE TRIGGER trigger_call_links_activity_delete
+        AFTER DELETE ON call_opportunities
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION refresh_activity_for_call_links();
+EXCEPTION
+    WHEN duplicate_object THEN null;
+END $$;
+
+DO $$ BEGIN
+    CREATE TRIGGER trigger_emails_activity_insert
+        AFTER INSERT ON emails
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION refresh_activity_for_emails();
+    CREATE TRIGGER trigger_emails_activity_update
+        AFTER UPDATE ON emails
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION refresh_activity_for_emails();
+    CREATE TRIGGER trigger_emails_activity_delete
+        AFTER DELETE ON emails
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION refresh_activity_for_emails();
+EXCEPTION
+    WHEN duplicate_object THEN null;
+END $$;
+
+DO $$ BEGIN
+    CREATE TRIGGER trigger_opportunities_activity_insert
+        AFTER INSERT ON opportunities
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION refresh_activity_for_new_opportunities();
+EXCEPTION
+    WHEN duplicate_object THEN null;
+END $$;
+
+-- ============================================================================
+-- BACKFILL AND INDEXES
+-- ============================================================================
+
+SELECT refresh_opportunity_activity(NULL);
+
+CREATE INDEX IF NOT EXISTS idx_opportunities_keyset_activity
+    ON opportunities((COALESCE(last_activity_at, '-infinity'::timestamptz)) DESC, id DESC);
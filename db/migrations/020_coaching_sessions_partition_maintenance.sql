@@ -0,0 +1,65 @@
+-- Migration: 020_coaching_sessions_partition_maintenance.sql
+-- Purpose: Keep quarterly coaching_sessions partitions created ahead of time
+-- Date: 2026-10-18
+--
+-- Changes:
+-- 1. Add create_coaching_sessions_partitions(quarters_ahead, from) to create any missing
+--    quarterly partitions from the quarter containing `from` onwards
+-- 2. Create the partitions missing since 2026 Q3 plus four quarters ahead
+--
+-- 001 only created partitions through 2026 Q2, and inserts outside every partition fail.
+-- The function is idempotent; the partition_maintenance flow (flows/partition_maintenance.py)
+-- calls it on a schedule so there are always several quarters of headroom, and detaches
+-- or archives old quarters when a retention period is configured (db/partitions.py).
+--
+-- There is deliberately no DEFAULT partition: attaching a new quarter would then have to
+-- scan the default partition under lock and move any matching rows, and rows parked there
+-- defeat pruning. Failing loudly when maintenance has lapsed is the better trade-off.
+-- Indexes defined on coaching_sessions are created on each new partition automatically.
+
+-- ============================================================================
+-- PARTITION CREATION
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION create_coaching_sessions_partitions(
+    p_quarters_ahead INTEGER DEFAULT 4,
+    p_from DATE DEFAULT CURRENT_DATE
+)
+RETURNS SETOF TEXT AS $$
+DECLARE
+    v_start DATE := date_trunc('quarter', p_from)::date;
+    v_end DATE;
+    v_name TEXT;
+BEGIN
+    FOR i IN 0..p_quarters_ahead LOOP
+        v_end := (v_start + INTERVAL '3 months')::date;
+        v_name := format(
+            'coaching_sessions_%s_q%s',
+            to_char(v_start, 'YYYY'),
+            extract(quarter FROM v_start)
+        );
+
+        IF to_regclass(v_name) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE %I PARTITION OF coaching_sessions FOR VALUES FROM (%L) TO (%L)',
+                v_name, v_start, v_end
+            );
+            RETURN NEXT v_name;
+        END IF;
+
+        v_start := v_end;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION create_coaching_sessions_partitions IS
+    'Creates missing quarterly coaching_sessions partitions from the quarter containing '
+    'p_from through p_quarters_ahead quarters later; returns the names created';
+
+-- ============================================================================
+-- CATCH UP
+-- ============================================================================
+
+-- Fill the gap after 2026 Q2, then make sure the next four quarters exist
+SELECT create_coaching_sessions_partitions(6, DATE '2026-07-01');
+SELECT create_coaching_sessions_partitions(4);
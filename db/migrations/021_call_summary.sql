@@ -0,0 +1,218 @@
+-- Migration: 021_call_summary.sql
+-- Purpose: One denormalized row per call with its scores and participants, for call
+--          search and call lists
+-- Date: 2026-10-18
+--
+-- Changes:
+-- 1. Create call_summary (overall score, latest score per dimension, evaluated role,
+--    rep/customer name arrays, rep emails)
+-- 2. Add refresh_call_summary(ids) to recompute rows for given (or all) calls
+-- 3. Statement-level triggers on coaching_sessions and speakers refresh affected calls
+-- 4. Backfill and index the filter/sort columns
+--
+-- search_calls_tool used to aggregate AVG(score) over every coaching session and
+-- ARRAY_AGG over speakers for each candidate call; it and the call list endpoints now
+-- join this table on its primary key and filter on indexed columns.
+--
+-- overall_score keeps the previous definition (average of all scored sessions for the
+-- call), so search results and score filters are unchanged. dimension_scores holds the
+-- latest score per dimension and evaluated_role the rubric role of the latest session.
+-- A row is created the first time a call's speakers or sessions are written (the
+-- backfill covers existing calls); readers LEFT JOIN.
+-- Replaces the manual full-table UPDATE in scripts/update_overall_scores.py, which now
+-- just rebuilds this table.
+
+CREATE TABLE IF NOT EXISTS call_summary (
+    call_id UUID PRIMARY KEY REFERENCES calls(id) ON DELETE CASCADE,
+    overall_score NUMERIC(5,2),
+    scored_sessions INTEGER NOT NULL DEFAULT 0,
+    dimension_scores JSONB NOT NULL DEFAULT '{}',
+    evaluated_role VARCHAR(50),
+    rep_names TEXT[] NOT NULL DEFAULT '{}',
+    rep_emails TEXT[] NOT NULL DEFAULT '{}',
+    customer_names TEXT[] NOT NULL DEFAULT '{}',
+    last_analyzed_at TIMESTAMP,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+COMMENT ON TABLE call_summary IS
+    'Per-call scores and participants, maintained by triggers on coaching_sessions and speakers';
+COMMENT ON COLUMN call_summary.overall_score IS
+    'Average of all scored coaching sessions for the call';
+COMMENT ON COLUMN call_summary.dimension_scores IS
+    'Latest score per coaching dimension, e.g. {"discovery": 82}';
+COMMENT ON COLUMN call_summary.evaluated_role IS
+    'metadata.rubric_role of the latest coaching session (ae, se, csm)';
+
+-- ============================================================================
+-- REFRESH FUNCTION
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION refresh_call_summary(p_call_ids UUID[] DEFAULT NULL)
+RETURNS INTEGER AS $$
+DECLARE
+    v_updated INTEGER;
+BEGIN
+    INSERT INTO call_summary AS cs (
+        call_id, overall_score, scored_sessions, dimension_scores, evaluated_role,
+        rep_names, rep_emails, customer_names, last_analyzed_at, updated_at
+    )
+    SELECT
+        c.id,
+        sc.overall_score,
+        sc.scored_sessions,
+        COALESCE(latest.dimension_scores, '{}'),
+        latest.evaluated_role,
+        COALESCE(sp.rep_names, '{}'),
+        COALESCE(sp.rep_emails, '{}'),
+        COALESCE(sp.customer_names, '{}'),
+        sc.last_analyzed_at,
+        NOW()
+    FROM calls c
+    CROSS JOIN LATERAL (
+        SELECT
+            ROUND(AVG(s.score), 2) AS overall_score,
+            COUNT(s.score) AS scored_sessions,
+            MAX(s.created_at) AS last_analyzed_at
+        FROM coaching_sessions s
+        WHERE s.call_id = c.id
+    ) sc
+    CROSS JOIN LATERAL (
+        SELECT
+            jsonb_object_agg(d.coaching_dimension, d.score)
+                FILTER (WHERE d.score IS NOT NULL) AS dimension_scores,
+            (array_agg(d.rubric_role ORDER BY d.created_at DESC)
+                FILTER (WHERE d.rubric_role IS NOT NULL))[1] AS evaluated_role
+        FROM (
+            SELECT DISTINCT ON (s.coaching_dimension)
+                s.coaching_dimension, s.score, s.created_at,
+                s.metadata->>'rubric_role' AS rubric_role
+            FROM coaching_sessions s
+            WHERE s.call_id = c.id
+            ORDER BY s.coaching_dimension, s.created_at DESC
+        ) d
+    ) latest
+    CROSS JOIN LATERAL (
+        SELECT
+            array_agg(DISTINCT p.name ORDER BY p.name) FILTER (WHERE p.company_side) AS rep_names,
+            array_agg(DISTINCT p.email ORDER BY p.email)
+                FILTER (WHERE p.company_side AND p.email IS NOT NULL) AS rep_emails,
+            array_agg(DISTINCT p.name ORDER BY p.name)
+                FILTER (WHERE NOT p.company_side) AS customer_names
+        FROM speakers p
+        WHERE p.call_id = c.id
+    ) sp
+    WHERE p_call_ids IS NULL OR c.id = ANY(p_call_ids)
+    ON CONFLICT (call_id) DO UPDATE SET
+        overall_score = EXCLUDED.overall_score,
+        scored_sessions = EXCLUDED.scored_sessions,
+        dimension_scores = EXCLUDED.dimension_scores,
+        evaluated_role = EXCLUDED.evaluated_role,
+        rep_names = EXCLUDED.rep_names,
+        rep_emails = EXCLUDED.rep_emails,
+        customer_names = EXCLUDED.customer_names,
+        last_analyzed_at = EXCLUDED.last_analyzed_at,
+        updated_at = NOW()
+    WHERE (cs.overall_score, cs.scored_sessions, cs.dimension_scores, cs.evaluated_role,
+           cs.rep_names, cs.rep_emails, cs.customer_names, cs.last_analyzed_at)
+          IS DISTINCT FROM
+          (EXCLUDED.overall_score, EXCLUDED.scored_sessions, EXCLUDED.dimension_scores,
+           EXCLUDED.evaluated_role, EXCLUDED.rep_names, EXCLUDED.rep_emails,
+           EXCLUDED.customer_names, EXCLUDED.last_analyzed_at);
+
+    GET DIAGNOSTICS v_updated = ROW_COUNT;
+    RETURN v_updated;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION refresh_call_summary IS
+    'Recomputes call_summary rows for the given calls (all when NULL); returns the number '
+    'of rows inserted or changed';
+
+-- ============================================================================
+-- TRIGGERS
+-- ============================================================================
+
+-- Shared by coaching_sessions and speakers: both carry call_id
+CREATE OR REPLACE FUNCTION refresh_call_summary_for_rows()
+RETURNS TRIGGER AS $$
+DECLARE
+    v_ids UUID[];
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(DISTINCT call_id) INTO v_ids FROM new_rows;
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT array_agg(DISTINCT call_id) INTO v_ids FROM old_rows;
+    ELSE
+        SELECT array_agg(DISTINCT call_id) INTO v_ids
+        FROM (
+            SELECT call_id FROM new_rows
+            UNION
+            SELECT call_id FROM old_rows
+        ) changed;
+    END IF;
+
+    IF v_ids IS NOT NULL THEN
+        PERFORM refresh_call_summary(v_ids);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Transition tables can't be shared across events, so each event gets its own trigger
+DO $$ BEGIN
+    CREATE TRIGGER trigger_coaching_sessions_call_summary_insert
+        AFTER INSERT ON coaching_sessions
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION refresh_call_summary_for_rows();
+    CREATE TRIGGER trigger_coaching_sessions_call_summary_update
+        AFTER UPDATE ON coaching_sessions
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION refresh_call_summary_for_rows();
+    CREATE TRIGGER trigger_coaching_sessions_call_summary_delete
+        AFTER DELETE ON coaching_sessions
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION refresh_call_summary_for_rows();
+EXCEPTION
+    WHEN duplicate_object THEN null;
+END $$;
+
+DO $$ BEGIN
+    CREATE TRIGGER trigger_speakers_call_summary_insert
+        AFTER INSERT ON speakers
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION refresh_call_summary_for_rows();
+    CREATE TRIGGER trigger_speakers_call_summary_update
+        AFTER UPDATE ON speakers
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION refresh_call_summary_for_rows();
+    CREATE TRIGGER trigger_speakers_call_summary_delete
+        AFTER DELETE ON speakers
+        REFERENCING OLD TABLE AS old_rows
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION refresh_call_summary_for_rows();
+EXCEPTION
+    WHEN duplicate_object THEN null;
+END $$;
+
+-- ============================================================================
+-- BACKFILL AND INDEXES
+-- ============================================================================
+
+SELECT refresh_call_summary(NULL);
+
+-- Score range filters and "best calls" sorts
+CREATE INDEX IF NOT EXISTS idx_call_summary_overall_score
+    ON call_summary(overall_score DESC NULLS LAST);
+
+-- Rep filter: rep_emails @> ARRAY['rep@example.com']
+CREATE INDEX IF NOT EXISTS idx_call_summary_rep_emails
+    ON call_summary USING GIN (rep_emails);
+
+CREATE INDEX IF NOT EXISTS idx_call_summary_evaluated_role
+    ON call_summary(evaluated_role) WHERE evaluated_role IS NOT NULL;
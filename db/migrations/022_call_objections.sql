@@ -0,0 +1,53 @@
+-- Migration: 022_call_objections.sql
+-- Purpose: Store objections extracted from objection-handling analyses as rows
+-- Date: 2026-10-18
+--
+-- Changes:
+-- 1. Create call_objections (type, quote, timestamps, resolution) per objection
+-- 2. Index by type (objection search) and by rep/date (recurring-objection reports)
+--
+-- Objections used to be found with ILIKE over coaching_sessions.full_analysis
+-- (search_calls_tool) or re-classified in Python from specific_examples on every weekly
+-- review run. They are now extracted once when an objection-handling session is stored
+-- (analysis/objections.py, called from analysis.cache.store_analysis_with_cache).
+-- Each call keeps only the objections from its latest objection-handling analysis.
+--
+-- objection_type is one of pricing, timing, technical_fit, competitive, other.
+-- created_at is copied from the source session, so backfilled rows keep their analysis date.
+-- coaching_session_id references coaching_sessions(id) without an FK (partitioned table).
+-- Existing sessions are loaded by scripts/backfill_call_objections.py.
+
+CREATE TABLE IF NOT EXISTS call_objections (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    call_id UUID NOT NULL REFERENCES calls(id) ON DELETE CASCADE,
+    coaching_session_id UUID NOT NULL,
+    rep_id UUID REFERENCES speakers(id) ON DELETE SET NULL,
+    objection_type VARCHAR(50) NOT NULL,
+    quote TEXT,
+    timestamp_start INTEGER,
+    timestamp_end INTEGER,
+    resolved BOOLEAN,
+    handled_well BOOLEAN,
+    created_at TIMESTAMP DEFAULT NOW(),
+
+    CONSTRAINT valid_objection_type CHECK (
+        objection_type IN ('pricing', 'timing', 'technical_fit', 'competitive', 'other')
+    )
+);
+
+-- search_calls_tool(has_objection_type=...): EXISTS on (call_id, objection_type)
+CREATE INDEX IF NOT EXISTS idx_call_objections_type_call
+    ON call_objections(objection_type, call_id);
+
+-- Replacing a call's objections and joining from calls
+CREATE INDEX IF NOT EXISTS idx_call_objections_call
+    ON call_objections(call_id);
+
+-- Weekly recurring-objection report: one rep over a date range, grouped by type
+CREATE INDEX IF NOT EXISTS idx_call_objections_rep_created
+    ON call_objections(rep_id, created_at);
+
+COMMENT ON TABLE call_objections IS
+    'Objections extracted from the latest objection-handling analysis of each call';
+COMMENT ON COLUMN call_objections.handled_well IS
+    'True for exchanges the analysis cited as good handling, false for needs-work, NULL if unknown';
@@ -0,0 +1,83 @@
+-- Migration: 023_speaker_role_history_batched.sql
+-- Purpose: Log speaker role changes with one INSERT per statement instead of per row
+-- Date: 2026-10-18
+--
+-- Changes:
+-- 1. Replace the row-level trigger_log_speaker_role_changes with statement-level
+--    INSERT and UPDATE triggers that read transition tables
+-- 2. Keep the history rows identical (changed_by from app.current_user, same
+--    change_reason and metadata)
+--
+-- queries.bulk_update_speaker_roles now updates every speaker in a single
+-- UPDATE ... FROM unnest(...). With the row-level trigger that statement still issued
+-- one history INSERT per speaker; these triggers write all of a statement's history
+-- rows in one INSERT ... SELECT, so role assignments for large teams cost a constant
+-- number of statements.
+
+CREATE OR REPLACE FUNCTION log_speaker_role_changes_batch()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        -- Only log if role is not NULL (skip initial NULL assignments)
+        INSERT INTO speaker_role_history (
+            speaker_id, old_role, new_role, changed_by, change_reason, metadata
+        )
+        SELECT
+            n.id,
+            NULL,
+            n.role,
+            COALESCE(current_setting('app.current_user', true), 'system'),
+            'Initial role assignment',
+            jsonb_build_object('trigger', 'INSERT')
+        FROM new_rows n
+        WHERE n.role IS NOT NULL;
+
+    ELSIF TG_OP = 'UPDATE' THEN
+        -- Only log if role actually changed
+        INSERT INTO speaker_role_history (
+            speaker_id, old_role, new_role, changed_by, change_reason, metadata
+        )
+        SELECT
+            n.id,
+            o.role,
+            n.role,
+            COALESCE(current_setting('app.current_user', true), 'system'),
+            CASE
+                WHEN n.role IS NULL THEN 'Role removed'
+                WHEN o.role IS NULL THEN 'Role assigned'
+                ELSE 'Role changed'
+            END,
+            jsonb_build_object(
+                'trigger', 'UPDATE',
+                'old_role', o.role::text,
+                'new_role', n.role::text
+            )
+        FROM new_rows n
+        JOIN old_rows o ON o.id = n.id
+        WHERE o.role IS DISTINCT FROM n.role;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION log_speaker_role_changes_batch IS
+    'Logs all role changes made by a statement on speakers to speaker_role_history in one insert';
+
+DROP TRIGGER IF EXISTS trigger_log_speaker_role_changes ON speakers;
+
+-- Transition tables can't be shared across events, so each event gets its own trigger
+DO $$ BEGIN
+    CREATE TRIGGER trigger_log_speaker_role_changes_insert
+        AFTER INSERT ON speakers
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION log_speaker_role_changes_batch();
+    CREATE TRIGGER trigger_log_speaker_role_changes_update
+        AFTER UPDATE ON speakers
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT
+        EXECUTE FUNCTION log_speaker_role_changes_batch();
+EXCEPTION
+    WHEN duplicate_object THEN null;
+END $$;
@@ -0,0 +1,31 @@
+-- Migration: 024_coaching_rubrics_updated_at.sql
+-- Purpose: Give coaching_rubrics an updated_at watermark for conditional GET
+-- Date: 2026-10-18
+--
+-- Changes:
+-- 1. Add coaching_rubrics.updated_at (existing rows get the migration time)
+-- 2. Keep it current with a BEFORE UPDATE trigger (same shape as rubric_criteria)
+--
+-- GET /knowledge/rubrics derives its ETag from COUNT(*) and MAX(updated_at) over the
+-- matching rubrics. New versions bump the count, and the trigger catches in-place
+-- edits (examples, active) and deprecation, so the ETag changes whenever the listed
+-- payload does.
+
+ALTER TABLE coaching_rubrics ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP DEFAULT NOW();
+
+CREATE OR REPLACE FUNCTION update_coaching_rubrics_updated_at()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at = NOW();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DO $$ BEGIN
+    CREATE TRIGGER trigger_coaching_rubrics_updated_at
+        BEFORE UPDATE ON coaching_rubrics
+        FOR EACH ROW
+        EXECUTE FUNCTION update_coaching_rubrics_updated_at();
+EXCEPTION
+    WHEN duplicate_object THEN null;
+END $$;
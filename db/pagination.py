@@ -3,10 +3,22 @@ Database query pagination utilities.
 
 Provides cursor-based and offset-based pagination for efficient
 query result handling.
+
+Cursor (keyset) pagination seeks past the last row of the previous page with a
+row-value comparison on the sort key, so page 50 costs the same as page 1.
+Cursors are opaque base64url tokens; clients must pass them back unchanged.
 """
 
+import base64
+import binascii
+import json
 import logging
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from datetime import date, datetime
+from decimal import Decimal
 from typing import Any, Generic, TypeVar
+from uuid import UUID
 
 from pydantic import BaseModel, Field
 
@@ -15,6 +27,246 @@ logger = logging.getLogger(__name__)
 T = TypeVar("T")
 
 
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor is malformed or belongs to a different sort order."""
+
+
+# ============================================================================
+# CURSOR ENCODING
+# ============================================================================
+
+
+def _encode_value(value: Any) -> Any:
+    """Tag values JSON can't round-trip so they decode to the same Python type."""
+    if isinstance(value, datetime):
+        return {"$dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"$d": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"$dec": str(value)}
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "$dt" in value:
+            return datetime.fromisoformat(value["$dt"])
+        if "$d" in value:
+            return date.fromisoformat(value["$d"])
+        if "$dec" in value:
+            return Decimal(value["$dec"])
+    return value
+
+
+def encode_cursor(values: Sequence[Any], scope: str = "") -> str:
+    """
+    Encode sort key values as an opaque cursor.
+
+    Args:
+        values: Sort key values of the last row on the page
+        scope: Identifies the sort order; decode_cursor rejects cursors from another scope
+
+    Returns:
+        URL-safe cursor string
+    """
+    payload = json.dumps(
+        {"s": scope, "v": [_encode_value(v) for v in values]}, separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, scope: str = "", size: int | None = None) -> list[Any]:
+    """
+    Decode a cursor created by encode_cursor.
+
+    Args:
+        cursor: Cursor string from a previous page
+        scope: Expected sort order scope
+        size: Expected number of key values
+
+    Returns:
+        Sort key values
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed or from a different scope
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values = [_decode_value(v) for v in payload["v"]]
+        cursor_scope = payload["s"]
+    except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError) as e:
+        raise InvalidCursorError("Invalid pagination cursor") from e
+
+    if cursor_scope != scope or (size is not None and len(values) != size):
+        raise InvalidCursorError("Pagination cursor does not match this query's sort order")
+    return values
+
+
+# ============================================================================
+# KEYSET PAGINATION
+# ============================================================================
+
+
+@dataclass(frozen=True)
+class SortKey:
+    """
+    One column of a keyset sort order.
+
+    Attributes:
+        column: SQL expression to sort on (e.g. "o.updated_at")
+        field: Key of the column in result rows (e.g. "updated_at")
+        nulls: SQL sentinel substituted for NULL so NULLs sort last without breaking
+            the row comparison (e.g. "'-infinity'::timestamptz" for a DESC timestamp).
+            Leave unset for NOT NULL columns.
+    """
+
+    column: str
+    field: str
+    nulls: str | None = None
+
+    @property
+    def expression(self) -> str:
+        return f"COALESCE({self.column}, {self.nulls})" if self.nulls else self.column
+
+
+@dataclass(frozen=True)
+class Keyset:
+    """
+    A keyset sort order: sort keys ending in a unique tiebreaker, all in one direction.
+
+    A single direction lets the seek predicate be one row-value comparison, which
+    Postgres can answer from an index on the same expressions.
+
+    Usage:
+        nulls = nulls_last("timestamp", descending=True)
+        keyset = Keyset(
+            (SortKey("c.scheduled_at", "scheduled_at", nulls), SortKey("c.id", "id")),
+            descending=True,
+        )
+        params = [...]
+        where = keyset.condition(cursor, bind=lambda v: params.append(v) or "%s")
+        sql = f"... WHERE {where} ORDER BY {keyset.order_by()} LIMIT %s"
+        items, next_cursor = keyset.paginate(fetch_all(sql, params + [limit + 1]), limit)
+    """
+
+    keys: tuple[SortKey, ...]
+    descending: bool = False
+
+    @property
+    def scope(self) -> str:
+        direction = "desc" if self.descending else "asc"
+        return ",".join(key.field for key in self.keys) + ":" + direction
+
+    def order_by(self) -> str:
+        """ORDER BY list matching the seek predicate."""
+        direction = "DESC" if self.descending else "ASC"
+        return ", ".join(f"{key.expression} {direction}" for key in self.keys)
+
+    def condition(self, cursor: str | None, bind: Callable[[Any], str]) -> str:
+        """
+        Seek predicate for rows after the cursor.
+
+        Args:
+            cursor: Cursor from the previous page, or None for the first page
+            bind: Registers a parameter value and returns its placeholder
+                ("%s" for psycopg2, "$n" for asyncpg)
+
+        Returns:
+            SQL boolean expression ("TRUE" when there is no cursor)
+
+        Raises:
+            InvalidCursorError: If the cursor is invalid for this keyset
+        """
+        if not cursor:
+            return "TRUE"
+        values = decode_cursor(cursor, self.scope, len(self.keys))
+
+        placeholders = []
+        for key, value in zip(self.keys, values, strict=True):
+            placeholder = bind(value)
+            placeholders.append(
+                f"COALESCE({placeholder}, {key.nulls})" if key.nulls else placeholder
+            )
+
+        operator = "<" if self.descending else ">"
+        columns = ", ".join(key.expression for key in self.keys)
+        return f"({columns}) {operator} ({', '.join(placeholders)})"
+
+    def cursor_for(self, row: dict[str, Any]) -> str:
+        """Cursor pointing just past the given row."""
+        return encode_cursor([row.get(key.field) for key in self.keys], self.scope)
+
+    def paginate(
+        self, rows: list[dict[str, Any]], limit: int
+    ) -> tuple[list[dict[str, Any]], str | None]:
+        """
+        Split a limit + 1 fetch into the page and the cursor for the next page.
+
+        Args:
+            rows: Query results fetched with LIMIT limit + 1
+            limit: Page size
+
+        Returns:
+            Tuple of (page rows, next cursor or None on the last page)
+        """
+        if len(rows) <= limit:
+            return rows, None
+        page = rows[:limit]
+        return page, self.cursor_for(page[-1])
+
+
+def nulls_last(sql_type: str, descending: bool) -> str:
+    """
+    NULL sentinel that sorts after every value of sql_type in the given direction.
+
+    Args:
+        sql_type: Postgres type with an infinity value (timestamp, timestamptz, date, numeric)
+        descending: Whether the sort key is descending
+
+    Returns:
+        SQL literal, e.g. "'-infinity'::timestamptz"
+    """
+    return f"'{'-' if descending else ''}infinity'::{sql_type}"
+
+
+def _plan_rows(plan: Any) -> int:
+    """Extract the planner's row estimate from EXPLAIN (FORMAT JSON) output."""
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def estimate_count(query: str, params: Any = None) -> int:
+    """
+    Approximate row count for a query from the planner's estimate.
+
+    Costs one planning pass instead of a full COUNT(*) scan. Accuracy depends on
+    table statistics, so only use it for "about N results" style totals.
+
+    Args:
+        query: SELECT query (psycopg2 placeholders)
+        params: Query parameters
+
+    Returns:
+        Estimated number of rows
+    """
+    from db.connection import fetch_one
+
+    row = fetch_one(f"EXPLAIN (FORMAT JSON) {query}", params)
+    return _plan_rows(next(iter(row.values()))) if row else 0
+
+
+async def async_estimate_count(query: str, *args: Any) -> int:
+    """Async twin of estimate_count for asyncpg queries ($n placeholders)."""
+    from db.async_connection import async_fetch_val
+
+    plan = await async_fetch_val(f"EXPLAIN (FORMAT JSON) {query}", *args)
+    return _plan_rows(plan) if plan else 0
+
+
 class PaginationParams(BaseModel):
     """Parameters for pagination."""
 
@@ -116,9 +368,10 @@ class CursorPaginatedResult(BaseModel, Generic[T]):
             # Get cursor value from last item
             last_item = items_to_return[-1]
             if isinstance(last_item, dict):
-                next_cursor = str(last_item.get(cursor_field))
+                value = last_item.get(cursor_field)
             else:
-                next_cursor = str(getattr(last_item, cursor_field))
+                value = getattr(last_item, cursor_field)
+            next_cursor = encode_cursor([value], cursor_field)
 
         return cls(
             items=items_to_return,
@@ -155,30 +408,38 @@ def add_cursor_pagination_to_query(
     """
     Add cursor-based pagination to SQL query.
 
+    The base query is wrapped as a subquery, so it may already have its own
+    WHERE clause. cursor_field must be unique and NOT NULL; use Keyset for
+    compound or nullable sort keys.
+
     Args:
         base_query: Base SQL query
         cursor_field: Field to use for cursor
-        cursor_value: Current cursor value (None for first page)
+        cursor_value: Cursor from CursorPaginatedResult.next_cursor (None for first page)
         limit: Items per page
         order: Sort order (ASC or DESC)
 
     Returns:
         Tuple of (query with cursor filter, query params)
+
+    Raises:
+        InvalidCursorError: If cursor_value is not a cursor for cursor_field
     """
-    params = []
+    params: list[Any] = []
+    order = "DESC" if order.upper() == "DESC" else "ASC"
+    query = f"SELECT * FROM ({base_query}) AS page"
 
     # Add cursor filter if provided
     if cursor_value:
         operator = ">" if order == "ASC" else "<"
-        cursor_filter = f" WHERE {cursor_field} {operator} %s"
-        base_query += cursor_filter
-        params.append(cursor_value)
+        query += f" WHERE {cursor_field} {operator} %s"
+        params.extend(decode_cursor(cursor_value, cursor_field, 1))
 
     # Add ordering and limit (fetch 1 extra to determine if there's a next page)
-    base_query += f" ORDER BY {cursor_field} {order} LIMIT %s"
+    query += f" ORDER BY {cursor_field} {order} LIMIT %s"
     params.append(limit + 1)
 
-    return base_query, params
+    return query, params
 
 
 # ============================================================================
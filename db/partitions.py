@@ -0,0 +1,165 @@
+"""
+Partition maintenance for coaching_sessions.
+
+coaching_sessions is range-partitioned on created_at into quarterly tables named
+coaching_sessions_<year>_q<n>. This module:
+- Creates partitions ahead of time (via create_coaching_sessions_partitions from
+  migration 020) so inserts never run past the last partition
+- Optionally detaches partitions older than a retention period, and moves them into an
+  archive schema so they stay queryable without being scanned by the live table
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+from datetime import date
+
+from psycopg2 import sql
+
+from .connection import fetch_all, get_db_connection
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "coaching_sessions"
+_PARTITION_NAME = re.compile(r"^coaching_sessions_(\d{4})_q([1-4])$")
+
+
+@dataclass(frozen=True)
+class Partition:
+    """A quarterly coaching_sessions partition covering [start, end)."""
+
+    name: str
+    start: date
+    end: date
+
+
+def quarter_start(day: date) -> date:
+    """First day of the quarter containing day."""
+    return date(day.year, 3 * ((day.month - 1) // 3) + 1, 1)
+
+
+def shift_quarters(day: date, quarters: int) -> date:
+    """First day of the quarter `quarters` away from the one containing day."""
+    index = day.year * 4 + (day.month - 1) // 3 + quarters
+    return date(index // 4, 3 * (index % 4) + 1, 1)
+
+
+def parse_partition_name(name: str) -> Partition | None:
+    """
+    Derive a partition's bounds from its name.
+
+    Returns:
+        Partition, or None if the name doesn't follow the quarterly naming scheme
+    """
+    match = _PARTITION_NAME.match(name)
+    if not match:
+        return None
+    start = date(int(match.group(1)), 3 * (int(match.group(2)) - 1) + 1, 1)
+    return Partition(name=name, start=start, end=shift_quarters(start, 1))
+
+
+def list_coaching_session_partitions() -> list[Partition]:
+    """
+    List the quarterly partitions currently attached to coaching_sessions, oldest first.
+    """
+    rows = fetch_all(
+        """
+        SELECT c.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = %s::regclass
+        """,
+        (PARENT_TABLE,),
+    )
+    partitions = [p for p in (parse_partition_name(row["relname"]) for row in rows) if p]
+    return sorted(partitions, key=lambda p: p.start)
+
+
+def ensure_coaching_session_partitions(quarters_ahead: int = 4) -> list[str]:
+    """
+    Create any missing partitions from the current quarter through quarters_ahead.
+
+    Args:
+        quarters_ahead: Quarters after the current one that should already exist
+
+    Returns:
+        Names of the partitions created (empty when all already existed)
+    """
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            try:
+                cur.execute(
+                    "SELECT * FROM create_coaching_sessions_partitions(%s)", (quarters_ahead,)
+                )
+                created = [row[0] for row in cur.fetchall()]
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+    if created:
+        logger.info(f"Created coaching_sessions partitions: {', '.join(created)}")
+    return created
+
+
+def detach_old_coaching_session_partitions(
+    retain_quarters: int,
+    archive_schema: str | None = None,
+    today: date | None = None,
+) -> list[str]:
+    """
+    Detach partitions that ended before the retention window.
+
+    Partitions are detached CONCURRENTLY so reads and inserts on coaching_sessions
+    aren't blocked. Detached tables keep their data; with archive_schema they are also
+    moved out of the public schema so it's clear they are no longer live.
+
+    Args:
+        retain_quarters: Complete quarters to keep attached before the current one
+        archive_schema: Schema to move detached partitions into (None leaves them in place)
+        today: Reference date (defaults to today)
+
+    Returns:
+        Names of the partitions detached
+    """
+    if retain_quarters < 1:
+        raise ValueError("retain_quarters must be at least 1")
+
+    cutoff = shift_quarters(today or date.today(), -retain_quarters)
+    expired = [p for p in list_coaching_session_partitions() if p.end <= cutoff]
+    if not expired:
+        return []
+
+    detached = []
+    with get_db_connection() as conn:
+        # DETACH ... CONCURRENTLY can't run inside a transaction block
+        conn.autocommit = True
+        try:
+            with conn.cursor() as cur:
+                if archive_schema:
+                    cur.execute(
+                        sql.SQL("CREATE SCHEMA IF NOT EXISTS {}").format(
+                            sql.Identifier(archive_schema)
+                        )
+                    )
+                for partition in expired:
+                    cur.execute(
+                        sql.SQL("ALTER TABLE {} DETACH PARTITION {} CONCURRENTLY").format(
+                            sql.Identifier(PARENT_TABLE), sql.Identifier(partition.name)
+                        )
+                    )
+                    if archive_schema:
+                        cur.execute(
+                            sql.SQL("ALTER TABLE {} SET SCHEMA {}").format(
+                                sql.Identifier(partition.name), sql.Identifier(archive_schema)
+                            )
+                        )
+                    detached.append(partition.name)
+                    logger.info(
+                        f"Detached coaching_sessions partition {partition.name}"
+                        + (f" into schema {archive_schema}" if archive_schema else "")
+                    )
+        finally:
+            conn.autocommit = False
+
+    return detached
@@ -0,0 +1,314 @@
+"""
+Instrumented psycopg2 connection pool.
+
+Wraps ThreadedConnectionPool with:
+- One-time session setup per physical connection (instead of a SET on every checkout),
+  with idle connections kept open up to maxconn so the setup isn't thrown away
+- A bounded wait for a free connection instead of failing immediately when exhausted
+- Validation of connections returned after an error
+- Prometheus histograms for checkout wait and hold time, labelled by pool name
+  (primary, replica)
+- Leak detection: connections held past a threshold are logged with their checkout stack
+"""
+
+import logging
+import threading
+import time
+import traceback
+from dataclasses import dataclass
+from typing import Any
+
+import psycopg2
+from prometheus_client import Counter, Histogram
+from psycopg2 import extensions, pool
+
+from .query_budget import TrackedConnection
+
+logger = logging.getLogger(__name__)
+
+POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a database connection from the pool",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0),
+)
+POOL_CONNECTION_HOLD = Histogram(
+    "db_pool_connection_hold_seconds",
+    "Time a database connection was held before being returned to the pool",
+    ["pool"],
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0, 60.0),
+)
+POOL_CHECKOUT_TIMEOUTS = Counter(
+    "db_pool_checkout_timeouts_total",
+    "Checkouts that gave up waiting for a free database connection",
+    ["pool"],
+)
+POOL_CONNECTIONS_DISCARDED = Counter(
+    "db_pool_connections_discarded_total",
+    "Connections closed instead of reused because they failed validation",
+    ["pool"],
+)
+
+
+class PoolTimeoutError(pool.PoolError):
+    """Raised when no connection becomes available within the checkout timeout."""
+
+
+@dataclass
+class _Checkout:
+    """Bookkeeping for a connection that is currently checked out."""
+
+    started_at: float
+    stack: list[traceback.FrameSummary] | None
+    thread_name: str
+    leak_reported: bool = False
+
+
+class InstrumentedConnectionPool(pool.ThreadedConnectionPool):
+    """
+    ThreadedConnectionPool with session init, bounded waits, validation and metrics.
+
+    Usage:
+        db_pool = InstrumentedConnectionPool(
+            minconn=1, maxconn=10, dsn=..., session_settings={"statement_timeout": "30s"}
+        )
+        conn = db_pool.getconn()
+        try:
+            ...
+        finally:
+            db_pool.putconn(conn)
+    """
+
+    def __init__(
+        self,
+        minconn: int,
+        maxconn: int,
+        *args: Any,
+        session_settings: dict[str, str] | None = None,
+        checkout_timeout: float = 30.0,
+        leak_threshold: float = 0.0,
+        name: str = "primary",
+        **kwargs: Any,
+    ):
+        """
+        Args:
+            minconn: Connections opened up front
+            maxconn: Maximum connections open at once
+            session_settings: GUCs applied once when each physical connection is opened
+            checkout_timeout: Seconds getconn() waits for a free connection before raising
+            leak_threshold: Seconds after which a held connection is logged as a possible
+                leak, with the stack that checked it out (0 disables)
+            name: Label for this pool's metrics and logs
+            *args, **kwargs: Passed to psycopg2.connect; connections default to
+                TrackedConnection so per-request query budgets see every statement
+        """
+        kwargs.setdefault("connection_factory", TrackedConnection)
+        self.name = name
+        self._session_settings = session_settings or {}
+        self._checkout_timeout = checkout_timeout
+        self._leak_threshold = leak_threshold
+        self._slots = threading.BoundedSemaphore(maxconn)
+        self._checkouts: dict[int, _Checkout] = {}
+        self._checkouts_lock = threading.Lock()
+        self._waiting = 0
+        super().__init__(minconn, maxconn, *args, **kwargs)
+
+    def _connect(self, key: Any = None) -> extensions.connection:
+        """Open a physical connection and apply session settings once."""
+        conn = super()._connect(key)
+        if self._session_settings:
+            try:
+                with conn.cursor() as cur:
+                    for name, value in self._session_settings.items():
+                        cur.execute("SELECT set_config(%s, %s, false)", (name, value))
+                conn.commit()
+            except Exception:
+                self._discard(conn, key)
+                raise
+        return conn
+
+    def getconn(self, key: Any = None) -> extensions.connection:
+        """
+        Check out a connection, waiting up to checkout_timeout for one to free up.
+
+        Raises:
+            PoolTimeoutError: If no connection became available in time
+        """
+        self._report_leaks()
+
+        started = time.perf_counter()
+        with self._checkouts_lock:
+            self._waiting += 1
+        try:
+            acquired = self._slots.acquire(timeout=self._checkout_timeout)
+        finally:
+            with self._checkouts_lock:
+                self._waiting -= 1
+        waited = time.perf_counter() - started
+        POOL_CHECKOUT_WAIT.labels(pool=self.name).observe(waited)
+
+        if not acquired:
+            POOL_CHECKOUT_TIMEOUTS.labels(pool=self.name).inc()
+            raise PoolTimeoutError(
+                f"No database connection available after {self._checkout_timeout:.1f}s "
+                f"(pool={self.name}, maxconn={self.maxconn})"
+            )
+
+        try:
+            conn = super().getconn(key)
+        except Exception:
+            self._slots.release()
+            raise
+
+        with self._checkouts_lock:
+            self._checkouts[id(conn)] = _Checkout(
+                started_at=time.perf_counter(),
+                stack=traceback.extract_stack()[:-1] if self._leak_threshold > 0 else None,
+                thread_name=threading.current_thread().name,
+            )
+        return conn
+
+    def putconn(
+        self,
+        conn: extensions.connection,
+        key: Any = None,
+        close: bool = False,
+        validate: bool = False,
+    ) -> None:
+        """
+        Return a connection to the pool.
+
+        Args:
+            conn: Connection to return
+            key: Pool key (see psycopg2.pool)
+            close: Close the connection instead of keeping it
+            validate: Check the connection is still usable (after an error) and
+                close it if not
+        """
+        with self._checkouts_lock:
+            checkout = self._checkouts.pop(id(conn), None)
+
+        if checkout is not None:
+            held = time.perf_counter() - checkout.started_at
+            POOL_CONNECTION_HOLD.labels(pool=self.name).observe(held)
+            if self._leak_threshold > 0 and held > self._leak_threshold:
+                self._log_leak(checkout, held, returned=True)
+
+        if validate and not close and not self._is_usable(conn):
+            POOL_CONNECTIONS_DISCARDED.labels(pool=self.name).inc()
+            close = True
+
+        try:
+            super().putconn(conn, key, close)
+        finally:
+            if checkout is not None:
+                self._slots.release()
+
+    def _putconn(self, conn: extensions.connection, key: Any = None, close: bool = False) -> None:
+        """
+        Put away a connection, keeping up to maxconn idle connections open.
+
+        psycopg2 closes every connection returned beyond minconn, which would throw away
+        the session setup under load; this keeps them for reuse instead.
+        """
+        if self.closed:
+            raise pool.PoolError("connection pool is closed")
+
+        if key is None:
+            key = self._rused.get(id(conn))
+            if key is None:
+                raise pool.PoolError("trying to put unkeyed connection")
+
+        if not close and not conn.closed and len(self._pool) < self.maxconn:
+            status = conn.info.transaction_status
+            if status == extensions.TRANSACTION_STATUS_UNKNOWN:
+                # Server connection lost
+                conn.close()
+            else:
+                if status != extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+                self._pool.append(conn)
+        elif not conn.closed:
+            conn.close()
+
+        self._used.pop(key, None)
+        self._rused.pop(id(conn), None)
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Snapshot of pool state.
+
+        Returns:
+            Dict with maxconn, open, in_use, idle and waiting connection counts
+        """
+        with self._checkouts_lock:
+            in_use = len(self._checkouts)
+            waiting = self._waiting
+        return {
+            "maxconn": self.maxconn,
+            "open": len(self._pool) + len(self._used),
+            "in_use": in_use,
+            "idle": len(self._pool),
+            "waiting": waiting,
+        }
+
+    @staticmethod
+    def _is_usable(conn: extensions.connection) -> bool:
+        """Roll back and ping a connection that saw an error."""
+        if conn.closed:
+            return False
+        if conn.info.transaction_status == extensions.TRANSACTION_STATUS_UNKNOWN:
+            return False
+        try:
+            conn.rollback()
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _discard(self, conn: extensions.connection, key: Any) -> None:
+        """Drop a connection that failed session setup from the pool's bookkeeping."""
+        try:
+            conn.close()
+        finally:
+            if key is None:
+                key = self._rused.get(id(conn))
+            if key is not None:
+                self._used.pop(key, None)
+                self._rused.pop(id(conn), None)
+            elif conn in self._pool:
+                self._pool.remove(conn)
+
+    def _report_leaks(self) -> None:
+        """Log connections held past the leak threshold that haven't been reported yet."""
+        if self._leak_threshold <= 0:
+            return
+        now = time.perf_counter()
+        with self._checkouts_lock:
+            overdue = [
+                c
+                for c in self._checkouts.values()
+                if not c.leak_reported and now - c.started_at > self._leak_threshold
+            ]
+            for checkout in overdue:
+                checkout.leak_reported = True
+        for checkout in overdue:
+            self._log_leak(checkout, now - checkout.started_at, returned=False)
+
+    @staticmethod
+    def _log_leak(checkout: _Checkout, held: float, returned: bool) -> None:
+        """Log a possible connection leak with the stack that checked it out."""
+        if returned and checkout.leak_reported:
+            return
+        stack = (
+            "".join(traceback.format_list(checkout.stack))
+            if checkout.stack
+            else "(stack not captured)\n"
+        )
+        state = "returned after" if returned else "still held after"
+        logger.warning(
+            f"Possible database connection leak: connection {state} {held:.1f}s "
+            f"(thread {checkout.thread_name}). Checked out at:\n{stack}"
+        )
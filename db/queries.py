@@ -4,12 +4,14 @@ Provides high-level abstractions over raw SQL.
 """
 
 import logging
+from collections.abc import Callable
 from datetime import datetime
 from typing import Any
 from uuid import UUID
 
 from .connection import execute_query, fetch_all, fetch_one
 from .models import CoachingDimension
+from .pagination import Keyset, SortKey, estimate_count, nulls_last
 
 logger = logging.getLogger(__name__)
 
@@ -24,6 +26,25 @@ def get_call_by_id(call_id: UUID) -> dict[str, Any] | None:
     return fetch_one("SELECT * FROM calls WHERE id = %s", (str(call_id),))
 
 
+def get_calls_by_ids(call_ids: list[UUID] | list[str]) -> dict[str, dict[str, Any]]:
+    """
+    Get many calls in one query.
+
+    Args:
+        call_ids: Call UUIDs
+
+    Returns:
+        Dict mapping call ID (as string) to call row; missing calls are absent
+    """
+    if not call_ids:
+        return {}
+    rows = fetch_all(
+        "SELECT * FROM calls WHERE id = ANY(%s::uuid[])",
+        ([str(call_id) for call_id in call_ids],),
+    )
+    return {str(row["id"]): row for row in rows}
+
+
 def get_call_by_gong_id(gong_call_id: str) -> dict[str, Any] | None:
     """Get call by Gong call ID."""
     return fetch_one("SELECT * FROM calls WHERE gong_call_id = %s", (gong_call_id,))
@@ -64,6 +85,69 @@ def get_calls_by_date_range(
         )
 
 
+# Per-call scores and participants from call_summary (migration 021), for list queries
+# that LEFT JOIN call_summary sm ON sm.call_id = c.id
+CALL_SUMMARY_COLUMNS = (
+    "sm.overall_score, sm.dimension_scores, sm.evaluated_role, sm.rep_names, sm.customer_names"
+)
+
+
+def call_summary_filters(
+    bind: Callable[[Any], str],
+    min_score: float | None = None,
+    max_score: float | None = None,
+    evaluated_role: str | None = None,
+) -> list[str]:
+    """
+    Build WHERE conditions on call_summary (aliased sm).
+
+    Args:
+        bind: Registers a parameter value and returns its placeholder
+        min_score: Minimum overall score
+        max_score: Maximum overall score
+        evaluated_role: Rubric role the call was evaluated against (ae, se, csm)
+
+    Returns:
+        SQL conditions; calls without a summary never match a score or role filter
+    """
+    conditions = []
+    if min_score is not None:
+        conditions.append(f"sm.overall_score >= {bind(min_score)}")
+    if max_score is not None:
+        conditions.append(f"sm.overall_score <= {bind(max_score)}")
+    if evaluated_role:
+        conditions.append(f"sm.evaluated_role = {bind(evaluated_role)}")
+    return conditions
+
+
+def refresh_call_summary(call_ids: list[UUID] | list[str] | None = None) -> int:
+    """
+    Recompute call_summary rows.
+
+    Triggers on coaching_sessions and speakers keep call_summary current; use this to
+    rebuild it after bulk loads with triggers disabled.
+
+    Args:
+        call_ids: Calls to refresh (all calls when None)
+
+    Returns:
+        Number of summary rows inserted or changed
+    """
+    from .connection import get_db_connection
+
+    ids = [str(call_id) for call_id in call_ids] if call_ids is not None else None
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            try:
+                cur.execute("SELECT refresh_call_summary(%s::uuid[])", (ids,))
+                changed: int = cur.fetchone()[0]
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+    return changed
+
+
 # ============================================================================
 # SPEAKER QUERIES
 # ============================================================================
@@ -244,7 +328,7 @@ def bulk_update_speaker_roles(
     updates: list[tuple[UUID, str | None]], changed_by: str
 ) -> dict[str, Any]:
     """
-    Update multiple speaker roles in a single transaction.
+    Update multiple speaker roles in a single statement.
 
     Args:
         updates: List of (speaker_id, role) tuples to update
@@ -271,8 +355,11 @@ def bulk_update_speaker_roles(
         >>> print(f"Updated {result['updated']} speakers")
 
     Note:
-        All updates are performed in a single transaction. If any update fails,
-        all changes are rolled back. Each change is logged to speaker_role_history.
+        All updates are performed in a single UPDATE ... FROM unnest(...) statement, so
+        the number of round trips doesn't grow with the batch. If any speaker_id doesn't
+        match a speaker, all changes are rolled back and the unmatched ids are returned
+        in "failed". Changes are logged to speaker_role_history by a statement-level
+        trigger in one batched insert (migration 023).
     """
     # Validate all role values before starting
     valid_roles = ["ae", "se", "csm", "support", None]
@@ -287,8 +374,8 @@ def bulk_update_speaker_roles(
 
     from .connection import get_db_connection
 
-    updated_speakers = []
-    failed_ids = []
+    # One row per speaker; the last update for a repeated speaker_id wins
+    roles_by_id = {str(speaker_id): role for speaker_id, role in updates}
 
     with get_db_connection() as conn:
         with conn.cursor(cursor_factory=RealDictCursor) as cur:
@@ -296,52 +383,45 @@ def bulk_update_speaker_roles(
                 # Set session variable for audit trail
                 cur.execute("SELECT set_config('app.current_user', %s, false)", (changed_by,))
 
-                # Update each speaker
-                for speaker_id, role in updates:
-                    try:
-                        cur.execute(
-                            """
-                            UPDATE speakers
-                            SET role = %s::speaker_role
-                            WHERE id = %s
-                            RETURNING
-                                id,
-                                email,
-                                name,
-                                role,
-                                company_side,
-                                call_id,
-                                talk_time_seconds,
-                                talk_time_percentage,
-                                speaker_id as gong_speaker_id,
-                                manager_id
-                            """,
-                            (role, str(speaker_id)),
-                        )
-
-                        result = cur.fetchone()
-                        if result:
-                            updated_speakers.append(dict(result))
-                        else:
-                            # Speaker not found
-                            failed_ids.append(str(speaker_id))
-                            logger.warning(f"Speaker not found: {speaker_id}")
-
-                    except Exception as e:
-                        failed_ids.append(str(speaker_id))
-                        logger.error(f"Failed to update speaker {speaker_id}: {e}")
-
-                # Commit all changes if no failures, otherwise rollback
+                cur.execute(
+                    """
+                    UPDATE speakers s
+                    SET role = u.role
+                    FROM unnest(%s::uuid[], %s::speaker_role[]) AS u(id, role)
+                    WHERE s.id = u.id
+                    RETURNING
+                        s.id,
+                        s.email,
+                        s.name,
+                        s.role,
+                        s.company_side,
+                        s.call_id,
+                        s.talk_time_seconds,
+                        s.talk_time_percentage,
+                        s.speaker_id as gong_speaker_id,
+                        s.manager_id
+                    """,
+                    (list(roles_by_id), list(roles_by_id.values())),
+                )
+                updated_speakers = [dict(row) for row in cur.fetchall()]
+
+                matched = {str(speaker["id"]) for speaker in updated_speakers}
+                failed_ids = [speaker_id for speaker_id in roles_by_id if speaker_id not in matched]
+
+                # Commit all changes if every speaker matched, otherwise rollback
                 if failed_ids:
                     conn.rollback()
-                    logger.warning(f"Bulk update rolled back due to {len(failed_ids)} failures")
-                else:
-                    conn.commit()
-                    logger.info(f"Successfully updated {len(updated_speakers)} speaker roles")
+                    logger.warning(
+                        f"Bulk update rolled back: {len(failed_ids)} speakers not found "
+                        f"({', '.join(failed_ids[:10])})"
+                    )
+                    return {"updated": 0, "failed": failed_ids, "speakers": []}
 
+                conn.commit()
+                logger.info(f"Successfully updated {len(updated_speakers)} speaker roles")
                 return {
                     "updated": len(updated_speakers),
-                    "failed": failed_ids,
+                    "failed": [],
                     "speakers": updated_speakers,
                 }
 
@@ -806,6 +886,44 @@ def get_full_transcript(call_id: UUID) -> str:
     return str(result["full_transcript"]) if result else ""
 
 
+def get_transcript_excerpts(call_ids: list[UUID] | list[str], chars: int) -> dict[str, str]:
+    """
+    Get the first `chars` characters of several transcripts in one query.
+
+    Only segments that start before the cutoff are aggregated, so long transcripts
+    aren't assembled in full just to be truncated.
+
+    Args:
+        call_ids: Call UUIDs
+        chars: Maximum excerpt length
+
+    Returns:
+        Dict mapping call ID (as string) to excerpt; calls without transcripts are absent
+    """
+    if not call_ids:
+        return {}
+    rows = fetch_all(
+        """
+        SELECT call_id, LEFT(STRING_AGG(text, ' ' ORDER BY sequence_number), %s) as excerpt
+        FROM (
+            SELECT
+                call_id,
+                text,
+                sequence_number,
+                SUM(LENGTH(text) + 1) OVER (
+                    PARTITION BY call_id ORDER BY sequence_number
+                ) - LENGTH(text) - 1 as start_offset
+            FROM transcripts
+            WHERE call_id = ANY(%s::uuid[])
+        ) segments
+        WHERE start_offset < %s
+        GROUP BY call_id
+        """,
+        (chars, [str(call_id) for call_id in call_ids], chars),
+    )
+    return {str(row["call_id"]): row["excerpt"] for row in rows if row["excerpt"]}
+
+
 def get_transcript_segments(call_id: UUID) -> list[dict[str, Any]]:
     """Get transcript segments with speaker info."""
     return fetch_all(
@@ -880,6 +998,46 @@ def get_coaching_sessions_for_call(
         )
 
 
+def get_latest_sessions_for_calls(
+    call_ids: list[UUID] | list[str],
+    dimensions: list[CoachingDimension] | None = None,
+) -> dict[str, dict[str, dict[str, Any]]]:
+    """
+    Get the most recent coaching session per call and dimension in one query.
+
+    Args:
+        call_ids: Call UUIDs
+        dimensions: Optional dimensions to restrict to (default: all)
+
+    Returns:
+        Dict mapping call ID (as string) to {dimension value: latest session}
+    """
+    if not call_ids:
+        return {}
+
+    params: list[Any] = [[str(call_id) for call_id in call_ids]]
+    dimension_sql = ""
+    if dimensions:
+        dimension_sql = "AND coaching_dimension = ANY(%s)"
+        params.append([d.value for d in dimensions])
+
+    rows = fetch_all(
+        f"""
+        SELECT DISTINCT ON (call_id, coaching_dimension) *
+        FROM coaching_sessions
+        WHERE call_id = ANY(%s::uuid[])
+        {dimension_sql}
+        ORDER BY call_id, coaching_dimension, created_at DESC
+        """,
+        tuple(params),
+    )
+
+    sessions: dict[str, dict[str, dict[str, Any]]] = {}
+    for row in rows:
+        sessions.setdefault(str(row["call_id"]), {})[row["coaching_dimension"]] = row
+    return sessions
+
+
 def get_coaching_sessions_for_rep(
     rep_email: str,
     start_date: datetime | None = None,
@@ -918,6 +1076,74 @@ def get_coaching_sessions_for_rep(
     return fetch_all(query, tuple(params))
 
 
+def replace_call_objections(
+    call_id: UUID | str,
+    coaching_session_id: UUID | str,
+    rep_id: UUID | str | None,
+    objections: list[dict[str, Any]],
+    analyzed_at: datetime | None = None,
+) -> int:
+    """
+    Replace a call's objections with those from its latest objection-handling session.
+
+    Rows are stamped with the session's created_at rather than the time they are
+    written, so backfills and re-stored objections keep their place in date-range
+    reports.
+
+    Args:
+        call_id: Call UUID
+        coaching_session_id: Objection-handling session the objections came from
+        rep_id: Rep (speaker) UUID the session evaluated
+        objections: Rows from analysis.objections.extract_objections
+        analyzed_at: The session's created_at (default: now, for a just-stored session)
+
+    Returns:
+        Number of objections stored
+    """
+    from psycopg2.extras import execute_values
+
+    from .connection import get_db_connection
+
+    rows = [
+        (
+            str(call_id),
+            str(coaching_session_id),
+            str(rep_id) if rep_id else None,
+            o["objection_type"],
+            o.get("quote"),
+            o.get("timestamp_start"),
+            o.get("timestamp_end"),
+            o.get("resolved"),
+            o.get("handled_well"),
+            analyzed_at,
+        )
+        for o in objections
+    ]
+
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            try:
+                cur.execute("DELETE FROM call_objections WHERE call_id = %s", (str(call_id),))
+                if rows:
+                    execute_values(
+                        cur,
+                        """
+                        INSERT INTO call_objections (
+                            call_id, coaching_session_id, rep_id, objection_type, quote,
+                            timestamp_start, timestamp_end, resolved, handled_well, created_at
+                        ) VALUES %s
+                        """,
+                        rows,
+                        template="(%s, %s, %s, %s, %s, %s, %s, %s, %s, COALESCE(%s, NOW()))",
+                    )
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+    return len(rows)
+
+
 def get_rep_performance_summary(rep_email: str) -> dict[str, Any] | None:
     """Get performance summary for a rep."""
     return fetch_one(
@@ -945,25 +1171,39 @@ def get_call_analysis_status(call_id: UUID) -> dict[str, Any] | None:
 # ============================================================================
 
 
+# Score rollups live in rep_dimension_weekly_scores (migration 017), one row per rep email,
+# dimension and ISO week. A week belongs to a date window when its Thursday falls inside it
+# (the ISO week-numbering rule), i.e. week_start >= window_start - 3 days.
+SCORE_HISTOGRAM_BUCKETS = 10
+
+
 def get_score_trends_for_rep(
     rep_email: str,
     dimension: CoachingDimension,
     days: int = 90,
 ) -> list[dict[str, Any]]:
-    """Get score trends over time for a rep and dimension."""
+    """
+    Get weekly score trends for a rep and dimension.
+
+    Args:
+        rep_email: Rep's email address
+        dimension: Coaching dimension
+        days: How far back to look
+
+    Returns:
+        List of {date (Monday of the week), avg_score, session_count}, oldest first
+    """
     return fetch_all(
         """
         SELECT
-            DATE(cs.created_at) as date,
-            AVG(cs.score) as avg_score,
-            COUNT(*) as session_count
-        FROM coaching_sessions cs
-        JOIN speakers s ON cs.rep_id = s.id
-        WHERE s.email = %s
-        AND cs.coaching_dimension = %s
-        AND cs.created_at >= NOW() - INTERVAL '%s days'
-        GROUP BY DATE(cs.created_at)
-        ORDER BY date ASC
+            week_start as date,
+            score_sum::numeric / NULLIF(score_count, 0) as avg_score,
+            score_count as session_count
+        FROM rep_dimension_weekly_scores
+        WHERE rep_email = %s
+        AND coaching_dimension = %s
+        AND week_start >= CURRENT_DATE - %s - 3
+        ORDER BY week_start ASC
         """,
         (rep_email, dimension.value, days),
     )
@@ -977,13 +1217,13 @@ def get_team_average_scores(
     return fetch_one(
         """
         SELECT
-            AVG(score) as avg_score,
-            MIN(score) as min_score,
-            MAX(score) as max_score,
-            COUNT(*) as session_count
-        FROM coaching_sessions
+            SUM(score_sum)::numeric / NULLIF(SUM(score_count), 0) as avg_score,
+            MIN(score_min) as min_score,
+            MAX(score_max) as max_score,
+            COALESCE(SUM(score_count), 0) as session_count
+        FROM rep_dimension_weekly_scores
         WHERE coaching_dimension = %s
-        AND created_at >= NOW() - INTERVAL '%s days'
+        AND week_start >= CURRENT_DATE - %s - 3
         """,
         (dimension.value, days),
     )
@@ -994,29 +1234,119 @@ def get_top_performers(
     days: int = 30,
     limit: int = 10,
 ) -> list[dict[str, Any]]:
-    """Get top performing reps for a dimension."""
+    """
+    Get top performing reps for a dimension.
+
+    call_count is the number of scored sessions in the window (one per analyzed call
+    unless a call was re-analyzed).
+    """
     return fetch_all(
         """
+        WITH totals AS (
+            SELECT
+                rep_email,
+                SUM(score_sum)::numeric / SUM(score_count) as avg_score,
+                SUM(score_count) as call_count
+            FROM rep_dimension_weekly_scores
+            WHERE coaching_dimension = %s
+            AND week_start >= CURRENT_DATE - %s - 3
+            GROUP BY rep_email
+            HAVING SUM(score_count) >= 3  -- Min 3 calls
+        )
         SELECT
             s.name,
-            s.email,
+            t.rep_email as email,
             s.role,
-            AVG(cs.score) as avg_score,
-            COUNT(DISTINCT cs.call_id) as call_count
-        FROM coaching_sessions cs
-        JOIN speakers s ON cs.rep_id = s.id
-        WHERE cs.coaching_dimension = %s
-        AND cs.created_at >= NOW() - INTERVAL '%s days'
-        AND s.company_side = true
-        GROUP BY s.id, s.name, s.email, s.role
-        HAVING COUNT(DISTINCT cs.call_id) >= 3  -- Min 3 calls
-        ORDER BY avg_score DESC
+            t.avg_score,
+            t.call_count
+        FROM totals t
+        JOIN LATERAL (
+            SELECT name, role
+            FROM speakers
+            WHERE email = t.rep_email
+            AND company_side = true
+            ORDER BY created_at DESC
+            LIMIT 1
+        ) s ON true
+        ORDER BY t.avg_score DESC
         LIMIT %s
         """,
         (dimension.value, days, limit),
     )
 
 
+def rebuild_rep_dimension_weekly_scores(since: datetime | None = None) -> int:
+    """
+    Recompute score rollups from coaching_sessions.
+
+    Used to backfill history that predates the rollup trigger, or to repair weeks after
+    sessions were edited by hand. Weeks are recomputed whole and overwritten; weeks with
+    no remaining sessions (e.g. dropped by retention) are left as they are. The rollup
+    table is locked against concurrent session inserts for the duration, so no increment
+    is lost or double counted.
+
+    Args:
+        since: Only recompute weeks from the one containing this date (default: all)
+
+    Returns:
+        Number of rollup rows written
+    """
+    from .connection import get_db_connection
+
+    histogram = ", ".join(
+        f"COUNT(*) FILTER (WHERE LEAST(cs.score / 10, 9) = {bucket})"
+        for bucket in range(SCORE_HISTOGRAM_BUCKETS)
+    )
+
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            try:
+                cur.execute("LOCK TABLE rep_dimension_weekly_scores IN SHARE ROW EXCLUSIVE MODE")
+                cur.execute(
+                    f"""
+                    INSERT INTO rep_dimension_weekly_scores (
+                        rep_email, coaching_dimension, week_start,
+                        score_sum, score_count, score_min, score_max, score_histogram
+                    )
+                    SELECT
+                        s.email,
+                        cs.coaching_dimension,
+                        date_trunc('week', cs.created_at)::date,
+                        SUM(cs.score),
+                        COUNT(*),
+                        MIN(cs.score),
+                        MAX(cs.score),
+                        ARRAY[{histogram}]
+                    FROM coaching_sessions cs
+                    JOIN speakers s ON s.id = cs.rep_id
+                    WHERE cs.score IS NOT NULL
+                    AND s.email IS NOT NULL
+                    AND (
+                        %(since)s::timestamp IS NULL
+                        OR cs.created_at >= date_trunc('week', %(since)s::timestamp)
+                    )
+                    GROUP BY s.email, cs.coaching_dimension, date_trunc('week', cs.created_at)
+                    ON CONFLICT (rep_email, coaching_dimension, week_start) DO UPDATE SET
+                        score_sum = EXCLUDED.score_sum,
+                        score_count = EXCLUDED.score_count,
+                        score_min = EXCLUDED.score_min,
+                        score_max = EXCLUDED.score_max,
+                        score_histogram = EXCLUDED.score_histogram,
+                        updated_at = NOW()
+                    """,
+                    {"since": since},
+                )
+                written: int = cur.rowcount
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                logger.error(f"Failed to rebuild score rollups: {e}")
+                raise
+
+    logger.info(f"Rebuilt {written} rep/dimension/week score rollups")
+    return written
+
+
 # ============================================================================
 # OPPORTUNITY QUERIES
 # ============================================================================
@@ -1071,24 +1401,48 @@ def upsert_email(email_data: dict[str, Any]) -> str:
 
     Returns:
         Email UUID (str)
+
+    The opportunity's email_count and last_activity_at are updated by trigger.
     """
+    # Only rows that actually change invalidate opportunity analysis caches: the
+    # conditional DO UPDATE returns nothing for no-op re-syncs. When an email moves
+    # between opportunities, both the previous and the new opportunity are invalidated.
     execute_query(
         """
-        INSERT INTO emails (
-            gong_email_id, opportunity_id, subject, sender_email,
-            recipients, sent_at, body_snippet, metadata
-        ) VALUES (
-            %(gong_email_id)s, %(opportunity_id)s, %(subject)s, %(sender_email)s,
-            %(recipients)s, %(sent_at)s, %(body_snippet)s, %(metadata)s
+        WITH previous AS (
+            SELECT opportunity_id FROM emails WHERE gong_email_id = %(gong_email_id)s
+        ),
+        upserted AS (
+            INSERT INTO emails (
+                gong_email_id, opportunity_id, subject, sender_email,
+                recipients, sent_at, body_snippet, metadata
+            ) VALUES (
+                %(gong_email_id)s, %(opportunity_id)s, %(subject)s, %(sender_email)s,
+                %(recipients)s, %(sent_at)s, %(body_snippet)s, %(metadata)s
+            )
+            ON CONFLICT (gong_email_id) DO UPDATE SET
+                opportunity_id = EXCLUDED.opportunity_id,
+                subject = EXCLUDED.subject,
+                sender_email = EXCLUDED.sender_email,
+                recipients = EXCLUDED.recipients,
+                sent_at = EXCLUDED.sent_at,
+                body_snippet = EXCLUDED.body_snippet,
+                metadata = EXCLUDED.metadata
+            WHERE (
+                emails.opportunity_id, emails.subject, emails.sender_email,
+                emails.recipients, emails.sent_at, emails.body_snippet, emails.metadata
+            ) IS DISTINCT FROM (
+                EXCLUDED.opportunity_id, EXCLUDED.subject, EXCLUDED.sender_email,
+                EXCLUDED.recipients, EXCLUDED.sent_at, EXCLUDED.body_snippet, EXCLUDED.metadata
+            )
+            RETURNING opportunity_id
+        )
+        DELETE FROM opportunity_analysis_cache
+        WHERE opportunity_id IN (
+            SELECT opportunity_id FROM upserted
+            UNION
+            SELECT opportunity_id FROM previous WHERE EXISTS (SELECT 1 FROM upserted)
         )
-        ON CONFLICT (gong_email_id) DO UPDATE SET
-            opportunity_id = EXCLUDED.opportunity_id,
-            subject = EXCLUDED.subject,
-            sender_email = EXCLUDED.sender_email,
-            recipients = EXCLUDED.recipients,
-            sent_at = EXCLUDED.sent_at,
-            body_snippet = EXCLUDED.body_snippet,
-            metadata = EXCLUDED.metadata
         """,
         email_data,
     )
@@ -1104,15 +1458,24 @@ def link_call_to_opportunity(call_id: str, opp_id: str) -> None:
     """
     Create junction record linking call to opportunity.
 
+    Cached opportunity analyses are invalidated only when a new link is created;
+    re-linking an already linked call leaves the cache intact. The opportunity's
+    call_count and last_activity_at are updated by trigger.
+
     Args:
         call_id: Call UUID
         opp_id: Opportunity UUID
     """
     execute_query(
         """
-        INSERT INTO call_opportunities (call_id, opportunity_id)
-        VALUES (%s, %s)
-        ON CONFLICT (call_id, opportunity_id) DO NOTHING
+        WITH linked AS (
+            INSERT INTO call_opportunities (call_id, opportunity_id)
+            VALUES (%s, %s)
+            ON CONFLICT (call_id, opportunity_id) DO NOTHING
+            RETURNING opportunity_id
+        )
+        DELETE FROM opportunity_analysis_cache
+        WHERE opportunity_id IN (SELECT opportunity_id FROM linked)
         """,
         (call_id, opp_id),
     )
@@ -1120,7 +1483,10 @@ def link_call_to_opportunity(call_id: str, opp_id: str) -> None:
 
 def get_opportunity(opp_id: str) -> dict[str, Any] | None:
     """
-    Get opportunity with aggregated call/email counts.
+    Get opportunity with its call/email counts.
+
+    call_count, email_count and last_activity_at are columns kept current by
+    triggers on call_opportunities and emails (migration 019).
 
     Args:
         opp_id: Opportunity UUID
@@ -1128,26 +1494,24 @@ def get_opportunity(opp_id: str) -> dict[str, Any] | None:
     Returns:
         Opportunity dict with call_count and email_count
     """
-    return fetch_one(
-        """
-        SELECT
-            o.*,
-            COUNT(DISTINCT co.call_id) as call_count,
-            COUNT(DISTINCT e.id) as email_count
-        FROM opportunities o
-        LEFT JOIN call_opportunities co ON o.id = co.opportunity_id
-        LEFT JOIN emails e ON o.id = e.opportunity_id
-        WHERE o.id = %s
-        GROUP BY o.id
-        """,
-        (opp_id,),
-    )
+    return fetch_one("SELECT * FROM opportunities WHERE id = %s", (opp_id,))
+
+
+# Newest first; undated items last, ids break ties between items at the same time
+OPPORTUNITY_TIMELINE_KEYSET = Keyset(
+    (
+        SortKey('timeline."timestamp"', "timestamp", nulls_last("timestamptz", descending=True)),
+        SortKey("timeline.id", "id"),
+    ),
+    descending=True,
+)
 
 
 def get_opportunity_timeline(
     opp_id: str,
     limit: int = 20,
     offset: int = 0,
+    cursor: str | None = None,
 ) -> list[dict[str, Any]]:
     """
     Get chronological timeline of calls and emails for an opportunity.
@@ -1155,68 +1519,154 @@ def get_opportunity_timeline(
     Args:
         opp_id: Opportunity UUID
         limit: Max items to return
-        offset: Number of items to skip
+        offset: Number of items to skip (prefer cursor for paging)
+        cursor: Continue after the item this cursor was made from
+            (OPPORTUNITY_TIMELINE_KEYSET.cursor_for)
 
     Returns:
         List of timeline items with type field ('call' or 'email')
+
+    Raises:
+        InvalidCursorError: If cursor is not a timeline cursor
     """
+    params: list[Any] = [opp_id, opp_id]
+
+    def bind(value: Any) -> str:
+        params.append(value)
+        return "%s"
+
+    seek = OPPORTUNITY_TIMELINE_KEYSET.condition(cursor, bind)
+    params.extend([limit, offset])
+
     return fetch_all(
-        """
-        -- Calls timeline
-        SELECT
-            'call' as item_type,
-            c.id,
-            c.gong_call_id,
-            c.title,
-            c.scheduled_at as timestamp,
-            c.duration,
-            NULL as subject,
-            NULL as sender_email
-        FROM calls c
-        JOIN call_opportunities co ON c.id = co.call_id
-        WHERE co.opportunity_id = %s
+        f"""
+        SELECT * FROM (
+            -- Calls timeline
+            SELECT
+                'call' as item_type,
+                c.id,
+                c.gong_call_id,
+                c.title,
+                c.scheduled_at as timestamp,
+                c.duration,
+                NULL as subject,
+                NULL as sender_email
+            FROM calls c
+            JOIN call_opportunities co ON c.id = co.call_id
+            WHERE co.opportunity_id = %s
 
-        UNION ALL
+            UNION ALL
 
-        -- Emails timeline
-        SELECT
-            'email' as item_type,
-            e.id,
-            e.gong_email_id,
-            NULL as title,
-            e.sent_at as timestamp,
-            NULL as duration,
-            e.subject,
-            e.sender_email
-        FROM emails e
-        WHERE e.opportunity_id = %s
-
-        ORDER BY timestamp DESC
+            -- Emails timeline
+            SELECT
+                'email' as item_type,
+                e.id,
+                e.gong_email_id,
+                NULL as title,
+                e.sent_at as timestamp,
+                NULL as duration,
+                e.subject,
+                e.sender_email
+            FROM emails e
+            WHERE e.opportunity_id = %s
+        ) timeline
+        WHERE {seek}
+        ORDER BY {OPPORTUNITY_TIMELINE_KEYSET.order_by()}
         LIMIT %s OFFSET %s
         """,
-        (opp_id, opp_id, limit, offset),
+        tuple(params),
     )
 
 
+def get_call_ids_for_opportunities(opp_ids: list[str]) -> dict[str, list[str]]:
+    """
+    Get linked call IDs for several opportunities in one query.
+
+    Args:
+        opp_ids: Opportunity UUIDs
+
+    Returns:
+        Dict mapping opportunity ID to call IDs, most recent call first
+        (same order as get_opportunity_timeline)
+    """
+    if not opp_ids:
+        return {}
+    rows = fetch_all(
+        """
+        SELECT co.opportunity_id, c.id as call_id
+        FROM call_opportunities co
+        JOIN calls c ON c.id = co.call_id
+        WHERE co.opportunity_id = ANY(%s::uuid[])
+        ORDER BY c.scheduled_at DESC
+        """,
+        ([str(opp_id) for opp_id in opp_ids],),
+    )
+    call_ids: dict[str, list[str]] = {str(opp_id): [] for opp_id in opp_ids}
+    for row in rows:
+        call_ids[str(row["opportunity_id"])].append(str(row["call_id"]))
+    return call_ids
+
+
+# Column type of each sortable opportunity field (None = NOT NULL)
+OPPORTUNITY_SORT_TYPES: dict[str, str | None] = {
+    "updated_at": "timestamptz",
+    "last_activity_at": "timestamptz",
+    "close_date": "date",
+    "health_score": "numeric",
+    "amount": "numeric",
+    "name": None,
+}
+
+
+def opportunity_keyset(sort: str, sort_dir: str) -> Keyset:
+    """
+    Keyset sort order for search_opportunities.
+
+    Args:
+        sort: Field to sort by; unknown fields fall back to updated_at
+        sort_dir: Sort direction (ASC or DESC)
+
+    Returns:
+        Keyset on (sort field NULLS LAST, id)
+    """
+    if sort not in OPPORTUNITY_SORT_TYPES:
+        sort = "updated_at"
+    descending = sort_dir.upper() == "DESC"
+    sort_type = OPPORTUNITY_SORT_TYPES[sort]
+    nulls = nulls_last(sort_type, descending) if sort_type else None
+    return Keyset((SortKey(sort, sort, nulls), SortKey("id", "id")), descending=descending)
+
+
 def search_opportunities(
     filters: dict[str, Any] | None = None,
     sort: str = "updated_at",
     sort_dir: str = "DESC",
     limit: int = 50,
     offset: int = 0,
-) -> tuple[list[dict[str, Any]], int]:
+    cursor: str | None = None,
+    count: str = "exact",
+) -> tuple[list[dict[str, Any]], int | None]:
     """
     Search opportunities with filters, sorting, and pagination.
 
+    Reads only the opportunities table: call_count, email_count and last_activity_at
+    are maintained columns, so each page is one index scan on the sort key.
+
     Args:
         filters: Dict with optional keys: owner, stage, health_score_min, health_score_max, search
-        sort: Field to sort by (updated_at, close_date, health_score, amount)
+        sort: Field to sort by (updated_at, last_activity_at, close_date, health_score, amount)
         sort_dir: Sort direction (ASC or DESC)
         limit: Max results to return
-        offset: Number of results to skip
+        offset: Number of results to skip (prefer cursor for paging)
+        cursor: Continue after the row this cursor was made from
+            (opportunity_keyset(sort, sort_dir).cursor_for)
+        count: "exact" for COUNT(*), "estimate" for the planner's estimate, "none" to skip
 
     Returns:
-        Tuple of (opportunities list, total count)
+        Tuple of (opportunities list, total count or None when count="none")
+
+    Raises:
+        InvalidCursorError: If cursor was made for a different sort order
     """
     filters = filters or {}
 
@@ -1250,41 +1700,32 @@ def search_opportunities(
 
     where_sql = "WHERE " + " AND ".join(where_clauses) if where_clauses else ""
 
-    # Validate sort field
-    valid_sorts = {"updated_at", "close_date", "health_score", "amount"}
-    if sort not in valid_sorts:
-        sort = "updated_at"
-
-    # Validate sort direction
-    sort_dir = "DESC" if sort_dir.upper() == "DESC" else "ASC"
-
+    # Get total count
+    total: int | None = None
+    count_query = f"SELECT COUNT(*) as total FROM opportunities o {where_sql}"
+    if count == "exact":
+        count_result = fetch_one(count_query, params)
+        total = count_result["total"] if count_result else 0
+    elif count == "estimate":
+        total = estimate_count(f"SELECT 1 FROM opportunities o {where_sql}", params)
+
+    keyset = opportunity_keyset(sort, sort_dir)
+
+    def bind(value: Any) -> str:
+        name = f"cursor_{len(params)}"
+        params[name] = value
+        return f"%({name})s"
+
+    page_where = " AND ".join([*where_clauses, keyset.condition(cursor, bind)])
     params["limit"] = limit
     params["offset"] = offset
 
-    # Get total count
-    count_result = fetch_one(
-        f"""
-        SELECT COUNT(*) as total
-        FROM opportunities o
-        {where_sql}
-        """,
-        params,
-    )
-    total = count_result["total"] if count_result else 0
-
-    # Get paginated results with counts
     opportunities = fetch_all(
         f"""
-        SELECT
-            o.*,
-            COUNT(DISTINCT co.call_id) as call_count,
-            COUNT(DISTINCT e.id) as email_count
+        SELECT o.*
         FROM opportunities o
-        LEFT JOIN call_opportunities co ON o.id = co.opportunity_id
-        LEFT JOIN emails e ON o.id = e.opportunity_id
-        {where_sql}
-        GROUP BY o.id
-        ORDER BY o.{sort} {sort_dir} NULLS LAST
+        WHERE {page_where}
+        ORDER BY {keyset.order_by()}
         LIMIT %(limit)s OFFSET %(offset)s
         """,
         params,
@@ -1293,6 +1734,33 @@ def search_opportunities(
     return opportunities, total
 
 
+def reconcile_opportunity_activity() -> int:
+    """
+    Recompute call_count, email_count and last_activity_at for every opportunity.
+
+    Triggers keep these current as calls are linked and emails written; this corrects
+    anything they can't see, such as a call's scheduled_at changing after it was linked.
+
+    Returns:
+        Number of opportunities whose counters were out of date
+    """
+    from .connection import get_db_connection
+
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            try:
+                cur.execute("SELECT refresh_opportunity_activity(NULL)")
+                corrected: int = cur.fetchone()[0]
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+
+    if corrected:
+        logger.warning(f"Corrected activity counters on {corrected} opportunities")
+    return corrected
+
+
 def get_sync_status(entity_type: str) -> dict[str, Any] | None:
     """
     Get last sync timestamp for entity type.
@@ -1483,17 +1951,28 @@ def submit_feedback(
     Returns:
         Feedback record ID (str) or None if failed
     """
-    result = fetch_one(
-        """
-        INSERT INTO coaching_feedback (
-            coaching_session_id, rep_id, feedback_type, feedback_text, created_at
-        )
-        VALUES (%s, %s, %s, %s, NOW())
-        RETURNING id
-        """,
-        (coaching_session_id, rep_id, feedback_type, feedback_text),
-    )
-    return str(result["id"]) if result else None
+    from .connection import get_db_connection
+
+    # Not fetch_one: that reads from the replica (when configured) and never commits
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            try:
+                cur.execute(
+                    """
+                    INSERT INTO coaching_feedback (
+                        coaching_session_id, rep_id, feedback_type, feedback_text, created_at
+                    )
+                    VALUES (%s, %s, %s, %s, NOW())
+                    RETURNING id
+                    """,
+                    (coaching_session_id, rep_id, feedback_type, feedback_text),
+                )
+                result = cur.fetchone()
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+    return str(result[0]) if result else None
 
 
 def get_feedback_stats(
@@ -1751,7 +2230,25 @@ def get_managed_reps(manager_email: str) -> list[dict[str, Any]]:
     )
 
 
-def get_calls_for_user(user_email: str, role: str, limit: int = 50) -> list[dict[str, Any]]:
+# Most recent first; unscheduled calls last
+CALLS_KEYSET = Keyset(
+    (
+        SortKey("c.scheduled_at", "scheduled_at", nulls_last("timestamp", descending=True)),
+        SortKey("c.id", "id"),
+    ),
+    descending=True,
+)
+
+
+def get_calls_for_user(
+    user_email: str,
+    role: str,
+    limit: int = 50,
+    cursor: str | None = None,
+    min_score: float | None = None,
+    max_score: float | None = None,
+    evaluated_role: str | None = None,
+) -> list[dict[str, Any]]:
     """
     Get calls filtered by user role.
     - Reps see only their own calls
@@ -1762,46 +2259,63 @@ def get_calls_for_user(user_email: str, role: str, limit: int = 50) -> list[dict
         user_email: User's email address
         role: User's role ('admin', 'manager', 'rep')
         limit: Maximum number of calls to return
+        cursor: Continue after the call this cursor was made from (CALLS_KEYSET.cursor_for)
+        min_score: Minimum overall score
+        max_score: Maximum overall score
+        evaluated_role: Only calls evaluated against this rubric role
 
     Returns:
-        List of call dicts
+        List of call dicts with their call_summary columns (CALL_SUMMARY_COLUMNS)
+
+    Raises:
+        InvalidCursorError: If cursor is not a calls cursor
     """
+    params: list[Any] = []
     if role == "admin":
         # Admins see all calls
-        return fetch_all(
-            "SELECT * FROM calls ORDER BY scheduled_at DESC NULLS LAST LIMIT %s",
-            (limit,),
-        )
+        visible = "TRUE"
     elif role == "manager":
         # Managers see their team's calls
-        return fetch_all(
-            """
-            SELECT DISTINCT c.*
-            FROM calls c
-            JOIN speakers s ON c.id = s.call_id
-            JOIN users u ON s.email = u.email
-            JOIN speakers s2 ON u.email = s2.email
-            JOIN users manager ON s2.manager_id = manager.id
-            WHERE manager.email = %s
-            ORDER BY c.scheduled_at DESC NULLS LAST
-            LIMIT %s
-            """,
-            (user_email, limit),
-        )
+        visible = """EXISTS (
+                SELECT 1
+                FROM speakers s
+                JOIN users u ON s.email = u.email
+                JOIN speakers s2 ON u.email = s2.email
+                JOIN users manager ON s2.manager_id = manager.id
+                WHERE s.call_id = c.id
+                AND manager.email = %s
+            )"""
+        params.append(user_email)
     else:  # rep
         # Reps see only their own calls
-        return fetch_all(
-            """
-            SELECT DISTINCT c.*
-            FROM calls c
-            JOIN speakers s ON c.id = s.call_id
-            WHERE s.email = %s
-            AND s.company_side = true
-            ORDER BY c.scheduled_at DESC NULLS LAST
-            LIMIT %s
-            """,
-            (user_email, limit),
-        )
+        visible = """EXISTS (
+                SELECT 1
+                FROM speakers s
+                WHERE s.call_id = c.id
+                AND s.email = %s
+                AND s.company_side = true
+            )"""
+        params.append(user_email)
+
+    def bind(value: Any) -> str:
+        params.append(value)
+        return "%s"
+
+    conditions = [visible, *call_summary_filters(bind, min_score, max_score, evaluated_role)]
+    conditions.append(CALLS_KEYSET.condition(cursor, bind))
+    params.append(limit)
+
+    return fetch_all(
+        f"""
+        SELECT c.*, {CALL_SUMMARY_COLUMNS}
+        FROM calls c
+        LEFT JOIN call_summary sm ON sm.call_id = c.id
+        WHERE {" AND ".join(conditions)}
+        ORDER BY {CALLS_KEYSET.order_by()}
+        LIMIT %s
+        """,
+        tuple(params),
+    )
 
 
 # ============================================================================
@@ -1809,6 +2323,51 @@ def get_calls_for_user(user_email: str, role: str, limit: int = 50) -> list[dict
 # ============================================================================
 
 
+def get_opportunity_data_watermark(opportunity_id: str) -> dict[str, Any] | None:
+    """
+    Get the data watermark for an opportunity in a single round-trip.
+
+    The watermark changes whenever a call or email is linked to the opportunity,
+    or a coaching session is written for one of its calls.
+
+    Args:
+        opportunity_id: Opportunity UUID
+
+    Returns:
+        Dict with last_call_at, call_count, last_email_at, email_count,
+        last_session_at and session_count
+    """
+    return fetch_one(
+        """
+        SELECT
+            calls.last_call_at,
+            calls.call_count,
+            em.last_email_at,
+            em.email_count,
+            sessions.last_session_at,
+            sessions.session_count
+        FROM (
+            SELECT MAX(c.scheduled_at) as last_call_at, COUNT(*) as call_count
+            FROM call_opportunities co
+            JOIN calls c ON c.id = co.call_id
+            WHERE co.opportunity_id = %(opp_id)s
+        ) calls,
+        (
+            SELECT MAX(e.sent_at) as last_email_at, COUNT(*) as email_count
+            FROM emails e
+            WHERE e.opportunity_id = %(opp_id)s
+        ) em,
+        (
+            SELECT MAX(cs.created_at) as last_session_at, COUNT(*) as session_count
+            FROM call_opportunities co
+            JOIN coaching_sessions cs ON cs.call_id = co.call_id
+            WHERE co.opportunity_id = %(opp_id)s
+        ) sessions
+        """,
+        {"opp_id": opportunity_id},
+    )
+
+
 def get_opportunity_analysis_cache(cache_key: str) -> dict[str, Any] | None:
     """
     Get cached opportunity analysis result.
@@ -1817,11 +2376,11 @@ def get_opportunity_analysis_cache(cache_key: str) -> dict[str, Any] | None:
         cache_key: SHA256 cache key
 
     Returns:
-        Dict with analysis_result and cached_at, or None if not found
+        Dict with analysis_result, data_watermark and cached_at, or None if not found
     """
     result = fetch_one(
         """
-        SELECT cache_key, opportunity_id, analysis_type, analysis_result, cached_at
+        SELECT cache_key, opportunity_id, analysis_type, analysis_result, data_watermark, cached_at
         FROM opportunity_analysis_cache
         WHERE cache_key = %s
         """,
@@ -1837,6 +2396,7 @@ def set_opportunity_analysis_cache(
     opportunity_id: str,
     analysis_type: str,
     analysis_result: dict[str, Any] | list[Any],
+    data_watermark: str | None = None,
 ) -> None:
     """
     Store opportunity analysis result in cache.
@@ -1848,18 +2408,28 @@ def set_opportunity_analysis_cache(
         opportunity_id: Opportunity UUID
         analysis_type: Type of analysis (patterns, themes, objections, relationship, recommendations)
         analysis_result: Analysis result (JSON serializable)
+        data_watermark: Fingerprint of the opportunity data the result was computed from
     """
     import json
 
     execute_query(
         """
-        INSERT INTO opportunity_analysis_cache (cache_key, opportunity_id, analysis_type, analysis_result, cached_at)
-        VALUES (%s, %s, %s, %s, NOW())
+        INSERT INTO opportunity_analysis_cache (
+            cache_key, opportunity_id, analysis_type, analysis_result, data_watermark, cached_at
+        )
+        VALUES (%s, %s, %s, %s, %s, NOW())
         ON CONFLICT (cache_key) DO UPDATE SET
             analysis_result = EXCLUDED.analysis_result,
+            data_watermark = EXCLUDED.data_watermark,
             cached_at = NOW()
         """,
-        (cache_key, opportunity_id, analysis_type, json.dumps(analysis_result)),
+        (
+            cache_key,
+            opportunity_id,
+            analysis_type,
+            json.dumps(analysis_result, default=str),
+            data_watermark,
+        ),
     )
 
 
@@ -1876,3 +2446,23 @@ def invalidate_opportunity_cache(opportunity_id: str) -> None:
         "DELETE FROM opportunity_analysis_cache WHERE opportunity_id = %s",
         (opportunity_id,),
     )
+
+
+def invalidate_opportunity_cache_for_call(call_id: str) -> None:
+    """
+    Invalidate cached analyses for every opportunity a call is linked to.
+
+    Call this after coaching sessions are written for the call.
+
+    Args:
+        call_id: Call UUID
+    """
+    execute_query(
+        """
+        DELETE FROM opportunity_analysis_cache
+        WHERE opportunity_id IN (
+            SELECT opportunity_id FROM call_opportunities WHERE call_id = %s
+        )
+        """,
+        (call_id,),
+    )
@@ -0,0 +1,236 @@
+"""
+Per-request database query accounting.
+
+While a request (or a test block) is tracked with track_queries(), every statement run
+on a pooled psycopg2 connection (fetch_one/fetch_all, execute_query and raw cursors
+from get_db_connection) and every async_* helper query is recorded:
+- Query count and total database time
+- The slowest statements
+- How often each statement shape ran; the same shape repeated many times in one
+  request is the signature of an N+1 loop
+
+The API middleware tracks each request, reports the totals in a Server-Timing header
+and logs them. Endpoints can declare a budget with @query_budget(n): exceeding it is
+logged, or raised as QueryBudgetExceededError when settings.query_budget_strict is on (for
+tests). assert_query_budget() does the same around any block of code.
+"""
+
+import functools
+import re
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Generator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, TypeVar
+
+from psycopg2 import extensions, sql
+
+SLOWEST_KEPT = 5
+MAX_SHAPE_LENGTH = 300
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\$\d+|%\(\w+\)s|%s|\b\d+(?:\.\d+)?\b")
+_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+class QueryBudgetExceededError(AssertionError):
+    """Raised in strict mode when a request runs more queries than its budget."""
+
+
+def statement_shape(query: str) -> str:
+    """
+    Normalize a statement so executions that differ only in values compare equal.
+
+    Literals and placeholders become ?, lists of them (?, ...), whitespace collapses.
+    """
+    shape = _LITERALS.sub("?", query)
+    shape = _LISTS.sub("(?, ...)", shape)
+    return _WHITESPACE.sub(" ", shape).strip()[:MAX_SHAPE_LENGTH]
+
+
+class QueryStats:
+    """Queries recorded for one request."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_seconds = 0.0
+        self.shapes: Counter[str] = Counter()
+        self.slowest: list[tuple[float, str]] = []
+        self._lock = threading.Lock()
+
+    def record(self, query: str, seconds: float) -> None:
+        shape = statement_shape(query)
+        with self._lock:
+            self.count += 1
+            self.total_seconds += seconds
+            self.shapes[shape] += 1
+            if len(self.slowest) < SLOWEST_KEPT or seconds > self.slowest[-1][0]:
+                self.slowest.append((seconds, shape))
+                self.slowest.sort(key=lambda item: item[0], reverse=True)
+                del self.slowest[SLOWEST_KEPT:]
+
+    def repeated(self, threshold: int) -> dict[str, int]:
+        """Statement shapes run at least threshold times (likely N+1 loops)."""
+        return {shape: n for shape, n in self.shapes.most_common() if n >= threshold}
+
+    def server_timing(self) -> str:
+        """Server-Timing entry for the database time, e.g. db;dur=12.3;desc="7 queries"."""
+        return f'db;dur={self.total_seconds * 1000:.1f};desc="{self.count} queries"'
+
+    def summary(self, repeat_threshold: int) -> dict[str, Any]:
+        """Totals, slowest statements and repeated shapes, for structured logs."""
+        return {
+            "db_queries": self.count,
+            "db_time_ms": round(self.total_seconds * 1000, 2),
+            "db_slowest": [
+                {"ms": round(seconds * 1000, 2), "statement": shape}
+                for seconds, shape in self.slowest
+            ],
+            "db_repeated": self.repeated(repeat_threshold),
+        }
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("db_query_stats", default=None)
+
+
+@contextmanager
+def track_queries() -> Generator[QueryStats, None, None]:
+    """Record the queries run inside the block (including in threads that copy the context)."""
+    stats = QueryStats()
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+def current_stats() -> QueryStats | None:
+    """Stats for the request being tracked, if any."""
+    return _current.get()
+
+
+@contextmanager
+def timed(query: str) -> Generator[None, None, None]:
+    """Time one statement against the current request, if it is being tracked."""
+    stats = _current.get()
+    if stats is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stats.record(query, time.perf_counter() - started)
+
+
+# ============================================================================
+# BUDGETS
+# ============================================================================
+
+
+def query_budget(max_queries: int) -> Callable[[_F], _F]:
+    """
+    Declare the most queries an endpoint is expected to run per request.
+
+    Usage:
+        @app.post("/tools/search_calls")
+        @query_budget(5)
+        async def search_calls_endpoint(...): ...
+    """
+
+    def decorate(endpoint: _F) -> _F:
+        endpoint.__query_budget__ = max_queries  # type: ignore[attr-defined]
+        return endpoint
+
+    return decorate
+
+
+def budget_for(endpoint: Any) -> int | None:
+    """The budget declared on an endpoint with @query_budget, if any."""
+    return getattr(endpoint, "__query_budget__", None)
+
+
+def check_budget(stats: QueryStats, max_queries: int, label: str, repeat_threshold: int) -> None:
+    """
+    Raise QueryBudgetExceededError if stats exceed max_queries.
+
+    The message lists the slowest statements and repeated shapes to point at the cause.
+    """
+    if stats.count <= max_queries:
+        return
+    lines = [f"{label} ran {stats.count} queries (budget {max_queries})"]
+    lines += [f"  x{n}: {shape}" for shape, n in stats.repeated(repeat_threshold).items()]
+    lines += [f"  {seconds * 1000:.1f}ms: {shape}" for seconds, shape in stats.slowest]
+    raise QueryBudgetExceededError("\n".join(lines))
+
+
+@contextmanager
+def assert_query_budget(
+    max_queries: int, repeat_threshold: int = 5
+) -> Generator[QueryStats, None, None]:
+    """
+    Fail if the block runs more than max_queries queries.
+
+    Usage (tests):
+        with assert_query_budget(3):
+            get_coaching_feed_tool(limit=50)
+    """
+    with track_queries() as stats:
+        yield stats
+    check_budget(stats, max_queries, "Block", repeat_threshold)
+
+
+# ============================================================================
+# PSYCOPG2 INSTRUMENTATION
+# ============================================================================
+
+
+@functools.cache
+def _tracked_cursor_class(factory: type) -> type:
+    """Subclass of a cursor class that records execute/executemany timings."""
+
+    class TrackedCursor(factory):  # type: ignore[misc, valid-type]
+        def execute(self, query: Any, vars: Any = None) -> Any:
+            stats = _current.get()
+            if stats is None:
+                return super().execute(query, vars)
+            started = time.perf_counter()
+            try:
+                return super().execute(query, vars)
+            finally:
+                stats.record(_query_text(query, self), time.perf_counter() - started)
+
+        def executemany(self, query: Any, vars_list: Any) -> Any:
+            stats = _current.get()
+            if stats is None:
+                return super().executemany(query, vars_list)
+            started = time.perf_counter()
+            try:
+                return super().executemany(query, vars_list)
+            finally:
+                stats.record(_query_text(query, self), time.perf_counter() - started)
+
+    TrackedCursor.__name__ = TrackedCursor.__qualname__ = f"Tracked{factory.__name__}"
+    return TrackedCursor
+
+
+def _query_text(query: Any, cursor: Any) -> str:
+    if isinstance(query, sql.Composable):
+        text: str = query.as_string(cursor)
+        return text
+    if isinstance(query, bytes):
+        return query.decode(errors="replace")
+    return str(query)
+
+
+class TrackedConnection(extensions.connection):
+    """psycopg2 connection whose cursors (of any cursor_factory) record query timings."""
+
+    def cursor(self, *args: Any, **kwargs: Any) -> Any:
+        factory = kwargs.get("cursor_factory") or self.cursor_factory or extensions.cursor
+        kwargs["cursor_factory"] = _tracked_cursor_class(factory)
+        return super().cursor(*args, **kwargs)
@@ -0,0 +1,218 @@
+"""
+Read replica routing for the synchronous query helpers.
+
+When settings.database_replica_url is set, fetch_one/fetch_all (db.connection) read
+from a separate replica pool, so dashboards, search and analytics don't compete with
+ingest and session writes on the primary. A read still goes to the primary when:
+- The same request (or thread, outside a request) wrote within
+  database_read_your_writes_seconds, so callers see their own writes
+- The caller asked for it with use_primary()
+- The replica's replay lag exceeded database_replica_max_lag_seconds at the last check,
+  or the replica couldn't be reached (it is retried at the next check)
+
+Writes (execute_query, execute_many and get_db_connection) always use the primary.
+"""
+
+import logging
+import threading
+import time
+from collections.abc import Callable, Generator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from prometheus_client import Counter, Gauge
+
+logger = logging.getLogger(__name__)
+
+READS_ROUTED = Counter(
+    "db_reads_total",
+    "Read-only queries by the pool that served them",
+    ["pool"],
+)
+REPLICA_FALLBACKS = Counter(
+    "db_replica_fallbacks_total",
+    "Reads sent to the primary while a replica is configured, by reason",
+    ["reason"],
+)
+REPLICA_LAG = Gauge(
+    "db_replica_lag_seconds",
+    "Replica replay lag at the last check",
+)
+
+# Zero when the replica has replayed everything it received (an idle primary produces
+# no new transactions, so pg_last_xact_replay_timestamp alone would overstate lag), or
+# when the "replica" isn't in recovery at all (e.g. a second local instance in tests).
+LAG_QUERY = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
+
+
+# ============================================================================
+# READ-YOUR-WRITES
+# ============================================================================
+
+
+class _WriteClock:
+    """Time of the last write in a request or thread (shared across context copies)."""
+
+    __slots__ = ("last_write",)
+
+    def __init__(self) -> None:
+        self.last_write: float | None = None
+
+
+_request_clock: ContextVar[_WriteClock | None] = ContextVar("db_write_clock", default=None)
+_force_primary: ContextVar[bool] = ContextVar("db_force_primary", default=False)
+_thread_state = threading.local()
+
+
+def _clock() -> _WriteClock:
+    clock = _request_clock.get()
+    if clock is None:
+        clock = getattr(_thread_state, "clock", None)
+        if clock is None:
+            clock = _thread_state.clock = _WriteClock()
+    return clock
+
+
+@contextmanager
+def request_scope() -> Generator[None, None, None]:
+    """
+    Track writes per request rather than per thread.
+
+    Entered by the API's request middleware. The clock is a mutable object, so writes
+    made in worker threads that copied the request's context still pin later reads.
+    """
+    token = _request_clock.set(_WriteClock())
+    try:
+        yield
+    finally:
+        _request_clock.reset(token)
+
+
+@contextmanager
+def use_primary() -> Generator[None, None, None]:
+    """Send every read inside the block to the primary."""
+    token = _force_primary.set(True)
+    try:
+        yield
+    finally:
+        _force_primary.reset(token)
+
+
+def mark_write() -> None:
+    """Record that the current request (or thread) just used the primary for writing."""
+    _clock().last_write = time.monotonic()
+
+
+def primary_read_reason(read_your_writes_seconds: float) -> str | None:
+    """
+    Why the current read must go to the primary, if it must.
+
+    Returns:
+        "pinned" inside use_primary(), "read_your_writes" shortly after a write,
+        otherwise None
+    """
+    if _force_primary.get():
+        return "pinned"
+    last_write = _clock().last_write
+    if last_write is not None and time.monotonic() - last_write < read_your_writes_seconds:
+        return "read_your_writes"
+    return None
+
+
+# ============================================================================
+# LAG MONITORING
+# ============================================================================
+
+
+class ReplicaMonitor:
+    """
+    Periodically measures replica lag and remembers whether the replica is usable.
+
+    Checks run inline on the read path at most once per check interval; concurrent
+    readers use the last result rather than waiting for a check in progress.
+    """
+
+    def __init__(self, max_lag_seconds: float, check_interval_seconds: float):
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval_seconds = check_interval_seconds
+        self.lag_seconds: float | None = None
+        self.error: str | None = None
+        self._checked_at: float | None = None
+        self._lock = threading.Lock()
+
+    def unusable_reason(self, get_pool: Callable[[], Any]) -> str | None:
+        """
+        Check the replica if a check is due.
+
+        Args:
+            get_pool: Returns the replica pool (may raise if it can't be created)
+
+        Returns:
+            "unavailable" or "lag" if reads should go to the primary, otherwise None
+        """
+        now = time.monotonic()
+        due = self._checked_at is None or now - self._checked_at >= self.check_interval_seconds
+        if due and self._lock.acquire(blocking=False):
+            try:
+                self._check(get_pool)
+            finally:
+                self._checked_at = time.monotonic()
+                self._lock.release()
+
+        if self.error is not None:
+            return "unavailable"
+        if self.lag_seconds is None or self.lag_seconds > self.max_lag_seconds:
+            return "lag"
+        return None
+
+    def mark_unavailable(self, error: Exception) -> None:
+        """Stop using the replica until the next check (e.g. after a failed checkout)."""
+        self.error = str(error)
+        self._checked_at = time.monotonic()
+        logger.warning(f"Read replica unavailable, reading from primary: {error}")
+
+    def status(self) -> dict[str, Any]:
+        """Last check result, for the monitoring endpoint."""
+        return {
+            "lag_seconds": self.lag_seconds,
+            "max_lag_seconds": self.max_lag_seconds,
+            "available": self.error is None and self.lag_seconds is not None,
+            "error": self.error,
+        }
+
+    def _check(self, get_pool: Callable[[], Any]) -> None:
+        try:
+            db_pool = get_pool()
+            conn = db_pool.getconn()
+            try:
+                with conn.cursor() as cur:
+                    cur.execute(LAG_QUERY)
+                    lag = float(cur.fetchone()[0])
+                conn.rollback()
+            finally:
+                db_pool.putconn(conn)
+        except Exception as e:
+            if self.error is None:
+                logger.warning(f"Read replica check failed, reading from primary: {e}")
+            self.error = str(e)
+            return
+
+        if self.error is not None:
+            logger.info("Read replica reachable again")
+        if lag > self.max_lag_seconds and (
+            self.lag_seconds is None or self.lag_seconds <= self.max_lag_seconds
+        ):
+            logger.warning(
+                f"Read replica lag {lag:.1f}s exceeds {self.max_lag_seconds:.1f}s, "
+                f"reading from primary"
+            )
+        self.error = None
+        self.lag_seconds = lag
+        REPLICA_LAG.set(lag)
@@ -203,6 +203,27 @@ def sync_opportunities() -> dict[str, Any]:
         }
 
 
+def reconcile_activity_counters() -> dict[str, Any]:
+    """
+    Correct opportunity call/email counters after a sync.
+
+    Triggers keep the counters current as DLT merges calls links and emails, but
+    changed call dates and re-merged opportunities are only caught here.
+
+    Returns:
+        Dict with {status: str, corrected: int}
+    """
+    from db.queries import reconcile_opportunity_activity
+
+    try:
+        corrected = reconcile_opportunity_activity()
+        logger.info(f"Opportunity activity counters reconciled: {corrected} corrected")
+        return {"status": "success", "corrected": corrected}
+    except Exception as e:
+        logger.error(f"Opportunity activity reconciliation failed: {e}", exc_info=True)
+        return {"status": "failed", "error": str(e)}
+
+
 def run_sync(
     sync_calls_enabled: bool = True,
     sync_emails_enabled: bool = True,
@@ -264,6 +285,9 @@ def run_sync(
         else:
             total_rows += opps_result.get("rows_synced", 0)
 
+    if total_rows:
+        results["activity_counters"] = reconcile_activity_counters()
+
     end_time = datetime.now(UTC)
     duration = (end_time - start_time).total_seconds()
 
@@ -0,0 +1,95 @@
+"""
+Partition Maintenance Flow
+
+Keeps coaching_sessions partitions created ahead of time and, when a retention period
+is given, detaches (and optionally archives) quarters that have aged out.
+
+Scheduled to run on the 1st of every month (deployments/partition_maintenance.yaml);
+any run creates the partitions it finds missing, so a few skipped runs are harmless.
+"""
+
+import json
+import logging
+from typing import Any
+
+from prefect import flow, task
+
+from db.partitions import (
+    detach_old_coaching_session_partitions,
+    ensure_coaching_session_partitions,
+    list_coaching_session_partitions,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@task(name="create_upcoming_partitions", retries=2, retry_delay_seconds=60)
+def create_upcoming_partitions(quarters_ahead: int) -> list[str]:
+    """Create missing coaching_sessions partitions through quarters_ahead."""
+    return ensure_coaching_session_partitions(quarters_ahead)
+
+
+@task(name="detach_expired_partitions")
+def detach_expired_partitions(retain_quarters: int, archive_schema: str | None) -> list[str]:
+    """Detach coaching_sessions partitions older than the retention window."""
+    return detach_old_coaching_session_partitions(retain_quarters, archive_schema)
+
+
+@flow(
+    name="partition_maintenance",
+    description="Pre-create and retire coaching_sessions partitions",
+)
+def partition_maintenance_flow(
+    quarters_ahead: int = 4,
+    retain_quarters: int | None = None,
+    archive_schema: str | None = "archive",
+) -> dict[str, Any]:
+    """
+    Partition maintenance flow.
+
+    Args:
+        quarters_ahead: Quarters after the current one that should already exist
+        retain_quarters: Complete past quarters to keep attached (None keeps everything)
+        archive_schema: Schema detached partitions are moved into (None leaves them
+            detached in place)
+
+    Returns:
+        Dict with created and detached partition names and the partitions now attached
+    """
+    created = create_upcoming_partitions(quarters_ahead)
+
+    detached: list[str] = []
+    if retain_quarters is not None:
+        detached = detach_expired_partitions(retain_quarters, archive_schema)
+
+    attached = [p.name for p in list_coaching_session_partitions()]
+    logger.info(
+        f"Partition maintenance complete: created={created}, detached={detached}, "
+        f"attached through {attached[-1] if attached else 'none'}"
+    )
+
+    return {"created": created, "detached": detached, "attached": attached}
+
+
+if __name__ == "__main__":
+    """
+    Local execution for testing:
+
+    python -m flows.partition_maintenance
+
+    Scheduled by deployments/partition_maintenance.yaml:
+
+    prefect deploy -f deployments/partition_maintenance.yaml
+    """
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+
+    result = partition_maintenance_flow()
+
+    print(json.dumps(result, indent=2))
@@ -19,6 +19,7 @@ from typing import Any
 from prefect import flow, task
 from prefect.task_runners import ConcurrentTaskRunner
 
+from analysis.objections import OBJECTION_TYPE_LABELS
 from db import fetch_all
 from db.models import CoachingDimension
 
@@ -118,20 +119,23 @@ def aggregate_coaching_scores(
 
     Returns:
         Dict with average scores by dimension and overall stats
+
+    Reads the weekly score rollups, so the period is resolved to whole ISO weeks: a week
+    is included when its Thursday falls within [start_date, end_date).
     """
     scores = fetch_all(
         """
         SELECT
-            cs.coaching_dimension,
-            AVG(cs.score) as avg_score,
-            MIN(cs.score) as min_score,
-            MAX(cs.score) as max_score,
-            COUNT(*) as session_count
-        FROM coaching_sessions cs
-        JOIN speakers s ON cs.rep_id = s.id
-        WHERE s.email = %s
-        AND cs.created_at BETWEEN %s AND %s
-        GROUP BY cs.coaching_dimension
+            coaching_dimension,
+            SUM(score_sum)::numeric / SUM(score_count) as avg_score,
+            MIN(score_min) as min_score,
+            MAX(score_max) as max_score,
+            SUM(score_count) as session_count
+        FROM rep_dimension_weekly_scores
+        WHERE rep_email = %s
+        AND week_start >= %s::date - 3
+        AND week_start < %s::date - 3
+        GROUP BY coaching_dimension
         """,
         (rep_email, start_date, end_date),
     )
@@ -166,7 +170,7 @@ def identify_recurring_objections(
     rep_email: str, start_date: datetime, end_date: datetime
 ) -> list[dict[str, Any]]:
     """
-    Identify recurring objections and common themes from coaching sessions.
+    Identify recurring objections from the objections extracted for the rep's calls.
 
     Args:
         rep_email: Rep's email address
@@ -176,76 +180,55 @@ def identify_recurring_objections(
     Returns:
         List of objection/theme patterns with frequency and examples
     """
-    # Get all objection handling coaching sessions
-    sessions = fetch_all(
+    # Objections are extracted when each objection-handling session is stored
+    # (call_objections); count them by type and keep the 3 most recent quotes of each
+    rows = fetch_all(
         """
-        SELECT
-            cs.id,
-            cs.call_id,
-            cs.specific_examples,
-            cs.areas_for_improvement,
-            c.title as call_title,
-            c.scheduled_at
-        FROM coaching_sessions cs
-        JOIN speakers s ON cs.rep_id = s.id
-        JOIN calls c ON cs.call_id = c.id
-        WHERE s.email = %s
-        AND cs.coaching_dimension = 'objection_handling'
-        AND cs.created_at BETWEEN %s AND %s
-        ORDER BY c.scheduled_at DESC
+        WITH rep_objections AS (
+            SELECT
+                o.objection_type,
+                COALESCE(o.quote, '') as quote,
+                c.title as call_title,
+                c.scheduled_at,
+                COUNT(*) OVER (PARTITION BY o.objection_type) as type_count,
+                ROW_NUMBER() OVER (
+                    PARTITION BY o.objection_type
+                    ORDER BY c.scheduled_at DESC NULLS LAST
+                ) as rn
+            FROM call_objections o
+            JOIN speakers s ON o.rep_id = s.id
+            JOIN calls c ON o.call_id = c.id
+            WHERE s.email = %s
+            AND o.created_at BETWEEN %s AND %s
+        )
+        SELECT objection_type, type_count, call_title, scheduled_at, quote
+        FROM rep_objections
+        WHERE rn <= 3
+        ORDER BY type_count DESC, objection_type, rn
         """,
         (rep_email, start_date, end_date),
     )
 
-    # Extract and count objection types from specific_examples and areas_for_improvement
-    objection_patterns = {}
-
-    for session in sessions:
-        # Parse specific examples (JSONB)
-        examples = session.get("specific_examples") or {}
-        if isinstance(examples, str):
-            examples = json.loads(examples)
-
-        needs_work = examples.get("needs_work", [])
-        for example in needs_work:
-            if isinstance(example, dict):
-                text = example.get("analysis", "")
-                # Simple keyword extraction for common objection types
-                if "pricing" in text.lower() or "cost" in text.lower():
-                    key = "pricing_objections"
-                    label = "Pricing/Cost Concerns"
-                elif "timing" in text.lower() or "not ready" in text.lower():
-                    key = "timing_objections"
-                    label = "Timing/Readiness"
-                elif "technical" in text.lower() or "integration" in text.lower():
-                    key = "technical_objections"
-                    label = "Technical Concerns"
-                elif "competitor" in text.lower():
-                    key = "competitor_objections"
-                    label = "Competitive Comparison"
-                else:
-                    key = "other_objections"
-                    label = "Other Objections"
-
-                if key not in objection_patterns:
-                    objection_patterns[key] = {
-                        "type": label,
-                        "count": 0,
-                        "examples": [],
-                    }
-
-                objection_patterns[key]["count"] += 1
-                if len(objection_patterns[key]["examples"]) < 3:  # Keep top 3
-                    objection_patterns[key]["examples"].append(
-                        {
-                            "call_title": session.get("call_title"),
-                            "date": session.get("scheduled_at"),
-                            "quote": example.get("quote", "")[:200],  # Truncate
-                        }
-                    )
+    objection_patterns: dict[str, dict[str, Any]] = {}
+    for row in rows:
+        pattern = objection_patterns.setdefault(
+            row["objection_type"],
+            {
+                "type": OBJECTION_TYPE_LABELS.get(row["objection_type"], row["objection_type"]),
+                "count": row["type_count"],
+                "examples": [],
+            },
+        )
+        pattern["examples"].append(
+            {
+                "call_title": row["call_title"],
+                "date": row["scheduled_at"],
+                "quote": row["quote"][:200],  # Truncate
+            }
+        )
 
-    # Sort by frequency
-    result = sorted(objection_patterns.values(), key=lambda x: x["count"], reverse=True)
+    # Already sorted by frequency
+    result = list(objection_patterns.values())
 
     logger.info(f"Identified {len(result)} objection patterns for {rep_email}")
     return result
@@ -25,6 +25,7 @@ async function handleGet(req: NextRequest) {
       end_date: searchParams.get("end_date") || undefined,
       limit: searchParams.get("limit") ? parseInt(searchParams.get("limit")!) : 20,
       offset: searchParams.get("offset") ? parseInt(searchParams.get("offset")!) : 0,
+      cursor: searchParams.get("cursor") || undefined,
       include_dismissed: searchParams.get("include_dismissed") === "true",
     };
 
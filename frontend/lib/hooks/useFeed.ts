@@ -87,7 +87,10 @@ export function useInfiniteFeed(
       end_date: options.end_date,
       include_dismissed: options.include_dismissed,
       limit,
-      offset: pageIndex * limit,
+      // Follow the server's cursor after the first page; offsets rescan earlier pages
+      ...(previousPageData?.next_cursor
+        ? { cursor: previousPageData.next_cursor }
+        : { offset: pageIndex * limit }),
     };
 
     return buildApiUrl('/api/coaching/feed', params);
@@ -391,6 +391,7 @@ export const feedRequestSchema = z.object({
   end_date: z.string().datetime().optional(),
   limit: z.number().int().min(1).max(50).optional().default(20),
   offset: z.number().int().min(0).optional().default(0),
+  cursor: z.string().optional(),
   include_dismissed: z.boolean().optional().default(false),
 });
 
@@ -402,6 +403,7 @@ export interface FeedResponse {
   highlights: CoachingHighlight[];
   total_count: number;
   has_more: boolean;
+  next_cursor?: string | null;
   new_items_count: number;
 }
 
@@ -99,6 +99,16 @@ class KnowledgeBaseManager:
             for row in results
         ]
 
+    def get_entries_version(self) -> dict[str, Any] | None:
+        """
+        Get a cheap data version for the knowledge base entries (for ETags).
+
+        Updates set last_updated and deletes change the count.
+        """
+        return fetch_one(
+            "SELECT COUNT(*) as count, MAX(last_updated) as last_updated FROM knowledge_base"
+        )
+
     def create_or_update_entry(
         self,
         product: Product,
@@ -295,6 +305,17 @@ class KnowledgeBaseManager:
             for row in results
         ]
 
+    def get_rubrics_version(self) -> dict[str, Any] | None:
+        """
+        Get a cheap data version for the coaching rubrics (for ETags).
+
+        New versions change the count; edits and deprecation bump updated_at
+        (migration 024).
+        """
+        return fetch_one(
+            "SELECT COUNT(*) as count, MAX(updated_at) as updated_at FROM coaching_rubrics"
+        )
+
     def create_rubric(self, rubric_data: dict[str, Any]) -> CoachingRubric:
         """
         Create new coaching rubric version.
@@ -3,7 +3,7 @@ Middleware components for API optimization.
 
 This package provides:
 - Rate limiting per-user and per-endpoint
-- Response compression (gzip)
+- Response compression (zstd, br, gzip; streaming)
 - Caching headers and ETag support
 - Performance monitoring
 """
@@ -15,6 +15,8 @@ from fastapi import Request, Response, status
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import JSONResponse
 
+from api.middleware.gcra import DEFAULT_MAX_KEYS, BoundedLRU
+
 logger = logging.getLogger(__name__)
 
 
@@ -83,6 +85,7 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         default_burst: int = 150,
         expensive_rate_limit: int = 20,
         expensive_burst: int = 30,
+        max_buckets: int = DEFAULT_MAX_KEYS,
     ):
         super().__init__(app)
         self.default_rate_limit = default_rate_limit
@@ -90,8 +93,9 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         self.expensive_rate_limit = expensive_rate_limit
         self.expensive_burst = expensive_burst
 
-        # Per-user rate limit buckets (key: user_identifier)
-        self.user_buckets: dict[str, TokenBucket] = {}
+        # Per-user rate limit buckets (key: user_identifier); least recently used are
+        # evicted beyond max_buckets, so memory stays bounded between cleanups
+        self.user_buckets: BoundedLRU = BoundedLRU(max_buckets)
         self.lock = Lock()
 
         # Expensive endpoints (require more rate limiting)
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Backfill call_objections from existing objection-handling sessions.
+
+New objection-handling sessions have their objections extracted when they are stored
+(migration 022). Run this once after applying the migration to index the latest
+objection-handling session of each existing call. Stored sessions don't keep the
+model's objection list, so types are classified from their specific_examples.
+
+Usage:
+    python scripts/backfill_call_objections.py
+    python scripts/backfill_call_objections.py --since 2026-01-01
+"""
+
+import argparse
+import logging
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from analysis.objections import extract_objections
+from db import fetch_all
+from db.queries import replace_call_objections
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Main entry point for the objection backfill."""
+    parser = argparse.ArgumentParser(
+        description="Extract call_objections from stored objection-handling sessions"
+    )
+    parser.add_argument(
+        "--since",
+        type=datetime.fromisoformat,
+        default=datetime(1970, 1, 1),
+        help="Only sessions created on or after this date, YYYY-MM-DD (default: all)",
+    )
+    args = parser.parse_args()
+
+    try:
+        sessions = fetch_all(
+            """
+            SELECT DISTINCT ON (call_id) id, call_id, rep_id, specific_examples, created_at
+            FROM coaching_sessions
+            WHERE coaching_dimension = 'objection_handling'
+            AND created_at >= %s
+            ORDER BY call_id, created_at DESC
+            """,
+            (args.since,),
+        )
+
+        stored = 0
+        for session in sessions:
+            stored += replace_call_objections(
+                session["call_id"],
+                session["id"],
+                session["rep_id"],
+                extract_objections(session),
+                analyzed_at=session["created_at"],
+            )
+        logger.info(f"Backfill complete: {stored} objections from {len(sessions)} calls")
+    except Exception as e:
+        logger.error(f"Backfill failed: {e}", exc_info=True)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Backfill rep/dimension/week score rollups from coaching_sessions.
+
+New sessions are folded into rep_dimension_weekly_scores by a trigger (migration 017).
+Run this once after applying the migration to cover existing history, or with --since
+to recompute recent weeks after sessions were edited by hand.
+
+Usage:
+    python scripts/backfill_score_rollups.py
+    python scripts/backfill_score_rollups.py --since 2026-01-01
+"""
+
+import argparse
+import logging
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from db.queries import rebuild_rep_dimension_weekly_scores
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Main entry point for the rollup backfill."""
+    parser = argparse.ArgumentParser(
+        description="Recompute rep_dimension_weekly_scores from coaching_sessions"
+    )
+    parser.add_argument(
+        "--since",
+        type=datetime.fromisoformat,
+        default=None,
+        help="Only recompute weeks from the one containing this date, YYYY-MM-DD "
+        "(default: all history)",
+    )
+    args = parser.parse_args()
+
+    try:
+        written = rebuild_rep_dimension_weekly_scores(since=args.since)
+        logger.info(f"Backfill complete: {written} rollup rows written")
+    except Exception as e:
+        logger.error(f"Backfill failed: {e}", exc_info=True)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
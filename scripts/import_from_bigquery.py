@@ -9,11 +9,12 @@ Usage:
 import argparse
 from typing import Any
 
+import pandas as pd
 import psycopg2
 from google.cloud import bigquery
-from psycopg2.extras import execute_batch
 
 from coaching_mcp.shared import settings
+from db.bulk import bulk_merge
 
 
 def get_bigquery_client() -> bigquery.Client:
@@ -47,7 +48,9 @@ def import_calls(
     bq_client: bigquery.Client, conn, since_date: str, limit: int | None = None
 ) -> dict[str, Any]:
     """
-    Import calls from BigQuery.
+    Import calls, speakers and transcripts from BigQuery.
+
+    Each entity is COPYed into a staging table and merged in one statement (db.bulk).
 
     Returns dict with statistics about imported data.
     """
@@ -79,142 +82,107 @@ def import_calls(
     calls_df = bq_client.query(query).to_dataframe()
     print(f"Found {len(calls_df)} calls to import")
 
-    with conn.cursor() as cursor:
-        # Import calls
-        call_values = []
-        for _, row in calls_df.iterrows():
-            # Check if call already exists
-            cursor.execute("SELECT 1 FROM calls WHERE gong_call_id = %s", (row["id"],))
-            if cursor.fetchone():
-                print(f"  Skip (exists): {row['id']} - {row['title']}")
-                continue
-
-            call_values.append(
-                (
-                    row["id"],  # gong_call_id
-                    row["title"],
-                    row["scheduled"],
-                    row["duration"],
-                    row["purpose"],  # call_type placeholder
-                    None,  # product (will need manual classification)
-                    row["scheduled"].date() if row["scheduled"] else None,  # date
-                    row["scheduled"],  # processed_at (mark as ingested)
-                    psycopg2.extras.Json(
-                        {
-                            "gong_url": row["url"],
-                            "started": str(row["started"]) if row["started"] else None,
-                        }
-                    ),
-                )
-            )
-
-        if call_values:
-            print(f"Inserting {len(call_values)} new calls...")
-            execute_batch(
-                cursor,
-                """
-                INSERT INTO calls (
-                    gong_call_id, title, scheduled_at, duration_seconds,
-                    call_type, product, date, processed_at, metadata
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                ON CONFLICT (gong_call_id) DO NOTHING
-                """,
-                call_values,
-                page_size=100,
-            )
-            stats["calls_imported"] = len(call_values)
-            conn.commit()
-            print(f"✓ Imported {len(call_values)} calls")
-        else:
-            print("✓ No new calls to import")
-
-        # Import speakers for imported calls
-        print("\nFetching speakers from BigQuery...")
-        speaker_query = f"""
-        SELECT DISTINCT
-            cs.call_id,
-            cs.user_id,
-            cs.talk_time,
-            u.email_address,
-            u.title
-        FROM `prefect-data-warehouse.gongio_ft.call` c
-        JOIN `prefect-data-warehouse.gongio_ft.call_speaker` cs ON c.id = cs.call_id
-        LEFT JOIN `prefect-data-warehouse.gongio_ft.users` u ON CAST(cs.user_id AS STRING) = u.id
-        WHERE c.scheduled >= '{since_date}'
-            AND c._fivetran_deleted = FALSE
-            AND cs._fivetran_deleted = FALSE
-        {f'LIMIT {limit * 50 if limit else ""}'}
-        """
-
-        speakers_df = bq_client.query(speaker_query).to_dataframe()
-        print(f"Found {len(speakers_df)} speaker records")
-
-        speaker_values = []
-        for _, row in speakers_df.iterrows():
-            # Get call internal ID
-            cursor.execute("SELECT id FROM calls WHERE gong_call_id = %s", (row["call_id"],))
-            call_result = cursor.fetchone()
-            if not call_result:
-                continue
-            call_internal_id = call_result[0]
-
-            # Extract name from email if available
-            email = row["email_address"]
-            if email:
-                # Extract name from email (e.g., "george@prefect.io" -> "George")
-                name_part = email.split("@")[0]
-                # Handle names like "brian.r" or "george.coyne"
-                name_parts = name_part.replace(".", " ").split()
-                full_name = " ".join(part.capitalize() for part in name_parts)
-            else:
-                full_name = f"Speaker {row['user_id']}"
-
-            # Check if speaker already exists for this call
-            cursor.execute(
-                "SELECT 1 FROM speakers WHERE call_id = %s AND email = %s",
-                (call_internal_id, email),
-            )
-            if cursor.fetchone():
-                continue
-
-            # Determine if company side (Prefect employee)
-            is_company = email and "@prefect.io" in email
-
-            # Convert talk_time to seconds (it's in seconds already as float)
-            talk_time_seconds = int(row["talk_time"]) if row["talk_time"] else None
-
-            speaker_values.append(
-                (
-                    call_internal_id,
-                    full_name,
-                    email,
-                    row["title"],  # Use job title as role placeholder
-                    is_company,
-                    talk_time_seconds,
-                    None,  # talk_time_percentage (will calculate later if needed)
-                )
+    # Existing calls are skipped (ON CONFLICT DO NOTHING on gong_call_id)
+    scheduled = pd.to_datetime(calls_df["scheduled"])
+    calls = pd.DataFrame(
+        {
+            "gong_call_id": calls_df["id"].astype("string"),
+            "title": calls_df["title"],
+            "scheduled_at": scheduled,
+            "duration_seconds": pd.to_numeric(calls_df["duration"]).round().astype("Int64"),
+            "call_type": calls_df["purpose"],  # call_type placeholder
+            "date": scheduled.dt.date,
+            "processed_at": scheduled,  # mark as ingested
+            "metadata": pd.DataFrame(
+                {
+                    "gong_url": calls_df["url"],
+                    "started": calls_df["started"].astype("string"),
+                }
             )
+            .to_json(orient="records", lines=True)
+            .splitlines(),
+        }
+    )
+    result = bulk_merge(
+        conn,
+        "calls",
+        calls,
+        {
+            "gong_call_id": "varchar",
+            "title": "varchar",
+            "scheduled_at": "timestamp",
+            "duration_seconds": "int",
+            "call_type": "varchar",
+            "date": "date",
+            "processed_at": "timestamp",
+            "metadata": "jsonb",
+        },
+        conflict_columns=["gong_call_id"],
+    )
+    stats["calls_imported"] = result.inserted
+    print(f"✓ Imported {result.inserted} calls ({result.rows_per_second:,.0f} rows/s)")
+
+    # Import speakers for imported calls
+    print("\nFetching speakers from BigQuery...")
+    speaker_query = f"""
+    SELECT DISTINCT
+        cs.call_id,
+        cs.user_id,
+        cs.talk_time,
+        u.email_address,
+        u.title
+    FROM `prefect-data-warehouse.gongio_ft.call` c
+    JOIN `prefect-data-warehouse.gongio_ft.call_speaker` cs ON c.id = cs.call_id
+    LEFT JOIN `prefect-data-warehouse.gongio_ft.users` u ON CAST(cs.user_id AS STRING) = u.id
+    WHERE c.scheduled >= '{since_date}'
+        AND c._fivetran_deleted = FALSE
+        AND cs._fivetran_deleted = FALSE
+    {f'LIMIT {limit * 50 if limit else ""}'}
+    """
 
-        if speaker_values:
-            print(f"Inserting {len(speaker_values)} speakers...")
-            execute_batch(
-                cursor,
-                """
-                INSERT INTO speakers (
-                    call_id, name, email, role, company_side,
-                    talk_time_seconds, talk_time_percentage
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s)
-                ON CONFLICT DO NOTHING
-                """,
-                speaker_values,
-                page_size=100,
+    speakers_df = bq_client.query(speaker_query).to_dataframe()
+    print(f"Found {len(speakers_df)} speaker records")
+
+    # Name from email (e.g., "george.coyne@prefect.io" -> "George Coyne")
+    email = speakers_df["email_address"].astype("string").replace("", pd.NA)
+    name_from_email = email.str.split("@").str[0].str.replace(".", " ", regex=False).str.title()
+    speakers = pd.DataFrame(
+        {
+            "gong_call_id": speakers_df["call_id"].astype("string"),
+            "name": name_from_email.fillna("Speaker " + speakers_df["user_id"].astype("string")),
+            "email": email,
+            # Company side = Prefect employee
+            "company_side": email.str.contains("@prefect.io", regex=False).fillna(False),
+            # talk_time is in seconds already (as float)
+            "talk_time_seconds": (pd.to_numeric(speakers_df["talk_time"]) // 1).astype("Int64"),
+        }
+    )
+    # Resolve call ids and skip speakers already recorded for the call (by email)
+    result = bulk_merge(
+        conn,
+        "speakers",
+        speakers,
+        {
+            "gong_call_id": "varchar",
+            "name": "varchar",
+            "email": "varchar",
+            "company_side": "boolean",
+            "talk_time_seconds": "int",
+        },
+        target_columns=["call_id", "name", "email", "company_side", "talk_time_seconds"],
+        source="""
+            SELECT c.id, st.name, st.email, st.company_side, st.talk_time_seconds
+            FROM {stage} st
+            JOIN calls c ON c.gong_call_id = st.gong_call_id
+            WHERE NOT EXISTS (
+                SELECT 1 FROM speakers s WHERE s.call_id = c.id AND s.email = st.email
             )
-            stats["speakers_imported"] = len(speaker_values)
-            conn.commit()
-            print(f"✓ Imported {len(speaker_values)} speakers")
-        else:
-            print("✓ No new speakers to import")
+        """,
+    )
+    stats["speakers_imported"] = result.inserted
+    print(f"✓ Imported {result.inserted} speakers ({result.rows_per_second:,.0f} rows/s)")
 
+    with conn.cursor() as cursor:
         # Update prefect_reps array for all calls
         print("\nUpdating prefect_reps arrays...")
         cursor.execute(
@@ -232,81 +200,63 @@ def import_calls(
         conn.commit()
         print(f"✓ Updated prefect_reps for {updated_count} calls")
 
-        # Import transcripts (sample - first sentence per speaker per call)
-        print("\nFetching transcript samples from BigQuery...")
-        transcript_query = f"""
-        SELECT
-            t.call_id,
-            t.speaker_id,
-            t.sentence,
-            t.index
-        FROM `prefect-data-warehouse.gongio_ft.transcript` t
-        WHERE t.call_id IN (
-            SELECT id
-            FROM `prefect-data-warehouse.gongio_ft.call`
-            WHERE scheduled >= '{since_date}'
-                AND _fivetran_deleted = FALSE
-        )
-        AND t._fivetran_deleted = FALSE
-        ORDER BY t.call_id, t.index
-        {f'LIMIT {limit * 50 if limit else "5000"}'}
-        """
+    # Import transcripts (sample - first sentence per speaker per call)
+    print("\nFetching transcript samples from BigQuery...")
+    transcript_query = f"""
+    SELECT
+        t.call_id,
+        t.speaker_id,
+        t.sentence,
+        t.index
+    FROM `prefect-data-warehouse.gongio_ft.transcript` t
+    WHERE t.call_id IN (
+        SELECT id
+        FROM `prefect-data-warehouse.gongio_ft.call`
+        WHERE scheduled >= '{since_date}'
+            AND _fivetran_deleted = FALSE
+    )
+    AND t._fivetran_deleted = FALSE
+    ORDER BY t.call_id, t.index
+    {f'LIMIT {limit * 50 if limit else "5000"}'}
+    """
 
-        transcripts_df = bq_client.query(transcript_query).to_dataframe()
-        print(f"Found {len(transcripts_df)} transcript segments")
-
-        transcript_values = []
-        for _, row in transcripts_df.iterrows():
-            # Get call internal ID
-            cursor.execute("SELECT id FROM calls WHERE gong_call_id = %s", (row["call_id"],))
-            call_result = cursor.fetchone()
-            if not call_result:
-                continue
-            call_internal_id = call_result[0]
-
-            # Get speaker internal ID
-            cursor.execute(
-                """
-                SELECT id FROM speakers
-                WHERE call_id = %s
-                LIMIT 1
-                """,
-                (call_internal_id,),
-            )
-            speaker_result = cursor.fetchone()
-            if not speaker_result:
-                continue
-            speaker_internal_id = speaker_result[0]
-
-            transcript_values.append(
-                (
-                    call_internal_id,
-                    speaker_internal_id,
-                    row["index"],
-                    None,  # start_time_ms (not available in this data)
-                    row["sentence"],
-                )
-            )
+    transcripts_df = bq_client.query(transcript_query).to_dataframe()
+    print(f"Found {len(transcripts_df)} transcript segments")
 
-        if transcript_values:
-            print(f"Inserting {len(transcript_values)} transcript segments...")
-            execute_batch(
-                cursor,
-                """
-                INSERT INTO transcripts (
-                    call_id, speaker_id, sequence_number,
-                    start_time_ms, text
-                ) VALUES (%s, %s, %s, %s, %s)
-                ON CONFLICT DO NOTHING
-                """,
-                transcript_values,
-                page_size=100,
+    transcripts = pd.DataFrame(
+        {
+            "gong_call_id": transcripts_df["call_id"].astype("string"),
+            "sequence_number": pd.to_numeric(transcripts_df["index"]).astype("Int64"),
+            "text": transcripts_df["sentence"],
+        }
+    )
+    # Attributed to one speaker of the call (Gong speaker ids aren't stored locally);
+    # segments already imported for the call are skipped. start_time_ms isn't available.
+    result = bulk_merge(
+        conn,
+        "transcripts",
+        transcripts,
+        {"gong_call_id": "varchar", "sequence_number": "int", "text": "text"},
+        target_columns=["call_id", "speaker_id", "sequence_number", "text"],
+        source="""
+            SELECT c.id, sp.id, st.sequence_number, st.text
+            FROM {stage} st
+            JOIN calls c ON c.gong_call_id = st.gong_call_id
+            CROSS JOIN LATERAL (
+                SELECT id FROM speakers WHERE call_id = c.id LIMIT 1
+            ) sp
+            WHERE st.text IS NOT NULL
+            AND NOT EXISTS (
+                SELECT 1 FROM transcripts tr
+                WHERE tr.call_id = c.id AND tr.sequence_number = st.sequence_number
             )
-            stats["transcripts_imported"] = len(transcript_values)
-            conn.commit()
-            print(f"✓ Imported {len(transcript_values)} transcript segments")
-        else:
-            print("✓ No transcript segments to import")
+        """,
+    )
+    stats["transcripts_imported"] = result.inserted
+    print(
+        f"✓ Imported {result.inserted} transcript segments "
+        f"({result.rows_per_second:,.0f} rows/s)"
+    )
 
     return stats
 
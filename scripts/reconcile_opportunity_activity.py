@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Reconcile opportunity call/email counters with the underlying tables.
+
+call_count, email_count and last_activity_at on opportunities are kept current by
+triggers (migration 019), and the DLT sync flow reconciles them after each sync. Run
+this by hand after bulk edits made with triggers disabled, or to check for drift.
+
+Usage:
+    python scripts/reconcile_opportunity_activity.py
+"""
+
+import logging
+import sys
+from pathlib import Path
+
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from db.queries import reconcile_opportunity_activity
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Main entry point for counter reconciliation."""
+    try:
+        corrected = reconcile_opportunity_activity()
+        logger.info(f"Reconciliation complete: {corrected} opportunities corrected")
+    except Exception as e:
+        logger.error(f"Reconciliation failed: {e}", exc_info=True)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -27,11 +27,12 @@ import logging
 from datetime import UTC, datetime
 from typing import Any
 
+import pandas as pd
 import psycopg2
-import psycopg2.extras
 from google.cloud import bigquery
 
 from coaching_mcp.shared import settings
+from db.bulk import bulk_merge
 
 logger = logging.getLogger(__name__)
 
@@ -152,61 +153,41 @@ def sync_opportunities(last_sync: datetime | None = None) -> dict[str, int]:
         if len(opps_df) == 0:
             return stats
 
+        opps = opps_df[
+            ["gong_opportunity_id", "name", "account_name", "owner_email", "stage"]
+        ].astype("string")
+        opps["close_date"] = pd.to_datetime(opps_df["close_date"]).dt.date
+        opps["amount"] = pd.to_numeric(opps_df["amount"])
+        opps["metadata"] = json.dumps({"source": "salesforce_ft"})
+
         with get_db_connection() as conn:
-            with conn.cursor() as cursor:
-                for _, row in opps_df.iterrows():
-                    try:
-                        cursor.execute(
-                            "SELECT id FROM opportunities WHERE gong_opportunity_id = %s",
-                            (row["gong_opportunity_id"],),
-                        )
-                        existing = cursor.fetchone()
-
-                        if existing:
-                            cursor.execute(
-                                """
-                                UPDATE opportunities SET
-                                    name = %s, account_name = %s, owner_email = %s,
-                                    stage = %s, close_date = %s, amount = %s, updated_at = NOW()
-                                WHERE gong_opportunity_id = %s
-                                """,
-                                (
-                                    row["name"],
-                                    row["account_name"],
-                                    row["owner_email"],
-                                    row["stage"],
-                                    row["close_date"],
-                                    row["amount"],
-                                    row["gong_opportunity_id"],
-                                ),
-                            )
-                            stats["updated"] += 1
-                        else:
-                            cursor.execute(
-                                """
-                                INSERT INTO opportunities (
-                                    gong_opportunity_id, name, account_name, owner_email,
-                                    stage, close_date, amount, metadata
-                                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                                """,
-                                (
-                                    row["gong_opportunity_id"],
-                                    row["name"],
-                                    row["account_name"],
-                                    row["owner_email"],
-                                    row["stage"],
-                                    row["close_date"],
-                                    row["amount"],
-                                    psycopg2.extras.Json({"source": "salesforce_ft"}),
-                                ),
-                            )
-                            stats["inserted"] += 1
-
-                    except Exception as e:
-                        stats["errors"] += 1
-                        logger.error(f"Error syncing opportunity {row['name']}: {e}")
-
-                conn.commit()
+            result = bulk_merge(
+                conn,
+                "opportunities",
+                opps,
+                {
+                    "gong_opportunity_id": "varchar",
+                    "name": "varchar",
+                    "account_name": "varchar",
+                    "owner_email": "varchar",
+                    "stage": "varchar",
+                    "close_date": "date",
+                    "amount": "numeric",
+                    "metadata": "jsonb",
+                },
+                conflict_columns=["gong_opportunity_id"],
+                update_columns=[
+                    "name",
+                    "account_name",
+                    "owner_email",
+                    "stage",
+                    "close_date",
+                    "amount",
+                ],
+                touch_columns=["updated_at"],
+            )
+        stats["inserted"] = result.inserted
+        stats["updated"] = result.updated
 
     except Exception as e:
         logger.error(f"BigQuery query failed: {e}")
@@ -261,57 +242,42 @@ def sync_calls(last_sync: datetime | None = None) -> dict[str, int]:
         if len(calls_df) == 0:
             return stats
 
+        scheduled = pd.to_datetime(calls_df["scheduled"])
+        calls = pd.DataFrame(
+            {
+                "gong_call_id": calls_df["id"].astype("string"),
+                "title": calls_df["title"],
+                "scheduled_at": scheduled,
+                "duration_seconds": (pd.to_numeric(calls_df["duration"]) // 1).astype("Int64"),
+                "call_type": calls_df["purpose"],
+                "date": scheduled.dt.date,
+                "processed_at": scheduled,
+                "metadata": pd.DataFrame({"gong_url": calls_df["url"]})
+                .to_json(orient="records", lines=True)
+                .splitlines(),
+            }
+        )
+
         with get_db_connection() as conn:
-            with conn.cursor() as cursor:
-                for _, row in calls_df.iterrows():
-                    try:
-                        cursor.execute("SELECT id FROM calls WHERE gong_call_id = %s", (row["id"],))
-                        existing = cursor.fetchone()
-
-                        if existing:
-                            cursor.execute(
-                                """
-                                UPDATE calls SET
-                                    title = %s, scheduled_at = %s, duration_seconds = %s,
-                                    call_type = %s
-                                WHERE gong_call_id = %s
-                                """,
-                                (
-                                    row["title"],
-                                    row["scheduled"],
-                                    int(row["duration"]) if row["duration"] else None,
-                                    row["purpose"],
-                                    row["id"],
-                                ),
-                            )
-                            stats["updated"] += 1
-                        else:
-                            cursor.execute(
-                                """
-                                INSERT INTO calls (
-                                    gong_call_id, title, scheduled_at, duration_seconds,
-                                    call_type, date, processed_at, metadata
-                                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-                                ON CONFLICT (gong_call_id) DO NOTHING
-                                """,
-                                (
-                                    row["id"],
-                                    row["title"],
-                                    row["scheduled"],
-                                    int(row["duration"]) if row["duration"] else None,
-                                    row["purpose"],
-                                    row["scheduled"].date() if row["scheduled"] else None,
-                                    row["scheduled"],
-                                    psycopg2.extras.Json({"gong_url": row["url"]}),
-                                ),
-                            )
-                            stats["inserted"] += 1
-                        conn.commit()
-
-                    except Exception as e:
-                        conn.rollback()
-                        stats["errors"] += 1
-                        logger.error(f"Error syncing call {row['id']}: {e}")
+            result = bulk_merge(
+                conn,
+                "calls",
+                calls,
+                {
+                    "gong_call_id": "varchar",
+                    "title": "varchar",
+                    "scheduled_at": "timestamp",
+                    "duration_seconds": "int",
+                    "call_type": "varchar",
+                    "date": "date",
+                    "processed_at": "timestamp",
+                    "metadata": "jsonb",
+                },
+                conflict_columns=["gong_call_id"],
+                update_columns=["title", "scheduled_at", "duration_seconds", "call_type"],
+            )
+        stats["inserted"] = result.inserted
+        stats["updated"] = result.updated
 
     except Exception as e:
         logger.error(f"BigQuery query failed: {e}")
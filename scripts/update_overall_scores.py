@@ -1,54 +1,56 @@
 #!/usr/bin/env python3
 """
-Update overall_score for all calls from their coaching_sessions.
+Rebuild call_summary (overall and per-dimension scores) from coaching_sessions.
 
-This recalculates the average score across all dimensions for each call.
+call_summary is kept current by triggers on coaching_sessions and speakers
+(migration 021). Run this by hand after bulk loads made with triggers disabled, or to
+check for drift.
+
+Usage:
+    python scripts/update_overall_scores.py
 """
 
+import logging
 import sys
 from pathlib import Path
 
-sys.path.insert(0, str(Path(__file__).parent.parent))
-
-from db.connection import get_db_connection
-
-with get_db_connection() as conn:
-    with conn.cursor() as cursor:
-        # Update overall_score for all calls with coaching sessions
-        cursor.execute(
-            """
-            UPDATE calls SET overall_score = (
-                SELECT ROUND(AVG(cs.score))::int
-                FROM coaching_sessions cs
-                WHERE cs.call_id = calls.id
-                AND cs.score IS NOT NULL
-            )
-            WHERE EXISTS (
-                SELECT 1 FROM coaching_sessions cs2
-                WHERE cs2.call_id = calls.id
-                AND cs2.score IS NOT NULL
-            )
+# Add project root to path for imports
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from db import fetch_all
+from db.queries import refresh_call_summary
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+)
+logger = logging.getLogger(__name__)
+
+
+def main():
+    """Main entry point for the call summary rebuild."""
+    try:
+        changed = refresh_call_summary()
+        logger.info(f"Rebuild complete: {changed} call summaries inserted or updated")
+    except Exception as e:
+        logger.error(f"Rebuild failed: {e}", exc_info=True)
+        sys.exit(1)
+
+    top_calls = fetch_all(
         """
-        )
-
-        updated = cursor.rowcount
-        conn.commit()
-
-        print(f"✓ Updated overall_score for {updated} calls")
-
-        # Show some examples
-        cursor.execute(
-            """
-            SELECT c.title, c.overall_score, COUNT(cs.id) as session_count
-            FROM calls c
-            JOIN coaching_sessions cs ON cs.call_id = c.id
-            WHERE c.overall_score IS NOT NULL
-            GROUP BY c.id
-            ORDER BY c.overall_score DESC
-            LIMIT 5
+        SELECT c.title, sm.overall_score, sm.scored_sessions
+        FROM call_summary sm
+        JOIN calls c ON c.id = sm.call_id
+        WHERE sm.overall_score IS NOT NULL
+        ORDER BY sm.overall_score DESC NULLS LAST
+        LIMIT 5
         """
-        )
+    )
+    print("\nTop scored calls:")
+    for row in top_calls:
+        print(f"  {row['title']}: {row['overall_score']}/100 ({row['scored_sessions']} sessions)")
+
 
-        print("\nTop scored calls:")
-        for row in cursor.fetchall():
-            print(f"  {row[0]}: {row[1]}/100 ({row[2]} dimensions)")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""
+Tests for the streaming analyze_call endpoint (Server-Sent Events).
+
+Tests cover:
+- A dimension event per dimension, in completion order, then the aggregated sections
+- Token deltas forwarded from the analysis thread when stream_tokens is set
+- Heartbeats while waiting, and per-dimension failures
+- Validation errors returned as normal HTTP responses
+"""
+
+import json
+import threading
+import time
+from dataclasses import replace
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api import streaming
+from api.rest_server import app
+from coaching_mcp.tools.analyze_call import CallAnalysisContext
+
+CONTEXT = CallAnalysisContext(
+    call_id="call-1",
+    call={
+        "gong_call_id": "call-1",
+        "title": "Acme discovery",
+        "scheduled_at": None,
+        "call_type": "discovery",
+        "product": "prefect",
+    },
+    db_call_id=uuid4(),
+    dimensions=["discovery", "engagement"],
+    detected_role="ae",
+    speakers=[],
+    rep={"id": str(uuid4()), "name": "Sam Rep", "email": "sam@prefect.io"},
+    transcript="Hello there.",
+)
+
+ANALYSIS = {
+    "scores": {"discovery": 80, "engagement": 70},
+    "five_wins_evaluation": {"overall_score": 64},
+    "strengths": ["Clear agenda"],
+    "comparison_to_average": [],
+    "transcript": [],
+}
+
+
+def parse_events(body: str) -> list[tuple[str, dict]]:
+    """Split an SSE body into (event, data) pairs, skipping comments."""
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = [line for line in block.splitlines() if not line.startswith(":")]
+        if not lines:
+            continue
+        event = lines[0].removeprefix("event: ")
+        events.append((event, json.loads(lines[1].removeprefix("data: "))))
+    return events
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+@pytest.fixture
+def prepared():
+    with (
+        patch("api.rest_server.prepare_call_analysis", return_value=CONTEXT) as prepare,
+        patch("api.rest_server.find_cached_dimensions", return_value={}),
+        # Fixed estimate, so the token budget charge doesn't load the tiktoken encoding
+        patch("api.token_budget.estimate_analysis_tokens", return_value=2_000),
+    ):
+        yield prepare
+
+
+class TestAnalyzeCallStream:
+    """Tests for POST /tools/analyze_call/stream."""
+
+    def test_dimension_events_then_sections(self, client, prepared):
+        """
+        GIVEN a call with two dimensions where engagement finishes first
+        WHEN the analysis is streamed
+        THEN each dimension is sent as it completes, followed by the sections and done
+        """
+        discovery_started = threading.Event()
+        engagement_done = threading.Event()
+
+        def analyze(context, dimension, force_reanalysis, on_token):
+            if dimension == "discovery":
+                discovery_started.set()
+                engagement_done.wait(5)
+                time.sleep(0.05)  # let engagement's result reach the event loop first
+                return {"score": 80}
+            discovery_started.wait(5)
+            engagement_done.set()
+            return {"score": 70}
+
+        with (
+            patch.object(streaming, "analyze_call_dimension", analyze),
+            patch.object(streaming, "build_call_analysis", return_value=ANALYSIS) as build,
+        ):
+            response = client.post("/tools/analyze_call/stream", json={"call_id": "call-1"})
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = parse_events(response.text)
+        assert [event for event, _ in events] == [
+            "call",
+            "dimension",
+            "dimension",
+            "five_wins",
+            "insights",
+            "comparison",
+            "transcript",
+            "done",
+        ]
+        assert events[0][1]["rep_analyzed"]["evaluated_as_role"] == "ae"
+        assert events[1][1] == {"dimension": "engagement", "result": {"score": 70}}
+        assert events[3][1]["scores"] == ANALYSIS["scores"]
+        assert events[-1][1] == {"overall_score": 64}
+        # Aggregation sees results in the requested dimension order
+        assert list(build.call_args.args[1]) == ["discovery", "engagement"]
+
+    def test_stream_tokens(self, client, prepared):
+        prepared.return_value = replace(CONTEXT, dimensions=["discovery"])
+
+        def analyze(context, dimension, force_reanalysis, on_token):
+            for text in ("Strong ", "opening"):
+                on_token(text)
+            return {"score": 75}
+
+        with (
+            patch.object(streaming, "analyze_call_dimension", analyze),
+            patch.object(streaming, "build_call_analysis", return_value=ANALYSIS),
+        ):
+            response = client.post(
+                "/tools/analyze_call/stream",
+                json={"call_id": "call-1", "dimensions": ["discovery"], "stream_tokens": True},
+            )
+
+        events = parse_events(response.text)
+        tokens = [data for event, data in events if event == "token"]
+        assert [t["text"] for t in tokens] == ["Strong ", "opening"]
+        # Every token for a dimension arrives before its result
+        names = [event for event, _ in events]
+        assert names.index("dimension") > names.index("token")
+
+    def test_heartbeat_and_dimension_failure(self, client, prepared):
+        """
+        GIVEN a dimension that is slower than the heartbeat and one that fails
+        WHEN the analysis is streamed
+        THEN keep-alive comments are sent and the failure is reported in its event
+        """
+
+        def analyze(context, dimension, force_reanalysis, on_token):
+            if dimension == "engagement":
+                raise RuntimeError("claude unavailable")
+            threading.Event().wait(0.2)
+            return {"score": 80}
+
+        with (
+            patch.object(streaming, "HEARTBEAT_SECONDS", 0.05),
+            patch.object(streaming, "analyze_call_dimension", analyze),
+            patch.object(streaming, "build_call_analysis", return_value=ANALYSIS),
+        ):
+            response = client.post("/tools/analyze_call/stream", json={"call_id": "call-1"})
+
+        assert streaming.HEARTBEAT in response.text
+        results = {
+            data["dimension"]: data["result"]
+            for event, data in parse_events(response.text)
+            if event == "dimension"
+        }
+        assert results["engagement"] == {"error": "claude unavailable", "score": None}
+        assert results["discovery"] == {"score": 80}
+
+    def test_aggregation_error_ends_stream(self, client, prepared):
+        with (
+            patch.object(streaming, "analyze_call_dimension", return_value={"score": 80}),
+            patch.object(streaming, "build_call_analysis", side_effect=RuntimeError("boom")),
+        ):
+            response = client.post("/tools/analyze_call/stream", json={"call_id": "call-1"})
+
+        events = parse_events(response.text)
+        assert events[-1] == ("error", {"detail": "boom"})
+
+    def test_unknown_call_is_400(self, client):
+        with patch(
+            "api.rest_server.prepare_call_analysis",
+            side_effect=ValueError("Call nope not found in database"),
+        ):
+            response = client.post("/tools/analyze_call/stream", json={"call_id": "nope"})
+
+        assert response.status_code == 400
+        assert "not found" in response.json()["error"]
@@ -0,0 +1,202 @@
+"""
+Tests for batch analysis jobs.
+
+Tests cover:
+- Only dimensions without a cached session are analyzed
+- Duplicate call IDs, failed calls and bounded concurrency
+- Progress over SSE and NDJSON download
+- Endpoint validation and job handles
+"""
+
+import asyncio
+import json
+import threading
+import time
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api import batch
+from api.rest_server import app
+from coaching_mcp.tools.analyze_call import CallAnalysisContext
+
+DIMENSIONS = ["discovery", "engagement"]
+
+
+def make_context(call_id, dimensions=None):
+    if call_id == "missing":
+        raise ValueError(f"Call {call_id} not found in database")
+    return CallAnalysisContext(
+        call_id=call_id,
+        call={"gong_call_id": call_id, "title": f"Call {call_id}", "scheduled_at": None},
+        db_call_id=uuid4(),
+        dimensions=dimensions or DIMENSIONS,
+        detected_role="ae",
+        speakers=[],
+        rep=None,
+        transcript="Hello there.",
+    )
+
+
+@pytest.fixture
+def tools():
+    """Patch the analysis tools: discovery is cached for every call, the rest is analyzed."""
+    analyzed = []
+
+    def analyze(context, dimension, force_reanalysis):
+        analyzed.append((context.call_id, dimension))
+        return {"score": 70}
+
+    with (
+        patch.object(batch, "prepare_call_analysis", side_effect=make_context),
+        patch.object(
+            batch, "find_cached_dimensions", return_value={"discovery": {"score": 90}}
+        ) as cached,
+        patch.object(batch, "analyze_call_dimension", side_effect=analyze),
+    ):
+        yield analyzed, cached
+    batch._jobs.clear()
+
+
+class TestBatchJobs:
+    """Tests for submit_batch and job execution."""
+
+    async def test_only_cache_misses_are_analyzed(self, tools):
+        """
+        GIVEN calls whose discovery session is already cached
+        WHEN they are analyzed in a batch (one call listed twice)
+        THEN only engagement is analyzed, once per distinct call
+        """
+        analyzed, _ = tools
+        job = batch.submit_batch(["a", "b", "a"])
+        await job.task
+
+        assert job.status == batch.COMPLETED
+        assert sorted(analyzed) == [("a", "engagement"), ("b", "engagement")]
+        assert job.summary()["total_calls"] == 2
+        assert (job.cached_dimensions, job.analyzed_dimensions) == (2, 2)
+        result = job.results[0]
+        assert result["scores"] == {"discovery": 90, "engagement": 70}
+        assert result["cached_dimensions"] == ["discovery"]
+        assert result["analyzed_dimensions"] == ["engagement"]
+
+    async def test_force_reanalysis_skips_cache(self, tools):
+        analyzed, cached = tools
+        job = batch.submit_batch(["a"], force_reanalysis=True)
+        await job.task
+
+        assert cached.call_count == 0
+        assert sorted(analyzed) == [("a", "discovery"), ("a", "engagement")]
+
+    async def test_failed_call_does_not_stop_job(self, tools):
+        job = batch.submit_batch(["missing", "a"])
+        await job.task
+
+        assert job.status == batch.COMPLETED
+        assert job.failed_calls == 1
+        failed = next(r for r in job.results if r["call_id"] == "missing")
+        assert failed["status"] == "failed"
+        assert "not found" in failed["error"]
+
+    async def test_concurrency_is_bounded(self, tools):
+        """
+        GIVEN batch_concurrency=2 and slow analyses
+        WHEN six calls are batched
+        THEN no more than two analyses run at once
+        """
+        running = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def slow(context, dimension, force_reanalysis):
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.02)
+            with lock:
+                running -= 1
+            return {"score": 70}
+
+        with (
+            patch.object(batch.settings, "batch_concurrency", 2),
+            patch.object(batch, "analyze_call_dimension", side_effect=slow),
+        ):
+            job = batch.submit_batch([f"call-{i}" for i in range(6)])
+            await job.task
+
+        assert len(job.results) == 6
+        assert peak == 2
+
+    async def test_events_replay_then_follow(self, tools):
+        job = batch.submit_batch(["a", "b"])
+        events = [event async for event in batch.job_events(job)]
+
+        names = [event.split("\n", 1)[0] for event in events if not event.startswith(":")]
+        assert names == ["event: call", "event: call", "event: done"]
+        assert json.loads(events[-1].split("data: ", 1)[1])["completed_calls"] == 2
+
+    async def test_cancelled_on_shutdown(self, tools):
+        def blocked(context, dimension, force_reanalysis):
+            time.sleep(0.05)
+            return {"score": 70}
+
+        with patch.object(batch, "analyze_call_dimension", side_effect=blocked):
+            job = batch.submit_batch([f"call-{i}" for i in range(20)])
+            await asyncio.sleep(0.01)
+            await batch.cancel_batch_jobs()
+
+        assert job.status == batch.CANCELLED
+        assert job.finished_at is not None
+        assert len(job.results) < 20
+
+
+class TestBatchEndpoints:
+    """Tests for the /api/v1/analyses endpoints."""
+
+    def test_submit_poll_and_download(self, tools):
+        with TestClient(app) as client:
+            created = client.post("/api/v1/analyses:batch", json={"call_ids": ["a", "b"]})
+            job_id = created.json()["job_id"]
+
+            for _ in range(100):
+                status = client.get(f"/api/v1/analyses/batches/{job_id}").json()
+                if status["status"] == batch.COMPLETED:
+                    break
+                time.sleep(0.01)
+            newer = client.get(f"/api/v1/analyses/batches/{job_id}?offset=1").json()
+            download = client.get(created.json()["links"]["results"])
+
+        assert created.status_code == 202
+        assert created.headers["Location"] == f"/api/v1/analyses/batches/{job_id}"
+        assert status["completed_calls"] == 2
+        assert len(status["results"]) == 2
+        assert len(newer["results"]) == 1
+        assert download.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in download.text.splitlines()]
+        assert {line["call_id"] for line in lines} == {"a", "b"}
+
+    def test_results_conflict_until_finished(self, tools):
+        job = batch.BatchJob(id="job-1", call_ids=["a"], dimensions=None, force_reanalysis=False)
+        batch._jobs[job.id] = job
+
+        response = TestClient(app).get("/api/v1/analyses/batches/job-1/results")
+
+        assert response.status_code == 409
+
+    def test_validation(self, tools):
+        client = TestClient(app)
+        with patch.object(batch.settings, "batch_max_calls", 2):
+            too_many = client.post("/api/v1/analyses:batch", json={"call_ids": ["a", "b", "c"]})
+        bad_dimension = client.post(
+            "/api/v1/analyses:batch", json={"call_ids": ["a"], "dimensions": ["vibes"]}
+        )
+        empty = client.post("/api/v1/analyses:batch", json={"call_ids": []})
+        unknown = client.get("/api/v1/analyses/batches/nope")
+
+        assert too_many.status_code == 400
+        assert bad_dimension.status_code == 400
+        assert empty.status_code == 422
+        assert unknown.status_code == 404
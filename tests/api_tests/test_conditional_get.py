@@ -0,0 +1,199 @@
+"""
+Tests for conditional GET (ETag / If-None-Match).
+
+Tests cover:
+- ETag construction and If-None-Match matching
+- 304 responses that skip the payload queries
+- ETag changes when the data version changes
+- Cache-Control on public and per-user endpoints
+"""
+
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.dependencies.conditional import (
+    CACHE_PRIVATE,
+    CACHE_PUBLIC,
+    etag_matches,
+    make_etag,
+)
+from api.middleware.rbac import get_current_user
+from api.rest_server import app
+
+VERSION = {"criteria_count": 4, "last_updated": datetime(2026, 10, 1, 12, 0)}
+CRITERION = {
+    "id": "3f1c8f5e-0000-0000-0000-000000000001",
+    "role": "ae",
+    "dimension": "discovery",
+    "criterion_name": "Pain",
+    "description": "Uncovers business pain",
+    "weight": 25,
+    "max_score": 10,
+    "display_order": 1,
+    "created_at": None,
+    "updated_at": None,
+}
+
+
+@pytest.fixture
+def client():
+    app.dependency_overrides[get_current_user] = lambda: {
+        "email": "manager@prefect.io",
+        "role": "manager",
+    }
+    yield TestClient(app)
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+class TestEtagHelpers:
+    """Tests for make_etag and etag_matches."""
+
+    def test_etag_is_strong_and_stable(self):
+        etag = make_etag("rubric_criteria", "ae", None, VERSION)
+
+        assert etag.startswith('"') and etag.endswith('"')
+        assert etag == make_etag("rubric_criteria", "ae", None, dict(VERSION))
+
+    def test_etag_changes_with_version_and_parameters(self):
+        etag = make_etag("rubric_criteria", "ae", None, VERSION)
+
+        assert etag != make_etag("rubric_criteria", "se", None, VERSION)
+        assert etag != make_etag("rubric_criteria", "ae", None, {**VERSION, "criteria_count": 5})
+
+    def test_if_none_match_comparison(self):
+        etag = make_etag("x", 1)
+
+        assert etag_matches(etag, etag)
+        assert etag_matches(f'"other", W/{etag}', etag)
+        assert etag_matches("*", etag)
+        assert not etag_matches('"other"', etag)
+        assert not etag_matches(None, etag)
+
+
+class TestRubricCriteriaEtag:
+    """Tests for GET /api/v1/rubrics/{role}."""
+
+    def test_returns_etag_then_304(self, client):
+        """
+        GIVEN a first request that returns criteria with an ETag
+        WHEN the client repeats it with If-None-Match
+        THEN it gets 304 and the criteria query is not run again
+        """
+        with (
+            patch("db.async_queries.get_rubric_criteria_version", AsyncMock(return_value=VERSION)),
+            patch(
+                "db.async_queries.get_rubric_criteria", AsyncMock(return_value=[CRITERION])
+            ) as criteria,
+        ):
+            first = client.get("/api/v1/rubrics/ae")
+            second = client.get(
+                "/api/v1/rubrics/ae", headers={"If-None-Match": first.headers["ETag"]}
+            )
+
+        assert first.status_code == 200
+        assert first.json()[0]["criterion_name"] == "Pain"
+        assert first.headers["Cache-Control"] == CACHE_PRIVATE
+        assert second.status_code == 304
+        assert second.content == b""
+        assert second.headers["ETag"] == first.headers["ETag"]
+        assert criteria.await_count == 1
+
+    def test_version_change_invalidates(self, client):
+        with (
+            patch(
+                "db.async_queries.get_rubric_criteria_version",
+                AsyncMock(side_effect=[VERSION, {**VERSION, "last_updated": datetime.now()}]),
+            ),
+            patch("db.async_queries.get_rubric_criteria", AsyncMock(return_value=[CRITERION])),
+        ):
+            first = client.get("/api/v1/rubrics/ae/discovery")
+            second = client.get(
+                "/api/v1/rubrics/ae/discovery",
+                headers={"If-None-Match": first.headers["ETag"]},
+            )
+
+        assert second.status_code == 200
+        assert second.headers["ETag"] != first.headers["ETag"]
+
+
+class TestOpportunityDetailEtag:
+    """Tests for GET /api/v1/opportunities/{id}."""
+
+    def test_304_skips_timeline_query(self, client):
+        opportunity = {
+            "id": "opp-1",
+            "name": "Acme",
+            "updated_at": datetime(2026, 10, 1),
+            "call_count": 3,
+            "email_count": 7,
+            "last_activity_at": datetime(2026, 10, 2),
+        }
+        with (
+            patch("db.async_queries.get_opportunity", AsyncMock(return_value=opportunity)),
+            patch(
+                "db.async_queries.get_opportunity_timeline_version",
+                AsyncMock(return_value={"calls_version": 11, "emails_version": 5}),
+            ),
+            patch(
+                "db.async_queries.get_opportunity_timeline", AsyncMock(return_value=[])
+            ) as timeline,
+        ):
+            first = client.get("/api/v1/opportunities/opp-1")
+            second = client.get(
+                "/api/v1/opportunities/opp-1", headers={"If-None-Match": first.headers["ETag"]}
+            )
+            other_page = client.get(
+                "/api/v1/opportunities/opp-1?timeline_limit=10",
+                headers={"If-None-Match": first.headers["ETag"]},
+            )
+
+        assert first.status_code == 200
+        assert second.status_code == 304
+        assert other_page.status_code == 200
+        assert timeline.await_count == 2
+
+    def test_etag_changes_when_linked_call_changes(self, client):
+        """A call updated in place by sync changes the ETag, though the opportunity doesn't."""
+        opportunity = {"id": "opp-1", "name": "Acme", "updated_at": datetime(2026, 10, 1)}
+        versions = [
+            {"calls_version": 11, "emails_version": 5},
+            {"calls_version": -42, "emails_version": 5},
+        ]
+        with (
+            patch("db.async_queries.get_opportunity", AsyncMock(return_value=opportunity)),
+            patch(
+                "db.async_queries.get_opportunity_timeline_version",
+                AsyncMock(side_effect=versions),
+            ),
+            patch("db.async_queries.get_opportunity_timeline", AsyncMock(return_value=[])),
+        ):
+            first = client.get("/api/v1/opportunities/opp-1")
+            second = client.get(
+                "/api/v1/opportunities/opp-1", headers={"If-None-Match": first.headers["ETag"]}
+            )
+
+        assert second.status_code == 200
+        assert second.headers["ETag"] != first.headers["ETag"]
+
+
+class TestKnowledgeEtag:
+    """Tests for the public knowledge base endpoints."""
+
+    def test_rubrics_are_publicly_cacheable(self, client):
+        manager = MagicMock()
+        manager.get_rubrics_version.return_value = {"count": 5, "updated_at": datetime(2026, 9, 1)}
+        manager.list_rubrics.return_value = []
+
+        with patch("api.rest_server.kb_manager", manager):
+            first = client.get("/knowledge/rubrics")
+            second = client.get(
+                "/knowledge/rubrics", headers={"If-None-Match": first.headers["ETag"]}
+            )
+
+        assert first.status_code == 200
+        assert first.headers["Cache-Control"] == CACHE_PUBLIC
+        assert second.status_code == 304
+        assert manager.list_rubrics.call_count == 1
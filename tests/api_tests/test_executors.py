@@ -0,0 +1,137 @@
+"""
+Tests for the bounded tool executors.
+
+Tests cover:
+- Running sync tools off the event loop with the request's context
+- Rejecting jobs with 503 + Retry-After when workers and queue are full
+- Endpoint responses when an executor is saturated
+- Shutdown waiting for running jobs without blocking the event loop
+"""
+
+import asyncio
+import threading
+from contextvars import ContextVar
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api import rest_server
+from api.executors import ExecutorSaturated, ToolExecutor
+from api.rest_server import app
+
+_request_value: ContextVar[str | None] = ContextVar("test_request_value", default=None)
+
+
+@pytest.fixture
+def executor():
+    executor = ToolExecutor("test", max_workers=1, max_queue=1)
+    yield executor
+    executor.shutdown()
+
+
+class TestToolExecutor:
+    """Tests for ToolExecutor.run."""
+
+    async def test_runs_in_worker_with_request_context(self, executor):
+        """
+        GIVEN a context variable set by the request
+        WHEN a sync function runs on the executor
+        THEN it runs on a worker thread, sees the variable and returns its result
+        """
+        _request_value.set("req-1")
+
+        def job(x):
+            return threading.current_thread().name, _request_value.get(), x * 2
+
+        thread_name, value, result = await executor.run(job, 21)
+
+        assert thread_name.startswith("test-tool")
+        assert (value, result) == ("req-1", 42)
+        assert executor.pending == 0
+
+    async def test_exceptions_propagate(self, executor):
+        """
+        GIVEN a job that raises
+        WHEN it runs on the executor
+        THEN the error reaches the caller and the slot is released
+        """
+
+        def job():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            await executor.run(job)
+
+        assert executor.pending == 0
+
+    async def test_rejects_when_saturated(self, executor):
+        """
+        GIVEN one running and one queued job on a 1 worker + 1 queue executor
+        WHEN a third job is submitted
+        THEN it is rejected with 503 and a Retry-After, and the others complete
+        """
+        release = threading.Event()
+        running = [asyncio.ensure_future(executor.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0)
+
+        with pytest.raises(ExecutorSaturated) as exc:
+            await executor.run(lambda: None)
+
+        assert exc.value.status_code == 503
+        assert int(exc.value.headers["Retry-After"]) >= 1
+
+        release.set()
+        assert await asyncio.gather(*running) == [True, True]
+        assert executor.pending == 0
+
+
+class TestSaturatedEndpoints:
+    """Tests for endpoint responses under executor saturation."""
+
+    def test_analyze_call_returns_503_with_retry_after(self):
+        """
+        GIVEN the analysis executor is saturated
+        WHEN a call is analyzed
+        THEN the response is 503 with Retry-After, and health checks still answer
+        """
+        client = TestClient(app)
+        with patch(
+            "api.rest_server.run_analysis",
+            AsyncMock(side_effect=ExecutorSaturated("analysis", 7)),
+        ):
+            response = client.post("/tools/analyze_call", json={"call_id": "call-1"})
+            health = client.get("/health")
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "7"
+        assert health.status_code == 200
+
+
+class TestShutdown:
+    """Tests for executor shutdown on application shutdown."""
+
+    async def test_running_jobs_finish_while_shutdown_waits(self):
+        """
+        GIVEN an analysis running on the executor
+        WHEN the application shuts down
+        THEN shutdown waits for it off the event loop, so its request still gets the result
+        """
+        executor = ToolExecutor("shutdown-test", max_workers=1, max_queue=1)
+        release = threading.Event()
+        job = asyncio.ensure_future(executor.run(lambda: release.wait(5) and "done"))
+        await asyncio.sleep(0.01)
+
+        with (
+            patch.object(rest_server, "shutdown_executors", executor.shutdown),
+            patch.object(rest_server, "stop_scheduler"),
+            patch.object(rest_server, "close_async_pool", AsyncMock()),
+        ):
+            shutdown = asyncio.ensure_future(rest_server.shutdown_event())
+            await asyncio.sleep(0.01)
+            assert not shutdown.done()
+
+            release.set()
+            await shutdown
+
+        assert await job == "done"
@@ -0,0 +1,139 @@
+"""
+Tests for API monitoring metrics.
+
+Tests cover:
+- Histogram percentiles within the bucket precision, in fixed memory
+- Merging histograms and exports from several workers
+- Recording from many threads
+- Requests recorded by route template through the app middleware, unmatched
+  paths under one label
+"""
+
+import random
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api.monitoring import (
+    HISTOGRAM_BUCKETS,
+    LatencyHistogram,
+    MetricsCollector,
+    merge_metrics,
+    metrics,
+)
+from api.rest_server import app
+
+
+def exact_percentile(values: list[float], percentile: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * percentile / 100), len(ordered) - 1)]
+
+
+class TestLatencyHistogram:
+    """Tests for LatencyHistogram."""
+
+    def test_percentiles_within_precision(self):
+        rng = random.Random(7)
+        values = [rng.lognormvariate(4, 1.5) for _ in range(50_000)]
+        histogram = LatencyHistogram()
+        for value in values:
+            histogram.record(value)
+
+        for percentile in (50, 90, 99, 99.9):
+            assert histogram.percentile(percentile) == pytest.approx(
+                exact_percentile(values, percentile), rel=0.02
+            )
+        assert histogram.percentile(100) == max(values)
+        assert len(histogram.counts) == HISTOGRAM_BUCKETS
+
+    def test_empty_and_out_of_range(self):
+        histogram = LatencyHistogram()
+        assert histogram.percentile(50) is None
+
+        histogram.record(0.0)
+        histogram.record(10 * 3_600_000)
+
+        assert histogram.count == 2
+        assert histogram.percentile(100) == 10 * 3_600_000
+
+    def test_merge_matches_single_histogram(self):
+        rng = random.Random(3)
+        values = [rng.uniform(1, 500) for _ in range(1000)]
+        whole, first, second = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+        for i, value in enumerate(values):
+            whole.record(value)
+            (first if i % 2 else second).record(value)
+
+        first.merge(LatencyHistogram.from_dict(second.to_dict()))
+
+        assert list(first.counts) == list(whole.counts)
+        assert first.count == whole.count
+        assert first.percentile(95) == whole.percentile(95)
+
+
+class TestMetricsCollector:
+    """Tests for MetricsCollector."""
+
+    def test_concurrent_recording(self):
+        collector = MetricsCollector()
+
+        def record():
+            for i in range(1000):
+                collector.record_request("/calls", float(i % 100), 429 if i % 10 == 0 else 200)
+
+        threads = [threading.Thread(target=record) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        summary = collector.get_metrics_summary()
+        assert summary["total_requests"] == 8000
+        assert summary["rate_limit_hits"] == 800
+        assert summary["errors_by_status"] == {429: 800}
+        assert 48 <= summary["response_time_ms"]["p50"] <= 51
+
+    def test_endpoints_are_bounded(self):
+        collector = MetricsCollector(max_endpoints=3)
+
+        for i in range(10):
+            collector.record_request(f"/scan/{i}", 1.0, 404)
+
+        counts = collector.get_metrics_summary()["requests_by_endpoint"]
+        assert counts == {"/scan/0": 1, "/scan/1": 1, "/scan/2": 1, "other": 7}
+
+    def test_merge_worker_exports(self):
+        workers = [MetricsCollector(), MetricsCollector()]
+        for ms in range(1, 101):
+            workers[ms % 2].record_request("/calls", float(ms), 200)
+
+        merged = merge_metrics(worker.snapshot().to_dict() for worker in workers)
+
+        assert merged.request_counts == {"/calls": 100}
+        assert merged.response_times["/calls"].percentile(50) == pytest.approx(51, rel=0.02)
+
+
+class TestRequestRecording:
+    """Requests through the app are recorded by route template."""
+
+    def test_records_route_template(self):
+        metrics.reset_metrics()
+        client = TestClient(app)
+
+        client.get("/monitoring/metrics/endpoint/tools/analyze_call")
+        export = client.get("/monitoring/metrics/export").json()
+
+        assert export["request_counts"] == {"/monitoring/metrics/endpoint/{endpoint:path}": 1}
+        histogram = export["response_times"]["/monitoring/metrics/endpoint/{endpoint:path}"]
+        assert histogram["count"] == 1
+
+    def test_unmatched_paths_share_a_label(self):
+        metrics.reset_metrics()
+        client = TestClient(app)
+
+        for i in range(3):
+            client.get(f"/wp-admin/{i}.php")
+        export = client.get("/monitoring/metrics/export").json()
+
+        assert export["request_counts"] == {"unmatched": 3}
@@ -75,41 +75,45 @@ class TestRateLimiting:
             assert len(expensive_limited) > len(health_limited)
 
 
+# search_calls results well above CompressionMiddleware's minimum_size (500 bytes)
+LARGE_SEARCH_RESULTS = [
+    {
+        "call_id": f"call-{i}",
+        "title": f"Sales Call {i}" * 10,
+        "transcript": "A" * 100,
+    }
+    for i in range(10)
+]
+
+
 class TestCompression:
     """Test response compression middleware."""
 
     def test_gzip_compression_applied(self, client):
-        """Test that responses are gzip compressed when requested."""
-        response = client.get("/health", headers={"Accept-Encoding": "gzip"})
+        """Test that responses above minimum_size are gzip compressed when requested."""
+        with patch("api.rest_server.search_calls_tool", return_value=LARGE_SEARCH_RESULTS):
+            response = client.post(
+                "/tools/search_calls", json={"limit": 20}, headers={"Accept-Encoding": "gzip"}
+            )
 
-        # Check for compression headers
+        assert response.status_code == 200
         assert response.headers.get("Content-Encoding") == "gzip"
-        assert response.headers.get("Vary") == "Accept-Encoding"
+        assert "Accept-Encoding" in response.headers.get("Vary", "")
 
     def test_small_responses_not_compressed(self, client):
-        """Test that small responses are not compressed."""
-        # Health check response is small
+        """Test that responses below minimum_size pass through uncompressed."""
+        # Health check response is well under 500 bytes
         response = client.get("/health", headers={"Accept-Encoding": "gzip"})
 
-        # May or may not be compressed based on size
-        # Just verify it doesn't error
         assert response.status_code == 200
+        assert "Content-Encoding" not in response.headers
+        assert response.num_bytes_downloaded == len(response.content) < 500
+        # The representation still varies with Accept-Encoding for larger bodies
+        assert "Accept-Encoding" in response.headers.get("Vary", "")
 
     def test_compression_reduces_size(self, client):
         """Test that compression actually reduces response size."""
-        # Mock large response
-        with patch("api.rest_server.search_calls_tool") as mock_tool:
-            # Create large response (> 500 bytes)
-            large_response = [
-                {
-                    "call_id": f"call-{i}",
-                    "title": f"Sales Call {i}" * 10,
-                    "transcript": "A" * 100,
-                }
-                for i in range(10)
-            ]
-            mock_tool.return_value = large_response
-
+        with patch("api.rest_server.search_calls_tool", return_value=LARGE_SEARCH_RESULTS):
             # Get uncompressed size
             response_uncompressed = client.post(
                 "/tools/search_calls",
@@ -122,11 +126,12 @@ class TestCompression:
                 "/tools/search_calls", json={"limit": 20}, headers={"Accept-Encoding": "gzip"}
             )
 
-            # Compressed should be smaller
-            if response_compressed.headers.get("Content-Encoding") == "gzip":
-                compressed_size = len(response_compressed.content)
-                uncompressed_size = len(response_uncompressed.content)
-                assert compressed_size < uncompressed_size
+            # Compressed should be smaller on the wire (content is decoded by the client)
+            assert response_compressed.headers.get("Content-Encoding") == "gzip"
+            compressed_size = response_compressed.num_bytes_downloaded
+            uncompressed_size = response_uncompressed.num_bytes_downloaded
+            assert compressed_size < uncompressed_size
+            assert response_compressed.content == response_uncompressed.content
 
 
 class TestErrorHandling:
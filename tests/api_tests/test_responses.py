@@ -0,0 +1,82 @@
+"""
+Tests for fast JSON responses.
+
+Tests cover:
+- UUID, datetime, Decimal and pydantic values serialized without conversion
+- Pre-serialized fragments embedded without re-encoding
+- Headers set on the injected Response carried over
+"""
+
+import json
+from datetime import UTC, datetime
+from decimal import Decimal
+from uuid import UUID
+
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from api.responses import FastJSONResponse, PreSerialized, dumps, json_response
+
+CALL_ID = UUID("6f1c2a6e-53d8-4a53-9a43-6a5f0c9c1b11")
+SCHEDULED = datetime(2025, 3, 4, 15, 30, tzinfo=UTC)
+
+
+class Score(BaseModel):
+    dimension: str
+    score: int
+
+
+class TestDumps:
+    """Tests for dumps."""
+
+    def test_native_types(self):
+        row = {
+            "id": CALL_ID,
+            "scheduled_at": SCHEDULED,
+            "avg_score": Decimal("81.5"),
+            "best": Score(dimension="discovery", score=90),
+            1: "non-string key",
+        }
+
+        assert json.loads(dumps(row)) == {
+            "id": str(CALL_ID),
+            "scheduled_at": SCHEDULED.isoformat(),
+            "avg_score": 81.5,
+            "best": {"dimension": "discovery", "score": 90},
+            "1": "non-string key",
+        }
+
+    def test_pre_serialized_is_embedded_as_is(self):
+        cached = dumps({"call_id": "a", "scores": {"discovery": 90}})
+
+        body = dumps({"results": [PreSerialized(cached)]})
+
+        assert body == b'{"results":[' + cached + b"]}"
+
+
+class TestFastJSONResponse:
+    """FastJSONResponse returned from endpoints."""
+
+    def test_headers_from_injected_response(self):
+        app = FastAPI()
+
+        @app.get("/calls")
+        async def calls(response: Response):
+            response.headers["X-Next-Cursor"] = "abc"
+            return json_response([{"id": CALL_ID, "scheduled_at": SCHEDULED}], response)
+
+        @app.get("/raw")
+        async def raw():
+            return FastJSONResponse(b'{"cached":true}')
+
+        client = TestClient(app)
+        calls_response = client.get("/calls")
+        raw_response = client.get("/raw")
+
+        assert calls_response.headers["X-Next-Cursor"] == "abc"
+        assert calls_response.headers["content-type"] == "application/json"
+        assert calls_response.json() == [
+            {"id": str(CALL_ID), "scheduled_at": "2025-03-04T15:30:00+00:00"}
+        ]
+        assert raw_response.json() == {"cached": True}
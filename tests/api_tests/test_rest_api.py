@@ -1,11 +1,12 @@
 """Tests for REST API endpoints."""
 
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
 import pytest
 from fastapi.testclient import TestClient
 
 from api.rest_server import app
+from db.pagination import InvalidCursorError
 
 
 @pytest.fixture
@@ -240,12 +241,70 @@ class TestSearchCallsEndpoint:
         assert response.status_code == 200
 
 
+class TestCoachingFeedEndpoint:
+    """Tests for coaching feed endpoint."""
+
+    def test_invalid_cursor_returns_400(self, client):
+        """Test that a malformed cursor is a client error, not an empty feed."""
+        with patch(
+            "api.rest_server.get_coaching_feed_tool",
+            side_effect=InvalidCursorError("Invalid cursor"),
+        ):
+            response = client.post("/coaching/feed", json={"cursor": "not-a-cursor"})
+
+        assert response.status_code == 400
+
+
+class TestQueryBudget:
+    """Tests for per-request query accounting in the request middleware."""
+
+    @staticmethod
+    def _run_queries(n):
+        from db.query_budget import current_stats
+
+        def side_effect(**kwargs):
+            for i in range(n):
+                current_stats().record(f"SELECT * FROM calls WHERE id = '{i}'", 0.001)
+            return []
+
+        return side_effect
+
+    def test_server_timing_header(self, client, mock_search_calls_tool):
+        """Test database time and query count are reported in Server-Timing."""
+        mock_search_calls_tool.side_effect = self._run_queries(2)
+
+        response = client.post("/tools/search_calls", json={})
+
+        assert response.status_code == 200
+        assert response.headers["Server-Timing"].startswith('db;dur=2.0;desc="2 queries", total;')
+
+    def test_budget_exceeded_strict(self, client, mock_search_calls_tool):
+        """Test exceeding an endpoint's query budget fails in strict mode."""
+        from db.query_budget import QueryBudgetExceededError
+
+        mock_search_calls_tool.side_effect = self._run_queries(6)
+
+        with patch("coaching_mcp.shared.config.settings.query_budget_strict", True):
+            with pytest.raises(QueryBudgetExceededError, match="budget 5"):
+                client.post("/tools/search_calls", json={})
+
+    def test_budget_exceeded_logged_by_default(self, client, mock_search_calls_tool):
+        """Test exceeding an endpoint's query budget is only logged outside strict mode."""
+        mock_search_calls_tool.side_effect = self._run_queries(6)
+
+        response = client.post("/tools/search_calls", json={})
+
+        assert response.status_code == 200
+
+
 class TestAnalyzeOpportunityEndpoint:
     """Tests for analyze opportunity endpoint."""
 
     def test_analyze_opportunity_success(self, client):
         """Test successful opportunity analysis."""
-        with patch("api.rest_server.queries.get_opportunity") as mock_get:
+        with patch(
+            "api.rest_server.async_queries.get_opportunity", new_callable=AsyncMock
+        ) as mock_get:
             mock_get.return_value = {
                 "id": "opp-123",
                 "name": "Acme Corp Deal",
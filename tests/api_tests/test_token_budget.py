@@ -0,0 +1,230 @@
+"""
+Tests for Claude token budgets.
+
+Tests cover:
+- Per-user and global buckets, capped charges and refunds
+- Predicted cost of an analysis: uncached dimensions plus the unified pass
+- Refunding the charge when the analysis raises
+- analyze_call_tool charging only dimensions the cache can't answer
+- 429 with Retry-After from the streaming endpoint when a budget is exhausted
+"""
+
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api import token_budget
+from api.rest_server import app
+from api.token_budget import AnalysisCharge, TokenBudget, TokenBudgetExceeded
+from coaching_mcp.tools import analyze_call
+from coaching_mcp.tools.analyze_call import CallAnalysisContext
+
+CONTEXT = CallAnalysisContext(
+    call_id="call-1",
+    call={
+        "gong_call_id": "call-1",
+        "title": "Acme discovery",
+        "scheduled_at": None,
+        "call_type": "discovery",
+        "product": "prefect",
+    },
+    db_call_id=uuid4(),
+    dimensions=["discovery", "engagement", "objection_handling"],
+    detected_role="ae",
+    speakers=[],
+    rep=None,
+    transcript="Hello there.",
+)
+
+
+def make_budget(user_tokens=100_000, global_tokens=1_000_000) -> TokenBudget:
+    return TokenBudget(user_tokens=user_tokens, global_tokens=global_tokens, window_seconds=3600)
+
+
+@pytest.fixture(autouse=True)
+def estimate():
+    """Fixed per-pass estimate, so tests don't load the tiktoken encoding."""
+    with patch.object(token_budget, "estimate_analysis_tokens", return_value=2_000):
+        yield
+
+
+class TestTokenBudget:
+    """Tests for TokenBudget."""
+
+    def test_user_budget_is_per_user(self):
+        budget = make_budget()
+        budget.charge("user:a", 80_000)
+
+        with pytest.raises(TokenBudgetExceeded) as exc_info:
+            budget.charge("user:a", 30_000)
+        budget.charge("user:b", 80_000)
+
+        assert exc_info.value.status_code == 429
+        assert exc_info.value.scope == "user:a"
+        assert int(exc_info.value.headers["Retry-After"]) > 0
+
+    def test_global_budget_rejection_refunds_user(self):
+        """
+        GIVEN a global budget nearly spent by other users
+        WHEN a user's charge fits their own budget but not the global one
+        THEN it is rejected and the user's budget is left untouched
+        """
+        budget = make_budget(global_tokens=150_000)
+        budget.charge("user:a", 100_000)
+
+        with pytest.raises(TokenBudgetExceeded) as exc_info:
+            budget.charge("user:b", 60_000)
+
+        assert exc_info.value.scope == token_budget.GLOBAL_KEY
+        budget.refund("user:a", 100_000)
+        budget.charge("user:b", 100_000)
+
+    def test_charge_larger_than_budget_is_capped(self):
+        budget = make_budget()
+
+        budget.charge("user:a", 500_000)
+
+        with pytest.raises(TokenBudgetExceeded):
+            budget.charge("user:a", 10_000)
+
+
+class TestAnalysisCharge:
+    """Tests for AnalysisCharge."""
+
+    def test_charges_dimensions_and_unified_pass(self):
+        charge = AnalysisCharge(make_budget(), "user:a")
+
+        with patch.object(token_budget.settings, "use_five_wins_unified", True):
+            charge(CONTEXT, ["discovery", "engagement"])
+
+        per_pass = token_budget.estimate_analysis_tokens(CONTEXT.transcript)
+        assert charge.tokens == 3 * per_pass
+
+    def test_settle_refunds_failed_dimensions(self):
+        budget = make_budget()
+        charge = AnalysisCharge(budget, "user:a", unified_pass=False)
+        charge(CONTEXT, ["discovery", "engagement"])
+
+        with patch.object(budget, "refund") as refund:
+            charge.settle({"discovery": {"score": 80}, "engagement": {"error": "timeout"}})
+
+        refund.assert_called_once_with("user:a", charge.dimension_tokens)
+        assert charge.tokens == charge.dimension_tokens
+
+    def test_cancel_refunds_unsettled_charge(self):
+        budget = make_budget()
+        charge = AnalysisCharge(budget, "user:a", unified_pass=False)
+        charge(CONTEXT, ["discovery", "engagement"])
+
+        with patch.object(budget, "refund") as refund:
+            charge.cancel()
+            charge.cancel()
+
+        refund.assert_called_once_with("user:a", 2 * charge.dimension_tokens)
+        assert charge.tokens == 0
+
+    def test_cancel_after_settle_does_nothing(self):
+        budget = make_budget()
+        charge = AnalysisCharge(budget, "user:a", unified_pass=False)
+        charge(CONTEXT, ["discovery"])
+        charge.settle({"discovery": {"score": 80}})
+
+        with patch.object(budget, "refund") as refund:
+            charge.cancel()
+
+        refund.assert_not_called()
+
+
+class TestAnalyzeCallHook:
+    """Tests for analyze_call_tool's before_analysis hook."""
+
+    def test_hook_sees_only_cache_misses(self):
+        """
+        GIVEN a call whose discovery session is cached
+        WHEN it is analyzed with a before_analysis hook
+        THEN the hook is told only the other dimensions, and only those are analyzed
+        """
+        seen = []
+        with (
+            patch.object(analyze_call, "prepare_call_analysis", return_value=CONTEXT),
+            patch.object(
+                analyze_call, "find_cached_dimensions", return_value={"discovery": {"score": 90}}
+            ),
+            patch.object(
+                analyze_call, "analyze_call_dimension", return_value={"score": 70}
+            ) as analyze,
+            patch.object(analyze_call, "build_call_analysis", side_effect=lambda c, r, i: r),
+        ):
+            results = analyze_call.analyze_call_tool(
+                "call-1", before_analysis=lambda context, dimensions: seen.append(dimensions)
+            )
+
+        assert seen == [["engagement", "objection_handling"]]
+        assert analyze.call_count == 2
+        assert list(results) == CONTEXT.dimensions
+        assert results["discovery"] == {"score": 90}
+
+
+class TestStreamEndpointBudget:
+    """The streaming endpoint charges before the stream starts."""
+
+    def test_exhausted_budget_returns_429(self):
+        """
+        GIVEN a user budget smaller than one analysis
+        WHEN the user streams two analyses back to back
+        THEN the first runs (charges are capped at the budget) and the second gets 429
+        """
+        headers = {"X-User-Email": "rep@example.com"}
+        with (
+            patch.object(token_budget, "_token_budget", make_budget(user_tokens=1_000)),
+            patch("api.rest_server.prepare_call_analysis", return_value=CONTEXT),
+            patch("api.rest_server.find_cached_dimensions", return_value={}),
+            patch("api.streaming.analyze_call_dimension", return_value={"score": 70}),
+            patch("api.streaming.build_call_analysis", return_value={}),
+        ):
+            client = TestClient(app)
+            first = client.post(
+                "/tools/analyze_call/stream", json={"call_id": "call-1"}, headers=headers
+            )
+            second = client.post(
+                "/tools/analyze_call/stream", json={"call_id": "call-1"}, headers=headers
+            )
+
+        assert first.status_code == 200
+        assert second.status_code == 429
+        assert int(second.headers["Retry-After"]) > 0
+        assert "token budget" in second.json()["error"]
+
+
+class TestAnalyzeCallEndpointBudget:
+    """The analyze_call endpoint refunds the charge when the analysis fails."""
+
+    def test_failed_analysis_is_refunded(self):
+        """
+        GIVEN a user budget that covers exactly one analysis
+        WHEN the first analysis raises after being charged
+        THEN its charge is refunded and a second analysis still fits the budget
+        """
+        outcomes = [RuntimeError("Claude unavailable"), {"dimension_details": {}}]
+
+        def analyze(call_id, before_analysis=None, **kwargs):
+            before_analysis(CONTEXT, CONTEXT.dimensions)
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        headers = {"X-User-Email": "rep@example.com"}
+        with (
+            patch.object(token_budget.settings, "use_five_wins_unified", False),
+            patch.object(token_budget, "_token_budget", make_budget(user_tokens=6_000)),
+            patch("api.rest_server.analyze_call_tool", side_effect=analyze),
+        ):
+            client = TestClient(app)
+            first = client.post("/tools/analyze_call", json={"call_id": "call-1"}, headers=headers)
+            second = client.post("/tools/analyze_call", json={"call_id": "call-1"}, headers=headers)
+
+        assert first.status_code == 500
+        assert second.status_code == 200
@@ -0,0 +1,135 @@
+"""
+Integration tests for coaching_sessions partition pruning.
+
+Runs EXPLAIN on the SQL issued by the hot coaching_sessions lookups and checks the
+planner only visits the partitions their created_at bounds allow. Requires a migrated
+test database (skipped otherwise, see conftest.py).
+
+Tests verify:
+- Upcoming partitions exist after maintenance
+- The analysis cache lookup skips partitions older than the cache TTL
+- The lookups right after storing a session only touch the newest partitions
+"""
+
+import json
+from datetime import date
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from analysis.cache import get_cached_analysis, store_analysis_with_cache
+from db.connection import get_db_connection
+from db.models import CoachingDimension
+from db.partitions import (
+    ensure_coaching_session_partitions,
+    list_coaching_session_partitions,
+    shift_quarters,
+)
+
+
+@pytest.fixture
+def db_url(test_database_url):
+    with patch("coaching_mcp.shared.config.settings.database_url", test_database_url):
+        yield test_database_url
+
+
+def _scanned_partitions(plan: dict[str, Any]) -> set[str]:
+    """Collect the coaching_sessions partitions a plan reads after pruning."""
+    found = set()
+    relation = plan.get("Relation Name", "")
+    if relation.startswith("coaching_sessions_"):
+        found.add(relation)
+    for child in plan.get("Plans", []):
+        found |= _scanned_partitions(child)
+    return found
+
+
+def _explain(query: str, params: Any) -> set[str]:
+    with get_db_connection() as conn:
+        with conn.cursor() as cur:
+            cur.execute("EXPLAIN (FORMAT JSON) " + query, params)
+            plan = cur.fetchone()[0]
+        conn.rollback()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return _scanned_partitions(plan[0]["Plan"])
+
+
+def _explaining_fetch_one(captured: list[set[str]]):
+    """Stand-in for fetch_one that records the partitions each query would scan."""
+
+    def fetch_one(query, params=None, as_dict=True):
+        captured.append(_explain(query, params))
+        return None
+
+    return fetch_one
+
+
+class TestPartitionMaintenance:
+    """Test partitions are created ahead of time."""
+
+    def test_upcoming_quarters_exist(self, db_url):
+        """
+        GIVEN a migrated database
+        WHEN maintenance runs
+        THEN the current quarter and the next four are attached
+        """
+        ensure_coaching_session_partitions(quarters_ahead=4)
+
+        attached = {p.start for p in list_coaching_session_partitions()}
+        expected = {shift_quarters(date.today(), n) for n in range(5)}
+        assert expected <= attached
+
+
+class TestPruning:
+    """Test hot lookups only scan the partitions their predicates allow."""
+
+    def test_cache_lookup_skips_partitions_past_ttl(self, db_url):
+        """
+        GIVEN quarterly partitions going back beyond the cache TTL
+        WHEN get_cached_analysis looks up a cache entry
+        THEN partitions that ended before the TTL cutoff are pruned from the plan
+        """
+        ensure_coaching_session_partitions(quarters_ahead=4)
+        captured: list[set[str]] = []
+
+        with patch("analysis.cache.fetch_one", _explaining_fetch_one(captured)):
+            get_cached_analysis("call-1", CoachingDimension.DISCOVERY, "hash", "v1")
+
+        scanned = captured[0]
+        attached = list_coaching_session_partitions()
+        oldest_allowed = shift_quarters(date.today(), -1)  # default TTL is 90 days
+        assert scanned
+        assert all(p.name not in scanned for p in attached if p.end <= oldest_allowed)
+
+    def test_post_insert_lookups_touch_current_partition_only(self, db_url):
+        """
+        GIVEN a session was just stored
+        WHEN its id is looked up again
+        THEN at most the current and previous quarter are scanned (the window is one day)
+        """
+        ensure_coaching_session_partitions(quarters_ahead=4)
+        captured: list[set[str]] = []
+
+        with (
+            patch("analysis.cache.execute_query"),
+            patch("analysis.cache.fetch_one", _explaining_fetch_one(captured)),
+            patch("analysis.cache.queries.invalidate_opportunity_cache_for_call"),
+        ):
+            store_analysis_with_cache(
+                call_id="call-1",
+                rep_id="rep-1",
+                dimension=CoachingDimension.DISCOVERY,
+                transcript_hash="hash",
+                rubric_version="v1",
+                analysis_result={"score": 80},
+            )
+
+        # NOW() is pruned when the executor starts, which plain EXPLAIN also does
+        allowed = {
+            f"coaching_sessions_{d.year}_q{(d.month - 1) // 3 + 1}"
+            for d in (shift_quarters(date.today(), 0), shift_quarters(date.today(), -1))
+        }
+        assert captured[0]
+        assert captured[0] <= allowed
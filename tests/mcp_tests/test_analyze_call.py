@@ -4,6 +4,7 @@ from unittest.mock import patch
 
 import pytest
 
+from analysis import score_distribution
 from coaching_mcp.tools.analyze_call import analyze_call_tool
 
 
@@ -21,7 +22,9 @@ def mock_db():
     with (
         patch("coaching_mcp.tools.analyze_call.fetch_one") as mock_fetch_one,
         patch("coaching_mcp.tools.analyze_call.fetch_all") as mock_fetch_all,
+        patch("analysis.score_distribution.fetch_all", return_value=[]),
     ):
+        score_distribution.reset()
         yield {
             "fetch_one": mock_fetch_one,
             "fetch_all": mock_fetch_all,
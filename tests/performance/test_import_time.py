@@ -0,0 +1,76 @@
+"""
+Startup Import-Time Budget Tests
+
+Imports each server entry point in a fresh interpreter with -X importtime and
+checks that:
+- Heavy dependencies (Anthropic SDK, tiktoken, BigQuery, pandas, dlt) are not
+  loaded until first use
+- The entry point's own import stays within the startup budget
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+# Cumulative import time allowed per entry point, framework included
+IMPORT_BUDGET_SECONDS = 1.0
+
+DEFERRED_MODULES = ("anthropic", "tiktoken", "google.cloud.bigquery", "pandas", "dlt")
+
+
+def import_profile(module: str) -> dict[str, int]:
+    """
+    Cumulative import time in microseconds of everything first imported by `module`.
+
+    -X importtime prints one line per module as it finishes, children before
+    parents, indented by nesting depth. The lines between the previous top-level
+    import and `module` itself are the modules it pulled in.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    if result.returncode != 0:
+        pytest.skip(f"{module} does not import here: {result.stderr.strip().splitlines()[-1]}")
+
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        entries.append((name.strip(), depth, int(cumulative)))
+
+    end = max(i for i, (name, depth, _) in enumerate(entries) if name == module and depth == 0)
+    start = end
+    while start > 0 and entries[start - 1][1] > 0:
+        start -= 1
+    return {name: cumulative for name, _, cumulative in entries[start : end + 1]}
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize("entry_point", ["api.rest_server", "coaching_mcp.server"])
+class TestStartupImports:
+    """Import cost of the REST API and MCP server."""
+
+    def test_heavy_dependencies_are_deferred(self, entry_point):
+        profile = import_profile(entry_point)
+
+        loaded = [
+            name
+            for name in profile
+            if any(name == heavy or name.startswith(f"{heavy}.") for heavy in DEFERRED_MODULES)
+        ]
+        assert loaded == []
+
+    def test_within_import_budget(self, entry_point):
+        profile = import_profile(entry_point)
+
+        assert profile[entry_point] / 1_000_000 < IMPORT_BUDGET_SECONDS
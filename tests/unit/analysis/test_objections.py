@@ -0,0 +1,206 @@
+"""
+Unit tests for structured objection extraction.
+
+Tests cover:
+- Objection type normalization and keyword classification
+- Extraction from the explicit objection list in objection_breakdown
+- Fallback to specific_examples for analyses without a list
+- Replacing a call's objections in call_objections
+"""
+
+import json
+from datetime import datetime
+from unittest.mock import patch
+
+from analysis.objections import (
+    MAX_QUOTE_LENGTH,
+    classify_objection_text,
+    extract_objections,
+    normalize_objection_type,
+)
+from db.queries import replace_call_objections
+
+
+class TestObjectionTypes:
+    """Tests for type names."""
+
+    def test_normalize_accepts_aliases_and_spelling_variants(self):
+        """
+        GIVEN canonical names, aliases and differently formatted names
+        WHEN they are normalized
+        THEN they map to the canonical types
+        """
+        assert normalize_objection_type("pricing") == "pricing"
+        assert normalize_objection_type("Budget") == "pricing"
+        assert normalize_objection_type("technical-fit") == "technical_fit"
+        assert normalize_objection_type("Competitor") == "competitive"
+
+    def test_normalize_rejects_unknown_types(self):
+        """
+        GIVEN an empty or unrecognised type
+        WHEN it is normalized
+        THEN None is returned
+        """
+        assert normalize_objection_type(None) is None
+        assert normalize_objection_type("") is None
+        assert normalize_objection_type("security review") is None
+
+    def test_classify_by_keyword(self):
+        """
+        GIVEN objection text
+        WHEN it is classified
+        THEN the first matching keyword group wins, otherwise "other"
+        """
+        assert classify_objection_text("That seems expensive for us") == "pricing"
+        assert classify_objection_text("We're not ready until next quarter") == "timing"
+        assert classify_objection_text("How does the integration with dbt work?") == "technical_fit"
+        assert classify_objection_text("We already use an alternative") == "competitive"
+        assert classify_objection_text("I need to check with my boss") == "other"
+
+
+class TestExtractObjections:
+    """Tests for pulling objections out of analyses."""
+
+    def test_uses_explicit_objection_list(self):
+        """
+        GIVEN an analysis with objection_breakdown.objections
+        WHEN objections are extracted
+        THEN one row per listed objection is returned with its fields
+        """
+        analysis = {
+            "objection_breakdown": {
+                "objections": [
+                    {
+                        "type": "Pricing",
+                        "quote": "It's over our budget",
+                        "timestamp_start": 120,
+                        "timestamp_end": "180",
+                        "resolved": True,
+                        "handled_well": True,
+                    },
+                    {"type": "unknown", "quote": "Airflow does this already", "resolved": False},
+                ]
+            }
+        }
+
+        objections = extract_objections(analysis)
+
+        assert objections == [
+            {
+                "objection_type": "pricing",
+                "quote": "It's over our budget",
+                "timestamp_start": 120,
+                "timestamp_end": 180,
+                "resolved": True,
+                "handled_well": True,
+            },
+            {
+                "objection_type": "other",
+                "quote": "Airflow does this already",
+                "timestamp_start": None,
+                "timestamp_end": None,
+                "resolved": False,
+                "handled_well": None,
+            },
+        ]
+
+    def test_falls_back_to_specific_examples(self):
+        """
+        GIVEN a stored session whose specific_examples is a JSON string
+        WHEN objections are extracted
+        THEN each example is classified by keyword and marked by bucket
+        """
+        session = {
+            "specific_examples": json.dumps(
+                {
+                    "good": [{"quote": "Pricing scales with usage", "timestamp_start": 60}],
+                    "needs_work": [{"exchange_summary": "Customer is evaluating a competitor"}],
+                }
+            )
+        }
+
+        objections = extract_objections(session)
+
+        assert [(o["objection_type"], o["handled_well"]) for o in objections] == [
+            ("pricing", True),
+            ("competitive", False),
+        ]
+        assert objections[0]["timestamp_start"] == 60
+        assert objections[1]["quote"] == "Customer is evaluating a competitor"
+
+    def test_truncates_long_quotes(self):
+        """
+        GIVEN a listed objection with a very long quote
+        WHEN objections are extracted
+        THEN the quote is truncated
+        """
+        analysis = {
+            "objection_breakdown": {"objections": [{"type": "timing", "quote": "x" * 2000}]}
+        }
+
+        assert len(extract_objections(analysis)[0]["quote"]) == MAX_QUOTE_LENGTH
+
+    def test_no_objections(self):
+        """
+        GIVEN an analysis without objections or examples
+        WHEN objections are extracted
+        THEN nothing is returned
+        """
+        assert extract_objections({"score": 70}) == []
+
+
+class TestReplaceCallObjections:
+    """Tests for writing call_objections."""
+
+    @patch("db.connection.get_db_connection")
+    def test_replaces_rows_and_commits(self, mock_get_conn):
+        """
+        GIVEN objections for a call
+        WHEN they are stored
+        THEN the call's previous objections are deleted, the new ones inserted and committed
+        """
+        conn = mock_get_conn.return_value.__enter__.return_value
+        cur = conn.cursor.return_value.__enter__.return_value
+        objections = [{"objection_type": "pricing", "quote": "Too expensive"}]
+
+        with patch("psycopg2.extras.execute_values") as mock_execute_values:
+            stored = replace_call_objections("call-1", "session-1", "rep-1", objections)
+
+        assert stored == 1
+        cur.execute.assert_called_once_with(
+            "DELETE FROM call_objections WHERE call_id = %s", ("call-1",)
+        )
+        rows = mock_execute_values.call_args[0][2]
+        assert rows == [
+            (
+                "call-1",
+                "session-1",
+                "rep-1",
+                "pricing",
+                "Too expensive",
+                None,
+                None,
+                None,
+                None,
+                None,
+            )
+        ]
+        conn.commit.assert_called_once()
+
+    @patch("db.connection.get_db_connection")
+    def test_rows_keep_the_session_date(self, mock_get_conn):
+        """
+        GIVEN objections backfilled from an old session
+        WHEN they are stored
+        THEN the rows carry the session's created_at, not the time of the backfill
+        """
+        analyzed_at = datetime(2025, 1, 6, 9, 30)
+
+        with patch("psycopg2.extras.execute_values") as mock_execute_values:
+            replace_call_objections(
+                "call-1", "session-1", "rep-1", [{"objection_type": "timing"}], analyzed_at
+            )
+
+        (row,) = mock_execute_values.call_args[0][2]
+        assert row[-1] == analyzed_at
+        assert "COALESCE(%s, NOW())" in mock_execute_values.call_args.kwargs["template"]
@@ -29,36 +29,81 @@ def mock_settings():
         yield mock_settings
 
 
+@pytest.fixture(autouse=True)
+def mock_data_watermark():
+    """Mock the opportunity data watermark query to avoid database access."""
+    with patch("analysis.opportunity_coaching.queries.get_opportunity_data_watermark") as mock_wm:
+        mock_wm.return_value = {"call_count": 0, "email_count": 0, "session_count": 0}
+        yield mock_wm
+
+
 class TestCacheKeyGeneration:
-    """Tests for cache key generation."""
+    """Tests for cache key and data watermark generation."""
 
-    @patch("db.queries.get_opportunity_timeline")
-    def test_cache_key_includes_call_ids(self, mock_timeline):
+    def test_cache_key_is_stable_per_analysis_type(self):
         """
-        GIVEN an opportunity with calls
+        GIVEN an opportunity
         WHEN _get_opportunity_cache_key is called
-        THEN the cache key includes all call IDs
+        THEN the key is stable and distinct per analysis type
         """
         from analysis.opportunity_coaching import _get_opportunity_cache_key
 
         opp_id = str(uuid4())
-        call_ids = [str(uuid4()), str(uuid4())]
-        mock_timeline.return_value = [
-            {"id": call_ids[0], "item_type": "call"},
-            {"id": call_ids[1], "item_type": "call"},
-            {"id": str(uuid4()), "item_type": "email"},  # Should be excluded
-        ]
 
         key1 = _get_opportunity_cache_key(opp_id, "patterns")
 
-        assert key1 is not None
         assert len(key1) == 64  # SHA256 hex length
+        assert key1 == _get_opportunity_cache_key(opp_id, "patterns")
+        assert key1 != _get_opportunity_cache_key(opp_id, "themes")
+
+    def test_watermark_changes_when_data_changes(self, mock_data_watermark):
+        """
+        GIVEN an opportunity watermark
+        WHEN a call is linked or a session is stored
+        THEN the watermark changes
+        """
+        from analysis.opportunity_coaching import _get_data_watermark
+
+        mock_data_watermark.return_value = {
+            "last_call_at": datetime(2026, 1, 1),
+            "call_count": 2,
+            "last_email_at": None,
+            "email_count": 0,
+            "last_session_at": datetime(2026, 1, 2),
+            "session_count": 8,
+        }
+        wm1 = _get_data_watermark("opp-1")
+        assert wm1 == _get_data_watermark("opp-1")
+
+        mock_data_watermark.return_value = {**mock_data_watermark.return_value, "call_count": 3}
+        wm2 = _get_data_watermark("opp-1")
+        assert wm2 != wm1
+
+        mock_data_watermark.return_value = {
+            **mock_data_watermark.return_value,
+            "session_count": 9,
+            "last_session_at": datetime(2026, 1, 3),
+        }
+        assert _get_data_watermark("opp-1") not in (wm1, wm2)
+
+    @patch("analysis.opportunity_coaching.queries.get_opportunity_analysis_cache")
+    def test_cached_entry_with_stale_watermark_is_a_miss(self, mock_get_cache):
+        """
+        GIVEN a cached entry computed from older data
+        WHEN _get_cached_analysis is called with the current watermark
+        THEN it returns None, and returns the result when watermarks match
+        """
+        from analysis.opportunity_coaching import _get_cached_analysis
 
-        # Verify cache key changes when calls change
-        mock_timeline.return_value.append({"id": str(uuid4()), "item_type": "call"})
-        key2 = _get_opportunity_cache_key(opp_id, "patterns")
+        mock_get_cache.return_value = {
+            "analysis_result": ["Rec 1"],
+            "data_watermark": "old",
+            "cached_at": datetime(2020, 1, 1),
+        }
 
-        assert key1 != key2
+        assert _get_cached_analysis("key", "new") is None
+        assert _get_cached_analysis("key", "old") == ["Rec 1"]
+        assert _get_cached_analysis("key", None) is None
 
 
 class TestAnalyzeOpportunityPatterns:
@@ -76,14 +121,12 @@ class TestAnalyzeOpportunityPatterns:
     @patch("analysis.opportunity_coaching._get_cached_analysis")
     @patch("analysis.opportunity_coaching._set_cached_analysis")
     @patch("db.queries.get_opportunity")
-    @patch("db.queries.search_opportunities")
     @patch("db.queries.get_opportunity_timeline")
-    @patch("db.queries.get_coaching_sessions_for_call")
+    @patch("db.queries.get_latest_sessions_for_calls")
     def test_patterns_aggregates_scores_by_dimension(
         self,
         mock_sessions,
         mock_timeline,
-        mock_search,
         mock_get_opp,
         mock_set_cache,
         mock_get_cache,
@@ -92,31 +135,35 @@ class TestAnalyzeOpportunityPatterns:
         """
         GIVEN opportunity with multiple calls
         WHEN analyze_opportunity_patterns is called
-        THEN it aggregates scores per dimension
+        THEN it aggregates scores per dimension from one batch session query
         """
         from analysis.opportunity_coaching import analyze_opportunity_patterns
 
         opp_id = str(uuid4())
+        call_1, call_2 = str(uuid4()), str(uuid4())
         mock_get_cache.return_value = None  # No cache hit
         mock_get_opp.return_value = {"name": "Test Opp", "id": opp_id}
-        mock_search.return_value = ([], 0)
         mock_timeline.return_value = [
-            {"id": str(uuid4()), "item_type": "call"},
-            {"id": str(uuid4()), "item_type": "call"},
+            {"id": call_1, "item_type": "call"},
+            {"id": call_2, "item_type": "call"},
         ]
-        mock_sessions.return_value = [sample_coaching_session]
+        mock_sessions.return_value = {
+            call_1: {"discovery": sample_coaching_session},
+            call_2: {"discovery": {**sample_coaching_session, "score": 85}},
+        }
 
         result = analyze_opportunity_patterns(opp_id, use_cache=True)
 
         assert result["call_count"] == 2
-        assert "average_scores" in result
+        assert result["average_scores"]["discovery"]["average"] == 80
+        assert result["average_scores"]["discovery"]["data_points"] == 2
+        mock_sessions.assert_called_once_with([call_1, call_2])
 
     @patch("analysis.opportunity_coaching._get_cached_analysis")
     @patch("db.queries.get_opportunity")
-    @patch("db.queries.search_opportunities")
     @patch("db.queries.get_opportunity_timeline")
     def test_patterns_returns_message_when_no_calls(
-        self, mock_timeline, mock_search, mock_get_opp, mock_get_cache
+        self, mock_timeline, mock_get_opp, mock_get_cache
     ):
         """
         GIVEN opportunity with no calls
@@ -128,7 +175,6 @@ class TestAnalyzeOpportunityPatterns:
         opp_id = str(uuid4())
         mock_get_cache.return_value = None
         mock_get_opp.return_value = {"name": "Test Opp", "id": opp_id}
-        mock_search.return_value = ([], 0)
         mock_timeline.return_value = []  # No calls
 
         result = analyze_opportunity_patterns(opp_id, use_cache=False)
@@ -199,9 +245,9 @@ class TestIdentifyRecurringThemes:
         assert result["themes"] == []
         assert "message" in result
 
-    @patch("analysis.opportunity_coaching.anthropic.Anthropic")
-    @patch("analysis.opportunity_coaching.queries.get_call_by_id")
-    @patch("analysis.opportunity_coaching.queries.get_full_transcript")
+    @patch("anthropic.Anthropic")
+    @patch("analysis.opportunity_coaching.queries.get_calls_by_ids")
+    @patch("analysis.opportunity_coaching.queries.get_transcript_excerpts")
     @patch("analysis.opportunity_coaching.queries.get_opportunity_timeline")
     @patch("analysis.opportunity_coaching._set_cached_analysis")
     @patch("analysis.opportunity_coaching._get_cached_analysis")
@@ -226,8 +272,8 @@ class TestIdentifyRecurringThemes:
 
         mock_get_cache.return_value = None
         mock_timeline.return_value = [{"id": call_id, "item_type": "call"}]
-        mock_transcript.return_value = "Sample transcript text..."
-        mock_get_call.return_value = {"scheduled_at": datetime.now()}
+        mock_transcript.return_value = {call_id: "Sample transcript text..."}
+        mock_get_call.return_value = {call_id: {"scheduled_at": datetime.now()}}
 
         # Mock Claude response
         mock_client = MagicMock()
@@ -240,12 +286,15 @@ class TestIdentifyRecurringThemes:
 
         assert "themes" in result
         mock_client.messages.create.assert_called_once()
+        mock_transcript.assert_called_once_with([call_id], 5000)
+        prompt = mock_client.messages.create.call_args.kwargs["messages"][0]["content"]
+        assert "Sample transcript text..." in prompt
 
 
 class TestAnalyzeObjectionProgression:
     """Tests for analyze_objection_progression function."""
 
-    @patch("analysis.opportunity_coaching.anthropic.Anthropic")
+    @patch("anthropic.Anthropic")
     @patch("analysis.opportunity_coaching.queries.get_opportunity_timeline")
     @patch("analysis.opportunity_coaching._get_cached_analysis")
     def test_objections_returns_empty_when_no_calls(
@@ -279,7 +328,7 @@ class TestAssessRelationshipStrength:
     @patch("analysis.opportunity_coaching._get_cached_analysis")
     @patch("analysis.opportunity_coaching._set_cached_analysis")
     @patch("db.queries.get_opportunity_timeline")
-    @patch("db.queries.get_call_by_id")
+    @patch("db.queries.get_calls_by_ids")
     def test_relationship_calculates_metrics(
         self, mock_get_call, mock_timeline, mock_set_cache, mock_get_cache
     ):
@@ -293,16 +342,16 @@ class TestAssessRelationshipStrength:
         opp_id = str(uuid4())
 
         mock_get_cache.return_value = None
+        call_ids = [str(uuid4()), str(uuid4())]
         mock_timeline.return_value = [
-            {"id": str(uuid4()), "item_type": "call"},
-            {"id": str(uuid4()), "item_type": "call"},
+            {"id": call_ids[0], "item_type": "call"},
+            {"id": call_ids[1], "item_type": "call"},
             {"id": str(uuid4()), "item_type": "email"},
             {"id": str(uuid4()), "item_type": "email"},
             {"id": str(uuid4()), "item_type": "email"},
         ]
         mock_get_call.return_value = {
-            "scheduled_at": datetime.now(),
-            "duration": 1800,
+            call_id: {"scheduled_at": datetime.now(), "duration": 1800} for call_id in call_ids
         }
 
         result = assess_relationship_strength(opp_id, use_cache=False)
@@ -315,7 +364,7 @@ class TestAssessRelationshipStrength:
     @patch("analysis.opportunity_coaching._get_cached_analysis")
     @patch("analysis.opportunity_coaching._set_cached_analysis")
     @patch("db.queries.get_opportunity_timeline")
-    @patch("db.queries.get_call_by_id")
+    @patch("db.queries.get_calls_by_ids")
     def test_relationship_detects_trend(
         self, mock_get_call, mock_timeline, mock_set_cache, mock_get_cache
     ):
@@ -329,27 +378,20 @@ class TestAssessRelationshipStrength:
         opp_id = str(uuid4())
 
         mock_get_cache.return_value = None
-        mock_timeline.return_value = [
-            {"id": str(uuid4()), "item_type": "call"},
-            {"id": str(uuid4()), "item_type": "call"},
-            {"id": str(uuid4()), "item_type": "call"},
-            {"id": str(uuid4()), "item_type": "call"},
-        ]
+        call_ids = [str(uuid4()) for _ in range(4)]
+        mock_timeline.return_value = [{"id": call_id, "item_type": "call"} for call_id in call_ids]
 
         # Simulate increasing call durations
         durations = [1000, 1200, 2000, 2500]
-        call_idx = [0]
-
-        def get_call_side_effect(call_id):
-            duration = durations[call_idx[0] % len(durations)]
-            call_idx[0] += 1
-            return {"scheduled_at": datetime.now(), "duration": duration}
-
-        mock_get_call.side_effect = get_call_side_effect
+        mock_get_call.return_value = {
+            call_id: {"scheduled_at": datetime.now(), "duration": duration}
+            for call_id, duration in zip(call_ids, durations, strict=True)
+        }
 
         result = assess_relationship_strength(opp_id, use_cache=False)
 
-        assert result["call_duration_trend"] in ["strengthening", "weakening", "stable"]
+        assert result["call_duration_trend"] == "strengthening"
+        mock_get_call.assert_called_once_with(call_ids)
 
 
 class TestDetectSpeakerRole:
@@ -423,7 +465,7 @@ class TestDetectSpeakerRole:
 class TestGenerateCoachingRecommendations:
     """Tests for generate_coaching_recommendations function."""
 
-    @patch("analysis.opportunity_coaching.anthropic.Anthropic")
+    @patch("anthropic.Anthropic")
     @patch("analysis.opportunity_coaching.assess_relationship_strength")
     @patch("analysis.opportunity_coaching.analyze_objection_progression")
     @patch("analysis.opportunity_coaching.identify_recurring_themes")
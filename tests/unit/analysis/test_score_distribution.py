@@ -0,0 +1,181 @@
+"""
+Unit tests for in-memory score distributions.
+
+Tests cover:
+- Percentiles and means from cumulative histograms
+- Per-product and all-products distributions loaded in one query
+- TTL-based reload
+- Incremental updates from newly stored scores
+- Lookups while scores are recorded from other threads
+"""
+
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from analysis import score_distribution
+from analysis.score_distribution import ScoreDistribution
+
+ROWS = [
+    {"coaching_dimension": "discovery", "product": "prefect", "score": 60, "session_count": 2},
+    {"coaching_dimension": "discovery", "product": "prefect", "score": 80, "session_count": 2},
+    {"coaching_dimension": "discovery", "product": "horizon", "score": 90, "session_count": 1},
+    {"coaching_dimension": "discovery", "product": None, "score": 40, "session_count": 1},
+]
+
+
+@pytest.fixture(autouse=True)
+def reset_distributions():
+    """Start every test with nothing loaded."""
+    score_distribution.reset()
+    yield
+    score_distribution.reset()
+
+
+@pytest.fixture
+def mock_fetch_all():
+    with patch("analysis.score_distribution.fetch_all", return_value=ROWS) as mock:
+        yield mock
+
+
+@pytest.fixture
+def mock_settings():
+    with patch("analysis.score_distribution.settings") as mock:
+        mock.score_distribution_ttl_seconds = 300
+        yield mock
+
+
+class TestScoreDistribution:
+    """Tests for the histogram itself."""
+
+    def test_percentile_counts_scores_strictly_below(self):
+        """
+        GIVEN scores 50, 70, 70, 90
+        WHEN percentiles are looked up
+        THEN they match the share of scores strictly below
+        """
+        dist = ScoreDistribution()
+        for score in (50, 70, 70, 90):
+            dist.add(score)
+
+        assert dist.percentile(50) == 0
+        assert dist.percentile(70) == 25
+        assert dist.percentile(71) == 75
+        assert dist.percentile(100) == 100
+        assert dist.mean() == 70
+
+    def test_empty_distribution(self):
+        """
+        GIVEN no scores
+        WHEN percentile and mean are requested
+        THEN None is returned
+        """
+        dist = ScoreDistribution()
+
+        assert dist.percentile(50) is None
+        assert dist.mean() is None
+
+    def test_add_invalidates_cumulative(self):
+        """
+        GIVEN a distribution whose cumulative counts were computed
+        WHEN another score is added
+        THEN lookups reflect it
+        """
+        dist = ScoreDistribution()
+        dist.add(80)
+        assert dist.percentile(90) == 100
+
+        dist.add(95)
+
+        assert dist.percentile(90) == 50
+
+
+class TestLookups:
+    """Tests for module-level lookups."""
+
+    def test_team_averages_by_product(self, mock_fetch_all, mock_settings):
+        """
+        GIVEN sessions across products
+        WHEN team averages are requested with and without a product
+        THEN each uses its own population
+        """
+        all_products = score_distribution.get_team_averages()
+        prefect = score_distribution.get_team_averages("prefect")
+
+        assert all_products["discovery"] == {"avg_score": pytest.approx(410 / 6), "sample_size": 6}
+        assert prefect["discovery"] == {"avg_score": 70, "sample_size": 4}
+        assert score_distribution.get_team_averages("unknown") == {}
+        mock_fetch_all.assert_called_once()
+
+    def test_percentile_lookup_without_query(self, mock_fetch_all, mock_settings):
+        """
+        GIVEN loaded distributions
+        WHEN many percentiles are looked up within the TTL
+        THEN the database is queried once
+        """
+        assert score_distribution.get_percentile(80, "discovery", "prefect") == 50
+        assert score_distribution.get_percentile(80, "discovery") == 50
+        assert score_distribution.get_percentile(80, "engagement") is None
+
+        mock_fetch_all.assert_called_once()
+
+    def test_reload_after_ttl(self, mock_fetch_all, mock_settings):
+        """
+        GIVEN loaded distributions older than the TTL
+        WHEN a lookup is made
+        THEN they are reloaded
+        """
+        score_distribution.get_percentile(80, "discovery")
+        mock_settings.score_distribution_ttl_seconds = 0
+
+        score_distribution.get_percentile(80, "discovery")
+
+        assert mock_fetch_all.call_count == 2
+
+    def test_record_score_updates_loaded_distributions(self, mock_fetch_all, mock_settings):
+        """
+        GIVEN loaded distributions
+        WHEN a new score is recorded
+        THEN both the product and all-products distributions include it
+        """
+        score_distribution.get_percentile(80, "discovery")
+
+        score_distribution.record_score("discovery", 100, "prefect")
+
+        assert score_distribution.get_team_averages("prefect")["discovery"]["sample_size"] == 5
+        assert score_distribution.get_team_averages()["discovery"]["sample_size"] == 7
+        mock_fetch_all.assert_called_once()
+
+    def test_record_score_before_load_is_noop(self, mock_fetch_all, mock_settings):
+        """
+        GIVEN nothing loaded yet
+        WHEN a score is recorded
+        THEN no query is made (the first lookup loads it from the database)
+        """
+        score_distribution.record_score("discovery", 100, "prefect")
+
+        mock_fetch_all.assert_not_called()
+
+    def test_lookups_during_concurrent_record_score(self, mock_fetch_all, mock_settings):
+        """
+        GIVEN loaded distributions
+        WHEN worker threads record scores for new products while lookups run
+        THEN lookups never fail and see every recorded score afterwards
+        """
+        score_distribution.get_percentile(80, "discovery")
+
+        def record(worker):
+            for i in range(500):
+                score_distribution.record_score("discovery", 70, f"product-{worker}-{i}")
+
+        threads = [threading.Thread(target=record, args=(worker,)) for worker in range(4)]
+        for thread in threads:
+            thread.start()
+        while any(thread.is_alive() for thread in threads):
+            score_distribution.get_team_averages("prefect")
+            score_distribution.get_percentile(75, "discovery")
+        for thread in threads:
+            thread.join()
+
+        assert score_distribution.get_team_averages()["discovery"]["sample_size"] == 2006
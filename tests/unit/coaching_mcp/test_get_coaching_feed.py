@@ -18,6 +18,7 @@ from uuid import uuid4
 import pytest
 
 from coaching_mcp.tools.get_coaching_feed import get_coaching_feed_tool
+from db.pagination import InvalidCursorError
 
 
 @pytest.fixture
@@ -156,16 +157,14 @@ class TestGetCoachingFeedTool:
         """
         GIVEN rep_email parameter
         WHEN get_coaching_feed_tool is called
-        THEN uses get_coaching_sessions_for_rep
+        THEN the paged session query is filtered to that rep
         """
         mock_get_sessions.return_value = []
-        mock_queries.get_coaching_sessions_for_rep.return_value = []
         mock_queries.get_call.return_value = sample_call
 
         get_coaching_feed_tool(rep_email="sarah@prefect.io")
 
-        # Should call rep-specific query
-        mock_queries.get_coaching_sessions_for_rep.assert_called_once()
+        assert mock_get_sessions.call_args.kwargs["rep_email"] == "sarah@prefect.io"
 
     @patch("coaching_mcp.tools.get_coaching_feed.queries")
     @patch("coaching_mcp.tools.get_coaching_feed._get_recent_sessions")
@@ -384,6 +383,19 @@ class TestGetCoachingFeedTool:
         assert result["items"] == []
         assert result["total_count"] == 0
 
+    @patch("coaching_mcp.tools.get_coaching_feed.queries")
+    @patch("coaching_mcp.tools.get_coaching_feed._get_recent_sessions")
+    def test_invalid_cursor_is_raised(self, mock_get_sessions, mock_queries):
+        """
+        GIVEN a cursor that isn't a coaching feed cursor
+        WHEN get_coaching_feed_tool is called
+        THEN InvalidCursorError is raised instead of returning an empty feed
+        """
+        mock_get_sessions.side_effect = InvalidCursorError("Invalid cursor")
+
+        with pytest.raises(InvalidCursorError):
+            get_coaching_feed_tool(cursor="not-a-cursor")
+
     @patch("coaching_mcp.tools.get_coaching_feed.queries")
     @patch("coaching_mcp.tools.get_coaching_feed._get_recent_sessions")
     def test_missing_call_skips_session(self, mock_get_sessions, mock_queries, sample_sessions):
@@ -401,3 +413,29 @@ class TestGetCoachingFeedTool:
         assert "items" in result
         # Items should be skipped if call doesn't exist
         assert len(result["items"]) == 0 or result["items"] is not None
+
+    @patch("coaching_mcp.tools.get_coaching_feed.queries")
+    @patch("coaching_mcp.tools.get_coaching_feed._get_recent_sessions")
+    def test_cursor_pagination(self, mock_get_sessions, mock_queries, sample_sessions):
+        """
+        GIVEN more sessions than the page size
+        WHEN get_coaching_feed_tool is called and then called again with next_cursor
+        THEN one extra row is fetched, next_cursor is returned, and the cursor replaces offset
+        """
+        extra = {**sample_sessions[0], "id": str(uuid4())}
+        mock_get_sessions.return_value = [*sample_sessions, extra]
+
+        result = get_coaching_feed_tool(limit=2)
+
+        assert len(result["items"]) == 2
+        assert result["has_more"] is True
+        assert result["next_cursor"]
+        assert mock_get_sessions.call_args.args[2] == 3
+
+        mock_get_sessions.return_value = [extra]
+        result = get_coaching_feed_tool(limit=2, offset=40, cursor=result["next_cursor"])
+
+        assert mock_get_sessions.call_args.kwargs["offset"] == 0
+        assert mock_get_sessions.call_args.kwargs["cursor"]
+        assert result["has_more"] is False
+        assert result["next_cursor"] is None
@@ -20,6 +20,8 @@ from uuid import uuid4
 
 import pytest
 
+from analysis import score_distribution
+
 # Import directly - proper patching happens in fixtures
 from coaching_mcp.tools.analyze_call import analyze_call_tool
 from coaching_mcp.tools.get_rep_insights import get_rep_insights_tool
@@ -35,7 +37,9 @@ def mock_db():
         patch("coaching_mcp.tools.get_rep_insights.fetch_one") as mock_fetch_one_insights,
         patch("coaching_mcp.tools.get_rep_insights.fetch_all") as mock_fetch_all_insights,
         patch("coaching_mcp.tools.search_calls.fetch_all") as mock_fetch_all_search,
+        patch("analysis.score_distribution.fetch_all", return_value=[]),
     ):
+        score_distribution.reset()
         yield {
             "analyze_call": {
                 "fetch_one": mock_fetch_one_analyze,
@@ -728,6 +732,34 @@ class TestSearchCallsComplexFilters:
         assert result is not None
         assert isinstance(result, list)
 
+    def test_search_calls_filters_on_call_summary(self, mock_db):
+        """
+        GIVEN rep, score, role and objection filters
+        WHEN search_calls_tool builds its query
+        THEN scores, reps and role come from call_summary without aggregating sessions,
+        and parameters line up with their placeholders
+        """
+        mock_db["search_calls"]["fetch_all"].return_value = []
+
+        search_calls_tool(
+            rep_email="rep@prefect.io",
+            min_score=70,
+            max_score=90,
+            role="ae",
+            has_objection_type="pricing",
+            limit=10,
+        )
+
+        query, params = mock_db["search_calls"]["fetch_all"].call_args[0][:2]
+        assert "LEFT JOIN call_summary sm ON sm.call_id = c.id" in query
+        assert "AVG(" not in query
+        assert "ARRAY_AGG" not in query
+        assert "sm.rep_emails @> ARRAY[%s]::text[]" in query
+        assert "sm.evaluated_role = %s" in query
+        assert "FROM call_objections o" in query
+        assert "full_analysis" not in query
+        assert params == ("rep@prefect.io", 70, 90, "ae", "pricing", 10)
+
     def test_search_calls_respects_limit(self, mock_db):
         """
         GIVEN many matching calls
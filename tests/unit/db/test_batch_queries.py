@@ -0,0 +1,153 @@
+"""
+Unit tests for batch-fetch queries.
+
+Tests cover:
+- get_calls_by_ids
+- get_transcript_excerpts
+- get_latest_sessions_for_calls
+- get_call_ids_for_opportunities
+"""
+
+from unittest.mock import patch
+from uuid import uuid4
+
+from db import queries
+from db.models import CoachingDimension
+
+
+class TestGetCallsByIds:
+    """Tests for get_calls_by_ids."""
+
+    @patch("db.queries.fetch_all")
+    def test_returns_calls_keyed_by_id(self, mock_fetch_all):
+        """
+        GIVEN several call IDs
+        WHEN get_calls_by_ids is called
+        THEN one ANY() query is issued and rows are keyed by string ID
+        """
+        call_1, call_2 = uuid4(), uuid4()
+        mock_fetch_all.return_value = [
+            {"id": str(call_1), "title": "Discovery"},
+            {"id": str(call_2), "title": "Demo"},
+        ]
+
+        result = queries.get_calls_by_ids([call_1, call_2])
+
+        assert result[str(call_1)]["title"] == "Discovery"
+        assert result[str(call_2)]["title"] == "Demo"
+        mock_fetch_all.assert_called_once()
+        query, params = mock_fetch_all.call_args[0]
+        assert "ANY(%s::uuid[])" in query
+        assert params == ([str(call_1), str(call_2)],)
+
+    @patch("db.queries.fetch_all")
+    def test_empty_input_skips_query(self, mock_fetch_all):
+        """
+        GIVEN no call IDs
+        WHEN get_calls_by_ids is called
+        THEN no query is issued
+        """
+        assert queries.get_calls_by_ids([]) == {}
+        mock_fetch_all.assert_not_called()
+
+
+class TestGetTranscriptExcerpts:
+    """Tests for get_transcript_excerpts."""
+
+    @patch("db.queries.fetch_all")
+    def test_limits_excerpt_in_sql(self, mock_fetch_all):
+        """
+        GIVEN call IDs and a character limit
+        WHEN get_transcript_excerpts is called
+        THEN truncation happens in SQL and calls without text are omitted
+        """
+        call_1, call_2 = str(uuid4()), str(uuid4())
+        mock_fetch_all.return_value = [
+            {"call_id": call_1, "excerpt": "Hello there"},
+            {"call_id": call_2, "excerpt": None},
+        ]
+
+        result = queries.get_transcript_excerpts([call_1, call_2], 1000)
+
+        assert result == {call_1: "Hello there"}
+        query, params = mock_fetch_all.call_args[0]
+        assert "LEFT(STRING_AGG" in query
+        assert "start_offset < %s" in query
+        assert params == (1000, [call_1, call_2], 1000)
+
+    @patch("db.queries.fetch_all")
+    def test_empty_input_skips_query(self, mock_fetch_all):
+        """
+        GIVEN no call IDs
+        WHEN get_transcript_excerpts is called
+        THEN no query is issued
+        """
+        assert queries.get_transcript_excerpts([], 1000) == {}
+        mock_fetch_all.assert_not_called()
+
+
+class TestGetLatestSessionsForCalls:
+    """Tests for get_latest_sessions_for_calls."""
+
+    @patch("db.queries.fetch_all")
+    def test_groups_by_call_and_dimension(self, mock_fetch_all):
+        """
+        GIVEN sessions for several calls and dimensions
+        WHEN get_latest_sessions_for_calls is called
+        THEN results are nested by call ID then dimension
+        """
+        call_1, call_2 = str(uuid4()), str(uuid4())
+        mock_fetch_all.return_value = [
+            {"call_id": call_1, "coaching_dimension": "discovery", "score": 80},
+            {"call_id": call_1, "coaching_dimension": "engagement", "score": 70},
+            {"call_id": call_2, "coaching_dimension": "discovery", "score": 60},
+        ]
+
+        result = queries.get_latest_sessions_for_calls([call_1, call_2])
+
+        assert result[call_1]["discovery"]["score"] == 80
+        assert result[call_1]["engagement"]["score"] == 70
+        assert result[call_2] == {"discovery": mock_fetch_all.return_value[2]}
+        query, params = mock_fetch_all.call_args[0]
+        assert "DISTINCT ON (call_id, coaching_dimension)" in query
+        assert "coaching_dimension = ANY" not in query
+        assert params == ([call_1, call_2],)
+
+    @patch("db.queries.fetch_all")
+    def test_filters_dimensions(self, mock_fetch_all):
+        """
+        GIVEN a dimension filter
+        WHEN get_latest_sessions_for_calls is called
+        THEN dimension values are passed as an array parameter
+        """
+        call_id = str(uuid4())
+        mock_fetch_all.return_value = []
+
+        queries.get_latest_sessions_for_calls([call_id], [CoachingDimension.OBJECTION_HANDLING])
+
+        query, params = mock_fetch_all.call_args[0]
+        assert "coaching_dimension = ANY(%s)" in query
+        assert params == ([call_id], [CoachingDimension.OBJECTION_HANDLING.value])
+
+
+class TestGetCallIdsForOpportunities:
+    """Tests for get_call_ids_for_opportunities."""
+
+    @patch("db.queries.fetch_all")
+    def test_groups_calls_by_opportunity(self, mock_fetch_all):
+        """
+        GIVEN opportunities with and without calls
+        WHEN get_call_ids_for_opportunities is called
+        THEN every opportunity is present and calls keep query order
+        """
+        opp_1, opp_2 = str(uuid4()), str(uuid4())
+        call_1, call_2 = str(uuid4()), str(uuid4())
+        mock_fetch_all.return_value = [
+            {"opportunity_id": opp_1, "call_id": call_2},
+            {"opportunity_id": opp_1, "call_id": call_1},
+        ]
+
+        result = queries.get_call_ids_for_opportunities([opp_1, opp_2])
+
+        assert result == {opp_1: [call_2, call_1], opp_2: []}
+        mock_fetch_all.assert_called_once()
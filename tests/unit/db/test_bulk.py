@@ -0,0 +1,160 @@
+"""
+Unit tests for COPY-based bulk loading.
+
+Tests cover:
+- CSV rendering of DataFrames for COPY (nulls, integers, chunking)
+- Staging, merge statement and commit/rollback in bulk_merge
+- Insert/update counts and rows per second
+"""
+
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+from db.bulk import BulkLoadResult, bulk_merge, copy_dataframe
+
+
+def _copied_text(cursor: MagicMock) -> list[str]:
+    """CSV payload of each copy_expert call."""
+    return [call.args[1].getvalue() for call in cursor.copy_expert.call_args_list]
+
+
+@pytest.fixture
+def frame():
+    return pd.DataFrame(
+        {
+            "gong_call_id": ["g1", "g2", "g3"],
+            "title": ["Discovery, part 1", "", None],
+            "duration_seconds": pd.array([1800, None, 60], dtype="Int64"),
+        }
+    )
+
+
+@pytest.fixture
+def mock_conn():
+    conn = MagicMock()
+    cur = conn.cursor.return_value.__enter__.return_value
+    cur.fetchone.return_value = (2, 1)
+    return conn
+
+
+class TestCopyDataframe:
+    """Tests for streaming DataFrames through COPY."""
+
+    def test_renders_nulls_and_integers(self, frame):
+        """
+        GIVEN a frame with quoted text, an empty string, nulls and nullable integers
+        WHEN it is copied
+        THEN nulls use the COPY null marker, empty strings stay empty and ints stay ints
+        """
+        cursor = MagicMock()
+
+        copied = copy_dataframe(cursor, "calls_stage", frame)
+
+        assert copied == 3
+        assert _copied_text(cursor) == ['g1,"Discovery, part 1",1800\ng2,,\\N\ng3,\\N,60\n']
+        assert "FORMAT csv" in repr(cursor.copy_expert.call_args.args[0])
+
+    def test_copies_in_chunks(self, frame):
+        """
+        GIVEN a chunk size smaller than the frame
+        WHEN it is copied
+        THEN each chunk is sent with its own COPY
+        """
+        cursor = MagicMock()
+
+        copy_dataframe(cursor, "calls_stage", frame, ["gong_call_id"], chunk_rows=2)
+
+        assert _copied_text(cursor) == ["g1\ng2\n", "g3\n"]
+
+
+class TestBulkMerge:
+    """Tests for staging and merging."""
+
+    def test_stages_merges_and_commits(self, mock_conn, frame):
+        """
+        GIVEN rows keyed by gong_call_id
+        WHEN they are merged with update columns
+        THEN a temp stage is created, copied into, merged with ON CONFLICT and committed
+        """
+        cur = mock_conn.cursor.return_value.__enter__.return_value
+
+        result = bulk_merge(
+            mock_conn,
+            "calls",
+            frame,
+            {"gong_call_id": "varchar", "title": "varchar", "duration_seconds": "int"},
+            conflict_columns=["gong_call_id"],
+            update_columns=["title", "duration_seconds"],
+            touch_columns=["processed_at"],
+        )
+
+        create_stage, merge = (repr(c.args[0]) for c in cur.execute.call_args_list)
+        assert "CREATE TEMP TABLE" in create_stage and "ON COMMIT DROP" in create_stage
+        assert "Identifier('calls_stage')" in create_stage
+        assert "ON CONFLICT" in merge and "DO UPDATE SET" in merge
+        assert "NOW()" in merge
+        assert "IS DISTINCT FROM" in merge
+        assert "RETURNING (xmax = 0)" in merge
+        mock_conn.commit.assert_called_once()
+        assert (result.rows_copied, result.inserted, result.updated) == (3, 2, 1)
+        assert result.skipped == 0
+
+    def test_custom_source_reads_from_stage(self, mock_conn, frame):
+        """
+        GIVEN a source query resolving foreign keys from the stage
+        WHEN rows are merged without a conflict target
+        THEN the source references the stage table and conflicts are skipped
+        """
+        cur = mock_conn.cursor.return_value.__enter__.return_value
+
+        bulk_merge(
+            mock_conn,
+            "speakers",
+            frame,
+            {"gong_call_id": "varchar", "title": "varchar"},
+            target_columns=["call_id", "name"],
+            source="SELECT c.id, st.title FROM {stage} st JOIN calls c USING (gong_call_id)",
+        )
+
+        merge = repr(cur.execute.call_args_list[1].args[0])
+        assert "Identifier('speakers_stage')" in merge
+        assert "ON CONFLICT DO NOTHING" in merge
+
+    def test_rolls_back_on_failure(self, mock_conn, frame):
+        """
+        GIVEN the merge fails
+        WHEN rows are merged
+        THEN the transaction is rolled back and the error raised
+        """
+        cur = mock_conn.cursor.return_value.__enter__.return_value
+        cur.execute.side_effect = [None, RuntimeError("boom")]
+
+        with pytest.raises(RuntimeError):
+            bulk_merge(mock_conn, "calls", frame, {"gong_call_id": "varchar"})
+
+        mock_conn.rollback.assert_called_once()
+        mock_conn.commit.assert_not_called()
+
+    def test_update_columns_require_conflict_target(self, mock_conn, frame):
+        """
+        GIVEN update columns without conflict columns
+        WHEN rows are merged
+        THEN a ValueError is raised before anything runs
+        """
+        with pytest.raises(ValueError):
+            bulk_merge(mock_conn, "calls", frame, {"title": "varchar"}, update_columns=["title"])
+
+        mock_conn.cursor.assert_not_called()
+
+
+def test_rows_per_second():
+    """
+    GIVEN a load of 1000 rows in 0.5s
+    WHEN its throughput is read
+    THEN it is 2000 rows/s
+    """
+    result = BulkLoadResult("calls", rows_copied=1000, inserted=1000, updated=0, seconds=0.5)
+
+    assert result.rows_per_second == 2000
@@ -0,0 +1,124 @@
+"""
+Unit tests for call_summary queries.
+
+Tests cover:
+- Score and role filter conditions
+- Rebuilding summaries in a committed transaction
+- Call lists joining call_summary (sync and async)
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from db.queries import call_summary_filters, get_calls_for_user, refresh_call_summary
+
+
+def _bind_into(params):
+    def bind(value):
+        params.append(value)
+        return "%s"
+
+    return bind
+
+
+class TestCallSummaryFilters:
+    """Test WHERE conditions on call_summary."""
+
+    def test_no_filters(self):
+        assert call_summary_filters(_bind_into([])) == []
+
+    def test_score_range_and_role(self):
+        """
+        GIVEN a score range and evaluated role
+        WHEN conditions are built
+        THEN each binds one parameter in order
+        """
+        params = []
+
+        conditions = call_summary_filters(_bind_into(params), 60, 90, "se")
+
+        assert conditions == [
+            "sm.overall_score >= %s",
+            "sm.overall_score <= %s",
+            "sm.evaluated_role = %s",
+        ]
+        assert params == [60, 90, "se"]
+
+    def test_zero_min_score_is_applied(self):
+        params = []
+        assert call_summary_filters(_bind_into(params), min_score=0) == ["sm.overall_score >= %s"]
+
+
+class TestRefreshCallSummary:
+    """Test rebuilding call_summary."""
+
+    @patch("db.connection.get_db_connection")
+    def test_refresh_given_calls_commits(self, mock_get_conn):
+        """
+        GIVEN call IDs
+        WHEN refresh_call_summary is called
+        THEN the SQL function gets them as a uuid array and the result is committed
+        """
+        conn = mock_get_conn.return_value.__enter__.return_value
+        cur = conn.cursor.return_value.__enter__.return_value
+        cur.fetchone.return_value = (2,)
+
+        assert refresh_call_summary(["a", "b"]) == 2
+
+        query, params = cur.execute.call_args[0]
+        assert "refresh_call_summary(%s::uuid[])" in query
+        assert params == (["a", "b"],)
+        conn.commit.assert_called_once()
+
+    @patch("db.connection.get_db_connection")
+    def test_refresh_all(self, mock_get_conn):
+        conn = mock_get_conn.return_value.__enter__.return_value
+        cur = conn.cursor.return_value.__enter__.return_value
+        cur.fetchone.return_value = (0,)
+
+        refresh_call_summary()
+
+        assert cur.execute.call_args[0][1] == (None,)
+
+
+class TestCallsForUser:
+    """Test call lists read scores from call_summary."""
+
+    @patch("db.queries.fetch_all")
+    def test_joins_summary_and_filters(self, mock_fetch_all):
+        """
+        GIVEN a manager filtering by minimum score
+        WHEN get_calls_for_user builds its query
+        THEN call_summary is joined and the score filter precedes the limit
+        """
+        mock_fetch_all.return_value = []
+
+        get_calls_for_user("mgr@prefect.io", "manager", 20, min_score=75)
+
+        query, params = mock_fetch_all.call_args[0]
+        assert "LEFT JOIN call_summary sm ON sm.call_id = c.id" in query
+        assert "sm.overall_score >= %s" in query
+        assert "sm.rep_names" in query
+        assert params == ("mgr@prefect.io", 75, 20)
+
+    @pytest.mark.asyncio
+    async def test_async_numbers_summary_placeholders(self):
+        """
+        GIVEN a rep filtering by role and score range
+        WHEN the async get_calls_for_user builds its query
+        THEN filter placeholders follow the email and the limit is last
+        """
+        from db import async_queries
+
+        with patch("db.async_queries.async_fetch_all", new=AsyncMock(return_value=[])) as fetch:
+            await async_queries.get_calls_for_user(
+                "rep@prefect.io", "rep", 11, min_score=50, max_score=80, evaluated_role="ae"
+            )
+
+        query, *args = fetch.call_args.args
+        assert "sm.overall_score >= $2" in query
+        assert "sm.overall_score <= $3" in query
+        assert "sm.evaluated_role = $4" in query
+        assert "LIMIT $5" in query
+        assert args == ["rep@prefect.io", 50, 80, "ae", 11]
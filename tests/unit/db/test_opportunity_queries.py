@@ -8,6 +8,7 @@ Tests cover:
 - get_opportunity
 - get_opportunity_timeline
 - search_opportunities
+- reconcile_opportunity_activity
 - get/update sync_status
 - opportunity_analysis_cache functions
 """
@@ -327,13 +328,52 @@ class TestOpportunityQueries:
 
         call_args = mock_fetch_all.call_args[0]
         query = call_args[0]
-        assert "ORDER BY o.close_date ASC" in query
+        assert "ORDER BY COALESCE(close_date, 'infinity'::date) ASC, id ASC" in query
 
         # Test invalid sort field defaults to updated_at
         search_opportunities(sort="invalid_field", sort_dir="DESC")
         call_args = mock_fetch_all.call_args[0]
         query = call_args[0]
-        assert "ORDER BY o.updated_at DESC" in query
+        assert "ORDER BY COALESCE(updated_at, '-infinity'::timestamptz) DESC, id DESC" in query
+
+    @patch("db.queries.fetch_all")
+    @patch("db.queries.fetch_one")
+    def test_search_opportunities_reads_counter_columns(self, mock_fetch_one, mock_fetch_all):
+        """
+        GIVEN maintained call/email counter columns
+        WHEN search_opportunities is called
+        THEN the page query reads opportunities alone without joining activity tables
+        """
+        from db.queries import search_opportunities
+
+        mock_fetch_one.return_value = {"total": 0}
+        mock_fetch_all.return_value = []
+
+        search_opportunities(filters={"stage": "Negotiation"}, sort="last_activity_at")
+
+        query = mock_fetch_all.call_args[0][0]
+        assert "call_opportunities" not in query
+        assert "emails" not in query
+        assert "COALESCE(last_activity_at, '-infinity'::timestamptz) DESC" in query
+
+    @patch("db.queries.logger")
+    @patch("db.connection.get_db_connection")
+    def test_reconcile_opportunity_activity_reports_drift(self, mock_get_conn, mock_logger):
+        """
+        GIVEN counters that drifted on some opportunities
+        WHEN reconcile_opportunity_activity is called
+        THEN every opportunity is refreshed, the fix is committed and the count is logged
+        """
+        from db.queries import reconcile_opportunity_activity
+
+        conn = mock_get_conn.return_value.__enter__.return_value
+        cur = conn.cursor.return_value.__enter__.return_value
+        cur.fetchone.return_value = (3,)
+
+        assert reconcile_opportunity_activity() == 3
+        assert "refresh_opportunity_activity(NULL)" in cur.execute.call_args[0][0]
+        conn.commit.assert_called_once()
+        mock_logger.warning.assert_called_once()
 
     @patch("db.queries.fetch_one")
     def test_get_sync_status(self, mock_fetch_one):
@@ -0,0 +1,331 @@
+"""
+Unit tests for cursor (keyset) pagination helpers.
+
+Tests cover:
+- Opaque cursor round-trips for datetime, date, Decimal and UUID values
+- Rejection of malformed cursors and cursors from another sort order
+- Keyset seek predicates, including NULLS LAST sentinels
+- Splitting limit + 1 fetches into a page and next cursor
+- Cursor pagination in search_opportunities and the async query twins
+"""
+
+from datetime import UTC, date, datetime
+from decimal import Decimal
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+
+import pytest
+
+from db.pagination import (
+    InvalidCursorError,
+    Keyset,
+    SortKey,
+    add_cursor_pagination_to_query,
+    decode_cursor,
+    encode_cursor,
+    estimate_count,
+    nulls_last,
+)
+
+KEYSET = Keyset(
+    (
+        SortKey("o.updated_at", "updated_at", nulls_last("timestamptz", descending=True)),
+        SortKey("o.id", "id"),
+    ),
+    descending=True,
+)
+
+
+def _bind_positional(params):
+    return lambda value: params.append(value) or "%s"
+
+
+class TestCursorEncoding:
+    """Test opaque cursor encoding."""
+
+    def test_round_trip_preserves_types(self):
+        """
+        GIVEN sort values of several types
+        WHEN they are encoded and decoded
+        THEN the same Python values come back
+        """
+        values = [
+            datetime(2026, 3, 1, 12, 30, tzinfo=UTC),
+            date(2026, 3, 31),
+            Decimal("1250.50"),
+            "Acme",
+            None,
+            7,
+        ]
+
+        cursor = encode_cursor(values, "scope")
+
+        assert "=" not in cursor
+        assert decode_cursor(cursor, "scope") == values
+
+    def test_uuid_encoded_as_string(self):
+        """
+        GIVEN a UUID sort value
+        WHEN it is encoded and decoded
+        THEN it comes back as its string form
+        """
+        value = uuid4()
+
+        assert decode_cursor(encode_cursor([value])) == [str(value)]
+
+    @pytest.mark.parametrize("cursor", ["not-a-cursor", "e30", "!!!"])
+    def test_malformed_cursor_rejected(self, cursor):
+        """
+        GIVEN a cursor that wasn't produced by encode_cursor
+        WHEN it is decoded
+        THEN InvalidCursorError is raised
+        """
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(cursor)
+
+    def test_cursor_from_other_scope_rejected(self):
+        """
+        GIVEN a cursor made for one sort order
+        WHEN it is decoded for another
+        THEN InvalidCursorError is raised
+        """
+        cursor = encode_cursor(["2026-01-01"], "updated_at:desc")
+
+        with pytest.raises(InvalidCursorError):
+            decode_cursor(cursor, "close_date:asc")
+
+
+class TestKeyset:
+    """Test keyset predicates and page splitting."""
+
+    def test_first_page_has_no_seek(self):
+        """
+        GIVEN no cursor
+        WHEN the seek condition is built
+        THEN it matches every row and binds nothing
+        """
+        params = []
+
+        assert KEYSET.condition(None, _bind_positional(params)) == "TRUE"
+        assert params == []
+
+    def test_seek_is_single_row_comparison(self):
+        """
+        GIVEN a cursor for a DESC keyset with a nullable leading key
+        WHEN the seek condition is built
+        THEN it is one row comparison with the NULL sentinel applied to both sides
+        """
+        row = {"updated_at": datetime(2026, 3, 1, tzinfo=UTC), "id": "opp-9"}
+        params = []
+
+        condition = KEYSET.condition(KEYSET.cursor_for(row), _bind_positional(params))
+
+        assert condition == (
+            "(COALESCE(o.updated_at, '-infinity'::timestamptz), o.id) < "
+            "(COALESCE(%s, '-infinity'::timestamptz), %s)"
+        )
+        assert params == [row["updated_at"], "opp-9"]
+        assert KEYSET.order_by() == (
+            "COALESCE(o.updated_at, '-infinity'::timestamptz) DESC, o.id DESC"
+        )
+
+    def test_null_cursor_value_binds_null(self):
+        """
+        GIVEN a last row whose sort value is NULL
+        WHEN the seek condition is built
+        THEN NULL is bound and folded to the sentinel by COALESCE
+        """
+        params = []
+
+        KEYSET.condition(
+            KEYSET.cursor_for({"updated_at": None, "id": "x"}), _bind_positional(params)
+        )
+
+        assert params == [None, "x"]
+
+    def test_ascending_keyset_uses_greater_than(self):
+        """
+        GIVEN an ascending keyset on a NOT NULL column
+        WHEN the seek condition is built with $n placeholders
+        THEN rows after the cursor are selected with >
+        """
+        keyset = Keyset((SortKey("name", "name"), SortKey("id", "id")))
+        params = ["owner"]
+
+        condition = keyset.condition(
+            keyset.cursor_for({"name": "Acme", "id": "opp-1"}),
+            lambda v: params.append(v) or f"${len(params)}",
+        )
+
+        assert condition == "(name, id) > ($2, $3)"
+
+    def test_paginate_splits_extra_row(self):
+        """
+        GIVEN limit + 1 rows
+        WHEN paginate is called
+        THEN the extra row is dropped and the cursor points past the last kept row
+        """
+        rows = [{"updated_at": None, "id": str(i)} for i in range(4)]
+
+        page, cursor = KEYSET.paginate(rows, 3)
+
+        assert page == rows[:3]
+        assert decode_cursor(cursor, KEYSET.scope) == [None, "2"]
+
+    def test_paginate_last_page(self):
+        """
+        GIVEN no more than limit rows
+        WHEN paginate is called
+        THEN there is no next cursor
+        """
+        rows = [{"updated_at": None, "id": "1"}]
+
+        assert KEYSET.paginate(rows, 3) == (rows, None)
+
+    def test_mismatched_cursor_rejected(self):
+        """
+        GIVEN a cursor from a different keyset
+        WHEN the seek condition is built
+        THEN InvalidCursorError is raised
+        """
+        other = Keyset((SortKey("name", "name"), SortKey("id", "id")))
+        cursor = other.cursor_for({"name": "Acme", "id": "1"})
+
+        with pytest.raises(InvalidCursorError):
+            KEYSET.condition(cursor, _bind_positional([]))
+
+
+class TestSingleFieldCursor:
+    """Test add_cursor_pagination_to_query."""
+
+    def test_wraps_query_and_decodes_cursor(self):
+        """
+        GIVEN a base query with its own WHERE clause and a cursor
+        WHEN cursor pagination is added
+        THEN the query is wrapped and the decoded cursor value is bound
+        """
+        cursor = encode_cursor([5], "seq")
+
+        query, params = add_cursor_pagination_to_query(
+            "SELECT * FROM t WHERE active", "seq", cursor, 10, "DESC"
+        )
+
+        assert query == (
+            "SELECT * FROM (SELECT * FROM t WHERE active) AS page "
+            "WHERE seq < %s ORDER BY seq DESC LIMIT %s"
+        )
+        assert params == [5, 11]
+
+
+class TestEstimateCount:
+    """Test planner-based counts."""
+
+    @patch("db.connection.fetch_one")
+    def test_reads_plan_rows(self, mock_fetch_one):
+        """
+        GIVEN EXPLAIN (FORMAT JSON) output
+        WHEN estimate_count is called
+        THEN the top plan node's row estimate is returned
+        """
+        mock_fetch_one.return_value = {"QUERY PLAN": [{"Plan": {"Plan Rows": 1234}}]}
+
+        assert estimate_count("SELECT 1 FROM calls", ()) == 1234
+        assert mock_fetch_one.call_args[0][0].startswith("EXPLAIN (FORMAT JSON) SELECT 1")
+
+
+class TestQueryCursors:
+    """Test cursor pagination in the query modules."""
+
+    @patch("db.queries.fetch_all")
+    @patch("db.queries.fetch_one")
+    def test_search_opportunities_seeks_with_cursor(self, mock_fetch_one, mock_fetch_all):
+        """
+        GIVEN a cursor from a previous page
+        WHEN search_opportunities is called with count="none"
+        THEN no COUNT runs and the page query seeks past the cursor instead of scanning
+        """
+        from db.queries import opportunity_keyset, search_opportunities
+
+        keyset = opportunity_keyset("amount", "DESC")
+        cursor = keyset.cursor_for({"amount": Decimal("5000.00"), "id": "opp-3"})
+        mock_fetch_all.return_value = []
+
+        _, total = search_opportunities(
+            filters={"owner": "sarah@prefect.io"},
+            sort="amount",
+            sort_dir="DESC",
+            limit=21,
+            cursor=cursor,
+            count="none",
+        )
+
+        assert total is None
+        mock_fetch_one.assert_not_called()
+        query, params = mock_fetch_all.call_args[0]
+        assert (
+            "(COALESCE(amount, '-infinity'::numeric), id) < "
+            "(COALESCE(%(cursor_1)s, '-infinity'::numeric), %(cursor_2)s)"
+        ) in query
+        assert params["cursor_1"] == Decimal("5000.00")
+        assert params["cursor_2"] == "opp-3"
+        assert "GROUP BY" not in query
+
+    @patch("db.queries.fetch_all")
+    @patch("db.queries.fetch_one")
+    def test_search_opportunities_rejects_cursor_for_other_sort(
+        self, mock_fetch_one, mock_fetch_all
+    ):
+        """
+        GIVEN a cursor made for a different sort order
+        WHEN search_opportunities is called
+        THEN InvalidCursorError is raised before the page query runs
+        """
+        from db.queries import opportunity_keyset, search_opportunities
+
+        cursor = opportunity_keyset("name", "ASC").cursor_for({"name": "Acme", "id": "1"})
+
+        with pytest.raises(InvalidCursorError):
+            search_opportunities(sort="updated_at", cursor=cursor, count="none")
+        mock_fetch_all.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_async_calls_for_user_numbers_cursor_placeholders(self):
+        """
+        GIVEN a rep and a cursor
+        WHEN the async get_calls_for_user builds its query
+        THEN cursor placeholders follow the email and the limit is last
+        """
+        from db import async_queries
+        from db.queries import CALLS_KEYSET
+
+        scheduled = datetime(2026, 2, 1, 9, 0)
+        cursor = CALLS_KEYSET.cursor_for({"scheduled_at": scheduled, "id": "call-1"})
+
+        with patch("db.async_queries.async_fetch_all", new=AsyncMock(return_value=[])) as fetch:
+            await async_queries.get_calls_for_user("rep@prefect.io", "rep", 11, cursor=cursor)
+
+        query, *args = fetch.call_args.args
+        assert "s.email = $1" in query
+        assert "< (COALESCE($2, '-infinity'::timestamp), $3)" in query
+        assert "LIMIT $4" in query
+        assert args == ["rep@prefect.io", scheduled, "call-1", 11]
+
+    @pytest.mark.asyncio
+    async def test_async_timeline_limit_offset_follow_cursor(self):
+        """
+        GIVEN a timeline cursor
+        WHEN the async get_opportunity_timeline builds its query
+        THEN LIMIT/OFFSET placeholders come after the cursor values
+        """
+        from db import async_queries
+        from db.queries import OPPORTUNITY_TIMELINE_KEYSET
+
+        sent = datetime(2026, 2, 1, tzinfo=UTC)
+        cursor = OPPORTUNITY_TIMELINE_KEYSET.cursor_for({"timestamp": sent, "id": "email-1"})
+
+        with patch("db.async_queries.async_fetch_all", new=AsyncMock(return_value=[])) as fetch:
+            await async_queries.get_opportunity_timeline("opp-1", limit=6, cursor=cursor)
+
+        query, *args = fetch.call_args.args
+        assert "LIMIT $4 OFFSET $5" in query
+        assert args == ["opp-1", sent, "email-1", 6, 0]
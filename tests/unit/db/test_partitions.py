@@ -0,0 +1,123 @@
+"""
+Unit tests for coaching_sessions partition maintenance.
+
+Tests cover:
+- Quarter arithmetic and partition name parsing
+- Creating upcoming partitions through the SQL function
+- Selecting and detaching partitions outside the retention window
+"""
+
+from datetime import date
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from db.partitions import (
+    Partition,
+    detach_old_coaching_session_partitions,
+    ensure_coaching_session_partitions,
+    parse_partition_name,
+    quarter_start,
+    shift_quarters,
+)
+
+
+def _mock_connection():
+    conn = MagicMock()
+    cursor = MagicMock()
+    cursor.__enter__.return_value = cursor
+    conn.cursor.return_value = cursor
+    ctx = MagicMock()
+    ctx.__enter__.return_value = conn
+    return ctx, conn, cursor
+
+
+class TestQuarterMath:
+    """Test quarter boundaries and partition names."""
+
+    def test_quarter_start(self):
+        assert quarter_start(date(2026, 10, 18)) == date(2026, 10, 1)
+        assert quarter_start(date(2026, 3, 31)) == date(2026, 1, 1)
+
+    def test_shift_quarters_crosses_years(self):
+        assert shift_quarters(date(2026, 10, 18), 1) == date(2027, 1, 1)
+        assert shift_quarters(date(2026, 2, 1), -1) == date(2025, 10, 1)
+        assert shift_quarters(date(2026, 5, 1), -6) == date(2024, 10, 1)
+
+    def test_parse_partition_name(self):
+        assert parse_partition_name("coaching_sessions_2025_q4") == Partition(
+            "coaching_sessions_2025_q4", date(2025, 10, 1), date(2026, 1, 1)
+        )
+        assert parse_partition_name("coaching_sessions_default") is None
+
+
+class TestEnsurePartitions:
+    """Test creating upcoming partitions."""
+
+    def test_calls_sql_function_and_commits(self):
+        """
+        GIVEN some partitions are missing
+        WHEN ensure_coaching_session_partitions runs
+        THEN the SQL function is called with the horizon and the names it created are returned
+        """
+        ctx, conn, cursor = _mock_connection()
+        cursor.fetchall.return_value = [("coaching_sessions_2027_q4",)]
+
+        with patch("db.partitions.get_db_connection", return_value=ctx):
+            created = ensure_coaching_session_partitions(quarters_ahead=4)
+
+        assert created == ["coaching_sessions_2027_q4"]
+        query, params = cursor.execute.call_args[0]
+        assert "create_coaching_sessions_partitions" in query
+        assert params == (4,)
+        conn.commit.assert_called_once()
+
+
+class TestDetachOldPartitions:
+    """Test retiring partitions outside the retention window."""
+
+    @patch("db.partitions.fetch_all")
+    def test_detaches_only_expired_partitions(self, mock_fetch_all):
+        """
+        GIVEN partitions from 2025 Q1 through 2026 Q4
+        WHEN detaching with four quarters retained on 2026-10-18
+        THEN only quarters that ended before 2025 Q4 are detached and archived
+        """
+        mock_fetch_all.return_value = [
+            {"relname": f"coaching_sessions_{year}_q{q}"}
+            for year in (2025, 2026)
+            for q in (1, 2, 3, 4)
+        ]
+        ctx, conn, cursor = _mock_connection()
+
+        with patch("db.partitions.get_db_connection", return_value=ctx):
+            detached = detach_old_coaching_session_partitions(
+                retain_quarters=4, archive_schema="archive", today=date(2026, 10, 18)
+            )
+
+        assert detached == [
+            "coaching_sessions_2025_q1",
+            "coaching_sessions_2025_q2",
+            "coaching_sessions_2025_q3",
+        ]
+        statements = [repr(c[0][0]) for c in cursor.execute.call_args_list]
+        assert sum("DETACH PARTITION" in s and "CONCURRENTLY" in s for s in statements) == 3
+        assert sum("SET SCHEMA" in s for s in statements) == 3
+        assert conn.autocommit is False
+
+    @patch("db.partitions.get_db_connection")
+    @patch("db.partitions.fetch_all")
+    def test_nothing_expired(self, mock_fetch_all, mock_get_conn):
+        """
+        GIVEN only partitions inside the retention window
+        WHEN detaching
+        THEN no connection is opened for DDL
+        """
+        mock_fetch_all.return_value = [{"relname": "coaching_sessions_2026_q3"}]
+
+        assert detach_old_coaching_session_partitions(4, today=date(2026, 10, 18)) == []
+        mock_get_conn.assert_not_called()
+
+    def test_rejects_zero_retention(self):
+        with pytest.raises(ValueError):
+            detach_old_coaching_session_partitions(0)
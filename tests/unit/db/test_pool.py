@@ -0,0 +1,173 @@
+"""
+Unit tests for the instrumented connection pool.
+
+Tests cover:
+- Session settings applied once per physical connection
+- Idle connections kept for reuse up to maxconn
+- Bounded wait when the pool is exhausted
+- Validation of connections returned after an error
+- Leak detection logging
+"""
+
+import threading
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from psycopg2 import OperationalError, extensions
+
+from db.pool import InstrumentedConnectionPool, PoolTimeoutError
+
+
+def _make_conn():
+    conn = MagicMock()
+    conn.closed = 0
+    conn.info.transaction_status = extensions.TRANSACTION_STATUS_IDLE
+    cursor = MagicMock()
+    cursor.__enter__.return_value = cursor
+    cursor.__exit__.return_value = False
+    conn.cursor.return_value = cursor
+    return conn
+
+
+@pytest.fixture
+def mock_connect():
+    """Patch psycopg2.connect to hand out fresh mock connections."""
+    with patch("psycopg2.pool.psycopg2.connect", side_effect=lambda *a, **k: _make_conn()) as m:
+        yield m
+
+
+class TestSessionInit:
+    """Test one-time session setup."""
+
+    def test_settings_applied_once_per_connection(self, mock_connect):
+        """
+        GIVEN a pool with session settings
+        WHEN the same connection is checked out several times
+        THEN settings are applied only when the connection is opened
+        """
+        db_pool = InstrumentedConnectionPool(
+            1, 2, dsn="postgresql://x", session_settings={"statement_timeout": "30s"}
+        )
+
+        for _ in range(3):
+            conn = db_pool.getconn()
+            db_pool.putconn(conn)
+
+        assert mock_connect.call_count == 1
+        cursor = conn.cursor.return_value
+        cursor.execute.assert_called_once_with(
+            "SELECT set_config(%s, %s, false)", ("statement_timeout", "30s")
+        )
+        conn.commit.assert_called_once()
+
+    def test_idle_connections_kept_above_minconn(self, mock_connect):
+        """
+        GIVEN a pool with minconn below maxconn
+        WHEN more than minconn connections are returned
+        THEN they stay open for reuse instead of being closed
+        """
+        db_pool = InstrumentedConnectionPool(1, 3, dsn="postgresql://x")
+
+        conns = [db_pool.getconn() for _ in range(3)]
+        for conn in conns:
+            db_pool.putconn(conn)
+
+        assert all(not conn.close.called for conn in conns)
+        assert db_pool.stats()["idle"] == 3
+
+
+class TestBoundedWait:
+    """Test waiting for a free connection."""
+
+    def test_timeout_when_exhausted(self, mock_connect):
+        """
+        GIVEN all connections checked out
+        WHEN another checkout waits past the timeout
+        THEN PoolTimeoutError is raised
+        """
+        db_pool = InstrumentedConnectionPool(1, 1, dsn="postgresql://x", checkout_timeout=0.05)
+        db_pool.getconn()
+
+        with pytest.raises(PoolTimeoutError):
+            db_pool.getconn()
+
+    def test_waiter_gets_returned_connection(self, mock_connect):
+        """
+        GIVEN all connections checked out
+        WHEN one is returned while another thread is waiting
+        THEN the waiter receives it instead of failing
+        """
+        db_pool = InstrumentedConnectionPool(1, 1, dsn="postgresql://x", checkout_timeout=5)
+        conn = db_pool.getconn()
+        result = {}
+
+        def waiter():
+            result["conn"] = db_pool.getconn()
+
+        thread = threading.Thread(target=waiter)
+        thread.start()
+        time.sleep(0.05)
+        assert db_pool.stats()["waiting"] == 1
+        db_pool.putconn(conn)
+        thread.join(timeout=5)
+
+        assert result["conn"] is conn
+
+
+class TestValidation:
+    """Test validation after errors."""
+
+    def test_broken_connection_discarded(self, mock_connect):
+        """
+        GIVEN a connection whose ping fails
+        WHEN it is returned with validate=True
+        THEN it is closed rather than reused
+        """
+        db_pool = InstrumentedConnectionPool(1, 2, dsn="postgresql://x")
+        conn = db_pool.getconn()
+        conn.cursor.return_value.execute.side_effect = OperationalError("server closed")
+
+        db_pool.putconn(conn, validate=True)
+
+        conn.close.assert_called_once()
+        assert db_pool.getconn() is not conn
+
+    def test_healthy_connection_kept(self, mock_connect):
+        """
+        GIVEN a connection that still responds
+        WHEN it is returned with validate=True
+        THEN it is rolled back and reused
+        """
+        db_pool = InstrumentedConnectionPool(1, 2, dsn="postgresql://x")
+        conn = db_pool.getconn()
+
+        db_pool.putconn(conn, validate=True)
+
+        conn.close.assert_not_called()
+        conn.rollback.assert_called()
+        assert db_pool.getconn() is conn
+
+
+class TestLeakDetection:
+    """Test leak detection logging."""
+
+    @patch("db.pool.logger")
+    def test_long_hold_logged_with_stack(self, mock_logger, mock_connect):
+        """
+        GIVEN a leak threshold
+        WHEN a connection is held past it
+        THEN a warning with the checkout stack is logged once
+        """
+        db_pool = InstrumentedConnectionPool(1, 2, dsn="postgresql://x", leak_threshold=10)
+        conn = db_pool.getconn()
+        db_pool._checkouts[id(conn)].started_at -= 20
+
+        # Next checkout notices the overdue connection; returning it doesn't log again
+        db_pool.putconn(db_pool.getconn())
+        db_pool.putconn(conn)
+
+        mock_logger.warning.assert_called_once()
+        message = mock_logger.warning.call_args[0][0]
+        assert "still held after 20" in message
+        assert "test_long_hold_logged_with_stack" in message
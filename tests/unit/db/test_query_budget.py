@@ -0,0 +1,178 @@
+"""
+Unit tests for per-request query accounting.
+
+Tests cover:
+- Statement shape normalization
+- Totals, slowest statements and repeated shapes
+- Cursor instrumentation (only while tracking)
+- Budget checks
+"""
+
+import pytest
+from psycopg2 import extensions
+
+from db.query_budget import (
+    QueryBudgetExceededError,
+    QueryStats,
+    _tracked_cursor_class,
+    assert_query_budget,
+    budget_for,
+    current_stats,
+    query_budget,
+    statement_shape,
+    timed,
+    track_queries,
+)
+
+
+class _FakeCursor:
+    """Stands in for a psycopg2 cursor class."""
+
+    def __init__(self):
+        self.executed = []
+
+    def execute(self, query, vars=None):
+        self.executed.append((query, vars))
+
+    def executemany(self, query, vars_list):
+        self.executed.append((query, list(vars_list)))
+
+
+class TestStatementShape:
+    """Tests for normalizing statements."""
+
+    def test_values_and_placeholders_collapse(self):
+        """
+        GIVEN the same statement with different literals and placeholder styles
+        WHEN their shapes are computed
+        THEN they are identical
+        """
+        a = statement_shape("SELECT * FROM calls\n  WHERE id = 'abc' AND score > 80")
+        b = statement_shape("SELECT * FROM calls WHERE id = %s AND score > %(min)s")
+        c = statement_shape("SELECT * FROM calls WHERE id = $1 AND score > $2")
+
+        assert a == b == c == "SELECT * FROM calls WHERE id = ? AND score > ?"
+
+    def test_in_lists_collapse(self):
+        """
+        GIVEN IN lists of different lengths
+        WHEN their shapes are computed
+        THEN they are identical
+        """
+        assert statement_shape("WHERE id IN (1, 2, 3)") == statement_shape("WHERE id IN (%s,%s)")
+
+
+class TestQueryStats:
+    """Tests for recording queries."""
+
+    def test_totals_slowest_and_repeats(self):
+        """
+        GIVEN one statement run six times and another once, slowly
+        WHEN the stats are summarized
+        THEN totals add up, the slow statement is first and the loop is flagged
+        """
+        stats = QueryStats()
+        for i in range(6):
+            stats.record(f"SELECT * FROM speakers WHERE call_id = '{i}'", 0.001)
+        stats.record("SELECT count(*) FROM calls", 0.05)
+
+        summary = stats.summary(repeat_threshold=5)
+
+        assert summary["db_queries"] == 7
+        assert summary["db_time_ms"] == pytest.approx(56.0)
+        assert summary["db_slowest"][0]["statement"] == "SELECT count(*) FROM calls"
+        assert len(summary["db_slowest"]) == 5
+        assert summary["db_repeated"] == {"SELECT * FROM speakers WHERE call_id = ?": 6}
+        assert stats.server_timing() == 'db;dur=56.0;desc="7 queries"'
+
+
+class TestTracking:
+    """Tests for cursor instrumentation and async timing."""
+
+    def test_cursor_records_only_while_tracking(self):
+        """
+        GIVEN a tracked cursor class
+        WHEN statements run outside and inside track_queries()
+        THEN only the statements inside are recorded, and all still execute
+        """
+        cursor = _tracked_cursor_class(_FakeCursor)()
+
+        cursor.execute("SELECT 1")
+        with track_queries() as stats:
+            cursor.execute("SELECT %s", (2,))
+            cursor.executemany("INSERT INTO t VALUES (%s)", [(1,), (2,)])
+
+        assert len(cursor.executed) == 3
+        assert stats.count == 2
+        assert current_stats() is None
+
+    def test_cursor_class_cached_per_factory(self):
+        """
+        GIVEN the same cursor factory twice
+        WHEN tracked classes are built
+        THEN the same subclass is reused
+        """
+        tracked = _tracked_cursor_class(extensions.cursor)
+
+        assert tracked is _tracked_cursor_class(extensions.cursor)
+        assert issubclass(tracked, extensions.cursor)
+
+    def test_timed_records_when_tracking(self):
+        """
+        GIVEN an async helper's query wrapped in timed()
+        WHEN it runs inside and outside track_queries()
+        THEN it is recorded only inside
+        """
+        with timed("SELECT 1"):
+            pass
+        with track_queries() as stats, timed("SELECT $1"):
+            pass
+
+        assert stats.count == 1
+
+
+class TestBudgets:
+    """Tests for declaring and enforcing query budgets."""
+
+    def test_declared_budget(self):
+        """
+        GIVEN an endpoint decorated with @query_budget
+        WHEN its budget is read
+        THEN it is the declared value, and undecorated endpoints have none
+        """
+
+        @query_budget(3)
+        async def endpoint():
+            return None
+
+        assert budget_for(endpoint) == 3
+        assert budget_for(lambda: None) is None
+        assert budget_for(None) is None
+
+    def test_assert_query_budget_raises_with_repeats(self):
+        """
+        GIVEN a block running a query per item
+        WHEN it exceeds its budget
+        THEN QueryBudgetExceededError names the repeated statement
+        """
+        cursor = _tracked_cursor_class(_FakeCursor)()
+
+        with pytest.raises(QueryBudgetExceededError, match=r"ran 6 queries \(budget 2\)") as exc:
+            with assert_query_budget(2):
+                for i in range(6):
+                    cursor.execute("SELECT * FROM coaching_sessions WHERE call_id = %s", (i,))
+
+        assert "x6: SELECT * FROM coaching_sessions WHERE call_id = ?" in str(exc.value)
+
+    def test_assert_query_budget_passes_within_budget(self):
+        """
+        GIVEN a block within its budget
+        WHEN it completes
+        THEN nothing is raised
+        """
+        cursor = _tracked_cursor_class(_FakeCursor)()
+
+        with assert_query_budget(2) as stats:
+            cursor.execute("SELECT 1")
+
+        assert stats.count == 1
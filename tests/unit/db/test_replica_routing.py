@@ -0,0 +1,179 @@
+"""
+Unit tests for read replica routing.
+
+Tests cover:
+- fetch_one/fetch_all read from the replica when one is configured
+- Read-your-writes pinning to the primary after a write in the same request
+- Lag-aware and unavailable-replica fallback to the primary
+- Lag checks at most once per interval
+"""
+
+from unittest.mock import MagicMock, patch
+
+import psycopg2
+import pytest
+
+import db.connection as db_conn
+from db import replica
+from db.connection import execute_query, fetch_all, fetch_one
+from db.replica import ReplicaMonitor, request_scope, use_primary
+
+
+def _pool(rows=None, lag: float = 0.0) -> MagicMock:
+    """Pool whose connections return rows for queries and lag for the lag check."""
+    db_pool = MagicMock()
+    cur = db_pool.getconn.return_value.cursor.return_value.__enter__.return_value
+    cur.fetchone.return_value = (lag,)
+    cur.fetchall.return_value = rows or []
+    return db_pool
+
+
+@pytest.fixture
+def mock_settings():
+    with patch("db.connection.settings") as mock:
+        mock.database_replica_url = "postgresql://replica/test"
+        mock.database_replica_max_lag_seconds = 10.0
+        mock.database_replica_lag_check_seconds = 5.0
+        mock.database_read_your_writes_seconds = 5.0
+        yield mock
+
+
+@pytest.fixture
+def pools(mock_settings):
+    primary, replica_pool = _pool([("primary",)]), _pool([("replica",)])
+    db_conn._replica_monitor = None
+    with (
+        patch("db.connection.get_db_pool", return_value=primary),
+        patch("db.connection.get_replica_pool", return_value=replica_pool),
+        request_scope(),
+    ):
+        yield primary, replica_pool
+    db_conn._replica_monitor = None
+
+
+class TestReadRouting:
+    """Tests for choosing the pool for read-only helpers."""
+
+    def test_reads_use_replica(self, pools):
+        """
+        GIVEN a healthy replica
+        WHEN fetch_all runs
+        THEN it reads from the replica pool
+        """
+        primary, replica_pool = pools
+
+        assert fetch_all("SELECT 1", as_dict=False) == [("replica",)]
+        primary.getconn.assert_not_called()
+
+    def test_no_replica_configured_uses_primary(self, pools, mock_settings):
+        """
+        GIVEN no replica URL
+        WHEN fetch_all runs
+        THEN it reads from the primary
+        """
+        mock_settings.database_replica_url = None
+
+        assert fetch_all("SELECT 1", as_dict=False) == [("primary",)]
+
+    def test_read_after_write_goes_to_primary(self, pools):
+        """
+        GIVEN a write in the current request
+        WHEN a read follows within the read-your-writes window
+        THEN it reads from the primary
+        """
+        primary, _ = pools
+        execute_query("UPDATE calls SET title = 'x'")
+
+        assert fetch_all("SELECT 1", as_dict=False) == [("primary",)]
+
+    def test_writes_in_other_requests_dont_pin(self, pools):
+        """
+        GIVEN a write in a different request
+        WHEN this request reads
+        THEN it still reads from the replica
+        """
+        with request_scope():
+            execute_query("UPDATE calls SET title = 'x'")
+
+        assert fetch_all("SELECT 1", as_dict=False) == [("replica",)]
+
+    def test_use_primary_pins_reads(self, pools):
+        """
+        GIVEN a block wrapped in use_primary()
+        WHEN reads run inside it
+        THEN they use the primary
+        """
+        with use_primary():
+            assert fetch_all("SELECT 1", as_dict=False) == [("primary",)]
+
+    def test_lagging_replica_falls_back(self, pools):
+        """
+        GIVEN replica lag above the limit
+        WHEN fetch_all runs
+        THEN it reads from the primary
+        """
+        _, replica_pool = pools
+        cur = replica_pool.getconn.return_value.cursor.return_value.__enter__.return_value
+        cur.fetchone.return_value = (60.0,)
+
+        assert fetch_all("SELECT 1", as_dict=False) == [("primary",)]
+        assert db_conn.get_replica_monitor().status()["lag_seconds"] == 60.0
+
+    def test_unreachable_replica_falls_back(self, pools):
+        """
+        GIVEN a replica whose checkout fails after a successful lag check
+        WHEN fetch_one runs
+        THEN it reads from the primary and the replica is marked unavailable
+        """
+        primary, replica_pool = pools
+        db_conn.get_replica_monitor().unusable_reason(lambda: replica_pool)
+        replica_pool.getconn.side_effect = psycopg2.OperationalError("connection refused")
+        primary.getconn.return_value.cursor.return_value.__enter__.return_value.fetchone.return_value = {
+            "pool": "primary"
+        }
+
+        assert fetch_one("SELECT 1") == {"pool": "primary"}
+        assert db_conn.get_replica_monitor().status()["available"] is False
+
+
+class TestReplicaMonitor:
+    """Tests for replica lag checks."""
+
+    def test_checks_at_most_once_per_interval(self):
+        """
+        GIVEN a monitor with a 60s check interval
+        WHEN it is asked repeatedly
+        THEN the replica is queried once
+        """
+        replica_pool = _pool(lag=0.5)
+        monitor = ReplicaMonitor(max_lag_seconds=10, check_interval_seconds=60)
+
+        for _ in range(3):
+            assert monitor.unusable_reason(lambda: replica_pool) is None
+
+        assert replica_pool.getconn.call_count == 1
+        assert monitor.lag_seconds == 0.5
+
+    def test_pool_creation_failure_marks_unavailable(self):
+        """
+        GIVEN a replica pool that can't be created
+        WHEN the monitor checks
+        THEN reads are sent to the primary
+        """
+        monitor = ReplicaMonitor(max_lag_seconds=10, check_interval_seconds=60)
+
+        def failing_pool():
+            raise psycopg2.OperationalError("could not connect")
+
+        assert monitor.unusable_reason(failing_pool) == "unavailable"
+
+    def test_primary_read_reason_outside_requests_is_per_thread(self):
+        """
+        GIVEN a write recorded outside any request scope
+        WHEN the same thread reads
+        THEN it is pinned to the primary
+        """
+        replica.mark_write()
+
+        assert replica.primary_read_reason(5.0) == "read_your_writes"
+        assert replica.primary_read_reason(0.0) is None
@@ -0,0 +1,115 @@
+"""
+Unit tests for the rep/dimension/week score rollup queries.
+
+Tests cover:
+- Analytics queries reading rep_dimension_weekly_scores
+- rebuild_rep_dimension_weekly_scores backfill
+"""
+
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from db import queries
+from db.models import CoachingDimension
+
+
+class TestRollupReads:
+    """Tests for analytics queries served from the rollup table."""
+
+    @patch("db.queries.fetch_all")
+    def test_score_trends_read_rollup(self, mock_fetch_all):
+        """
+        GIVEN a rep and dimension
+        WHEN get_score_trends_for_rep is called
+        THEN weekly rows come from the rollup table, not coaching_sessions
+        """
+        mock_fetch_all.return_value = []
+
+        queries.get_score_trends_for_rep("rep@example.com", CoachingDimension.DISCOVERY, days=30)
+
+        query, params = mock_fetch_all.call_args[0]
+        assert "FROM rep_dimension_weekly_scores" in query
+        assert "coaching_sessions" not in query
+        assert params == ("rep@example.com", "discovery", 30)
+
+    @patch("db.queries.fetch_one")
+    def test_team_average_weights_by_count(self, mock_fetch_one):
+        """
+        GIVEN a dimension
+        WHEN get_team_average_scores is called
+        THEN the average is sum over count across rollup rows, not an average of averages
+        """
+        mock_fetch_one.return_value = {"avg_score": 72, "session_count": 10}
+
+        queries.get_team_average_scores(CoachingDimension.ENGAGEMENT)
+
+        query = mock_fetch_one.call_args[0][0]
+        assert "SUM(score_sum)::numeric / NULLIF(SUM(score_count), 0)" in query
+        assert "FROM rep_dimension_weekly_scores" in query
+
+    @patch("db.queries.fetch_all")
+    def test_top_performers_read_rollup(self, mock_fetch_all):
+        """
+        GIVEN a dimension
+        WHEN get_top_performers is called
+        THEN totals come from the rollup and only company-side reps are returned
+        """
+        mock_fetch_all.return_value = []
+
+        queries.get_top_performers(CoachingDimension.DISCOVERY, days=30, limit=5)
+
+        query, params = mock_fetch_all.call_args[0]
+        assert "FROM rep_dimension_weekly_scores" in query
+        assert "company_side = true" in query
+        assert params == ("discovery", 30, 5)
+
+
+class TestRebuildRollups:
+    """Tests for rebuild_rep_dimension_weekly_scores."""
+
+    @pytest.fixture
+    def mock_conn(self):
+        conn = MagicMock()
+        cursor = MagicMock()
+        cursor.rowcount = 12
+        conn.cursor.return_value.__enter__.return_value = cursor
+        with patch("db.connection.get_db_connection") as mock_get_conn:
+            mock_get_conn.return_value.__enter__.return_value = conn
+            yield conn, cursor
+
+    def test_rebuild_locks_and_upserts(self, mock_conn):
+        """
+        GIVEN existing coaching sessions
+        WHEN rebuild_rep_dimension_weekly_scores is called
+        THEN the rollup is locked against trigger writes, recomputed and committed
+        """
+        conn, cursor = mock_conn
+        since = datetime(2026, 1, 7)
+
+        written = queries.rebuild_rep_dimension_weekly_scores(since=since)
+
+        assert written == 12
+        lock_sql = cursor.execute.call_args_list[0][0][0]
+        assert "LOCK TABLE rep_dimension_weekly_scores" in lock_sql
+        upsert_sql, params = cursor.execute.call_args_list[1][0]
+        assert "ON CONFLICT (rep_email, coaching_dimension, week_start)" in upsert_sql
+        assert upsert_sql.count("COUNT(*) FILTER") == queries.SCORE_HISTOGRAM_BUCKETS
+        assert params == {"since": since}
+        conn.commit.assert_called_once()
+
+    def test_rebuild_rolls_back_on_error(self, mock_conn):
+        """
+        GIVEN the upsert fails
+        WHEN rebuild_rep_dimension_weekly_scores is called
+        THEN the transaction is rolled back and the error raised
+        """
+        conn, cursor = mock_conn
+        cursor.execute.side_effect = [None, RuntimeError("boom")]
+
+        with pytest.raises(RuntimeError):
+            queries.rebuild_rep_dimension_weekly_scores()
+
+        conn.rollback.assert_called_once()
+        conn.commit.assert_not_called()
@@ -0,0 +1,94 @@
+"""
+Unit tests for set-based speaker role updates.
+
+Tests cover:
+- bulk_update_speaker_roles issues one UPDATE for the whole batch
+- Unmatched speaker ids roll the batch back and are reported
+- Role validation before touching the database
+"""
+
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+
+from db import queries
+
+
+@pytest.fixture
+def mock_cursor():
+    with patch("db.connection.get_db_connection") as mock_get_conn:
+        conn = mock_get_conn.return_value.__enter__.return_value
+        cur = conn.cursor.return_value.__enter__.return_value
+        yield conn, cur
+
+
+class TestBulkUpdateSpeakerRoles:
+    """Tests for bulk_update_speaker_roles."""
+
+    def test_updates_batch_in_one_statement(self, mock_cursor):
+        """
+        GIVEN role updates for several speakers
+        WHEN bulk_update_speaker_roles is called
+        THEN one UPDATE ... FROM unnest() runs with parallel id and role arrays and commits
+        """
+        conn, cur = mock_cursor
+        ids = [uuid4() for _ in range(3)]
+        cur.fetchall.return_value = [{"id": speaker_id, "role": "ae"} for speaker_id in ids]
+
+        result = queries.bulk_update_speaker_roles(
+            [(ids[0], "ae"), (ids[1], "se"), (ids[2], None)], "manager@prefect.io"
+        )
+
+        assert cur.execute.call_count == 2  # audit user + the update
+        query, params = cur.execute.call_args[0]
+        assert "unnest(%s::uuid[], %s::speaker_role[])" in query
+        assert params == ([str(i) for i in ids], ["ae", "se", None])
+        conn.commit.assert_called_once()
+        assert result["updated"] == 3
+        assert result["failed"] == []
+
+    def test_repeated_speaker_uses_last_role(self, mock_cursor):
+        """
+        GIVEN the same speaker listed twice
+        WHEN bulk_update_speaker_roles is called
+        THEN it is updated once, with the last role
+        """
+        _, cur = mock_cursor
+        speaker_id = uuid4()
+        cur.fetchall.return_value = [{"id": speaker_id, "role": "csm"}]
+
+        queries.bulk_update_speaker_roles([(speaker_id, "ae"), (speaker_id, "csm")], "m@prefect.io")
+
+        assert cur.execute.call_args[0][1] == ([str(speaker_id)], ["csm"])
+
+    def test_unmatched_ids_roll_back(self, mock_cursor):
+        """
+        GIVEN one speaker id that doesn't exist
+        WHEN bulk_update_speaker_roles is called
+        THEN the batch is rolled back and the missing id is reported
+        """
+        conn, cur = mock_cursor
+        found, missing = uuid4(), uuid4()
+        cur.fetchall.return_value = [{"id": found, "role": "ae"}]
+
+        result = queries.bulk_update_speaker_roles(
+            [(found, "ae"), (missing, "se")], "manager@prefect.io"
+        )
+
+        conn.rollback.assert_called_once()
+        conn.commit.assert_not_called()
+        assert result == {"updated": 0, "failed": [str(missing)], "speakers": []}
+
+    def test_invalid_role_rejected_before_query(self, mock_cursor):
+        """
+        GIVEN an unknown role
+        WHEN bulk_update_speaker_roles is called
+        THEN ValueError is raised without querying
+        """
+        _, cur = mock_cursor
+
+        with pytest.raises(ValueError):
+            queries.bulk_update_speaker_roles([(uuid4(), "cto")], "manager@prefect.io")
+
+        cur.execute.assert_not_called()
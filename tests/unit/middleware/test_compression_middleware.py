@@ -0,0 +1,308 @@
+"""
+Unit tests for the streaming compression middleware.
+
+Tests cover:
+- Accept-Encoding negotiation (q-values, wildcard, unavailable encodings)
+- Size-based level selection
+- Chunk-by-chunk compression of streamed responses, each chunk flushed as it is sent
+- Pass-through for SSE, already-encoded, non-compressible and small responses
+"""
+
+import gzip
+import zlib
+from unittest.mock import patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from api.middleware import compression
+from api.middleware.compression import (
+    CompressionMiddleware,
+    StreamCompressor,
+    compression_level,
+    negotiate_encoding,
+)
+
+LARGE_TEXT = "transcript line with some repeated words " * 200
+
+
+@pytest.fixture
+def gzip_only():
+    """Pretend the optional brotli/zstandard packages are missing."""
+    with (
+        patch.object(compression, "BROTLI_AVAILABLE", False),
+        patch.object(compression, "ZSTD_AVAILABLE", False),
+    ):
+        yield
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+
+    @app.get("/large")
+    def large():
+        return {"text": LARGE_TEXT}
+
+    @app.get("/small")
+    def small():
+        return {"ok": True}
+
+    @app.get("/stream")
+    def stream():
+        async def rows():
+            for i in range(5):
+                yield f'{{"row": {i}, "text": "{LARGE_TEXT}"}}\n'
+
+        return StreamingResponse(rows(), media_type="application/x-ndjson")
+
+    @app.get("/events")
+    def events():
+        async def gen():
+            for _ in range(3):
+                yield f"data: {LARGE_TEXT}\n\n"
+
+        return StreamingResponse(gen(), media_type="text/event-stream")
+
+    @app.get("/encoded")
+    def encoded():
+        body = gzip.compress(LARGE_TEXT.encode())
+        return Response(body, media_type="application/json", headers={"Content-Encoding": "gzip"})
+
+    @app.get("/binary")
+    def binary():
+        return Response(b"\x89PNG" * 1000, media_type="image/png")
+
+    @app.get("/error")
+    def error():
+        return JSONResponse({"detail": LARGE_TEXT}, status_code=500)
+
+    return TestClient(app)
+
+
+class TestNegotiateEncoding:
+    """Tests for negotiate_encoding."""
+
+    def test_prefers_zstd_then_br_then_gzip(self):
+        with (
+            patch.object(compression, "BROTLI_AVAILABLE", True),
+            patch.object(compression, "ZSTD_AVAILABLE", True),
+        ):
+            assert negotiate_encoding("gzip, br, zstd") == "zstd"
+            assert negotiate_encoding("gzip, br") == "br"
+            assert negotiate_encoding("gzip, deflate") == "gzip"
+
+    def test_q_values_override_preference(self):
+        with (
+            patch.object(compression, "BROTLI_AVAILABLE", True),
+            patch.object(compression, "ZSTD_AVAILABLE", True),
+        ):
+            assert negotiate_encoding("zstd;q=0.5, gzip;q=1.0") == "gzip"
+            assert negotiate_encoding("br;q=0, gzip;q=0.1") == "gzip"
+
+    def test_skips_unavailable_encodings(self, gzip_only):
+        assert negotiate_encoding("br, zstd, gzip;q=0.5") == "gzip"
+        assert negotiate_encoding("br, zstd") is None
+
+    def test_wildcard_and_identity(self, gzip_only):
+        assert negotiate_encoding("*") == "gzip"
+        assert negotiate_encoding("*, gzip;q=0") is None
+        assert negotiate_encoding("identity") is None
+        assert negotiate_encoding("") is None
+
+    def test_case_insensitive_and_malformed(self, gzip_only):
+        assert negotiate_encoding("GZIP") == "gzip"
+        assert negotiate_encoding("gzip;q=abc, ;;") is None
+
+
+class TestCompressionLevel:
+    """Tests for size-based level selection."""
+
+    def test_smaller_payloads_get_higher_levels(self):
+        small = compression_level("gzip", 10 * 1024)
+        medium = compression_level("gzip", 512 * 1024)
+        large = compression_level("gzip", 8 * 1024 * 1024)
+        assert small >= medium >= large
+
+    def test_unknown_length_uses_fastest_tier(self):
+        assert compression_level("gzip", None) == compression_level("gzip", 8 * 1024 * 1024)
+
+
+class TestStreamCompressor:
+    """Tests for StreamCompressor."""
+
+    def test_gzip_round_trip_across_chunks(self):
+        compressor = StreamCompressor("gzip", 6)
+        chunks = [LARGE_TEXT[i : i + 1000].encode() for i in range(0, len(LARGE_TEXT), 1000)]
+
+        out = b"".join(compressor.compress(chunk) for chunk in chunks) + compressor.finish()
+
+        assert gzip.decompress(out) == LARGE_TEXT.encode()
+
+    def test_brotli_round_trip(self):
+        brotli = pytest.importorskip("brotli")
+        compressor = StreamCompressor("br", 4)
+
+        out = compressor.compress(LARGE_TEXT.encode()) + compressor.finish()
+
+        assert brotli.decompress(out) == LARGE_TEXT.encode()
+
+    def test_zstd_round_trip(self):
+        zstandard = pytest.importorskip("zstandard")
+        compressor = StreamCompressor("zstd", 3)
+
+        out = compressor.compress(LARGE_TEXT.encode()) + compressor.finish()
+
+        assert zstandard.ZstdDecompressor().decompressobj().decompress(out) == LARGE_TEXT.encode()
+
+    @pytest.mark.parametrize("encoding", ["gzip", "br", "zstd"])
+    def test_flush_makes_output_so_far_decodable(self, encoding):
+        """
+        GIVEN a chunk compressed mid-stream
+        WHEN the compressor is flushed
+        THEN the bytes emitted so far decode to the chunk without finishing the stream
+        """
+        if encoding == "gzip":
+            decode = zlib.decompressobj(31).decompress
+        elif encoding == "br":
+            decode = pytest.importorskip("brotli").Decompressor().process
+        else:
+            decode = pytest.importorskip("zstandard").ZstdDecompressor().decompressobj().decompress
+        compressor = StreamCompressor(encoding, 3)
+        row = b'{"row": 1}\n'
+
+        out = compressor.compress(row) + compressor.flush()
+
+        assert decode(out) == row
+
+    def test_rejects_unknown_encoding(self):
+        with pytest.raises(ValueError):
+            StreamCompressor("deflate", 6)
+
+
+class TestCompressionMiddleware:
+    """Tests for CompressionMiddleware over a FastAPI app."""
+
+    def test_large_response_compressed(self, client, gzip_only):
+        """
+        GIVEN a JSON body above minimum_size
+        WHEN the client accepts gzip
+        THEN it is gzipped without Content-Length and with Vary: Accept-Encoding
+        """
+        response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.json() == {"text": LARGE_TEXT}
+        assert response.num_bytes_downloaded < len(LARGE_TEXT)
+
+    def test_small_response_not_compressed(self, client, gzip_only):
+        response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in response.headers
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.json() == {"ok": True}
+
+    def test_client_without_support(self, client, gzip_only):
+        response = client.get("/large", headers={"Accept-Encoding": "identity"})
+
+        assert "content-encoding" not in response.headers
+        assert response.json() == {"text": LARGE_TEXT}
+
+    def test_streamed_response_compressed_chunk_by_chunk(self, client, gzip_only):
+        """
+        GIVEN a StreamingResponse of NDJSON rows
+        WHEN the client accepts gzip
+        THEN each row is compressed as it arrives and the stream decodes intact
+        """
+        sent = []
+        original = StreamCompressor.compress
+
+        def record(self, chunk):
+            sent.append(len(chunk))
+            return original(self, chunk)
+
+        with patch.object(StreamCompressor, "compress", record):
+            response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert len(sent) == 5
+        lines = response.text.splitlines()
+        assert len(lines) == 5
+        assert response.num_bytes_downloaded < len(response.content)
+
+    async def test_streamed_chunks_are_flushed_as_sent(self, gzip_only):
+        """
+        GIVEN a streamed NDJSON response
+        WHEN each row is sent
+        THEN the compressed body sent for it decodes to that row straight away
+        """
+        rows = [f'{{"row": {i}}}\n'.encode() for i in range(3)]
+
+        async def app(scope, receive, send):
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 200,
+                    "headers": [(b"content-type", b"application/x-ndjson")],
+                }
+            )
+            for row in rows:
+                await send({"type": "http.response.body", "body": row, "more_body": True})
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {"type": "http", "headers": [(b"accept-encoding", b"gzip")]}
+        await CompressionMiddleware(app)(scope, None, send)
+
+        decoder = zlib.decompressobj(31)
+        bodies = [message["body"] for message in sent[1:]]
+        assert [decoder.decompress(body) for body in bodies[:3]] == rows
+        assert not sent[-1]["more_body"]
+
+    def test_event_stream_passes_through(self, client, gzip_only):
+        response = client.get("/events", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in response.headers
+        assert response.text.count("data: ") == 3
+
+    def test_already_encoded_passes_through(self, client, gzip_only):
+        response = client.get("/encoded", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.text == LARGE_TEXT
+
+    def test_non_compressible_type_passes_through(self, client, gzip_only):
+        response = client.get("/binary", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in response.headers
+        assert response.content == b"\x89PNG" * 1000
+
+    def test_error_responses_still_compressed(self, client, gzip_only):
+        response = client.get("/error", headers={"Accept-Encoding": "gzip"})
+
+        assert response.status_code == 500
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.json() == {"detail": LARGE_TEXT}
+
+    def test_fixed_level_overrides_adaptive(self, gzip_only):
+        app = FastAPI()
+        app.add_middleware(CompressionMiddleware, compression_level=1)
+
+        @app.get("/large")
+        def large():
+            return {"text": LARGE_TEXT}
+
+        with patch.object(compression.zlib, "compressobj", wraps=zlib.compressobj) as factory:
+            response = TestClient(app).get("/large", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert factory.call_args.args[0] == 1
@@ -0,0 +1,236 @@
+"""
+Unit tests for GCRA rate limiting.
+
+Tests cover:
+- Burst, rejection, Retry-After, refill and refunds for the in-process limiter
+- Bounded LRU eviction of per-key state
+- The Redis Lua script: one round trip per check, leased tokens, shared limits
+- Unused leased tokens handed back, so clients under their limit keep their burst
+- RateLimitMiddleware responses and fallback when Redis errors
+"""
+
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from api.middleware import gcra
+from api.middleware.gcra import BoundedLRU, LocalGCRA, RedisGCRA
+from api.middleware.rate_limit import RateLimitMiddleware
+
+
+class FakeClock:
+    """Stand-in for time.monotonic that only moves when told to."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    fake = FakeClock()
+    with patch.object(gcra.time, "monotonic", fake):
+        yield fake
+
+
+@pytest.fixture
+def redis_client():
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")  # fakeredis runs Lua scripts with lupa
+    client = fakeredis.FakeRedis()
+    client.script_load(gcra.GCRA_SCRIPT)  # so EVALSHA counts exclude the NOSCRIPT reload
+    return client
+
+
+class TestBoundedLRU:
+    """Tests for BoundedLRU."""
+
+    def test_evicts_least_recently_used(self):
+        lru = BoundedLRU(max_size=2)
+        lru["a"] = 1
+        lru["b"] = 2
+        assert lru["a"] == 1  # a is now the most recent
+        lru["c"] = 3
+
+        assert list(lru) == ["a", "c"]
+
+
+class TestLocalGCRA:
+    """Tests for LocalGCRA."""
+
+    def test_burst_then_reject(self, clock):
+        limiter = LocalGCRA()
+
+        results = [limiter.check("k", limit=5, period=60) for _ in range(6)]
+
+        assert [r.allowed for r in results] == [True] * 5 + [False]
+        assert [r.remaining for r in results[:5]] == [4, 3, 2, 1, 0]
+        assert results[-1].retry_after == pytest.approx(12.0)  # 60s / 5 requests
+
+    def test_refills_one_request_per_interval(self, clock):
+        limiter = LocalGCRA()
+        for _ in range(5):
+            limiter.check("k", limit=5, period=60)
+
+        clock.now += 11.9
+        assert not limiter.check("k", limit=5, period=60).allowed
+        clock.now += 0.2
+        result = limiter.check("k", limit=5, period=60)
+
+        assert result.allowed
+        assert result.remaining == 0
+
+    def test_keys_are_independent_and_bounded(self, clock):
+        limiter = LocalGCRA(max_keys=100)
+        limiter.check("a", limit=1)
+
+        for i in range(1000):
+            limiter.check(f"user-{i}", limit=1)
+
+        assert len(limiter._tats) == 100
+        # "a" was evicted, so it starts again with a full bucket
+        assert limiter.check("a", limit=1).allowed
+
+    def test_cost(self, clock):
+        limiter = LocalGCRA()
+
+        assert limiter.check("k", limit=10, cost=8).remaining == 2
+        assert not limiter.check("k", limit=10, cost=3).allowed
+        assert limiter.check("k", limit=10, cost=2).allowed
+
+    def test_refund_never_overfills(self, clock):
+        limiter = LocalGCRA()
+        limiter.check("k", limit=10, cost=8)
+
+        limiter.refund("k", limit=10, cost=5)
+        assert limiter.check("k", limit=10, cost=7).allowed
+        limiter.refund("k", limit=10, cost=100)
+        assert limiter.check("k", limit=10, cost=10).remaining == 0
+
+
+class TestRedisGCRA:
+    """Tests for RedisGCRA against the Lua script."""
+
+    def test_single_script_call_per_check(self, redis_client):
+        limiter = RedisGCRA(redis_client, max_lease=0)
+
+        with patch.object(redis_client, "evalsha", wraps=redis_client.evalsha) as evalsha:
+            results = [limiter.check("k", limit=3, period=60) for _ in range(4)]
+
+        assert [r.allowed for r in results] == [True, True, True, False]
+        assert [r.remaining for r in results[:3]] == [2, 1, 0]
+        assert 19 < results[-1].retry_after <= 20
+        assert evalsha.call_count == 4
+
+    def test_leases_admit_locally_when_far_under_limit(self, redis_client):
+        """
+        GIVEN a limit of 100/minute and a fresh bucket
+        WHEN 20 requests arrive
+        THEN most are admitted from leased tokens without calling Redis
+        """
+        limiter = RedisGCRA(redis_client, max_lease=10)
+
+        with patch.object(redis_client, "evalsha", wraps=redis_client.evalsha) as evalsha:
+            results = [limiter.check("k", limit=100, period=60) for _ in range(20)]
+
+        assert all(r.allowed for r in results)
+        assert evalsha.call_count == 2
+        assert results[-1].remaining == 80
+
+    def test_instances_share_the_limit(self, redis_client):
+        """
+        GIVEN two API instances limiting the same key through one Redis
+        WHEN they alternate requests, leasing what they can
+        THEN together they never admit more than the limit
+        """
+        first, second = RedisGCRA(redis_client), RedisGCRA(redis_client)
+
+        allowed = sum(
+            (first if i % 2 else second).check("k", limit=100, period=60).allowed
+            for i in range(300)
+        )
+
+        assert allowed == 100
+
+    def test_no_lease_near_the_limit(self, redis_client):
+        limiter = RedisGCRA(redis_client, max_lease=10)
+        for _ in range(99):
+            limiter.check("k", limit=100, period=60, cost=1)
+        limiter._leases.clear()  # spend only what Redis admitted directly
+
+        with patch.object(redis_client, "evalsha", wraps=redis_client.evalsha) as evalsha:
+            results = [limiter.check("k", limit=100, period=60) for _ in range(3)]
+
+        assert evalsha.call_count == 3
+        assert not results[-1].allowed
+
+    def test_unused_lease_tokens_are_handed_back(self, redis_client):
+        """
+        GIVEN a client sending 40 requests a minute against a 100/minute limit
+        WHEN it then bursts 50 requests at once
+        THEN all 50 are admitted: tokens leased for the steady requests and left
+             unspent were handed back rather than draining the bucket
+        """
+        clock = FakeClock()
+        clock.now = time.time()
+        limiter = RedisGCRA(redis_client, max_lease=10)
+
+        with patch.object(time, "time", clock), patch.object(time, "monotonic", clock):
+            steady = []
+            for _ in range(60):
+                steady.append(limiter.check("k", limit=100, period=60).allowed)
+                clock.now += 1.5
+            burst = [limiter.check("k", limit=100, period=60).allowed for _ in range(50)]
+
+        assert all(steady)
+        assert sum(burst) == 50
+
+    def test_refund(self, redis_client):
+        limiter = RedisGCRA(redis_client, max_lease=0)
+        limiter.check("k", limit=10, period=60, cost=10)
+        assert not limiter.check("k", limit=10, period=60).allowed
+
+        limiter.refund("k", limit=10, period=60, cost=4)
+
+        assert limiter.check("k", limit=10, period=60, cost=4).allowed
+        assert not limiter.check("k", limit=10, period=60).allowed
+
+
+class TestRateLimitMiddleware:
+    """Tests for RateLimitMiddleware."""
+
+    def make_client(self, redis_cache=None):
+        app = FastAPI()
+        app.add_middleware(RateLimitMiddleware, redis_client=redis_cache)
+
+        @app.post("/tools/analyze_call")
+        def analyze():
+            return {"ok": True}
+
+        return TestClient(app)
+
+    def test_returns_429_with_retry_after(self):
+        client = self.make_client()
+
+        responses = [client.post("/tools/analyze_call") for _ in range(11)]
+
+        assert [r.status_code for r in responses] == [200] * 10 + [429]
+        assert responses[0].headers["X-RateLimit-Remaining"] == "9"
+        assert responses[-1].headers["Retry-After"] == "6"
+        assert responses[-1].json()["error"] == "Rate limit exceeded"
+
+    def test_falls_back_to_local_when_redis_fails(self):
+        redis_cache = MagicMock(available=True)
+        redis_cache._client.register_script.return_value = MagicMock(
+            side_effect=ConnectionError("redis down")
+        )
+        client = self.make_client(redis_cache)
+
+        responses = [client.post("/tools/analyze_call") for _ in range(11)]
+
+        assert [r.status_code for r in responses] == [200] * 10 + [429]